@@ -0,0 +1,28 @@
+"""Small resume documents shared by the tests."""
+
+from typing import Any, Dict
+
+
+def document(heading: str = "Experience") -> Dict[str, Any]:
+    """A small document with a single list section"""
+    return {
+        "firstName": "Ada",
+        "lastName": "Lovelace",
+        "links": [],
+        "resume": {
+            "sections": [
+                {
+                    "heading": heading,
+                    "subsections": [
+                        {
+                            "heading": "Analytical Engine",
+                            "content": {
+                                "type": "list",
+                                "items": [{"segments": [{"text": "Notes"}]}],
+                            },
+                        }
+                    ],
+                }
+            ]
+        },
+    }
@@ -0,0 +1,173 @@
+"""Tests of rendering documents from coroutines on a thread or process pool."""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+import pytest
+from vitagen import aio
+from vitagen.aio import AsyncRenderer, render_async, render_document
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import load_resume
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import load_document
+
+SAMPLES = sorted(
+    [PROJECT_ROOT / "data.json", *PROJECT_ROOT.glob("samples/*/data.json")]
+)
+
+
+class BlockedRender:
+    """Stands in for ``render_document``, blocking until it is let go"""
+
+    def __init__(self):
+        self.started: List[str] = []
+        self.go = threading.Event()
+
+    def __call__(self, data, theme=None, unicode_escapes=False) -> str:
+        self.started.append(data)
+        self.go.wait(timeout=10)
+        return f"rendered {data}"
+
+    def let_go(self) -> None:
+        """Let blocked and later renders finish"""
+        self.go.set()
+
+
+@pytest.fixture(name="blocked")
+def fixture_blocked(monkeypatch) -> BlockedRender:
+    """Renders that block until the test lets them go"""
+    render = BlockedRender()
+    monkeypatch.setattr(aio, "render_document", render)
+    yield render
+    render.let_go()
+
+
+def free_slots(renderer: AsyncRenderer) -> int:
+    """Slots of the running event loop no render holds"""
+    # pylint: disable=protected-access
+    return renderer._slots(asyncio.get_running_loop())._value
+
+
+async def settle() -> None:
+    """Let callbacks scheduled from executor threads run"""
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_every_form_of_a_document_renders_alike(path):
+    """Bytes, text, decoded and parsed documents render as the generator does"""
+    expected = ResumeContentGenerator(load_document(path)).build_resume()
+    forms = [
+        path.read_bytes(),
+        path.read_text("utf-8"),
+        load_document(path),
+        load_resume(path),
+    ]
+
+    async def main():
+        async with AsyncRenderer(max_concurrency=2) as renderer:
+            return await asyncio.gather(*(renderer.render(d) for d in forms))
+
+    assert asyncio.run(main()) == [expected] * len(forms)
+
+
+def test_process_pool_renders_like_threads():
+    """Documents sent to worker processes render the same"""
+    path = PROJECT_ROOT / "samples" / "preset-carlito" / "data.json"
+
+    async def main():
+        async with AsyncRenderer("process", max_concurrency=1) as renderer:
+            return await renderer.render(path.read_bytes())
+
+    assert asyncio.run(main()) == render_document(path.read_bytes())
+
+
+def test_timed_out_render_keeps_its_slot_until_done(blocked):
+    """A running render is waited for before its slot is given to another"""
+
+    async def main():
+        async with AsyncRenderer(max_concurrency=1, timeout=0.1) as renderer:
+            with pytest.raises(TimeoutError, match="longer than 0.1s"):
+                await renderer.render("first")
+            assert free_slots(renderer) == 0
+
+            second = asyncio.ensure_future(renderer.render("second", timeout=5))
+            await settle()
+            assert blocked.started == ["first"]
+
+            blocked.let_go()
+            assert await second == "rendered second"
+            await settle()
+            assert free_slots(renderer) == 1
+
+    asyncio.run(main())
+
+
+def test_timed_out_render_that_never_started_is_dropped(blocked):
+    """A render still queued on the executor when it times out never runs"""
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            renderer = AsyncRenderer(executor, max_concurrency=2)
+            first = asyncio.ensure_future(renderer.render("first"))
+            await settle()
+
+            with pytest.raises(TimeoutError):
+                await renderer.render("queued", timeout=0.1)
+            await settle()
+            assert free_slots(renderer) == 1
+
+            blocked.let_go()
+            assert await first == "rendered first"
+            renderer.close()
+            assert await renderer.render("after close") == "rendered after close"
+        assert blocked.started == ["first", "after close"]
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiting_render_never_runs(blocked):
+    """A render cancelled while waiting for a slot neither runs nor keeps one"""
+
+    async def main():
+        async with AsyncRenderer(max_concurrency=1) as renderer:
+            first = asyncio.ensure_future(renderer.render("first"))
+            waiting = asyncio.ensure_future(renderer.render("waiting"))
+            await settle()
+
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            blocked.let_go()
+            await first
+            await settle()
+
+            assert blocked.started == ["first"]
+            assert free_slots(renderer) == 1
+
+    asyncio.run(main())
+
+
+def test_failed_render_releases_its_slot():
+    """Invalid documents raise on the caller and give their slot back"""
+    data = (PROJECT_ROOT / "samples" / "single-column" / "data.json").read_bytes()
+
+    async def main():
+        async with AsyncRenderer(max_concurrency=1) as renderer:
+            for invalid in (data[: len(data) // 2], json.dumps([]).encode()):
+                with pytest.raises(ValueError):
+                    await renderer.render(invalid)
+            await settle()
+            assert free_slots(renderer) == 1
+            return await render_async(data, renderer=renderer)
+
+    assert asyncio.run(main()) == render_document(data)
+
+
+def test_unknown_executor_is_rejected():
+    """Executors are named by their kind"""
+    with pytest.raises(ValueError, match="unknown executor 'fiber'"):
+        AsyncRenderer("fiber")
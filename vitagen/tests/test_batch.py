@@ -0,0 +1,126 @@
+"""Tests of rendering batches of documents, each failure isolated to its job."""
+
+import json
+import shutil
+from pathlib import Path
+from typing import List
+import pytest
+from vitagen import batch
+from vitagen.batch import BatchJob, collect_jobs, run_batch
+from vitagen.layout.fonts import PROJECT_ROOT
+
+SAMPLES = sorted(PROJECT_ROOT.glob("samples/*/data.json"))
+
+
+def copy_samples(directory: Path) -> List[str]:
+    """Copy the sample documents into a batch directory, returning their names"""
+    directory.mkdir()
+    names = []
+    for index, path in enumerate(SAMPLES):
+        shutil.copy(path, directory / f"sample-{index}.json")
+        names.append(f"sample-{index}")
+    return names
+
+
+def write_invalid(directory: Path) -> None:
+    """Write documents failing to decode and failing to parse"""
+    (directory / "a-truncated.json").write_text('{"firstName": "Ada"', "utf-8")
+    (directory / "b-spacing.json").write_text(
+        json.dumps({"spacing": "roomy", "resume": {"sections": []}}), "utf-8"
+    )
+
+
+def outcomes(summary) -> dict:
+    """Whether every document of a batch rendered, by name"""
+    return {result.name: result.ok for result in summary.results}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failures_stay_in_their_document(tmp_path, workers):
+    """Invalid documents fail on their own, the others render"""
+    names = copy_samples(tmp_path / "docs")
+    write_invalid(tmp_path / "docs")
+
+    summary = run_batch(tmp_path / "docs", tmp_path / "out", workers=workers)
+
+    assert outcomes(summary) == {
+        "a-truncated": False,
+        "b-spacing": False,
+        **{name: True for name in names},
+    }
+    assert (summary.succeeded, summary.failed) == (len(names), 2)
+    errors = {result.name: result.error for result in summary.results}
+    assert errors["b-spacing"].startswith("DocumentError")
+    assert "unknown spacing 'roomy'" in errors["b-spacing"]
+    assert not (tmp_path / "out" / "a-truncated.tex").exists()
+    for name in names:
+        assert (tmp_path / "out" / f"{name}.tex").stat().st_size > 0
+
+
+def test_summary_counts_every_document(tmp_path):
+    """Throughput, bytes and the leaf cache cover the rendered documents"""
+    names = copy_samples(tmp_path / "docs")
+    write_invalid(tmp_path / "docs")
+
+    summary = run_batch(tmp_path / "docs", tmp_path / "out", workers=1)
+
+    assert len(summary.results) == len(names) + 2
+    assert summary.documents_per_second > 0
+    assert all(result.output_bytes > 0 for result in summary.results if result.ok)
+    assert all(result.output_bytes == 0 for result in summary.results if not result.ok)
+    assert summary.leaf_cache.hits + summary.leaf_cache.misses > 0
+
+
+def test_document_removed_after_collection_fails_alone(tmp_path, monkeypatch):
+    """A document gone before its identity is taken fails, the batch goes on"""
+    names = copy_samples(tmp_path / "docs")
+    removed = tmp_path / "docs" / f"{names[0]}.json"
+    kept = removed.read_bytes()
+
+    def collect_then_remove(*args, **kwargs):
+        jobs = collect_jobs(*args, **kwargs)
+        removed.unlink()
+        return jobs
+
+    monkeypatch.setattr(batch, "collect_jobs", collect_then_remove)
+    summary = run_batch(tmp_path / "docs", tmp_path / "out", workers=1)
+
+    failed = summary.results[0]
+    assert (failed.name, failed.ok) == (names[0], False)
+    assert failed.error.startswith("FileNotFoundError")
+    assert (summary.succeeded, summary.failed) == (len(names) - 1, 1)
+
+    # restored, only the document that failed renders on resume
+    monkeypatch.setattr(batch, "collect_jobs", collect_jobs)
+    removed.write_bytes(kept)
+    resumed = run_batch(tmp_path / "docs", tmp_path / "out", workers=1, resume=True)
+    assert outcomes(resumed) == {names[0]: True}
+    assert resumed.skipped == len(names) - 1
+
+
+def test_missing_document_has_no_identity(tmp_path):
+    """The identity of a missing document is None instead of an error"""
+    job = BatchJob("gone", str(tmp_path / "gone.tex"), str(tmp_path / "gone.json"))
+
+    assert job.record_id is None
+    assert BatchJob("row", "row.tex", "docs.jsonl", record=(0, 2, 255)).record_id == (
+        "row:000000ff"
+    )
+
+
+def test_glob_sources_collect_matching_files(tmp_path):
+    """Glob patterns collect JSON files, in a stable order with unique names"""
+    copy_samples(tmp_path / "docs")
+    (tmp_path / "docs" / "nested").mkdir()
+    shutil.copy(
+        PROJECT_ROOT / "data.json", tmp_path / "docs" / "nested" / "sample-0.json"
+    )
+
+    jobs = collect_jobs(str(tmp_path / "docs" / "**" / "*.json"), tmp_path / "out")
+
+    assert [job.name for job in jobs] == [
+        "sample-0",
+        "sample-0-2",
+        *(f"sample-{i}" for i in range(1, len(SAMPLES))),
+    ]
+    assert len({job.output for job in jobs}) == len(jobs)
@@ -0,0 +1,194 @@
+"""Tests of the build driver, compiling with the stub engine."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+import pytest
+from vitagen.tex.build import BuildError, PdfCache, build
+from vitagen.tex.engine import StubEngine
+from vitagen.tex.preamble import FormatCache
+from tests.documents import document
+
+# builds a document given as JSON into a PDF cache, printing the build result
+BUILD_SCRIPT = """
+import json, sys
+from vitagen.tex.build import PdfCache, build
+from vitagen.tex.engine import StubEngine
+data, directory = json.loads(sys.argv[1]), sys.argv[2]
+result = build(
+    data, directory + "/resume.pdf", cache=PdfCache(directory + "/pdf"),
+    engine=StubEngine(),
+)
+print(json.dumps({"digest": result.digest, "cached": result.cached}))
+"""
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+class FormatlessEngine(StubEngine):
+    """A stub engine whose passes fail against any format"""
+
+    def run(self, main, output_dir, cwd, *, fmt=None, timeout=None, cancel=None):
+        if fmt is not None:
+            self.passes.append(main)
+            return 1
+        return super().run(
+            main, output_dir, cwd, fmt=fmt, timeout=timeout, cancel=cancel
+        )
+
+
+class BrokenEngine(StubEngine):
+    """A stub engine whose passes always fail, as for a broken document"""
+
+    def run(self, main, output_dir, cwd, *, fmt=None, timeout=None, cancel=None):
+        self.passes.append(main)
+        return 1
+
+
+def run_build(
+    tmp_path: Path,
+    engine: StubEngine,
+    data: Optional[Dict[str, Any]] = None,
+    formats: bool = False,
+):
+    """Build a document into the temporary directory with the caches there"""
+    return build(
+        data or document(),
+        tmp_path / "resume.pdf",
+        cache=PdfCache(tmp_path / "pdf"),
+        formats=FormatCache(tmp_path / "formats") if formats else None,
+        engine=engine,
+    )
+
+
+def test_unchanged_rebuild_is_served_from_the_cache(tmp_path):
+    """A second build of the same document runs no pass"""
+    engine = StubEngine()
+
+    first = run_build(tmp_path, engine)
+    passes = len(engine.passes)
+    second = run_build(tmp_path, engine)
+
+    assert not first.cached
+    assert second.cached
+    assert second.digest == first.digest
+    assert len(engine.passes) == passes
+    assert (tmp_path / "resume.pdf").read_bytes() == first.pdf.read_bytes()
+
+
+def test_changed_document_misses_the_cache(tmp_path):
+    """Another document compiles again, under another digest"""
+    engine = StubEngine()
+
+    first = run_build(tmp_path, engine)
+    second = run_build(tmp_path, engine, document("Projects"))
+
+    assert not second.cached
+    assert second.digest != first.digest
+
+
+def test_second_pass_only_runs_in_a_fresh_work_directory(tmp_path):
+    """The auxiliary files of the previous build settle the next one in one pass"""
+    engine = StubEngine()
+
+    first = run_build(tmp_path, engine)
+    second = run_build(tmp_path, engine, document("Projects"))
+
+    assert first.passes == 2
+    assert second.passes == 1
+    assert len(engine.passes) == 3
+
+
+def test_compiles_against_the_dumped_format(tmp_path):
+    """The preamble is dumped once and loaded by the passes"""
+    engine = StubEngine()
+
+    first = run_build(tmp_path, engine, formats=True)
+    second = run_build(tmp_path, engine, document("Projects"), formats=True)
+
+    assert first.fmt is not None and first.fmt.is_file()
+    assert second.fmt == first.fmt
+    assert len(engine.dumps) == 1
+
+
+def test_failing_format_falls_back_and_is_rejected(tmp_path):
+    """A compile that only succeeds without the format stops using the format"""
+    engine = FormatlessEngine()
+
+    first = run_build(tmp_path, engine, formats=True)
+
+    assert not first.cached
+    assert first.fmt is None
+    assert first.pdf.is_file()
+    rejected = list((tmp_path / "formats").rglob("*.failed"))
+    assert len(rejected) == 1
+    assert not rejected[0].with_suffix(".fmt").exists()
+
+    passes = len(engine.passes)
+    second = run_build(tmp_path, engine, document("Projects"), formats=True)
+
+    assert second.fmt is None
+    assert len(engine.dumps) == 1
+    # compiled without the rejected format straight away
+    assert len(engine.passes) == passes + second.passes
+
+
+def test_failing_document_keeps_the_format(tmp_path):
+    """A compile failing with and without the format raises, the format stays"""
+    engine = BrokenEngine()
+
+    with pytest.raises(BuildError):
+        run_build(tmp_path, engine, formats=True)
+
+    assert not list((tmp_path / "formats").rglob("*.failed"))
+    assert len(list((tmp_path / "formats").rglob("*.fmt"))) == 1
+
+
+def styled_document() -> Dict[str, Any]:
+    """A document whose segments combine every style"""
+    data = document()
+    data["resume"]["sections"][0]["subsections"][0]["content"]["items"] = [
+        {
+            "segments": [
+                {"text": "plain "},
+                {
+                    "text": "styled",
+                    "style": {"underline": True, "italic": True, "bold": True},
+                },
+                {
+                    "text": "linked",
+                    "href": "https://example.com",
+                    "style": {"bold": True, "underline": True},
+                },
+            ]
+        }
+    ]
+    return data
+
+
+def build_in_process(tmp_path: Path, data: Dict[str, Any], seed: int) -> dict:
+    """Build a document in a new interpreter with a given hash seed"""
+    completed = subprocess.run(
+        [sys.executable, "-c", BUILD_SCRIPT, json.dumps(data), str(tmp_path)],
+        cwd=PROJECT_DIR,
+        env={**os.environ, "PYTHONHASHSEED": str(seed), "LOG_LEVEL": "ERROR"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_styled_rebuild_hits_the_cache_across_processes(tmp_path):
+    """Style nesting does not depend on the hash seed of the process"""
+    data = styled_document()
+
+    first = build_in_process(tmp_path, data, seed=1)
+    results = [build_in_process(tmp_path, data, seed=seed) for seed in range(2, 6)]
+
+    assert not first["cached"]
+    assert all(result["cached"] for result in results)
+    assert {result["digest"] for result in results} == {first["digest"]}
@@ -0,0 +1,246 @@
+"""Tests of the persistent section cache and the cache of leaf fragments."""
+
+import copy
+from pathlib import Path
+from typing import Any, Dict, Tuple
+import pytest
+from vitagen.generator import cache as cache_module
+from vitagen.generator.cache import (
+    LeafCache,
+    LeafCacheStats,
+    SectionCache,
+    SectionCacheReport,
+)
+from vitagen.generator.config.theme import parse_theme
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import load_document
+
+SAMPLES = sorted(
+    [PROJECT_ROOT / "data.json", *PROJECT_ROOT.glob("samples/*/data.json")]
+)
+
+
+def render(
+    data: Dict[str, Any], directory: Path, **kwargs
+) -> Tuple[SectionCacheReport, str]:
+    """Render a document with a section cache, returning its report and output"""
+    section_cache = SectionCache(directory)
+    output = ResumeContentGenerator(
+        data, section_cache=section_cache, **kwargs
+    ).build_resume()
+    return section_cache.report, output
+
+
+def entries(directory: Path) -> list:
+    """Fragments stored in a cache directory"""
+    return sorted(directory.rglob("*.tex"))
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_unchanged_sections_are_served_from_the_cache(path, tmp_path):
+    """A second render hits every section and gives the same output"""
+    data = load_document(path)
+
+    first, output = render(data, tmp_path)
+    second, again = render(data, tmp_path)
+
+    sections = len(first.entries)
+    assert sections == len(data["resume"]["sections"])
+    assert (first.hits, first.misses) == (0, sections)
+    assert (second.hits, second.misses) == (sections, 0)
+    assert again == output
+    assert len(entries(tmp_path)) == sections
+
+
+def test_edited_section_misses_alone(tmp_path):
+    """Only the edited section renders again, under a new key"""
+    data = load_document(PROJECT_ROOT / "data.json")
+    first, _ = render(data, tmp_path)
+
+    edited = copy.deepcopy(data)
+    edited["resume"]["sections"][1]["heading"] = "Elsewhere"
+    second, output = render(edited, tmp_path)
+
+    assert [entry.hit for entry in second.entries] == [
+        index != 1 for index in range(len(first.entries))
+    ]
+    assert second.entries[1].key != first.entries[1].key
+    assert "ELSEWHERE" in output.upper()
+
+
+@pytest.mark.parametrize(
+    "change",
+    [{"spacing": "tight"}, {"preset": "preset-carlito"}],
+    ids=["spacing", "preset"],
+)
+def test_document_settings_are_part_of_the_key(change, tmp_path):
+    """Settings changing how every section renders miss every section"""
+    data = load_document(PROJECT_ROOT / "samples" / "single-column" / "data.json")
+    render(data, tmp_path)
+
+    changed, _ = render({**data, **change}, tmp_path)
+
+    assert changed.hits == 0
+
+
+def test_theme_is_part_of_the_key(tmp_path):
+    """Another theme misses, the same theme again hits"""
+    data = load_document(PROJECT_ROOT / "samples" / "preset-carlito" / "data.json")
+    theme = parse_theme({"section": {"titleFormat": "\\section*{{{}}}"}})
+    _, plain = render(data, tmp_path)
+
+    themed, output = render(data, tmp_path, theme=theme)
+    again, repeated = render(data, tmp_path, theme=theme)
+
+    assert themed.hits == 0
+    assert again.misses == 0
+    assert repeated == output != plain
+
+
+def test_renderer_change_invalidates_every_section(tmp_path, monkeypatch):
+    """Fragments of another renderer are never served"""
+    data = load_document(PROJECT_ROOT / "data.json")
+    first, output = render(data, tmp_path)
+
+    monkeypatch.setattr(cache_module, "renderer_fingerprint", lambda: "changed")
+    second, again = render(data, tmp_path)
+
+    assert second.hits == 0
+    assert again == output
+    assert {e.key for e in second.entries}.isdisjoint(e.key for e in first.entries)
+
+
+def test_renderer_fingerprint_is_computed_once():
+    """The fingerprint is a digest of the generator sources, hashed once"""
+    fingerprint = cache_module.renderer_fingerprint()
+
+    assert len(fingerprint) == 64
+    assert cache_module.renderer_fingerprint() is fingerprint
+
+
+def test_undecodable_entry_is_rendered_again(tmp_path):
+    """An entry that is not UTF-8 is a miss and is overwritten"""
+    data = load_document(PROJECT_ROOT / "samples" / "single-column" / "data.json")
+    first, output = render(data, tmp_path)
+    key = first.entries[0].key
+    damaged = SectionCache(tmp_path).path_for(key)
+    damaged.write_bytes(b"\xff\xfe\x00broken")
+
+    second, again = render(data, tmp_path)
+
+    assert [entry.hit for entry in second.entries] == [
+        index != 0 for index in range(len(first.entries))
+    ]
+    assert again == output
+    assert SectionCache(tmp_path).get(key) in output
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    """An entry that cannot be opened is not cached, not an error"""
+    section_cache = SectionCache(tmp_path)
+    section_cache.path_for("ab" * 32).mkdir(parents=True)
+
+    assert section_cache.get("ab" * 32) is None
+
+
+def test_sections_with_sources_are_never_cached(tmp_path):
+    """Streamed content is read on every render"""
+    rows = tmp_path / "rows.csv"
+    rows.write_text("Skill,Level\nPython,Expert\n", "utf-8")
+    data = {
+        "resume": {
+            "sections": [
+                {
+                    "heading": "Skills",
+                    "content": {"type": "table", "source": str(rows)},
+                },
+                {"heading": "Notes", "content": {"type": "paragraph", "text": "n"}},
+            ]
+        }
+    }
+
+    render(data, tmp_path / "cache")
+    rows.write_text("Skill,Level\nRust,Learning\n", "utf-8")
+    second, output = render(data, tmp_path / "cache")
+
+    assert [e.heading for e in second.entries] == ["Notes"]
+    assert "Rust" in output and "Python" not in output
+
+
+def leaf_render(data: Dict[str, Any], leaf_cache: LeafCache, **kwargs) -> str:
+    """Render a document with a leaf cache"""
+    return ResumeContentGenerator(data, leaf_cache=leaf_cache, **kwargs).build_resume()
+
+
+def test_least_recently_used_leaf_is_evicted():
+    """Lookups keep a fragment, the one unused the longest is dropped"""
+    leaf_cache = LeafCache(max_entries=2)
+    config = object()
+    leaf_cache.put("a", config, "A")
+    leaf_cache.put("b", config, "B")
+
+    assert leaf_cache.get("a") == "A"
+    leaf_cache.put("c", config, "C")
+
+    assert leaf_cache.get("b") is None
+    assert [leaf_cache.get(key) for key in ("a", "c")] == ["A", "C"]
+    assert leaf_cache.stats == LeafCacheStats(hits=3, misses=1, evictions=1)
+    assert leaf_cache.stats.hit_rate == 0.75
+
+
+def test_too_many_configs_drop_every_leaf(monkeypatch):
+    """Configs beyond the limit clear the cache instead of growing it"""
+    monkeypatch.setattr(cache_module, "MAX_LEAF_CONFIGS", 2)
+    leaf_cache = LeafCache()
+    first, second, third = object(), object(), object()
+    leaf_cache.put("a", first, "A")
+    leaf_cache.put("b", second, "B")
+    leaf_cache.put("c", first, "C")
+
+    assert len(leaf_cache.entries) == 3
+    leaf_cache.put("d", third, "D")
+
+    assert list(leaf_cache.entries) == ["d"]
+    assert list(leaf_cache.configs.values()) == [third]
+    assert leaf_cache.stats.evictions == 3
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_evicting_leaves_changes_no_output(path):
+    """A cache too small for a document renders it as without a cache"""
+    data = load_document(path)
+    expected = ResumeContentGenerator(data).build_resume()
+    leaf_cache = LeafCache(max_entries=4)
+
+    assert leaf_render(data, leaf_cache) == expected
+    before = leaf_cache.stats
+    assert leaf_render(data, leaf_cache) == expected
+
+    render_stats = leaf_cache.stats - before
+    assert before.evictions > 0 and render_stats.evictions > 0
+    assert render_stats.hits + render_stats.misses > 0
+    assert len(leaf_cache.entries) == 4
+
+
+def test_leaves_of_evicted_configs_are_not_served(monkeypatch):
+    """Themes alternating past the config limit keep their own fragments"""
+    data = load_document(PROJECT_ROOT / "samples" / "preset-carlito" / "data.json")
+    themes = [
+        parse_theme({"style": {"commands": {"bold": command}}})
+        for command in ("\\bfseries", "\\textbf", "\\textsc")
+    ]
+    expected = [ResumeContentGenerator(data, theme=t).build_resume() for t in themes]
+    leaf_cache = LeafCache()
+    # room for the configs of a single theme, the next one clears the cache
+    leaf_render(data, leaf_cache, theme=themes[0])
+    monkeypatch.setattr(cache_module, "MAX_LEAF_CONFIGS", len(leaf_cache.configs))
+    leaf_cache.clear()
+
+    outputs = [
+        leaf_render(data, leaf_cache, theme=theme) for theme in themes + themes[::-1]
+    ]
+
+    assert outputs == expected + expected[::-1]
+    assert leaf_cache.stats.evictions > 0 and leaf_cache.stats.hits > 0
+    assert len(leaf_cache.configs) <= cache_module.MAX_LEAF_CONFIGS
@@ -0,0 +1,155 @@
+"""Tests of the JSON decoders documents are read with."""
+
+import json
+import sys
+import types
+from typing import Iterator
+import pytest
+from vitagen import decoders
+from vitagen.decoders import (
+    DECODERS,
+    available_decoders,
+    decode,
+    get_decoder,
+    set_decoder,
+)
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import IncludeError, load_document, parse_document
+
+SAMPLES = sorted(
+    [PROJECT_ROOT / "data.json", *PROJECT_ROOT.glob("samples/*/data.json")]
+)
+INVALID = [b'{"resume": ', b'{"a": 1,}', b"[1 2]", b"\xff\xfe{}", b""]
+
+
+def missing() -> decoders.Decoder:
+    """A backend whose package is not installed"""
+    raise ImportError("No module named 'missing'")
+
+
+class FakeDecodeError(Exception):
+    """The decode error of the fake msgspec"""
+
+
+def fake_msgspec() -> types.ModuleType:
+    """A msgspec module decoding with the standard library"""
+
+    def decode_value(data):
+        """Decode a value, raising an error of its own"""
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise FakeDecodeError(f"malformed: {e}") from None
+
+    module = types.ModuleType("msgspec")
+    module.DecodeError = FakeDecodeError
+    module.json = types.SimpleNamespace(
+        Decoder=lambda: types.SimpleNamespace(decode=decode_value)
+    )
+    return module
+
+
+@pytest.fixture(name="fresh", autouse=True)
+def fixture_fresh(monkeypatch) -> Iterator[None]:
+    """Backends loaded again and the picked one reset around every test"""
+    monkeypatch.setattr(decoders.settings, "name", None)
+    decoders._load.cache_clear()  # pylint: disable=protected-access
+    decoders._fastest.cache_clear()  # pylint: disable=protected-access
+    yield
+    decoders._load.cache_clear()  # pylint: disable=protected-access
+    decoders._fastest.cache_clear()  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize("name", available_decoders())
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_backends_decode_samples_alike(path, name):
+    """Every installed backend decodes bytes and text as the standard library"""
+    data = path.read_bytes()
+    decoder = get_decoder(name)
+
+    assert decoder(data) == json.loads(data)
+    assert decoder(data.decode("utf-8")) == json.loads(data)
+
+
+@pytest.mark.parametrize("name", available_decoders())
+@pytest.mark.parametrize("data", INVALID)
+def test_invalid_json_raises_value_error(data, name):
+    """Whatever the backend, invalid JSON raises a ValueError"""
+    with pytest.raises(ValueError):
+        get_decoder(name)(data)
+
+
+def test_missing_backend_falls_back_to_the_next(monkeypatch):
+    """The fastest installed backend is picked when the first is missing"""
+    monkeypatch.setitem(DECODERS, "orjson", missing)
+
+    assert "orjson" not in available_decoders()
+    assert available_decoders()[-1] == "json"
+    assert get_decoder() is get_decoder(available_decoders()[0])
+    assert decode(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_missing_backend_cannot_be_picked(monkeypatch):
+    """Picking a backend that is not installed keeps the previous pick"""
+    monkeypatch.setitem(DECODERS, "orjson", missing)
+    set_decoder("json")
+
+    with pytest.raises(ValueError, match="json decoder 'orjson' is not installed"):
+        set_decoder("orjson")
+    with pytest.raises(ValueError, match="unknown json decoder 'yaml'"):
+        set_decoder("yaml")
+
+    assert decoders.settings.name == "json"
+    assert get_decoder() is json.loads
+
+
+def test_picked_backend_decodes_documents(monkeypatch):
+    """Documents are decoded by the backend of the process"""
+    calls = []
+
+    def counted() -> decoders.Decoder:
+        def decode_value(data):
+            calls.append(data)
+            return json.loads(data)
+
+        return decode_value
+
+    monkeypatch.setitem(DECODERS, "counted", counted)
+    set_decoder("counted")
+    data = (PROJECT_ROOT / "data.json").read_bytes()
+
+    assert parse_document(data) == json.loads(data)
+    assert calls == [data]
+
+    set_decoder(None)
+    assert parse_document(data) == json.loads(data)
+    assert len(calls) == 1
+
+
+def test_msgspec_errors_are_value_errors(monkeypatch):
+    """The decode errors of msgspec are raised as ValueError"""
+    monkeypatch.setitem(sys.modules, "msgspec", fake_msgspec())
+    set_decoder("msgspec")
+    data = (PROJECT_ROOT / "samples" / "single-column" / "data.json").read_bytes()
+
+    assert decode(data) == json.loads(data)
+    with pytest.raises(ValueError, match="malformed") as error:
+        decode(b'{"resume": ')
+    assert not isinstance(error.value, FakeDecodeError)
+
+
+@pytest.mark.parametrize("name", available_decoders())
+def test_invalid_documents_and_includes_are_reported(name, tmp_path):
+    """Loading reports invalid JSON of documents and fragments alike"""
+    set_decoder(name)
+    data = load_document(PROJECT_ROOT / "samples" / "preset-carlito" / "data.json")
+    (tmp_path / "sections.json").write_text('[{"heading": ', "utf-8")
+    data["resume"]["sections"] = {"$ref": "sections.json"}
+    (tmp_path / "resume.json").write_text(json.dumps(data), "utf-8")
+
+    with pytest.raises(IncludeError, match="invalid json"):
+        load_document(tmp_path / "resume.json")
+    with pytest.raises(ValueError):
+        parse_document(b'{"resume": ')
+    with pytest.raises(ValueError, match="must be a json object"):
+        parse_document(b"[]")
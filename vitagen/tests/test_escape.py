@@ -0,0 +1,86 @@
+"""Tests of the escaping engine against the routine it replaced."""
+
+import random
+import pytest
+from vitagen.bench.escape import legacy_escape_latex
+from vitagen.generator.escape import (
+    CHAIN_THRESHOLD,
+    LATEX_SPECIAL_CHARS,
+    LONG_TEXT_THRESHOLD,
+    PLACEHOLDER_START,
+    escape_latex,
+    get_escaper,
+)
+
+# every character the default mapping replaces, and some it does not
+ALPHABET = "".join(LATEX_SPECIAL_CHARS) + "abcXYZ019-.,;()[]@\u00e9\u2013"
+
+
+def random_text(length: int, seed: int) -> str:
+    """A reproducible text drawn from the alphabet"""
+    rng = random.Random(seed)
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+LENGTHS = [
+    0,
+    1,
+    40,
+    CHAIN_THRESHOLD,
+    CHAIN_THRESHOLD + 1,
+    LONG_TEXT_THRESHOLD,
+    LONG_TEXT_THRESHOLD + 1,
+    5000,
+]
+
+TEXTS = [
+    "Hello_world & 100%",
+    "C:\\path\\{to}\\file ~user^2 <a|b>",
+    '"quoted" and `ticked\' text\twith\nbreaks',
+    "".join(LATEX_SPECIAL_CHARS),
+    "".join(LATEX_SPECIAL_CHARS) * 60,
+    "{\\space}" * 200,
+    "a" * 2000,
+    chr(PLACEHOLDER_START) + "\\{}" * 100,
+    chr(PLACEHOLDER_START) + "\\{}" * 400,
+]
+
+CUSTOM_MAPPINGS = [
+    {"$": "USD"},
+    {"\\": "/", "-": r"\-"},
+    {"&": r"\&{}"},
+    {"C++": r"C\texttt{++}", "R&D": "research"},
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_legacy_on_texts(text):
+    """Hand picked texts escape as they always did"""
+    assert escape_latex(text) == legacy_escape_latex(text)
+
+
+@pytest.mark.parametrize("length", LENGTHS)
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_legacy_across_thresholds(length, seed):
+    """Random texts on both sides of every threshold escape as they always did"""
+    text = random_text(length, seed)
+    assert escape_latex(text) == legacy_escape_latex(text)
+
+
+@pytest.mark.parametrize("custom_chars", CUSTOM_MAPPINGS)
+@pytest.mark.parametrize("length", LENGTHS)
+def test_matches_legacy_with_custom_mappings(custom_chars, length):
+    """Custom mappings, multi character keys included, escape as they always did"""
+    text = random_text(length, length) + " C++ R&D " + random_text(length, 1)
+    expected = legacy_escape_latex(text, custom_chars)
+    assert escape_latex(text, custom_chars) == expected
+    assert get_escaper(custom_chars).escape(text) == expected
+
+
+def test_unicode_punctuation_is_optional():
+    """Typographic replacements only apply when asked for"""
+    text = "2019\u20132021 \u201cquoted\u201d\u2026"
+    assert escape_latex(text) == legacy_escape_latex(text)
+    assert escape_latex(text, unicode=True) == (
+        "2019--2021{\\space}``quoted''\\ldots{}"
+    )
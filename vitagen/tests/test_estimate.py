@@ -0,0 +1,136 @@
+"""Tests of estimating the page fill of documents and selecting their spacing."""
+
+import argparse
+import json
+from dataclasses import replace
+import pytest
+from vitagen.generator.config.spacing_factor import SpacingModel
+from vitagen.generator.config.theme import parse_theme
+from vitagen.generator.model import load_resume
+from vitagen.layout.estimate import (
+    FillEstimate,
+    estimate_fill,
+    main,
+    recommend_spacing,
+    select_spacing,
+)
+from vitagen.layout.fonts import PROJECT_ROOT
+
+SAMPLES = sorted(
+    [PROJECT_ROOT / "data.json", *PROJECT_ROOT.glob("samples/*/data.json")]
+)
+# densest models first, a document set looser takes more room
+BY_DENSITY = sorted(SpacingModel, key=lambda model: model.value)
+
+
+def estimates(*heights: float, available: float = 100.0):
+    """Estimates of the densest models with the given heights"""
+    return [
+        FillEstimate(model, height, available)
+        for model, height in zip(BY_DENSITY, heights)
+    ]
+
+
+def sample(name: str):
+    """A parsed sample document"""
+    return load_resume(PROJECT_ROOT / "samples" / name / "data.json")
+
+
+def test_loosest_fitting_model_is_recommended():
+    """Of the models that fit, the one filling the page the most wins"""
+    candidates = estimates(80, 90, 99, 101, 120)
+
+    assert recommend_spacing(candidates).spacing is BY_DENSITY[2]
+
+
+def test_densest_model_is_recommended_when_none_fits():
+    """Overflowing under every model, the smallest overflow is picked"""
+    candidates = estimates(110, 115, 130)
+
+    recommended = recommend_spacing(candidates, current=BY_DENSITY[2])
+
+    assert recommended.spacing is BY_DENSITY[0]
+    assert not recommended.fits
+
+
+@pytest.mark.parametrize("fits", [True, False], ids=["fitting", "overflowing"])
+def test_current_model_wins_ties(fits):
+    """Models filling the page equally keep the model of the document"""
+    height = 90 if fits else 110
+    candidates = estimates(*[height] * 5)
+
+    assert recommend_spacing(candidates, BY_DENSITY[3]).spacing is BY_DENSITY[3]
+    assert recommend_spacing(candidates).spacing is BY_DENSITY[4 if fits else 0]
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_recommendation_is_the_loosest_that_fits(path):
+    """Every looser model than the recommended one overflows"""
+    document = load_resume(path)
+    fills = estimate_fill(document)
+
+    recommended = select_spacing(document)
+
+    assert [estimate.spacing for estimate in fills] == BY_DENSITY
+    heights = [estimate.height_pt for estimate in fills]
+    assert heights == sorted(heights)
+    looser = [e for e in fills if e.height_pt > recommended.height_pt]
+    if recommended.fits:
+        assert not any(estimate.fits for estimate in looser)
+    else:
+        assert not any(estimate.fits for estimate in fills)
+        assert recommended.height_pt == heights[0]
+
+
+def test_single_column_documents_keep_their_spacing():
+    """Spacing only scales the multi-column layout, the model is kept"""
+    document = sample("single-column")
+    fills = estimate_fill(document)
+
+    assert len({round(estimate.height_pt, 3) for estimate in fills}) == 1
+    assert select_spacing(document).spacing is document.spacing
+    tight = replace(document, spacing=SpacingModel.TIGHT)
+    assert select_spacing(tight).spacing is SpacingModel.TIGHT
+
+
+def test_more_content_takes_more_room():
+    """Repeating the sections raises the estimate under every model"""
+    document = sample("preset-carlito")
+    longer = replace(document, sections=document.sections * 2)
+
+    for short, full in zip(estimate_fill(document), estimate_fill(longer)):
+        assert full.height_pt > short.height_pt
+
+
+def test_theme_column_settings_change_the_estimate():
+    """Subsections laid out in more columns by the theme take fewer lines"""
+    document = load_resume(PROJECT_ROOT / "data.json")
+    theme = parse_theme({"subsection": {"defaultColumns": 2}})
+
+    plain = estimate_fill(document, models=[SpacingModel.NORMAL])[0]
+    themed = estimate_fill(document, theme=theme, models=[SpacingModel.NORMAL])[0]
+
+    assert themed.height_pt != plain.height_pt
+
+
+@pytest.mark.parametrize("repeat, status", [(1, 0), (2, 1)])
+def test_report_fails_when_nothing_fits(repeat, status, tmp_path, capsys):
+    """The json report lists every model, overflowing everywhere exits 1"""
+    data = json.loads((PROJECT_ROOT / "data.json").read_text("utf-8"))
+    data["resume"]["sections"] *= repeat
+    path = tmp_path / "resume.json"
+    path.write_text(json.dumps(data), "utf-8")
+    args = argparse.Namespace(
+        document=str(path), root=str(PROJECT_ROOT), preset=None, json=True
+    )
+
+    assert main(args) == status
+    report = json.loads(capsys.readouterr().out)
+    assert [e["spacing"] for e in report["estimates"]] == [
+        model.name.lower() for model in BY_DENSITY
+    ]
+    assert report["current"] == data["spacing"].lower()
+    recommended = next(
+        e for e in report["estimates"] if e["spacing"] == report["recommended"]
+    )
+    assert recommended["fits"] is (status == 0)
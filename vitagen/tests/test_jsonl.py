@@ -0,0 +1,129 @@
+"""Tests of the byte offset index of JSONL batches and resuming them."""
+
+import json
+import os
+from pathlib import Path
+from typing import List
+from vitagen import jsonl
+from vitagen.batch import run_batch
+from vitagen.jsonl import JsonlIndex, build_index, load_index, read_record
+from tests.documents import document
+
+
+def record(heading: str) -> str:
+    """A document on a single line"""
+    return json.dumps(document(heading))
+
+
+def write_records(path: Path, headings: List[str]) -> Path:
+    """Write a JSONL file of one document per heading"""
+    path.write_text("".join(f"{record(h)}\n" for h in headings), encoding="utf-8")
+    return path
+
+
+def touch(path: Path, seconds: int = 1) -> None:
+    """Move the modification time of a file forward"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def rendered(summary) -> List[str]:
+    """Names of the documents a batch rendered"""
+    return [result.name for result in summary.results if result.ok]
+
+
+def test_index_skips_blank_lines_and_reads_records(tmp_path):
+    """Records keep their line numbers and are read back by offset"""
+    path = tmp_path / "docs.jsonl"
+    path.write_bytes(b'{"a": 1}\n\n  \n{"b": 2}')
+
+    index = build_index(path)
+
+    assert [r.line for r in index] == [1, 4]
+    assert [read_record(path, r.offset, r.length) for r in index] == [
+        b'{"a": 1}',
+        b'{"b": 2}',
+    ]
+
+
+def test_index_round_trips_through_bytes(tmp_path):
+    """A serialized index deserializes to the same columns"""
+    index = build_index(write_records(tmp_path / "docs.jsonl", ["A", "B"]))
+
+    copy = JsonlIndex.from_bytes(index.to_bytes())
+
+    assert list(copy) == list(index)
+    assert (copy.path, copy.size, copy.mtime_ns) == (
+        index.path,
+        index.size,
+        index.mtime_ns,
+    )
+
+
+def test_cached_index_is_rebuilt_when_the_source_changes(tmp_path, monkeypatch):
+    """The cached index serves an unchanged source, a new size or mtime rebuilds it"""
+    path = write_records(tmp_path / "docs.jsonl", ["A", "B"])
+    cache = tmp_path / "docs.index"
+    builds = []
+
+    def counting_build(source):
+        builds.append(source)
+        return build_index(source)
+
+    monkeypatch.setattr(jsonl, "build_index", counting_build)
+
+    first = load_index(path, cache)
+    assert list(load_index(path, cache)) == list(first)
+    assert len(builds) == 1
+
+    # same size, only the modification time tells the change
+    size = os.stat(path).st_size
+    write_records(path, ["A", "C"])
+    touch(path)
+    assert os.stat(path).st_size == size
+    assert load_index(path, cache).crcs[1] != first.crcs[1]
+    assert len(builds) == 2
+
+    write_records(path, ["A", "C", "D"])
+    assert len(load_index(path, cache)) == 3
+    assert len(builds) == 3
+
+
+def test_resume_skips_rendered_records(tmp_path):
+    """Resuming an unchanged batch renders nothing again"""
+    source = write_records(tmp_path / "docs.jsonl", ["A", "B", "C"])
+    output = tmp_path / "out"
+
+    first = run_batch(source, output, workers=1)
+    second = run_batch(source, output, workers=1, resume=True)
+
+    assert rendered(first) == ["docs-00001", "docs-00002", "docs-00003"]
+    assert second.results == []
+    assert second.skipped == 3
+
+
+def test_resume_renders_edited_and_missing_records(tmp_path):
+    """An edited record and a record whose output is gone render again"""
+    source = write_records(tmp_path / "docs.jsonl", ["A", "B", "C"])
+    output = tmp_path / "out"
+    run_batch(source, output, workers=1)
+
+    write_records(source, ["A", "Edited", "C"])
+    (output / "docs-00003.tex").unlink()
+    summary = run_batch(source, output, workers=1, resume=True)
+
+    assert rendered(summary) == ["docs-00002", "docs-00003"]
+    assert summary.skipped == 1
+    assert "EDITED" in (output / "docs-00002.tex").read_text(encoding="utf-8")
+
+
+def test_without_resume_every_record_renders_again(tmp_path):
+    """A fresh run ignores the checkpoint of the previous one"""
+    source = write_records(tmp_path / "docs.jsonl", ["A", "B"])
+    output = tmp_path / "out"
+    run_batch(source, output, workers=1)
+
+    summary = run_batch(source, output, workers=1)
+
+    assert len(rendered(summary)) == 2
+    assert summary.skipped == 0
@@ -0,0 +1,157 @@
+"""Tests of the ``$ref`` includes of documents."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+import pytest
+from vitagen.loader import (
+    FRAGMENT_KEY,
+    FragmentCache,
+    IncludeError,
+    load_document,
+    resolve_refs,
+)
+
+
+def write(path: Path, value: Any) -> Path:
+    """Write a value as JSON"""
+    path.write_text(json.dumps(value), encoding="utf-8")
+    return path
+
+
+def strip(value: Any) -> Any:
+    """A value without the content hashes of its resolved objects"""
+    if isinstance(value, dict):
+        return {k: strip(v) for k, v in value.items() if k != FRAGMENT_KEY}
+    if isinstance(value, list):
+        return [strip(item) for item in value]
+    return value
+
+
+def test_include_cycle_across_files_is_reported(tmp_path):
+    """Files including each other raise instead of recursing"""
+    write(tmp_path / "a.json", {"next": {"$ref": "b.json"}})
+    write(tmp_path / "b.json", {"next": {"$ref": "a.json"}})
+    main = write(tmp_path / "main.json", {"start": {"$ref": "a.json"}})
+
+    with pytest.raises(IncludeError, match="include cycle"):
+        load_document(main)
+
+
+def test_include_cycle_within_a_document_is_reported(tmp_path):
+    """A pointer into the document leading back to itself raises"""
+    main = write(tmp_path / "main.json", {"loop": {"$ref": "#/loop"}})
+
+    with pytest.raises(IncludeError, match="include cycle"):
+        load_document(main)
+
+
+def test_json_pointer_unescapes_tokens(tmp_path):
+    """``~1`` stands for ``/`` and ``~0`` for ``~``, in that order"""
+    write(
+        tmp_path / "frag.json",
+        {"a/b": {"m~n": ["first", {"~1": "literal"}]}},
+    )
+    main = write(
+        tmp_path / "main.json",
+        {
+            "slash": {"$ref": "frag.json#/a~1b/m~0n/0"},
+            "tilde": {"$ref": "frag.json#/a~1b/m~0n/1/~01"},
+        },
+    )
+
+    document = load_document(main)
+
+    assert document["slash"] == "first"
+    assert document["tilde"] == "literal"
+
+
+def test_json_pointer_to_a_missing_value_is_reported(tmp_path):
+    """A pointer past the end of an array raises"""
+    write(tmp_path / "frag.json", {"items": [1]})
+    main = write(tmp_path / "main.json", {"value": {"$ref": "frag.json#/items/1"}})
+
+    with pytest.raises(IncludeError, match="no value at '1'"):
+        load_document(main)
+
+
+def test_sibling_members_override_the_included_ones(tmp_path):
+    """Members next to ``$ref`` replace those of the referenced object"""
+    write(tmp_path / "frag.json", {"heading": "Shared", "column": 1})
+    main = write(
+        tmp_path / "main.json",
+        {
+            "plain": {"$ref": "frag.json"},
+            "custom": {"$ref": "frag.json", "heading": "Custom"},
+        },
+    )
+
+    document = load_document(main)
+
+    assert strip(document["plain"]) == {"heading": "Shared", "column": 1}
+    assert strip(document["custom"]) == {"heading": "Custom", "column": 1}
+    assert document["custom"][FRAGMENT_KEY] != document["plain"][FRAGMENT_KEY]
+
+
+def test_sibling_members_cannot_override_a_non_object(tmp_path):
+    """Overriding members of a string raises"""
+    write(tmp_path / "frag.json", {"name": "Ada"})
+    main = write(tmp_path / "main.json", {"name": {"$ref": "frag.json#/name", "x": 1}})
+
+    with pytest.raises(IncludeError, match="cannot override"):
+        load_document(main)
+
+
+def test_fragments_are_invalidated_when_their_file_changes(tmp_path):
+    """A changed mtime parses the file again, an unchanged one reuses it"""
+    fragment = write(tmp_path / "frag.json", {"heading": "One"})
+    data = {"section": {"$ref": "frag.json"}}
+    main = tmp_path / "main.json"
+    cache = FragmentCache()
+
+    first = resolve_refs(data, main, cache)
+    second = resolve_refs(data, main, cache)
+
+    assert first["section"]["heading"] == second["section"]["heading"] == "One"
+    assert (cache.parsed, cache.hits) == (1, 1)
+
+    # same size, only the modification time tells the change
+    write(fragment, {"heading": "Two"})
+    stat = os.stat(fragment)
+    os.utime(fragment, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    third = resolve_refs(data, main, cache)
+
+    assert third["section"]["heading"] == "Two"
+    assert cache.parsed == 2
+
+
+def test_resolved_values_are_not_shared(tmp_path):
+    """Changing a resolved value leaves the cached one as it was"""
+    write(tmp_path / "frag.json", {"items": ["a"]})
+    data = {"section": {"$ref": "frag.json"}}
+    main = tmp_path / "main.json"
+    cache = FragmentCache()
+
+    resolve_refs(data, main, cache)["section"]["items"].append("b")
+
+    assert resolve_refs(data, main, cache)["section"]["items"] == ["a"]
+
+
+def test_includes_collect_every_fragment_file(tmp_path):
+    """Nested fragment files are reported, the document itself is not"""
+    write(tmp_path / "inner.json", {"text": "x"})
+    write(tmp_path / "outer.json", {"inner": {"$ref": "inner.json"}})
+    main = write(
+        tmp_path / "main.json",
+        {"outer": {"$ref": "outer.json"}, "self": {"$ref": "#/outer"}},
+    )
+    includes = set()
+
+    load_document(main, includes)
+
+    assert includes == {
+        (tmp_path / "inner.json").resolve(),
+        (tmp_path / "outer.json").resolve(),
+    }
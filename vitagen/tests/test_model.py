@@ -0,0 +1,179 @@
+"""Tests of parsing resume documents into the typed model."""
+
+from pathlib import Path
+import pytest
+from vitagen.generator.config.base import TextStyle
+from vitagen.generator.config.spacing_factor import SpacingModel
+from vitagen.generator.config.sub_section import SubsectionConfig
+from vitagen.generator.model import (
+    DocumentError,
+    InlineList,
+    ListContent,
+    ParagraphContent,
+    Section,
+    TableContent,
+    dump,
+    parse_resume,
+    to_document,
+)
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import load_document
+
+SAMPLES = sorted(
+    [PROJECT_ROOT / "data.json", *PROJECT_ROOT.glob("samples/*/data.json")]
+)
+
+
+def resume_with(section=None, **members):
+    """A raw document with a single section and top level members"""
+    return {"resume": {"sections": [section or {"heading": "Notes"}]}, **members}
+
+
+def test_defaults_are_resolved_once():
+    """Members missing from the document take their defaults at parse time"""
+    document = parse_resume(
+        resume_with(
+            {"heading": "Work", "subsections": [{"heading": "ACME", "content": {}}]}
+        )
+    )
+
+    assert document.spacing is SpacingModel.ULTRA
+    assert document.show_last_updated and not document.hide_footer
+    section = document.sections[0]
+    assert (section.column, section.column_settings) == (1, None)
+    assert section.subsections[0].info_same_line
+    # empty content objects render nothing and are dropped
+    assert section.subsections[0].content is None
+
+
+def test_content_is_dispatched_on_its_type():
+    """Bare arrays and unknown types are lists, other types their own content"""
+    contents = [
+        [{"segments": [{"text": "a"}]}],
+        {"type": "unknown", "items": []},
+        {"type": "paragraph", "text": "p"},
+        {"type": "table", "rows": [["a", "b"]], "chunkRows": 5},
+        {"type": "inline_list", "items": ["x", "y"], "separator": "|"},
+    ]
+    document = parse_resume(
+        resume_with(
+            {
+                "subsections": [
+                    {"heading": str(i), "content": c} for i, c in enumerate(contents)
+                ]
+            }
+        )
+    )
+
+    parsed = [s.content for s in document.sections[0].subsections]
+    assert [type(c) for c in parsed] == [
+        ListContent,
+        ListContent,
+        ParagraphContent,
+        TableContent,
+        InlineList,
+    ]
+    assert parsed[3].rows == (("a", "b"),) and parsed[3].chunk_rows == 5
+    assert parsed[4].separator == "|"
+
+
+def test_empty_sections_and_subsections_are_dropped():
+    """Empty objects render nothing and never reach the renderer"""
+    document = parse_resume(
+        {"resume": {"sections": [{}, {"heading": "Work", "subsections": [{}, None]}]}}
+    )
+
+    assert [s.heading for s in document.sections] == ["Work"]
+    assert document.sections[0].subsections == ()
+
+
+def test_styles_follow_a_canonical_order():
+    """The order of the style keys of the document does not matter"""
+    segments = [
+        {"text": "a", "style": {"underline": True, "bold": True}},
+        {"text": "b", "style": {"bold": True, "underline": True, "italic": False}},
+    ]
+    document = parse_resume(resume_with({"content": [{"segments": segments}]}))
+
+    item = document.sections[0].content.items[0]
+    assert [s.styles for s in item.segments] == [
+        (TextStyle.BOLD, TextStyle.UNDERLINE),
+        (TextStyle.BOLD, TextStyle.UNDERLINE),
+    ]
+
+
+@pytest.mark.parametrize("name", ["tight", "TIGHT", "Tight"])
+def test_spacing_names_are_case_insensitive(name):
+    """Spacing models are looked up by their name in any case"""
+    assert parse_resume(resume_with(spacing=name)).spacing is SpacingModel.TIGHT
+
+
+def test_unknown_spacing_is_rejected_for_every_document():
+    """Single column documents validate their spacing too, not only multi column ones"""
+    with pytest.raises(DocumentError) as error:
+        parse_resume(resume_with(spacing="roomy"))
+
+    assert error.value.path == "$.spacing"
+    assert "unknown spacing 'roomy'" in error.value.message
+
+
+@pytest.mark.parametrize(
+    "data, path",
+    [
+        ({"links": [{"text": "site"}]}, "$.links[0]"),
+        ({"links": "none"}, "$.links"),
+        ({"firstName": 3}, "$.firstName"),
+        (resume_with({"column": "2"}), "$.resume.sections[0].column"),
+        (
+            resume_with({"content": {"type": "table", "chunkRows": -1}}),
+            "$.resume.sections[0].content.chunkRows",
+        ),
+        (
+            resume_with({"content": [{"segments": ["text"]}]}),
+            "$.resume.sections[0].content.items[0].segments[0]",
+        ),
+        (
+            resume_with({"content": {"type": "table", "source": "rows.txt"}}),
+            "$.resume.sections[0].content.source.format",
+        ),
+    ],
+)
+def test_errors_name_the_json_path_of_the_value(data, path):
+    """Invalid values raise a DocumentError naming where they are"""
+    with pytest.raises(DocumentError) as error:
+        parse_resume(data)
+
+    assert error.value.path == path
+
+
+def test_sources_are_relative_to_the_document(tmp_path):
+    """Relative source paths resolve against the directory of the document"""
+    data = resume_with({"content": {"type": "table", "source": "data/rows.csv"}})
+
+    with_file = parse_resume(data, tmp_path / "resume.json")
+    without = parse_resume(data)
+
+    assert Path(with_file.sections[0].content.source.path) == (
+        tmp_path.resolve() / "data" / "rows.csv"
+    )
+    assert with_file.sections[0].content.source.format == "csv"
+    assert without.sections[0].content.source.path == "data/rows.csv"
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_documents_round_trip_through_json(path):
+    """The JSON shape of a parsed document parses into the same document"""
+    document = parse_resume(load_document(path))
+
+    assert parse_resume(to_document(document)) == document
+    assert dump(parse_resume(to_document(document))) == dump(document)
+
+
+def test_column_settings_of_raw_and_parsed_sections():
+    """Column settings default to the ones of the theme in both forms"""
+    config = SubsectionConfig(default_columns=3)
+
+    assert config.get_column_settings({"columnSettings": 2}) == 2
+    assert config.get_column_settings({}) == 3
+    assert config.get_column_settings(Section(column_settings=2)) == 2
+    assert config.get_column_settings(Section()) == 3
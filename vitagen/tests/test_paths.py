@@ -0,0 +1,111 @@
+"""Tests of compiled key paths and the value lookups of the generator."""
+
+import pytest
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import parse_resume
+from vitagen.generator.paths import PathError, compile_path
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import load_document
+
+DATA = {
+    "name": "Ada",
+    "zero": 0,
+    "off": False,
+    "none": None,
+    "rows": [["a", "b"], ["c", "d"]],
+    "sections": [{"heading": "Experience"}, {"heading": "Education"}],
+}
+
+
+@pytest.mark.parametrize(
+    "expression, steps",
+    [
+        ("name", ("name",)),
+        ("rows[1][0]", ("rows", 1, 0)),
+        ("sections[-1].heading", ("sections", -1, "heading")),
+        ("[0].name", (0, "name")),
+    ],
+)
+def test_expressions_compile_into_steps(expression, steps):
+    """Keys and any number of indices per part, negative ones included"""
+    assert compile_path(expression).steps == steps
+
+
+@pytest.mark.parametrize(
+    "expression, value",
+    [
+        ("name", "Ada"),
+        ("rows[0][1]", "b"),
+        ("rows[-1][-1]", "d"),
+        ("sections[1].heading", "Education"),
+        ("zero", 0),
+        ("off", False),
+    ],
+)
+def test_paths_get_their_value(expression, value):
+    """Falsy values are values, not missing ones"""
+    assert compile_path(expression).get(DATA) == value
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "missing",
+        "none",
+        "rows[2][0]",
+        "rows[-3][0]",
+        "name.first",
+        "name[0]",
+        "sections.heading",
+    ],
+)
+def test_missing_values_give_the_default(expression):
+    """Missing keys, nulls, out of range indices and wrong types never raise"""
+    path = compile_path(expression)
+    assert path.get(DATA) == ""
+    assert path.get(DATA, None) is None
+    assert path.get(DATA, "n/a") == "n/a"
+
+
+@pytest.mark.parametrize("expression", ["", "a..b", "a.[0]", "a[x]", "a[0]b"])
+def test_malformed_expressions_are_rejected(expression):
+    """Malformed paths raise when compiled, not when evaluated"""
+    with pytest.raises(PathError):
+        compile_path(expression)
+
+
+def test_paths_are_compiled_once():
+    """The same expression gives the same compiled path"""
+    assert compile_path("rows[0][1]") is compile_path("rows[0][1]")
+
+
+def test_generator_values_are_the_same_for_raw_and_parsed_input():
+    """Paths of the JSON document resolve on a generator of a parsed document"""
+    data = load_document(PROJECT_ROOT / "data.json")
+    raw = ResumeContentGenerator(data)
+    parsed = ResumeContentGenerator(parse_resume(data))
+
+    for path in (
+        "firstName",
+        "lastName",
+        "resume.sections[0].heading",
+        "resume.sections[0].subsections[0].metadata.duration",
+        "resume.sections[-1].column",
+        "links[0].href",
+    ):
+        assert parsed.get_value(path) == raw.get_value(path)
+        assert parsed.get_value(path) == compile_path(path).get(data)
+
+
+def test_generator_values_resolve_defaults():
+    """Members missing from the document give their resolved default"""
+    generator = ResumeContentGenerator(
+        {"firstName": "Ada", "resume": {"sections": [{"heading": "Notes"}]}}
+    )
+
+    assert generator.get_value("spacing") == "ultra"
+    assert generator.get_value("showLastUpdated") is True
+    assert generator.get_value("resume.sections[0].column") == 1
+    assert generator.get_value("resume.sections[0].columnSettings", 1) == 1
+    assert generator.get_value("middleName") == ""
+    assert generator.get_value("resume.sections[3].heading", None) is None
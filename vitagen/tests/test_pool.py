@@ -0,0 +1,148 @@
+"""Tests of compiling batches of documents in parallel, with the stub engine."""
+
+import json
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import List
+from vitagen.app import parse_args
+from vitagen.batch import collect_jobs
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.tex.engine import ABSOLUTE_INPUT, StubEngine
+from vitagen.tex.pool import CompileOptions, compile_job, run_compile
+from tests.documents import document
+
+SAMPLES = sorted(PROJECT_ROOT.glob("samples/*/data.json"))
+
+
+class FailingEngine(StubEngine):
+    """A stub engine failing straight away on documents with a broken heading"""
+
+    def run(self, main, output_dir, cwd, *, fmt=None, timeout=None, cancel=None):
+        source = main.read_text(encoding="utf-8")
+        inputs = [Path(p).read_text("utf-8") for p in ABSOLUTE_INPUT.findall(source)]
+        if any("BROKEN" in text.upper() for text in inputs):
+            (output_dir / main.stem).with_suffix(".log").write_text("! error\n")
+            return 1
+        return super().run(
+            main, output_dir, cwd, fmt=fmt, timeout=timeout, cancel=cancel
+        )
+
+
+def copy_samples(directory: Path) -> List[str]:
+    """Copy the sample documents into a batch directory, returning their names"""
+    directory.mkdir()
+    names = []
+    for path in SAMPLES:
+        name = path.parent.name.split("(")[0]
+        shutil.copy(path, directory / f"{name}.json")
+        names.append(name)
+    # in the order of the file names, as batches collect them
+    return sorted(names, key=lambda name: f"{name}.json")
+
+
+def write_broken(directory: Path, name: str) -> None:
+    """Write a document the failing engine does not compile"""
+    (directory / f"{name}.json").write_text(
+        json.dumps(document("Broken")), encoding="utf-8"
+    )
+
+
+def options(engine: StubEngine) -> CompileOptions:
+    """Compile options with the sources of the project and no caches"""
+    return CompileOptions(engine=engine, root=PROJECT_ROOT)
+
+
+def test_samples_compile_in_the_order_of_the_source(tmp_path):
+    """Every sample compiles into a PDF with its log next to it"""
+    names = copy_samples(tmp_path / "docs")
+
+    summary = run_compile(tmp_path / "docs", tmp_path / "out", options(StubEngine()))
+
+    assert [result.name for result in summary.results] == names
+    assert (summary.succeeded, summary.failed, summary.cancelled) == (len(names), 0, 0)
+    for result in summary.results:
+        assert result.pdf.read_bytes().startswith(b"%PDF")
+        assert result.log == result.pdf.with_suffix(".log")
+
+
+def test_failures_stay_in_their_document(tmp_path):
+    """A failing document keeps its log and does not stop the others"""
+    names = copy_samples(tmp_path / "docs")
+    write_broken(tmp_path / "docs", "aaa-broken")
+
+    summary = run_compile(
+        tmp_path / "docs", tmp_path / "out", options(FailingEngine()), workers=2
+    )
+
+    broken = summary.results[0]
+    assert (broken.name, broken.ok, broken.cancelled) == ("aaa-broken", False, False)
+    assert broken.log.read_text(encoding="utf-8") == "! error\n"
+    assert not broken.pdf.exists()
+    assert (summary.succeeded, summary.failed) == (len(names), 1)
+
+
+def test_fail_fast_cancels_the_jobs_not_started(tmp_path):
+    """After the first failure the queued documents are never compiled"""
+    names = copy_samples(tmp_path / "docs")
+    write_broken(tmp_path / "docs", "aaa-broken")
+    engine = FailingEngine()
+
+    summary = run_compile(
+        tmp_path / "docs",
+        tmp_path / "out",
+        options(engine),
+        workers=1,
+        fail_fast=True,
+    )
+
+    assert summary.failed == 1
+    assert summary.cancelled == len(names)
+    assert not engine.passes
+    assert all(
+        result.error == "cancelled before it started" for result in summary.results[1:]
+    )
+
+
+def test_fail_fast_stops_running_passes(tmp_path):
+    """A pass running when another document fails is stopped, not waited for"""
+    directory = tmp_path / "docs"
+    directory.mkdir()
+    shutil.copy(PROJECT_ROOT / "data.json", directory / "resume.json")
+    write_broken(directory, "broken")
+    engine = FailingEngine(delay=30)
+
+    started = time.monotonic()
+    summary = run_compile(
+        directory, tmp_path / "out", options(engine), workers=2, fail_fast=True
+    )
+
+    assert time.monotonic() - started < 10
+    assert [(r.name, r.ok, r.cancelled) for r in summary.results] == [
+        ("broken", False, False),
+        ("resume", False, True),
+    ]
+    assert not (tmp_path / "out" / "resume.pdf").exists()
+
+
+def test_cancelled_job_does_not_start(tmp_path):
+    """A job picked up once cancelled runs no pass and writes nothing"""
+    copy_samples(tmp_path / "docs")
+    job = collect_jobs(tmp_path / "docs", tmp_path / "out")[0]
+    cancel = threading.Event()
+    cancel.set()
+    engine = StubEngine()
+
+    result = compile_job(job, options(engine), cancel)
+
+    assert result.cancelled and not result.ok
+    assert not engine.passes
+    assert not result.pdf.exists()
+
+
+def test_compile_workers_do_not_override_batch_workers():
+    """The --workers of compile is its own option"""
+    args = parse_args(["--workers", "3", "compile", "docs", "out", "--workers", "2"])
+
+    assert (args.workers, args.compile_workers) == (3, 2)
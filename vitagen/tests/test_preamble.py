@@ -0,0 +1,202 @@
+"""Tests of dumping the preamble into formats and reusing them."""
+
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+import pytest
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.tex.engine import StubEngine
+from vitagen.tex.preamble import (
+    CLASS_FILE,
+    MAIN_TEX,
+    FormatCache,
+    format_key,
+    preamble_sources,
+    split_main,
+)
+
+CLASS = """\\ProvidesClass{resume}
+\\input{top.tex} % \\input{commented.tex}
+\\newcommand{\\later}{
+  \\input{deferred.tex}
+  {\\input{nested.tex}}
+}
+\\input{missing.tex}
+\\def\\brace{\\{}
+\\input{after.tex}
+"""
+
+
+class VersionedEngine(StubEngine):
+    """A stub engine reporting a given version"""
+
+    def __init__(self, version: str = "1"):
+        super().__init__()
+        self.release = version
+
+    def version(self) -> str:
+        return self.release
+
+
+class FailingDumpEngine(StubEngine):
+    """A stub engine whose dumps fail with a log"""
+
+    def dump(self, preamble, output_dir, cwd, jobname, *, timeout=None, cancel=None):
+        self.dumps.append(preamble)
+        (output_dir / jobname).with_suffix(".log").write_text("! undefined\n", "utf-8")
+        return 1
+
+
+class SlowDumpEngine(StubEngine):
+    """A stub engine whose first dump times out"""
+
+    def dump(self, preamble, output_dir, cwd, jobname, *, timeout=None, cancel=None):
+        if not self.dumps:
+            self.dumps.append(preamble)
+            raise subprocess.TimeoutExpired(self.name, timeout)
+        return super().dump(
+            preamble, output_dir, cwd, jobname, timeout=timeout, cancel=cancel
+        )
+
+
+@pytest.fixture(name="root")
+def fixture_root(tmp_path) -> Path:
+    """A copy of the sources of the project the preamble is dumped from"""
+    root = tmp_path / "root"
+    root.mkdir()
+    for name in (MAIN_TEX, CLASS_FILE):
+        shutil.copy(PROJECT_ROOT / name, root / name)
+    for directory in ("modifiers", "cmd"):
+        shutil.copytree(PROJECT_ROOT / directory, root / directory)
+    return root
+
+
+def test_main_file_splits_at_the_document():
+    """The preamble ends where the document begins"""
+    preamble, document = split_main((PROJECT_ROOT / MAIN_TEX).read_text("utf-8"))
+
+    assert "\\documentclass" in preamble
+    assert document.startswith("\\begin{document}")
+    with pytest.raises(ValueError, match="no \\\\begin{document}"):
+        split_main("\\documentclass{resume}\n")
+
+
+def test_only_top_level_class_inputs_are_sources(tmp_path):
+    """Inputs of definitions and comments are not read while the class loads"""
+    for name in (MAIN_TEX, "top.tex", "deferred.tex", "nested.tex", "after.tex"):
+        (tmp_path / name).write_text("", "utf-8")
+    (tmp_path / CLASS_FILE).write_text(CLASS, "utf-8")
+
+    sources = preamble_sources(tmp_path)
+
+    assert [path.name for path in sources] == [
+        MAIN_TEX,
+        CLASS_FILE,
+        "top.tex",
+        "after.tex",
+    ]
+
+
+def test_project_preamble_sources():
+    """The class of the project inputs its scaling factor while it loads"""
+    sources = preamble_sources(PROJECT_ROOT)
+
+    assert [path.relative_to(PROJECT_ROOT).as_posix() for path in sources] == [
+        MAIN_TEX,
+        CLASS_FILE,
+        "modifiers/scaling-factor.tex",
+    ]
+
+
+def test_key_follows_the_preamble_sources_only(root):
+    """Editing what the preamble reads changes the key, other files do not"""
+    preamble, _ = split_main((root / MAIN_TEX).read_text("utf-8"))
+    engine = VersionedEngine()
+    key = format_key(preamble, root, engine)
+
+    # read by the document, not by the preamble
+    with open(root / "cmd" / "info.tex", "a", encoding="utf-8") as f:
+        f.write("% edited\n")
+    assert format_key(preamble, root, engine) == key
+
+    with open(root / "modifiers" / "scaling-factor.tex", "a", encoding="utf-8") as f:
+        f.write("% edited\n")
+    edited = format_key(preamble, root, engine)
+    assert edited != key
+
+    assert format_key(preamble + "%\n", root, engine) != edited
+    assert format_key(preamble, root, VersionedEngine("2")) != edited
+
+
+def test_format_is_dumped_once_and_reused(root, tmp_path):
+    """Concurrent and later callers share a single dump"""
+    cache = FormatCache(tmp_path / "formats")
+    engine = StubEngine(delay=0.2)
+    formats = []
+
+    threads = [
+        threading.Thread(target=lambda: formats.append(cache.ensure(root, engine)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(engine.dumps) == 1
+    assert len(set(formats)) == 1 and formats[0].is_file()
+    assert cache.ensure(root, engine) == formats[0]
+    assert len(engine.dumps) == 1
+
+
+def test_edited_class_dumps_a_new_format(root, tmp_path):
+    """A format is only reused for the sources it was dumped from"""
+    cache = FormatCache(tmp_path / "formats")
+    engine = StubEngine()
+    first = cache.ensure(root, engine)
+
+    with open(root / CLASS_FILE, "a", encoding="utf-8") as f:
+        f.write("% edited\n")
+    second = cache.ensure(root, engine)
+
+    assert second != first
+    assert len(engine.dumps) == 2
+    assert first.is_file() and second.is_file()
+
+
+def test_failed_dump_is_remembered(root, tmp_path):
+    """A preamble that does not dump is compiled without a format from then on"""
+    cache = FormatCache(tmp_path / "formats")
+    engine = FailingDumpEngine()
+
+    assert cache.ensure(root, engine) is None
+    assert cache.ensure(root, engine) is None
+
+    assert len(engine.dumps) == 1
+    (failed,) = (tmp_path / "formats").rglob("*.failed")
+    assert "dump failed with status 1" in failed.read_text("utf-8")
+    assert "! undefined" in failed.read_text("utf-8")
+
+
+def test_timed_out_dump_is_tried_again(root, tmp_path):
+    """A dump too slow for its timeout is not remembered as failed"""
+    cache = FormatCache(tmp_path / "formats")
+    engine = SlowDumpEngine()
+
+    assert cache.ensure(root, engine, timeout=1) is None
+    assert not list((tmp_path / "formats").rglob("*.failed"))
+    assert cache.ensure(root, engine, timeout=1).is_file()
+
+
+def test_rejected_format_is_not_used_again(root, tmp_path):
+    """A format that failed a compile is replaced by its reason"""
+    cache = FormatCache(tmp_path / "formats")
+    engine = StubEngine()
+    fmt = cache.ensure(root, engine)
+
+    cache.reject(fmt, "compile failed with the format\n")
+
+    assert not fmt.exists()
+    assert cache.ensure(root, engine) is None
+    assert len(engine.dumps) == 1
@@ -0,0 +1,206 @@
+"""Tests of the render server and its worker pool."""
+
+import http.client
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+import pytest
+from vitagen.app import parse_args
+from vitagen.server import (
+    InvalidDocumentError,
+    PoolBusyError,
+    RenderPool,
+    create_server,
+    render_payload,
+)
+
+DOCUMENT = {
+    "firstName": "Grace",
+    "lastName": "Hopper",
+    "resume": {
+        "sections": [
+            {"heading": "Projects", "content": {"type": "paragraph", "text": "COBOL"}}
+        ]
+    },
+}
+
+
+def echo_or_sleep(body: bytes) -> str:
+    """Render stand in, sleeping on ``sleep:<seconds>`` bodies"""
+    text = body.decode("utf-8")
+    if text.startswith("sleep:"):
+        time.sleep(float(text.partition(":")[2]))
+    if text == "invalid":
+        raise InvalidDocumentError("invalid body")
+    return text
+
+
+@contextmanager
+def running_server(pool: RenderPool) -> Iterator[Tuple[str, int]]:
+    """Serve a pool on a free loopback port for the duration of the block"""
+    server = create_server(pool, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[:2]
+    finally:
+        server.shutdown()
+        server.server_close()
+        pool.shutdown()
+
+
+def post(
+    address: Tuple[str, int], body: bytes, length: Optional[str] = "auto"
+) -> Tuple[int, bytes]:
+    """POST a body to /render with a given Content-Length header"""
+    conn = http.client.HTTPConnection(*address, timeout=30)
+    try:
+        conn.putrequest("POST", "/render")
+        if length == "auto":
+            length = str(len(body))
+        if length is not None:
+            conn.putheader("Content-Length", length)
+        conn.endheaders()
+        conn.send(body)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+def test_renders_a_document():
+    """A valid document renders into LaTeX"""
+    with running_server(RenderPool(workers=1)) as address:
+        status, body = post(address, json.dumps(DOCUMENT).encode("utf-8"))
+
+    assert status == 200
+    assert b"COBOL" in body
+
+
+@pytest.mark.parametrize(
+    "length, status",
+    [(None, 411), ("abc", 400), ("-1", 400), (str(64 * 1024 * 1024), 413)],
+)
+def test_content_length_is_checked_before_reading(length, status):
+    """Missing, invalid, negative and oversized lengths are refused"""
+    with running_server(RenderPool(workers=1, render=echo_or_sleep)) as address:
+        assert post(address, b"", length)[0] == status
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ({**DOCUMENT, "links": {"$ref": "/etc/passwd"}}, "includes are not allowed"),
+        (
+            {
+                "resume": {
+                    "sections": [
+                        {"content": {"type": "table", "source": "/etc/hosts.csv"}}
+                    ]
+                }
+            },
+            "external sources are not allowed",
+        ),
+        ([1, 2], "json object"),
+    ],
+)
+def test_documents_reading_local_files_are_rejected(data, message):
+    """Requests never make the server read files of its machine"""
+    with pytest.raises(InvalidDocumentError, match=message):
+        render_payload(json.dumps(data).encode("utf-8"))
+
+
+def test_invalid_documents_answer_bad_request():
+    """A $ref include is a client error"""
+    body = json.dumps({**DOCUMENT, "links": {"$ref": "other.json"}}).encode("utf-8")
+    with running_server(RenderPool(workers=1)) as address:
+        status, payload = post(address, body)
+
+    assert status == 400
+    assert json.loads(payload) == {"error": "includes are not allowed"}
+
+
+def test_requests_beyond_max_pending_are_refused():
+    """With every worker and pending slot taken, requests get 503 at once"""
+    pool = RenderPool(workers=1, max_pending=0, render=echo_or_sleep)
+    with running_server(pool) as address:
+        slow = threading.Thread(target=post, args=(address, b"sleep:1"))
+        slow.start()
+        time.sleep(0.3)
+        status, _ = post(address, b"fast")
+        slow.join()
+
+        assert status == 503
+        assert post(address, b"fast") == (200, b"fast")
+
+
+def test_timed_out_render_recycles_its_worker():
+    """A slow render is killed, its worker and slot serve the next request"""
+    pool = RenderPool(workers=1, max_pending=0, timeout=0.5, render=echo_or_sleep)
+    try:
+        pool.warm_up()
+        (worker,) = pool.running
+        started = time.monotonic()
+
+        with pytest.raises(TimeoutError):
+            pool.render(b"sleep:30")
+
+        assert time.monotonic() - started < 5
+        assert not worker.process.is_alive()
+        assert pool.render(b"after") == "after"
+        assert pool.running and worker not in pool.running
+    finally:
+        pool.shutdown()
+
+
+def test_worker_errors_stay_in_their_request():
+    """Invalid bodies raise in the caller and leave the worker serving"""
+    pool = RenderPool(workers=1, max_pending=0, render=echo_or_sleep)
+    try:
+        with pytest.raises(InvalidDocumentError):
+            pool.render(b"invalid")
+        assert pool.render(b"next") == "next"
+        with pytest.raises(PoolBusyError):
+            with running_busy(pool):
+                pool.render(b"refused")
+    finally:
+        pool.shutdown()
+
+
+@contextmanager
+def running_busy(pool: RenderPool) -> Iterator[None]:
+    """Keep the only slot of a pool taken for the duration of the block"""
+    thread = threading.Thread(target=pool.render, args=(b"sleep:0.5",))
+    thread.start()
+    time.sleep(0.2)
+    try:
+        yield
+    finally:
+        thread.join()
+
+
+@pytest.mark.parametrize("host", ["0.0.0.0", "192.168.1.10", "::"])
+def test_only_loopback_addresses_are_served(host):
+    """Binding a public interface is refused before anything listens"""
+    with pytest.raises(ValueError, match="only listens on localhost"):
+        create_server(None, host=host, port=0)
+
+
+def test_unix_socket_path_must_not_be_a_regular_file(tmp_path):
+    """A regular file at the socket path is left untouched"""
+    path = tmp_path / "render.sock"
+    path.write_text("keep", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="not a unix socket"):
+        create_server(None, socket_path=str(path))
+    assert path.read_text(encoding="utf-8") == "keep"
+
+
+def test_serve_workers_do_not_override_batch_workers():
+    """The --workers of serve is its own option"""
+    args = parse_args(["--workers", "3", "serve", "--workers", "2"])
+
+    assert (args.workers, args.serve_workers) == (3, 2)
+    assert parse_args(["serve"]).serve_workers is None
@@ -0,0 +1,261 @@
+"""Tests of reading table rows and list items lazily from CSV and JSONL files."""
+
+import copy
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+import pytest
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import DocumentError, ExternalSource, parse_resume
+from vitagen.generator.sources import (
+    StreamingSink,
+    check_sources,
+    external_sources,
+    has_sources,
+    iter_items,
+    iter_lines,
+    iter_rows,
+)
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import load_document
+from tests.test_stream import RecordingSink
+
+SAMPLES = sorted(
+    [PROJECT_ROOT / "data.json", *PROJECT_ROOT.glob("samples/*/data.json")]
+)
+
+
+def lists_of(data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """The list contents of a document, subsections before their section"""
+    for section in data["resume"]["sections"]:
+        for part in [*section.get("subsections", []), section]:
+            if (part.get("content") or {}).get("type") == "list":
+                yield part["content"]
+
+
+def externalised(path: Path, directory: Path) -> Dict[str, Any]:
+    """A sample whose list items are read from a JSONL file per list"""
+    data = load_document(path)
+    for number, content in enumerate(lists_of(data)):
+        source = directory / f"list-{number}.jsonl"
+        source.write_text(
+            "".join(f"{json.dumps(item)}\n\n" for item in content.pop("items")),
+            "utf-8",
+        )
+        content["source"] = str(source)
+    return data
+
+
+def skills(path: Path) -> List[List[str]]:
+    """Rows of the inline skill lists of a sample, a group and its skills"""
+    data = load_document(path)
+    return [
+        [str(number), ", ".join(item["inlineList"]["items"])]
+        for number, content in enumerate(lists_of(data))
+        for item in content["items"]
+        if "inlineList" in item
+    ]
+
+
+def with_table(path: Path, table: Dict[str, Any]) -> Dict[str, Any]:
+    """A sample with a table section appended"""
+    data = load_document(path)
+    data["resume"]["sections"].append(
+        {"heading": "Toolbox", "content": {"type": "table", **table}}
+    )
+    return data
+
+
+def write_csv(path: Path, rows: List[List[str]]) -> Path:
+    """Write rows to a CSV file"""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(rows)
+    return path
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_list_items_read_from_jsonl_match_inline_items(path, tmp_path):
+    """A list renders the same whether its items are inline or streamed"""
+    inline = ResumeContentGenerator(load_document(path)).build_resume()
+    data = externalised(path, tmp_path)
+
+    assert ResumeContentGenerator(copy.deepcopy(data)).build_resume() == inline
+    assert all(content.get("source") for content in lists_of(data))
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_table_rows_read_from_csv_and_jsonl_match_inline_rows(path, tmp_path):
+    """CSV rows and JSONL arrays and objects render as the same inline rows"""
+    rows = skills(path)
+    csv_path = write_csv(tmp_path / "skills.csv", [["group", "skills"], *rows])
+    jsonl_path = tmp_path / "skills.jsonl"
+    jsonl_path.write_text(
+        "".join(json.dumps({"skills": s, "group": g}) + "\n" for g, s in rows),
+        "utf-8",
+    )
+    inline = ResumeContentGenerator(with_table(path, {"rows": rows})).build_resume()
+
+    sources = [
+        {"path": str(csv_path), "header": True},
+        {"path": str(jsonl_path), "columns": ["group", "skills"]},
+    ]
+    for source in sources:
+        data = with_table(path, {"source": source})
+        assert ResumeContentGenerator(data).build_resume() == inline
+
+
+def test_inline_rows_come_before_the_rows_of_the_source(tmp_path):
+    """A table with both renders its inline rows first"""
+    rows = skills(PROJECT_ROOT / "data.json")
+    source = write_csv(tmp_path / "skills.csv", rows[1:])
+
+    merged = with_table(
+        PROJECT_ROOT / "data.json", {"rows": rows[:1], "source": str(source)}
+    )
+    inline = with_table(PROJECT_ROOT / "data.json", {"rows": rows})
+
+    assert (
+        ResumeContentGenerator(merged).build_resume()
+        == ResumeContentGenerator(inline).build_resume()
+    )
+
+
+def test_sources_are_written_to_the_sink_row_by_row(tmp_path):
+    """Streamed rows reach the sink one write at a time, in chunked tables"""
+    rows = skills(PROJECT_ROOT / "samples" / "single-column" / "data.json")
+    source = write_csv(tmp_path / "skills.csv", rows)
+    data = with_table(
+        PROJECT_ROOT / "samples" / "single-column" / "data.json",
+        {"source": str(source), "chunkRows": 2},
+    )
+    sink = RecordingSink()
+
+    ResumeContentGenerator(data).write_resume(sink)
+
+    written = [w.split(" & ")[0] for w in sink.writes if w.endswith(" \\\\")]
+    assert written == [group for group, _ in rows]
+    assert "\x00" not in sink.getvalue()
+    assert sink.getvalue().count("\\begin{tabular") == (len(rows) + 1) // 2
+
+
+def test_deferred_content_is_only_produced_when_written():
+    """A marker stands in for the chunks until its fragment is written"""
+    sink = RecordingSink()
+    streaming = StreamingSink(sink)
+    produced = []
+
+    def chunks() -> Iterator[str]:
+        for chunk in ("first", "second"):
+            produced.append(chunk)
+            yield chunk
+
+    fragment = f"before {streaming.defer(chunks)} after"
+    assert not produced and not sink.writes
+
+    streaming.write(fragment)
+
+    assert produced == ["first", "second"]
+    assert sink.writes == ["before ", "first", "second", " after"]
+    streaming.write("plain")
+    assert sink.writes[-1] == "plain"
+
+
+def test_rows_keep_their_columns(tmp_path):
+    """Headers name the columns to keep, JSONL objects are read by key"""
+    csv_path = write_csv(
+        tmp_path / "rows.csv",
+        [["name", "level", "years"], ["Python", "expert", "8"], ["Go", "", "2"]],
+    )
+    jsonl_path = tmp_path / "rows.jsonl"
+    jsonl_path.write_text(
+        '["Python", 8, null]\n\n   \n{"name": "Go", "years": 2, "team": "x"}\n',
+        "utf-8",
+    )
+
+    assert list(
+        iter_rows(ExternalSource(str(csv_path), header=True, columns=("years", "name")))
+    ) == [("8", "Python"), ("2", "Go")]
+    assert list(iter_rows(ExternalSource(str(csv_path)))) == [
+        ("name", "level", "years"),
+        ("Python", "expert", "8"),
+        ("Go", "", "2"),
+    ]
+    assert list(iter_rows(ExternalSource(str(jsonl_path), format="jsonl"))) == [
+        ("Python", "8", ""),
+        ("Go", "2", "x"),
+    ]
+
+
+def test_items_parse_objects_and_rows(tmp_path):
+    """JSONL objects are list items, rows have a plain segment per cell"""
+    item = load_document(PROJECT_ROOT / "data.json")["resume"]["sections"][1]
+    item = item["content"]["items"][0]
+    jsonl_path = tmp_path / "items.jsonl"
+    jsonl_path.write_text(f'{json.dumps(item)}\n["plain", "cells"]\n', "utf-8")
+
+    parsed, plain = iter_items(ExternalSource(str(jsonl_path), format="jsonl"))
+
+    assert [s.text for s in parsed.segments] == [s["text"] for s in item["segments"]]
+    assert [s.text for s in plain.segments] == ["plain", "cells"]
+
+
+@pytest.mark.parametrize(
+    "text, line, message",
+    [
+        ('["a"]\n\n{"a": \n', 3, "invalid json"),
+        ('["a"]\n["b", ["c"]]\n', 2, "expected a scalar, got list"),
+        ('"a"\n', 1, "expected an array or object, got str"),
+    ],
+)
+def test_invalid_records_name_their_line(text, line, message, tmp_path):
+    """Errors point at the file and line of the record"""
+    path = tmp_path / "rows.jsonl"
+    path.write_text(text, "utf-8")
+
+    with pytest.raises(DocumentError) as error:
+        list(iter_rows(ExternalSource(str(path), format="jsonl")))
+
+    assert error.value.path == f"{path}:{line}"
+    assert message in str(error.value)
+
+
+def test_records_are_read_lazily(tmp_path):
+    """Rows before an invalid record are read before it fails"""
+    path = tmp_path / "rows.jsonl"
+    path.write_text('["a"]\n{"a": \n', "utf-8")
+
+    rows = iter_rows(ExternalSource(str(path), format="jsonl"))
+
+    assert next(rows) == ("a",)
+    with pytest.raises(DocumentError):
+        next(rows)
+
+
+def test_sources_are_found_in_document_order(tmp_path):
+    """Subsection sources come before those of their section, missing fail"""
+    data = externalised(PROJECT_ROOT / "data.json", tmp_path)
+    document = parse_resume(data)
+
+    paths = [source.path for source in external_sources(document)]
+
+    assert paths == [content["source"] for content in lists_of(data)]
+    assert [has_sources(section) for section in document.sections] == [
+        any(
+            "source" in (part.get("content") or {})
+            for part in [*s.get("subsections", []), s]
+        )
+        for s in data["resume"]["sections"]
+    ]
+    check_sources(document)
+    Path(paths[-1]).unlink()
+    with pytest.raises(DocumentError, match="source file not found"):
+        check_sources(document)
+
+
+@pytest.mark.parametrize(
+    "parts", [[], ["", ""], ["a"], ["a", "", "b"], ["", "a", "b", ""]]
+)
+def test_lines_are_joined_lazily(parts):
+    """Empty parts are skipped like a filtered join"""
+    assert "".join(iter_lines(iter(parts))) == "\n".join(filter(None, parts))
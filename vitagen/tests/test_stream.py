@@ -0,0 +1,111 @@
+"""Tests of writing resumes to a sink as they are rendered."""
+
+import io
+from typing import List
+import pytest
+from vitagen.generator.config.column import LatexColumn
+from vitagen.generator.config.theme import Theme, parse_theme
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import parse_resume
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import load_document
+
+SAMPLES = sorted(
+    [PROJECT_ROOT / "data.json", *PROJECT_ROOT.glob("samples/*/data.json")]
+)
+
+# column pieces a theme may leave out, e.g. for a layout without environments
+BARE_COLUMNS = {"column": {"leftBegin": "", "leftEnd": "", "rightBegin": ""}}
+
+
+class RecordingSink(io.StringIO):
+    """A sink remembering every write it was given"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes: List[str] = []
+
+    def write(self, s: str) -> int:
+        self.writes.append(s)
+        return super().write(s)
+
+
+def generator(path, theme: Theme = None) -> ResumeContentGenerator:
+    """A generator of a sample document"""
+    return ResumeContentGenerator(load_document(path), theme=theme)
+
+
+def joined_columns(path, theme: Theme) -> str:
+    """The multi-column layout of a document, joined as a whole"""
+    document = parse_resume(load_document(path))
+    sections = generator(path, theme).process_single_section
+    column = theme.column
+
+    def rendered(number: int) -> List[str]:
+        return [sections(s) for s in document.sections if s.column == number]
+
+    pieces = [
+        f"\\columnratio{{{column.ratio}}}",
+        column.begin,
+        column.left_begin,
+        *rendered(1),
+        column.left_end,
+        column.right_begin,
+        *rendered(2),
+        column.right_end,
+        column.end,
+    ]
+    return "\n".join(filter(None, pieces))
+
+
+def is_multi_column(path) -> bool:
+    """Whether a sample has sections in the right column"""
+    return any(s.column == 2 for s in parse_resume(load_document(path)).sections)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_streamed_file_is_byte_identical(path, tmp_path):
+    """Writing to a file gives the bytes of the built string"""
+    output = tmp_path / "resume.tex"
+    with open(output, "w", encoding="utf-8") as f:
+        generator(path).write_resume(f)
+
+    assert output.read_bytes() == generator(path).build_resume().encode("utf-8")
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_sections_are_written_one_at_a_time(path):
+    """No write holds more than a single rendered section"""
+    sink = RecordingSink()
+    generator(path).write_resume(sink)
+
+    document = parse_resume(load_document(path))
+    sections = [generator(path).process_single_section(s) for s in document.sections]
+    assert sink.getvalue() == generator(path).build_resume()
+    assert max(map(len, sink.writes)) <= max(map(len, sections)) + 1
+
+
+@pytest.mark.parametrize(
+    "theme", [Theme(), parse_theme(BARE_COLUMNS)], ids=["default", "bare"]
+)
+def test_columns_match_the_joined_layout(theme):
+    """Empty layout pieces are left out, as joining the layout would"""
+    paths = [path for path in SAMPLES if is_multi_column(path)]
+    assert paths
+
+    for path in paths:
+        output = generator(path, theme).build_resume()
+        assert joined_columns(path, theme) in output
+
+
+def test_bare_columns_leave_no_blank_lines():
+    """A theme without column environments adds no empty lines"""
+    theme = parse_theme(BARE_COLUMNS)
+    path = next(path for path in SAMPLES if is_multi_column(path))
+
+    output = generator(path, theme).build_resume()
+
+    assert theme.column == LatexColumn(left_begin="", left_end="", right_begin="")
+    assert "\\begin{leftcolumn}" not in output
+    assert "\\begin{paracol}{2}\n\\" in output
+    assert "\n\n" not in output.split("\\columnratio", 1)[1]
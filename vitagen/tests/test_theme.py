@@ -0,0 +1,132 @@
+"""Tests of theme configurations overriding the formatter configs."""
+
+import json
+import pytest
+from vitagen.app import parse_args, run_build
+from vitagen.generator.config.base import TextStyle
+from vitagen.generator.config.theme import (
+    DEFAULT_THEME,
+    ThemeError,
+    load_theme,
+    parse_theme,
+    theme_digest,
+)
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import load_document
+from vitagen.logger.struct_json_logger import get_logger
+
+
+def test_overrides_replace_only_their_settings():
+    """Settings left out keep their defaults, camel cased keys map to fields"""
+    theme = parse_theme(
+        {
+            "section": {"titleFormat": "\\section*{{{}}}"},
+            "column": {"ratio": 1},
+            "subsection": {"defaultColumns": 2},
+            "subsectionElements": {"group": ["{", "}"]},
+            "style": {"commands": {"bold": "\\textbf"}},
+        }
+    )
+
+    assert theme.section.title_format == "\\section*{{{}}}"
+    assert theme.column.ratio == 1.0 and isinstance(theme.column.ratio, float)
+    assert theme.column.begin == DEFAULT_THEME.column.begin
+    assert theme.subsection.default_columns == 2
+    assert theme.subsection_elements.group == ("{", "}")
+    assert theme.style.commands[TextStyle.BOLD] == "\\textbf"
+    assert theme.style.commands[TextStyle.ITALIC] == "\\itshape"
+    assert DEFAULT_THEME.style.commands[TextStyle.BOLD] == "\\bfseries"
+
+
+def test_empty_configuration_is_the_default_theme():
+    """No override at all gives a theme equal to the default one"""
+    assert parse_theme({}) == DEFAULT_THEME
+    assert theme_digest(parse_theme({})) == theme_digest(DEFAULT_THEME)
+    assert theme_digest(parse_theme({"column": {"ratio": 0.5}})) != theme_digest(
+        DEFAULT_THEME
+    )
+
+
+@pytest.mark.parametrize(
+    "data, path, message",
+    [
+        ([], "$", "must be an object"),
+        ({"colour": {}}, "$.colour", "unknown setting"),
+        ({"section": "bold"}, "$.section", "must be an object"),
+        ({"section": {"titelFormat": "x"}}, "$.section.titelFormat", "unknown setting"),
+        ({"section": {"titleFormat": 3}}, "$.section.titleFormat", "must be a str"),
+        ({"column": {"ratio": "wide"}}, "$.column.ratio", "must be a float"),
+        ({"column": {"ratio": True}}, "$.column.ratio", "must be a float"),
+        (
+            {"subsection": {"defaultColumns": 1.5}},
+            "$.subsection.defaultColumns",
+            "must be a int",
+        ),
+        (
+            {"subsectionElements": {"group": ["{"]}},
+            "$.subsectionElements.group",
+            "must be an array of 2 strings",
+        ),
+        (
+            {"subsectionElements": {"minipage": [1, 2]}},
+            "$.subsectionElements.minipage",
+            "must be an array of 2 strings",
+        ),
+        ({"style": {"commands": {"bold": 1}}}, "$.style.commands.bold", "string"),
+        ({"style": {"commands": {"blink": "x"}}}, "$.style.commands.blink", "style"),
+    ],
+)
+def test_invalid_overrides_name_their_path(data, path, message):
+    """Unknown keys and values of the wrong type raise with their JSON path"""
+    with pytest.raises(ThemeError) as error:
+        parse_theme(data)
+
+    assert error.value.path == path
+    assert message in str(error.value)
+
+
+def test_theme_files_are_validated_when_loaded(tmp_path):
+    """Invalid JSON is reported at the root of the configuration"""
+    path = tmp_path / "theme.json"
+    path.write_text('{"section": ', "utf-8")
+
+    with pytest.raises(ThemeError, match=r"^\$: invalid json"):
+        load_theme(path)
+
+    path.write_text(json.dumps({"table": {"rowSeparator": " \\\\[2pt]"}}), "utf-8")
+    assert load_theme(path).table.row_separator == " \\\\[2pt]"
+
+
+def test_theme_changes_the_rendered_output():
+    """A sample renders with the commands of the theme"""
+    data = load_document(PROJECT_ROOT / "samples" / "preset-carlito" / "data.json")
+    theme = parse_theme({"style": {"commands": {"bold": "\\textbf"}}})
+
+    themed = ResumeContentGenerator(data, theme=theme).build_resume()
+    plain = ResumeContentGenerator(data).build_resume()
+
+    assert "\\bfseries" in plain and "\\bfseries" not in themed
+    assert themed.replace("\\textbf", "\\bfseries") == plain
+
+
+def test_invalid_theme_fails_the_build_before_rendering(tmp_path):
+    """The command line rejects an invalid theme without writing any output"""
+    theme = tmp_path / "theme.json"
+    theme.write_text(json.dumps({"column": {"ratio": "wide"}}), "utf-8")
+    output = tmp_path / "resume.pdf"
+    args = parse_args(
+        [
+            "--theme-config",
+            str(theme),
+            "build",
+            str(PROJECT_ROOT / "data.json"),
+            "--pdf",
+            str(output),
+            "--engine",
+            "stub",
+        ]
+    )
+
+    assert run_build(args, get_logger("vitagen")) == 1
+    assert not output.exists()
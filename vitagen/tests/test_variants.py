@@ -0,0 +1,151 @@
+"""Tests of rendering preset and spacing variants of a document."""
+
+import pytest
+from vitagen.app import parse_args, run_render
+from vitagen.generator.config.spacing_factor import SpacingModel
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import parse_resume
+from vitagen.generator.variants import (
+    Variant,
+    parse_variant,
+    render_variants,
+    variant_output,
+)
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import load_document
+from vitagen.logger.struct_json_logger import get_logger
+
+SAMPLES = sorted(
+    [PROJECT_ROOT / "data.json", *PROJECT_ROOT.glob("samples/*/data.json")]
+)
+
+VARIANTS = [
+    Variant(),
+    Variant(spacing=SpacingModel.TIGHT),
+    Variant(preset="preset-carlito", spacing=SpacingModel.COMPACT),
+    Variant(show_last_updated=False, hide_footer=True, name="print"),
+]
+
+
+@pytest.mark.parametrize(
+    "spec, variant",
+    [
+        ("", Variant()),
+        ("preset=carlito", Variant(preset="carlito")),
+        ("spacing=Ultra", Variant(spacing=SpacingModel.ULTRA)),
+        (
+            " showLastUpdated=no , hideFooter=1 ,name=print",
+            Variant(show_last_updated=False, hide_footer=True, name="print"),
+        ),
+    ],
+)
+def test_variants_parse_from_the_command_line(spec, variant):
+    """Settings are comma separated, booleans accept common spellings"""
+    assert parse_variant(spec) == variant
+
+
+@pytest.mark.parametrize(
+    "spec, message",
+    [
+        ("preset", "expected key=value"),
+        ("spacing=roomy", "unknown spacing 'roomy'"),
+        ("hideFooter=maybe", "hideFooter must be true or false"),
+        ("colour=red", "unknown variant setting 'colour'"),
+    ],
+)
+def test_invalid_variants_are_rejected(spec, message):
+    """Unknown settings and values raise a ValueError naming them"""
+    with pytest.raises(ValueError, match=message):
+        parse_variant(spec)
+
+
+@pytest.mark.parametrize(
+    "variant, name",
+    [
+        (Variant(), "resume-default.tex"),
+        (
+            Variant(preset="carlito", spacing=SpacingModel.TIGHT),
+            "resume-carlito-tight.tex",
+        ),
+        (
+            Variant(show_last_updated=True, hide_footer=False),
+            "resume-updated-footer.tex",
+        ),
+        (Variant(spacing=SpacingModel.TIGHT, name="short"), "resume-short.tex"),
+    ],
+)
+def test_outputs_are_named_after_the_variant(variant, name, tmp_path):
+    """The label of a variant is its name or its settings"""
+    assert variant_output(tmp_path / "resume.tex", variant) == tmp_path / name
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.parent.name)
+def test_variants_match_standalone_renders(path):
+    """Sharing fragments across variants changes no output"""
+    document = parse_resume(load_document(path))
+
+    outputs = render_variants(document, VARIANTS)
+
+    assert [variant for variant, _ in outputs] == VARIANTS
+    for variant, output in outputs:
+        assert output == ResumeContentGenerator(variant.apply(document)).build_resume()
+
+
+def test_sections_are_rendered_once(monkeypatch):
+    """Every section renders once, whatever the number of variants"""
+    document = parse_resume(load_document(PROJECT_ROOT / "data.json"))
+    rendered = []
+    process = ResumeContentGenerator.process_single_section
+
+    def counted(self, section, config=None):
+        if config is None:
+            rendered.append(section.heading)
+        return process(self, section, config)
+
+    monkeypatch.setattr(ResumeContentGenerator, "process_single_section", counted)
+    render_variants(document, VARIANTS)
+
+    assert sorted(rendered) == sorted(s.heading for s in document.sections)
+
+
+def test_variants_leave_the_document_alone():
+    """The settings of a variant only apply to its own output"""
+    data = load_document(PROJECT_ROOT / "samples" / "preset-carlito" / "data.json")
+    document = parse_resume(data)
+
+    outputs = dict(
+        (variant.label, output)
+        for variant, output in render_variants(
+            document, [Variant(hide_footer=True), Variant(hide_footer=False)]
+        )
+    )
+
+    assert "\\footertext" not in outputs["no-footer"]
+    assert "\\footertext" in outputs["footer"]
+    assert parse_resume(data) == document
+
+
+def test_command_writes_every_variant(tmp_path):
+    """Each variant is written next to the output, named after its label"""
+    output = tmp_path / "resume.tex"
+    args = parse_args(
+        [
+            "--input",
+            str(PROJECT_ROOT / "samples" / "single-column" / "data.json"),
+            "--output",
+            str(output),
+            "--variant",
+            "spacing=tight",
+            "--variant",
+            "preset=preset-carlito,name=carlito",
+        ]
+    )
+
+    assert run_render(args, get_logger("vitagen")) == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "resume-carlito.tex",
+        "resume-tight.tex",
+    ]
+    assert "\\loadpresent{preset-carlito}" in (
+        tmp_path / "resume-carlito.tex"
+    ).read_text("utf-8")
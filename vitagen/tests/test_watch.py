@@ -0,0 +1,177 @@
+"""Tests of watch mode, re-rendering a document as its files change."""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, List
+import pytest
+from vitagen import watch as watch_module
+from vitagen.layout.fonts import PROJECT_ROOT
+from vitagen.loader import load_document
+from vitagen.watch import render_once, watch
+
+DEBOUNCE = 0.3
+POLL_INTERVAL = 0.02
+
+
+def write(path: Path, value: Any) -> Path:
+    """Write a value as JSON"""
+    path.write_text(json.dumps(value), encoding="utf-8")
+    return path
+
+
+def eventually(predicate: Callable[[], bool], timeout: float = 10.0) -> None:
+    """Wait until a condition holds, failing after a timeout"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("condition not met in time")
+        time.sleep(POLL_INTERVAL)
+
+
+def project(directory: Path) -> Path:
+    """The single column sample, with a section included and a table read from CSV"""
+    data = load_document(PROJECT_ROOT / "samples" / "single-column" / "data.json")
+    write(directory / "education.json", data["resume"]["sections"][0])
+    (directory / "skills.csv").write_text("Skill,Level\nPython,Expert\n", "utf-8")
+    data["resume"]["sections"][0] = {"$ref": "education.json"}
+    data["resume"]["sections"].append(
+        {"heading": "Toolbox", "content": {"type": "table", "source": "skills.csv"}}
+    )
+    return write(directory / "resume.json", data)
+
+
+@contextmanager
+def watching(input_path: Path, monkeypatch, **kwargs) -> Iterator[List[Path]]:
+    """Watch a document on a thread, yielding the outputs of its renders"""
+    output = input_path.with_suffix(".tex")
+    renders: List[Path] = []
+
+    def counted_render_once(*args, **options):
+        latency = render_once(*args, **options)
+        renders.append(output)
+        return latency
+
+    monkeypatch.setattr(watch_module, "render_once", counted_render_once)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch,
+        args=(input_path, output),
+        kwargs={
+            "debounce": DEBOUNCE,
+            "poll_interval": POLL_INTERVAL,
+            "stop": stop,
+            **kwargs,
+        },
+        daemon=True,
+    )
+    thread.start()
+    try:
+        eventually(lambda: len(renders) == 1)
+        yield renders
+    finally:
+        stop.set()
+        thread.join(timeout=10)
+
+
+def edit(path: Path, old: str, new: str) -> None:
+    """Replace text in a file, changing its size so the edit is always seen"""
+    text = path.read_text("utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new), "utf-8")
+
+
+def output_of(input_path: Path) -> str:
+    """The rendered output of a watched document, headings are upper cased"""
+    return input_path.with_suffix(".tex").read_text("utf-8").upper()
+
+
+def test_burst_of_saves_renders_once(tmp_path, monkeypatch):
+    """Saves closer together than the debounce settle into a single render"""
+    resume = project(tmp_path)
+
+    with watching(resume, monkeypatch) as renders:
+        for count in range(1, 6):
+            edit(resume, "Toolbox" + "!" * (count - 1), "Toolbox" + "!" * count)
+            time.sleep(DEBOUNCE / 5)
+        eventually(lambda: len(renders) == 2)
+        time.sleep(DEBOUNCE * 2)
+
+        assert len(renders) == 2
+        assert "TOOLBOX!!!!!" in output_of(resume)
+
+
+def test_included_fragments_trigger_a_render(tmp_path, monkeypatch):
+    """Editing a file the document includes renders it again"""
+    resume = project(tmp_path)
+
+    with watching(resume, monkeypatch) as renders:
+        edit(tmp_path / "education.json", '"heading": "', '"heading": "Studies ')
+        eventually(lambda: len(renders) == 2)
+
+        assert "STUDIES" in output_of(resume)
+
+
+def test_external_sources_trigger_a_render(tmp_path, monkeypatch):
+    """Editing a source the document reads renders it again"""
+    resume = project(tmp_path)
+
+    with watching(resume, monkeypatch) as renders:
+        edit(tmp_path / "skills.csv", "Expert", "Gardening")
+        eventually(lambda: len(renders) == 2)
+
+        assert "GARDENING" in output_of(resume)
+        assert "EXPERT" not in output_of(resume)
+
+
+def test_extra_paths_trigger_a_render(tmp_path, monkeypatch):
+    """Files the document does not read are watched when asked for"""
+    resume = project(tmp_path)
+    notes = tmp_path / "notes.txt"
+    notes.write_text("first", "utf-8")
+
+    with watching(resume, monkeypatch, extra_paths=[notes]) as renders:
+        notes.write_text("second save", "utf-8")
+        eventually(lambda: len(renders) == 2)
+
+
+def test_failed_render_keeps_the_last_good_output(tmp_path, monkeypatch):
+    """A broken save leaves the output alone, the next good one renders"""
+    resume = project(tmp_path)
+
+    with watching(resume, monkeypatch) as renders:
+        good = output_of(resume)
+
+        text = resume.read_text("utf-8")
+        resume.write_text(text[: len(text) // 2], "utf-8")
+        time.sleep(DEBOUNCE * 3)
+        assert output_of(resume) == good
+        assert len(renders) == 1
+
+        # the fragments of the last good render are still watched
+        edit(tmp_path / "education.json", '"heading": "', '"heading": "Studies ')
+        time.sleep(DEBOUNCE * 3)
+        assert output_of(resume) == good
+
+        resume.write_text(text.replace("Toolbox", "Workshop"), "utf-8")
+        eventually(lambda: len(renders) == 2)
+        assert "WORKSHOP" in output_of(resume) and "STUDIES" in output_of(resume)
+
+
+def test_missing_include_keeps_the_last_good_output(tmp_path, monkeypatch):
+    """A fragment removed between saves fails the render, not the watch"""
+    resume = project(tmp_path)
+
+    with watching(resume, monkeypatch) as renders:
+        good = output_of(resume)
+        kept = (tmp_path / "education.json").read_text("utf-8")
+
+        (tmp_path / "education.json").unlink()
+        time.sleep(DEBOUNCE * 3)
+        assert output_of(resume) == good
+
+        (tmp_path / "education.json").write_text(kept.replace("}", " }", 1), "utf-8")
+        eventually(lambda: len(renders) == 2)
+        assert output_of(resume) == good
@@ -1,3 +1,12 @@
 """This module initializes the Flask application."""
 
-from .app import start
+__all__ = ["start"]  # pylint: disable=undefined-all-variable
+
+
+def __getattr__(name):
+    """Import the application lazily, submodules can be used without it"""
+    if name == "start":
+        from .app import start  # pylint: disable=import-outside-toplevel
+
+        return start
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
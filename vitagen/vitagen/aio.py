@@ -0,0 +1,231 @@
+"""Asyncio API rendering documents off the event loop, on a thread or process pool."""
+
+import asyncio
+import os
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from vitagen.generator.cache import LEAF_CACHE
+from vitagen.generator.config.theme import Theme
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import Resume, decode_resume, load_resume
+from vitagen.utils import write_atomic
+
+__all__ = [
+    "AsyncRenderer",
+    "render_document",
+    "render_async",
+    "load_resume_async",
+    "write_output_async",
+]
+
+# a resume document, raw JSON, its decoded value or its parsed model
+Document = Union[bytes, str, Dict[str, Any], Resume]
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+def render_document(
+    data: Document, theme: Optional[Theme] = None, unicode_escapes: bool = False
+) -> str:
+    """
+    Render a resume document into LaTeX, on the executor of an ``AsyncRenderer``.
+
+    Args:
+        data (Document): UTF-8 encoded or text JSON, a decoded document or a
+            parsed one
+        theme (Optional[Theme]): Theme of the document, the default one if None
+        unicode_escapes (bool): Escape non ASCII characters as LaTeX commands
+
+    Returns:
+        str: The generated LaTeX content
+    """
+    if isinstance(data, (bytes, str)):
+        data = decode_resume(data)
+    # leaves shared by the documents of the process are formatted once
+    return ResumeContentGenerator(
+        data, unicode_escapes=unicode_escapes, theme=theme, leaf_cache=LEAF_CACHE
+    ).build_resume()
+
+
+class AsyncRenderer:
+    """
+    Renders documents from coroutines, without blocking the event loop.
+
+    Rendering runs on a thread pool, or on a process pool. Threads still share
+    the interpreter lock with the event loop, which a large document can hold
+    for long stretches, processes never do at the cost of sending the document
+    and its output between processes. At most
+    ``max_concurrency`` documents render at once per event loop, others wait
+    for a slot without blocking the loop. A render that is cancelled or times
+    out before it started never runs, one already running keeps its slot
+    until it is done, as a running render cannot be interrupted.
+    """
+
+    def __init__(
+        self,
+        executor: Union[str, Executor] = "thread",
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            executor (Union[str, Executor]): "thread", "process", or an
+                executor of the caller, which the caller shuts down
+            max_concurrency (Optional[int]): Documents rendering at once,
+                defaults to the CPU count
+            timeout (Optional[float]): Seconds a render may take, unbounded if None
+
+        Raises:
+            ValueError: If the executor kind is unknown
+        """
+        self.max_concurrency = max(1, max_concurrency or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.owned = isinstance(executor, str)
+        if executor == "thread":
+            executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="vitagen"
+            )
+        elif executor == "process":
+            executor = ProcessPoolExecutor(max_workers=self.max_concurrency)
+        elif self.owned:
+            raise ValueError(
+                f"unknown executor '{executor}', expected one of {EXECUTOR_KINDS}"
+            )
+        self.executor = executor
+        # semaphores are bound to the event loop they are first awaited on
+        self.slots: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _slots(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        """The concurrency limit of an event loop"""
+        if (slots := self.slots.get(loop)) is None:
+            slots = self.slots[loop] = asyncio.Semaphore(self.max_concurrency)
+        return slots
+
+    async def render(
+        self,
+        data: Document,
+        theme: Optional[Theme] = None,
+        unicode_escapes: bool = False,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Render a resume document into LaTeX on the executor.
+
+        Args:
+            data (Document): UTF-8 encoded or text JSON, a decoded document or
+                a parsed one, bytes are the cheapest to send to a process
+            theme (Optional[Theme]): Theme of the document, the default one if None
+            unicode_escapes (bool): Escape non ASCII characters as LaTeX commands
+            timeout (Optional[float]): Seconds the render may take, defaults to
+                the one of the renderer
+
+        Returns:
+            str: The generated LaTeX content
+
+        Raises:
+            TimeoutError: If rendering takes longer than the timeout
+            asyncio.CancelledError: If the awaiting task is cancelled
+        """
+        loop = asyncio.get_running_loop()
+        slots = self._slots(loop)
+        await slots.acquire()
+
+        try:
+            future = self.executor.submit(render_document, data, theme, unicode_escapes)
+        except BaseException:
+            slots.release()
+            raise
+
+        # released once the executor is done with the render, not when the
+        # caller stops waiting for it
+        def release(_):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(slots.release)
+
+        future.add_done_callback(release)
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"rendering took longer than {timeout}s") from None
+        finally:
+            future.cancel()
+
+    def close(self) -> None:
+        """Shut an executor created by the renderer down, dropping pending renders"""
+        if self.owned:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> "AsyncRenderer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=1)
+def _default_renderer() -> AsyncRenderer:
+    """The thread pool renderer of ``render_async``, created by its first call"""
+    return AsyncRenderer()
+
+
+async def render_async(
+    data: Document,
+    *,
+    theme: Optional[Theme] = None,
+    unicode_escapes: bool = False,
+    renderer: Optional[AsyncRenderer] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    Render a resume document into LaTeX without blocking the event loop.
+
+    Args:
+        data (Document): UTF-8 encoded or text JSON, a decoded document or a
+            parsed one
+        theme (Optional[Theme]): Theme of the document, the default one if None
+        unicode_escapes (bool): Escape non ASCII characters as LaTeX commands
+        renderer (Optional[AsyncRenderer]): The renderer to render on, defaults
+            to a thread pool shared by the process
+        timeout (Optional[float]): Seconds the render may take
+
+    Returns:
+        str: The generated LaTeX content
+    """
+    renderer = renderer or _default_renderer()
+    return await renderer.render(
+        data, theme=theme, unicode_escapes=unicode_escapes, timeout=timeout
+    )
+
+
+async def load_resume_async(path: Union[str, Path]) -> Resume:
+    """
+    Load, resolve the includes of and parse a resume document file on the
+    default executor of the event loop.
+
+    Args:
+        path (Union[str, Path]): Path to the JSON file
+
+    Returns:
+        Resume: The parsed document
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, load_resume, path)
+
+
+async def write_output_async(
+    path: Union[str, Path], content: Union[str, bytes]
+) -> None:
+    """
+    Write generated content atomically on the default executor of the event loop.
+
+    Args:
+        path (Union[str, Path]): The output file
+        content (Union[str, bytes]): The content, e.g. from ``render_async``
+    """
+    await asyncio.get_running_loop().run_in_executor(None, write_atomic, path, content)
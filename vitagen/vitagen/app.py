@@ -1,24 +1,146 @@
 """The server module."""
 
-import argparse
-import json
+# Modules are imported where they are needed, so that each mode only pays for
+# its own imports and importing this module stays cheap.
+# pylint: disable=import-outside-toplevel
+
+from functools import lru_cache
+from importlib import import_module
 from pathlib import Path
-from typing import Union
-from dotenv import load_dotenv
-from .logger.struct_json_logger import configure_logging, get_logger
+from typing import List, Optional, Union
 from .constants import (
+    ERROR_INVALID_THEME_CONFIG,
+    ERROR_INVALID_VARIANT,
+    ERROR_PDF_BUILD_FAILED,
     ERROR_PROVIDE_A_VALID_JSON_FILE_PATH,
+    INFO_PDF_BUILT,
     INFO_RESUME_TEX_GENERATED_SUCCESSFULLY,
+    INFO_SPACING_SELECTED,
 )
-from .generator.main import ResumeContentGenerator
 
 __all__ = ["start"]
 
-load_dotenv()
-parser = argparse.ArgumentParser()
 
-parser.add_argument("--input", help="path to the JSON file")
-parser.add_argument("--output", help="path to the output file")
+# subcommands, with the module defining their options and their help
+COMMANDS = {
+    "serve": (
+        "server",
+        "serve POST /render on localhost from a pool of warm workers",
+    ),
+    "bench": (
+        "bench.render",
+        "benchmark rendering of synthetic resumes of growing size",
+    ),
+    "estimate": (
+        "layout.estimate",
+        "estimate the page fill of a document under every spacing model "
+        "from font metrics, without compiling it",
+    ),
+    "build": (
+        "tex.build",
+        "compile a document into a pdf, served from a content addressed "
+        "cache when no input changed",
+    ),
+    "compile": (
+        "tex.pool",
+        "compile every document of a batch source into a pdf, running "
+        "several tex engines in parallel",
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def build_parser(command: Optional[str] = None):
+    """
+    Build the command line parser
+
+    Args:
+        command (Optional[str]): The subcommand whose options are added, the
+            others are only listed. Without one, the parser parses the
+            options of the render mode and tells the subcommand given.
+
+    Returns:
+        argparse.ArgumentParser: The parser of the render mode and the command
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--input", help="path to the JSON file")
+    parser.add_argument("--output", help="path to the output file")
+    parser.add_argument(
+        "--batch",
+        help="directory, glob or JSONL file of JSON documents to render into --output",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="number of worker processes used in batch mode"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip the documents an interrupted batch already rendered into --output",
+    )
+    parser.add_argument(
+        "--cache-dir", help="directory of the persistent rendered section cache"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and re-render --output every time --input changes",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.1,
+        help="seconds the input has to stay unchanged before re-rendering in watch mode",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="write the output while rendering instead of building it in memory",
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        help="render a variant from the same parse, repeatable, e.g. "
+        "preset=carlito,spacing=ultra,showLastUpdated=false,hideFooter=true; "
+        "each is written next to --output, suffixed with its name",
+    )
+    parser.add_argument(
+        "--theme-config",
+        help="JSON file overriding the formatter configuration of the theme",
+    )
+    parser.add_argument(
+        "--fit-spacing",
+        action="store_true",
+        help="render a single document with the loosest spacing model its "
+        "estimated page fill still fits on one page with",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="log timing spans of every stage, section, subsection and content",
+    )
+    parser.add_argument(
+        "--profile-trace",
+        help="write the timing spans as a chrome trace file, implies --profile",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="trace allocations and log peak and retained memory of every span, "
+        "implies --profile",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    for name, (module, help_text) in COMMANDS.items():
+        # only the dispatched command pays for the module defining its options
+        selected = name == command
+        subparser = subparsers.add_parser(name, help=help_text, add_help=selected)
+        if selected:
+            import_module(f".{module}", __package__).add_arguments(subparser)
+
+    return parser
 
 
 def get_absolute_path(
@@ -67,33 +189,363 @@ def prepare():
     """
     Prepare the application for running
     """
+    from dotenv import load_dotenv
+    from .logger.struct_json_logger import configure_logging
+
+    load_dotenv()
     configure_logging()
 
 
-def start():
+def load_theme_config(args):
     """
-    Start the application
+    Load and validate the theme configuration once, before rendering anything
+
+    Returns:
+        Optional[Theme]: The theme of the command line, None for the default one
     """
-    prepare()
+    if not args.theme_config:
+        return None
 
-    default_logger = get_logger("vitagen")
+    from .generator.config.theme import load_theme
 
-    args = parser.parse_args()
-    if args.input and args.output:
+    return load_theme(get_absolute_path(args.theme_config))
+
+
+def run_serve(args) -> int:
+    """Serve renders over HTTP until interrupted"""
+    from .server import serve
+
+    serve(
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        workers=args.serve_workers,
+        max_pending=args.max_pending,
+        timeout=args.timeout,
+    )
+    return 0
+
+
+def run_bench(args) -> int:
+    """Run the rendering benchmark suite"""
+    from .bench.render import main as bench
+
+    return bench(args)
+
+
+def run_estimate(args, logger) -> int:
+    """Estimate the page fill of a document under every spacing model"""
+    from .layout.estimate import main as estimate
+
+    try:
+        theme = load_theme_config(args)
+    except (OSError, ValueError) as e:
+        logger.error(ERROR_INVALID_THEME_CONFIG, value=args.theme_config, error=str(e))
+        return 1
+
+    return estimate(args, theme)
+
+
+def build_caches(args):
+    """
+    Open the PDF and preamble format caches of the command line
+
+    Returns:
+        Tuple[Optional[PdfCache], Optional[FormatCache]]: The caches, None
+            for those disabled
+    """
+    from .tex.build import PdfCache, cache_directory, format_directory
+    from .tex.preamble import FormatCache
+
+    directory, formats = cache_directory(args), format_directory(args)
+    return (
+        PdfCache(directory) if directory else None,
+        FormatCache(formats) if formats else None,
+    )
+
+
+def run_build(args, logger) -> int:
+    """Compile a document into a PDF, reusing the cached PDF of equal inputs"""
+    from .generator.cache import SectionCache
+    from .generator.model import load_resume
+    from .tex.build import BuildError, build
+    from .tex.engine import create_engine
+
+    try:
+        theme = load_theme_config(args)
+    except (OSError, ValueError) as e:
+        logger.error(ERROR_INVALID_THEME_CONFIG, value=args.theme_config, error=str(e))
+        return 1
+
+    document = get_absolute_path(args.document)
+    pdf = get_absolute_path(args.pdf) if args.pdf else document.with_suffix(".pdf")
+    cache, formats = build_caches(args)
+
+    try:
+        result = build(
+            load_resume(document),
+            pdf,
+            root=args.root,
+            cache=cache,
+            formats=formats,
+            engine=create_engine(args.engine),
+            theme=theme,
+            section_cache=SectionCache(args.cache_dir) if args.cache_dir else None,
+            timeout=args.timeout,
+        )
+    except BuildError as e:
+        logger.error(
+            ERROR_PDF_BUILD_FAILED,
+            value=str(pdf),
+            error=e.message,
+            log=str(e.log_path) if e.log_path else None,
+        )
+        return 1
+
+    logger.info(
+        INFO_PDF_BUILT,
+        value=str(result.pdf),
+        digest=result.digest,
+        cached=result.cached,
+        passes=result.passes,
+        format=str(result.fmt) if result.fmt else None,
+        **{stage: round(ms, 3) for stage, ms in result.stages_ms.items()},
+    )
+    return 0
+
+
+def run_compile(args, logger) -> int:
+    """Compile every document of a batch source into a PDF in parallel"""
+    from .tex.engine import create_engine
+    from .tex.pool import CompileOptions, run_compile as compile_batch
+
+    try:
+        theme = load_theme_config(args)
+    except (OSError, ValueError) as e:
+        logger.error(ERROR_INVALID_THEME_CONFIG, value=args.theme_config, error=str(e))
+        return 1
+
+    cache, formats = build_caches(args)
+    options = CompileOptions(
+        engine=create_engine(args.engine),
+        root=get_absolute_path(args.root),
+        cache=cache,
+        formats=formats,
+        timeout=args.timeout,
+    )
+    summary = compile_batch(
+        args.source,
+        get_absolute_path(args.output_dir),
+        options,
+        args.compile_workers,
+        args.cache_dir,
+        fail_fast=args.fail_fast,
+        theme=theme,
+    )
+    return 1 if summary.failed or summary.cancelled else 0
+
+
+def fit_spacing(document, theme, logger):
+    """
+    Set a document with the spacing model recommended by its page fill estimate
+
+    Returns:
+        Resume: The document with the recommended spacing model
+    """
+    from dataclasses import replace
+    from .layout.estimate import select_spacing
+
+    estimate = select_spacing(document, theme=theme)
+    logger.info(
+        INFO_SPACING_SELECTED,
+        value=estimate.spacing.name.lower(),
+        previous=document.spacing.name.lower(),
+        fill=round(estimate.fill, 3),
+        fits=estimate.fits,
+    )
+    return replace(document, spacing=estimate.spacing)
+
+
+def run_batch(args) -> int:
+    """Render every document of a batch source"""
+    from .batch import run_batch as render_batch
+
+    summary = render_batch(
+        args.batch,
+        get_absolute_path(args.output),
+        args.workers,
+        args.cache_dir,
+        profile=args.profile,
+        memory_report=args.memory_report,
+        theme=args.theme,
+        resume=args.resume,
+    )
+    return 1 if summary.failed else 0
+
+
+def run_watch(args) -> int:
+    """Re-render the input every time it changes until interrupted"""
+    from .watch import watch
+
+    watch(
+        get_absolute_path(args.input),
+        args.output,
+        cache_dir=args.cache_dir,
+        debounce=args.debounce,
+        theme=args.theme,
+    )
+    return 0
+
+
+def run_variants(args, logger) -> int:
+    """Render every variant of a single document from one parse"""
+    from .generator.cache import SectionCache
+    from .generator.model import load_resume
+    from .generator.variants import parse_variant, render_variants, variant_output
+
+    try:
+        variants = [parse_variant(spec) for spec in args.variant]
+    except ValueError as e:
+        logger.error(ERROR_INVALID_VARIANT, error=str(e))
+        return 1
+
+    outputs = render_variants(
+        load_resume(get_absolute_path(args.input)),
+        variants,
+        section_cache=SectionCache(args.cache_dir) if args.cache_dir else None,
+        theme=args.theme,
+    )
+
+    for variant, resume_content in outputs:
+        output = variant_output(args.output, variant)
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(resume_content)
+        logger.info(
+            INFO_RESUME_TEX_GENERATED_SUCCESSFULLY,
+            value=str(output),
+            variant=variant.label,
+        )
+
+    return 0
+
+
+def run_single(args, logger) -> int:
+    """Render a single document"""
+    from .generator.cache import SectionCache
+    from .generator.main import ResumeContentGenerator
+    from .generator.model import parse_resume
+    from .loader import load_document
+    from .profiling import create_tracer, no_span
+
+    tracer = create_tracer(
+        profile=args.profile or bool(args.profile_trace),
+        memory_report=args.memory_report,
+    )
+    span = tracer.span if tracer else no_span
+
+    with tracer or no_span():
         # resolve path to the JSON file
         # handle in case of invalid path
         # handle in case of relative path
         # handle in case of absolute path
+        with span("load"):
+            data = load_document(get_absolute_path(args.input))
 
-        with open(get_absolute_path(args.input), "r", encoding="utf-8") as f:
-            data = json.loads(f.read())
+        # the decoded tree is dropped once parsed, it is never kept while rendering
+        with span("parse"):
+            document = parse_resume(data, get_absolute_path(args.input))
+            del data
 
-        generator = ResumeContentGenerator(data)
-        resume_content = generator.build_resume()
+        if args.fit_spacing:
+            with span("fit"):
+                document = fit_spacing(document, args.theme, logger)
 
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(resume_content)
+        generator = ResumeContentGenerator(
+            document,
+            section_cache=SectionCache(args.cache_dir) if args.cache_dir else None,
+            theme=args.theme,
+            tracer=tracer,
+        )
+
+        if args.stream:
+            with open(args.output, "w", encoding="utf-8") as f:
+                generator.write_resume(f)
+        else:
+            resume_content = generator.build_resume()
+
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(resume_content)
+
+    logger.info(INFO_RESUME_TEX_GENERATED_SUCCESSFULLY, value=args.output)
+
+    if tracer is not None:
+        tracer.report(logger, args.profile_trace, process_name=Path(args.input).name)
+    return 0
+
+
+def run_render(args, logger) -> int:
+    """Render in the mode selected on the command line"""
+    try:
+        args.theme = load_theme_config(args)
+    except (OSError, ValueError) as e:
+        logger.error(ERROR_INVALID_THEME_CONFIG, value=args.theme_config, error=str(e))
+        return 1
+
+    if args.batch and args.output:
+        return run_batch(args)
+
+    if args.watch and args.input and args.output:
+        return run_watch(args)
+
+    if args.variant and args.input and args.output:
+        return run_variants(args, logger)
+
+    if args.input and args.output:
+        return run_single(args, logger)
+
+    logger.info(ERROR_PROVIDE_A_VALID_JSON_FILE_PATH, value=args.input)
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """
+    Parse the command line, importing the options of its subcommand only.
+
+    Args:
+        argv (Optional[List[str]]): The arguments, defaults to the ones of the process
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    command = build_parser().parse_known_args(argv)[0].command
+    return build_parser(command).parse_args(argv)
+
+
+def start():
+    """
+    Start the application
+    """
+    args = parse_args()
+
+    prepare()
+
+    from .logger.struct_json_logger import get_logger
+
+    default_logger = get_logger("vitagen")
+
+    if args.command == "serve":
+        return run_serve(args)
+
+    if args.command == "bench":
+        return run_bench(args)
+
+    if args.command == "estimate":
+        return run_estimate(args, default_logger)
+
+    if args.command == "build":
+        return run_build(args, default_logger)
+
+    if args.command == "compile":
+        return run_compile(args, default_logger)
 
-        default_logger.info(INFO_RESUME_TEX_GENERATED_SUCCESSFULLY, value=args.output)
-    else:
-        default_logger.info(ERROR_PROVIDE_A_VALID_JSON_FILE_PATH, value=args.input)
+    return run_render(args, default_logger)
@@ -0,0 +1,459 @@
+"""Batch rendering of many resume documents across a pool of worker processes."""
+
+import glob
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from vitagen.constants import (
+    ERROR_BATCH_DOCUMENT_FAILED,
+    INFO_BATCH_COMPLETED,
+    INFO_BATCH_DOCUMENT_RENDERED,
+    INFO_BATCH_STARTED,
+)
+from vitagen.generator.cache import LEAF_CACHE, LeafCacheStats, SectionCache
+from vitagen.generator.config.theme import Theme
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import DocumentError, Resume, decode_resume, load_resume
+from vitagen.jsonl import load_index, read_record
+from vitagen.logger.struct_json_logger import configure_logging, get_logger
+from vitagen.profiling import create_tracer, no_span
+
+__all__ = [
+    "BatchJob",
+    "DocumentResult",
+    "BatchSummary",
+    "Checkpoint",
+    "collect_jobs",
+    "render_job",
+    "run_batch",
+]
+
+JSONL_SUFFIX = ".jsonl"
+
+# directory of the output holding the state of the batches rendered into it
+STATE_DIR = ".vitagen-batch"
+CHECKPOINT_FILE = "checkpoint"
+
+
+@dataclass
+class BatchJob:  # pylint: disable=too-many-instance-attributes
+    """A single document to be rendered as part of a batch"""
+
+    name: str
+    output: str
+    path: Optional[str] = None
+    # offset, length and CRC-32 of a record of a JSONL file, none for a JSON file
+    record: Optional[Tuple[int, int, int]] = None
+    cache_dir: Optional[str] = None
+    profile: bool = False
+    memory_report: bool = False
+    theme: Optional[Theme] = None
+
+    @property
+    def record_id(self) -> Optional[str]:
+        """
+        Identity of the job in a checkpoint, its name along with a signature
+        of its document, so that a changed document is rendered again.
+
+        None for a document removed since the batch was collected, rendering
+        the job then reports it as failed.
+        """
+        if self.record is not None:
+            return f"{self.name}:{self.record[2]:08x}"
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return f"{self.name}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def load(self) -> Resume:
+        """Load and parse the resume document of the job"""
+        if self.record is None:
+            return load_resume(self.path)
+
+        offset, length, crc = self.record
+        data = read_record(self.path, offset, length)
+        if zlib.crc32(data) != crc:
+            raise DocumentError(self.name, "record changed since the batch started")
+        # includes of JSONL documents are relative to the JSONL file
+        return decode_resume(data, self.path)
+
+
+@dataclass
+class DocumentResult:  # pylint: disable=too-many-instance-attributes
+    """Outcome of rendering a single document"""
+
+    name: str
+    output: str
+    ok: bool
+    seconds: float
+    output_bytes: int = 0
+    peak_kib: Optional[float] = None
+    error: Optional[str] = None
+    # lookups of the leaf cache of the worker while rendering the document
+    leaf_cache: Optional[LeafCacheStats] = None
+
+
+@dataclass
+class BatchSummary:
+    """Aggregate outcome of a batch run"""
+
+    results: List[DocumentResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    # documents a previous run already rendered, skipped when resuming
+    skipped: int = 0
+
+    @property
+    def succeeded(self) -> int:
+        """Number of documents rendered successfully"""
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def failed(self) -> int:
+        """Number of documents that failed to render"""
+        return len(self.results) - self.succeeded
+
+    @property
+    def documents_per_second(self) -> float:
+        """Overall throughput of the batch in documents per second"""
+        return len(self.results) / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def leaf_cache(self) -> LeafCacheStats:
+        """Lookups of the leaf caches of every worker"""
+        return sum(
+            (result.leaf_cache for result in self.results if result.leaf_cache),
+            LeafCacheStats(),
+        )
+
+
+def _unique_name(name: str, seen: set) -> str:
+    """Make a document name unique within a batch"""
+    candidate, counter = name, 1
+    while candidate in seen:
+        counter += 1
+        candidate = f"{name}-{counter}"
+    seen.add(candidate)
+    return candidate
+
+
+class Checkpoint:
+    """
+    Append only record of the documents of a batch rendered so far.
+
+    A document is recorded once its output is completely written, one line
+    per document, flushed right away, so that a run killed at any point
+    leaves a checkpoint of every document it finished and nothing else. A
+    line cut short by the kill is ignored.
+    """
+
+    def __init__(self, path: Union[str, Path], resume: bool = False):
+        self.path = Path(path)
+        self.done: Set[str] = set()
+        if resume and self.path.is_file():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.done = {line[:-1] for line in f if line.endswith("\n")}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # a fresh run starts a fresh checkpoint
+        self.file = open(  # pylint: disable=consider-using-with
+            self.path, "a" if resume else "w", encoding="utf-8"
+        )
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self.done
+
+    def record(self, record_id: str) -> None:
+        """Record a document whose output is written"""
+        self.file.write(f"{record_id}\n")
+        self.file.flush()
+        self.done.add(record_id)
+
+    def close(self) -> None:
+        """Write the checkpoint through to the disk and close it"""
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def collect_jobs(
+    source: Union[str, Path],
+    output_dir: Union[str, Path],
+    cache_dir: Optional[str] = None,
+    *,
+    profile: bool = False,
+    memory_report: bool = False,
+    theme: Optional[Theme] = None,
+) -> List[BatchJob]:
+    """
+    Collect the documents of a batch source.
+
+    Args:
+        source (Union[str, Path]): A directory of JSON files, a JSONL file with one
+            document per line, or a glob pattern matching JSON files
+        output_dir (Union[str, Path]): Directory the rendered documents are written to
+        cache_dir (Optional[str]): Directory of the persistent section cache
+        profile (bool): Log the timing spans of every document
+        memory_report (bool): Trace the memory of every document and log it with
+            its spans
+        theme (Optional[Theme]): Formatter configuration of every document
+
+    The byte offset index of a JSONL file is cached in the output directory,
+    so that the file is only read again once it changed.
+
+    Returns:
+        List[BatchJob]: The jobs of the batch, in a stable order
+    """
+    source_path, output_dir = Path(source), Path(output_dir)
+    seen: set = set()
+
+    def job(name: str, **kwargs) -> BatchJob:
+        name = _unique_name(name, seen)
+        output = str(output_dir / f"{name}.tex")
+        return BatchJob(
+            name=name,
+            output=output,
+            cache_dir=cache_dir,
+            profile=profile,
+            memory_report=memory_report,
+            theme=theme,
+            **kwargs,
+        )
+
+    # records are read by the workers, by their offsets in the JSONL file
+    if source_path.is_file() and source_path.suffix == JSONL_SUFFIX:
+        index = load_index(
+            source_path, output_dir / STATE_DIR / f"{source_path.stem}.index"
+        )
+        return [
+            job(
+                f"{source_path.stem}-{record.line:05d}",
+                path=str(source_path),
+                record=(record.offset, record.length, record.crc),
+            )
+            for record in index
+        ]
+
+    if source_path.is_dir():
+        paths = sorted(source_path.glob("*.json"))
+    else:
+        paths = sorted(Path(p) for p in glob.glob(str(source), recursive=True))
+
+    return [job(path.stem, path=str(path)) for path in paths if path.is_file()]
+
+
+def render_job(job: BatchJob) -> DocumentResult:
+    """
+    Render a single batch job, isolating any failure to the job itself.
+
+    Args:
+        job (BatchJob): The job to render
+
+    Returns:
+        DocumentResult: The outcome of the job
+    """
+    started = time.perf_counter()
+    leaf_cache = LEAF_CACHE.stats
+    tracer = create_tracer(profile=job.profile, memory_report=job.memory_report)
+    span = tracer.span if tracer else no_span
+
+    try:
+        with tracer or no_span(), span("job"):
+            with span("load"):
+                document = job.load()
+            section_cache = SectionCache(job.cache_dir) if job.cache_dir else None
+            # leaves shared by the documents of the worker are formatted once
+            generator = ResumeContentGenerator(
+                document,
+                section_cache=section_cache,
+                theme=job.theme,
+                tracer=tracer,
+                leaf_cache=LEAF_CACHE,
+            )
+            resume_content = generator.build_resume()
+            with open(job.output, "w", encoding="utf-8") as f:
+                f.write(resume_content)
+        # spans are logged by the worker, they never cross the process boundary
+        if tracer is not None:
+            tracer.report(get_logger("vitagen").bind(document=job.name))
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return DocumentResult(
+            name=job.name,
+            output=job.output,
+            ok=False,
+            seconds=time.perf_counter() - started,
+            error=f"{type(e).__name__}: {e}",
+        )
+
+    return DocumentResult(
+        name=job.name,
+        output=job.output,
+        ok=True,
+        seconds=time.perf_counter() - started,
+        output_bytes=len(resume_content.encode("utf-8")),
+        # the job span closes last and spans the whole document
+        peak_kib=tracer.spans[-1].attrs.get("peak_kib") if tracer else None,
+        leaf_cache=LEAF_CACHE.stats - leaf_cache,
+    )
+
+
+def _init_worker():
+    """Prepare a worker process once, before it renders any document"""
+    configure_logging()
+
+
+def run_batch(
+    source: Union[str, Path],
+    output_dir: Union[str, Path],
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    *,
+    profile: bool = False,
+    memory_report: bool = False,
+    theme: Optional[Theme] = None,
+    resume: bool = False,
+) -> BatchSummary:
+    """
+    Render every document of a batch source.
+
+    Every rendered document is recorded in a checkpoint in the output
+    directory. Resuming skips the documents the checkpoint holds, as long
+    as neither they nor their output changed since, so that an interrupted
+    run picks up where it stopped.
+
+    Args:
+        source (Union[str, Path]): Directory, glob pattern or JSONL file of documents
+        output_dir (Union[str, Path]): Directory the rendered documents are written to
+        workers (Optional[int]): Number of worker processes, defaults to the CPU count.
+            A single worker renders in the current process.
+        cache_dir (Optional[str]): Directory of the persistent section cache
+        profile (bool): Log the timing spans of every document
+        memory_report (bool): Trace the memory of every document and log it with
+            its spans
+        theme (Optional[Theme]): Formatter configuration of every document
+        resume (bool): Skip the documents of the checkpoint of a previous run
+            instead of starting a new checkpoint
+
+    Returns:
+        BatchSummary: Per document results and aggregate timings
+    """
+    logger = get_logger("vitagen")
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = collect_jobs(
+        source,
+        output_dir,
+        cache_dir,
+        profile=profile,
+        memory_report=memory_report,
+        theme=theme,
+    )
+    summary = BatchSummary()
+
+    with Checkpoint(
+        Path(output_dir) / STATE_DIR / CHECKPOINT_FILE, resume
+    ) as checkpoint:
+        # identities are taken before rendering, a document changed meanwhile
+        # is then rendered again by the next run
+        record_ids = {job.name: job.record_id for job in jobs}
+        pending = [
+            job
+            for job in jobs
+            if record_ids[job.name] not in checkpoint or not os.path.isfile(job.output)
+        ]
+        summary.skipped = len(jobs) - len(pending)
+        logger.info(
+            INFO_BATCH_STARTED,
+            total=len(jobs),
+            skipped=summary.skipped,
+            workers=workers,
+        )
+
+        started = time.perf_counter()
+        summary.results = _log_results(
+            _render_jobs(pending, workers), logger, checkpoint, record_ids
+        )
+        summary.wall_seconds = time.perf_counter() - started
+
+    _log_summary(summary, logger)
+    return summary
+
+
+def _log_summary(summary: BatchSummary, logger) -> None:
+    """Log the aggregate outcome of a batch, along with its leaf cache lookups"""
+    leaf_cache = summary.leaf_cache
+    logger.info(
+        INFO_BATCH_COMPLETED,
+        total=len(summary.results),
+        succeeded=summary.succeeded,
+        failed=summary.failed,
+        skipped=summary.skipped,
+        wall_seconds=round(summary.wall_seconds, 4),
+        documents_per_second=round(summary.documents_per_second, 2),
+        output_bytes=sum(result.output_bytes for result in summary.results),
+        leaf_cache_hits=leaf_cache.hits,
+        leaf_cache_misses=leaf_cache.misses,
+        leaf_cache_evictions=leaf_cache.evictions,
+        leaf_cache_hit_rate=round(leaf_cache.hit_rate, 4),
+    )
+
+
+def _render_jobs(jobs: List[BatchJob], workers: int) -> Iterator[DocumentResult]:
+    """Render jobs across a pool of workers, yielding results in job order"""
+    if workers == 1 or len(jobs) <= 1:
+        yield from map(render_job, jobs)
+        return
+
+    # contiguous ranges of records go to the same worker
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        yield from pool.map(render_job, jobs, chunksize=chunksize)
+
+
+def _log_results(
+    results: Iterable[DocumentResult],
+    logger,
+    checkpoint: Checkpoint,
+    record_ids: Dict[str, Optional[str]],
+) -> List[DocumentResult]:
+    """Log and checkpoint every document result as it arrives and collect them"""
+    collected = []
+    for result in results:
+        if result.ok:
+            # a document restored after it went missing renders again next run
+            if record_ids[result.name] is not None:
+                checkpoint.record(record_ids[result.name])
+            logger.info(
+                INFO_BATCH_DOCUMENT_RENDERED,
+                document=result.name,
+                output=result.output,
+                seconds=round(result.seconds, 4),
+                output_bytes=result.output_bytes,
+                **(
+                    {"peak_kib": round(result.peak_kib, 1)}
+                    if result.peak_kib is not None
+                    else {}
+                ),
+            )
+        else:
+            logger.error(
+                ERROR_BATCH_DOCUMENT_FAILED,
+                document=result.name,
+                seconds=round(result.seconds, 4),
+                error=result.error,
+            )
+        collected.append(result)
+
+    return collected
@@ -0,0 +1 @@
+"""Benchmarks for the resume content generator."""
@@ -0,0 +1,104 @@
+"""Benchmark of the JSON decoders installed, on small and very large documents."""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+from functools import partial
+from typing import Dict, Iterable, Optional
+from vitagen.bench.synthetic import SCALES, synthesize
+from vitagen.decoders import Decoder, available_decoders, get_decoder
+from vitagen.generator.model import Resume, parse_resume
+
+__all__ = ["run"]
+
+DEFAULT_SCALES = ("small", "large", "xlarge")
+
+
+def _best_ms(func, number: int, repeat: int) -> float:
+    """Best per call time in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e3
+
+
+def _load(decoder: Decoder, data: bytes) -> Resume:
+    """Decode a document and parse it into the document model"""
+    return parse_resume(decoder(data))
+
+
+def _peak_kib(func) -> float:
+    """Peak memory allocated by a call, in KiB"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run(
+    scales: Optional[Iterable[str]] = None, number: int = 5, repeat: int = 5
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Time every installed decoder on synthetic documents of growing size.
+
+    Documents are decoded from UTF-8 encoded bytes, as they are read from
+    disk, alone and followed by the parse into the document model.
+
+    Args:
+        scales (Optional[Iterable[str]]): Keys of ``SCALES``, defaults to a
+            small, a large and a very large document
+        number (int): Calls per timing
+        repeat (int): Timings per case, the best one is reported
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, float]]]: Per scale and decoder timings in
+            milliseconds, peak memory in KiB and speedup over the standard library
+    """
+    report = {}
+    for scale in scales or DEFAULT_SCALES:
+        data = json.dumps(synthesize(SCALES[scale])).encode("utf-8")
+        expected = json.loads(data)
+
+        report[scale] = {}
+        for name in available_decoders():
+            decoder = get_decoder(name)
+            if decoder(data) != expected:
+                raise AssertionError(f"{name} decodes the {scale} case differently")
+
+            decode = partial(decoder, data)
+            load = partial(_load, decoder, data)
+            report[scale][name] = {
+                "bytes": len(data),
+                "decode_ms": round(_best_ms(decode, number, repeat), 3),
+                "load_ms": round(_best_ms(load, number, repeat), 3),
+                "peak_kib": round(_peak_kib(decode), 1),
+            }
+
+        baseline = report[scale]["json"]["decode_ms"]
+        for timings in report[scale].values():
+            timings["speedup"] = round(baseline / timings["decode_ms"], 2)
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scale",
+        action="append",
+        choices=sorted(SCALES),
+        help="document size, repeatable, defaults to small, large and xlarge",
+    )
+    parser.add_argument("--number", type=int, default=5, help="calls per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per case")
+    args = parser.parse_args()
+
+    for scale_name, results in run(args.scale, args.number, args.repeat).items():
+        for decoder_name, result in results.items():
+            print(
+                f"{scale_name:<8} {decoder_name:<8} {result['bytes']:>9} bytes  "
+                f"decode {result['decode_ms']:>9.3f} ms  "
+                f"load {result['load_ms']:>9.3f} ms  "
+                f"peak {result['peak_kib']:>9.1f} KiB  "
+                f"x{result['speedup']}"
+            )
@@ -0,0 +1,82 @@
+"""Micro benchmark of the LaTeX escaping engine against the legacy implementation."""
+
+import argparse
+import re
+import timeit
+from functools import lru_cache
+from typing import Dict, Optional
+from vitagen.generator.escape import LATEX_SPECIAL_CHARS, escape_latex
+
+__all__ = ["legacy_escape_latex", "run"]
+
+SHORT_TEXT = "Built a VS Code extension: 60% faster onboarding & setup_time < 5 min"
+LONG_TEXT = (SHORT_TEXT + "\n") * 40
+
+
+def legacy_escape_latex(
+    text: str, custom_chars: Optional[Dict[str, str]] = None
+) -> str:
+    """The escaping routine the generator used before the table driven engine"""
+    escape_chars = dict(LATEX_SPECIAL_CHARS)
+
+    @lru_cache(maxsize=1024)
+    def _escape_char(char: str) -> str:
+        return escape_chars.get(char, char)
+
+    if custom_chars:
+        escape_chars.update(custom_chars)
+
+    if len(text) > 1000:
+        pattern = "|".join(map(re.escape, escape_chars.keys()))
+        return re.sub(pattern, lambda m: escape_chars[m.group()], text)
+
+    return "".join(_escape_char(c) for c in text)
+
+
+def _best_of(func, text: str, number: int, repeat: int) -> float:
+    """Best per call time in microseconds"""
+    timings = timeit.repeat(lambda: func(text), number=number, repeat=repeat)
+    return min(timings) / number * 1e6
+
+
+def run(number: int = 2000, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Time the legacy and the table driven escaping on short and long strings.
+
+    Args:
+        number (int): Calls per timing
+        repeat (int): Timings per case, the best one is reported
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per case timings in microseconds and speedup
+    """
+    report = {}
+    for case, text in (("short", SHORT_TEXT), ("long", LONG_TEXT)):
+        if legacy_escape_latex(text) != escape_latex(text):
+            raise AssertionError(f"escaping output differs for the {case} case")
+
+        legacy = _best_of(legacy_escape_latex, text, number, repeat)
+        engine = _best_of(escape_latex, text, number, repeat)
+        report[case] = {
+            "chars": len(text),
+            "legacy_us": round(legacy, 3),
+            "engine_us": round(engine, 3),
+            "speedup": round(legacy / engine, 1),
+        }
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per case")
+    args = parser.parse_args()
+
+    for name, result in run(args.number, args.repeat).items():
+        print(
+            f"{name:<6} {result['chars']:>6} chars  "
+            f"legacy {result['legacy_us']:>9.3f} us  "
+            f"engine {result['engine_us']:>8.3f} us  "
+            f"x{result['speedup']}"
+        )
@@ -0,0 +1,343 @@
+"""Rendering benchmark suite over synthetic resumes of growing size."""
+
+# The generator is imported when the suite runs, so that registering the
+# bench command on the command line parser stays cheap.
+# pylint: disable=import-outside-toplevel
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+from vitagen.bench.synthetic import SCALES, synthesize
+from vitagen.constants import CONFIG_LOG_LEVEL
+
+__all__ = [
+    "ScaleResult",
+    "Regression",
+    "measure_scale",
+    "run",
+    "compare",
+    "load_baseline",
+    "save_baseline",
+    "add_arguments",
+    "main",
+]
+
+DEFAULT_SCALES = ("small", "medium", "large", "single-column")
+
+# relative slowdown or memory growth tolerated before a metric counts as regressed
+DEFAULT_TOLERANCE = 0.25
+
+# seconds every single formatter timing runs for, calls are repeated to fill it
+FORMATTER_TIMING_SECONDS = 0.02
+
+
+@dataclass
+class ScaleResult:
+    """Timings and memory of rendering one synthetic resume"""
+
+    scale: str
+    output_bytes: int
+    parse_ms: float
+    build_ms: float
+    peak_kib: float
+    formatters_us: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def documents_per_second(self) -> float:
+        """Full renders per second"""
+        return 1e3 / self.build_ms if self.build_ms else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        """Generated LaTeX in megabytes per second"""
+        return self.output_bytes / 1e6 * self.documents_per_second
+
+    def metrics(self) -> Dict[str, float]:
+        """Every compared metric, formatters prefixed with their name"""
+        return {
+            "parse_ms": self.parse_ms,
+            "build_ms": self.build_ms,
+            "peak_kib": self.peak_kib,
+            **{f"{name}_us": us for name, us in self.formatters_us.items()},
+        }
+
+
+@dataclass
+class Regression:
+    """A metric that got worse than its baseline beyond the tolerance"""
+
+    scale: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Current value relative to the baseline"""
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def _best_ms(func: Callable[[], Any], repeat: int, number: int = 1) -> float:
+    """Best time of a call in milliseconds out of several timings"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best * 1e3
+
+
+def _time_formatter(func: Callable[[], str], repeat: int) -> float:
+    """Best time of a fast call in microseconds"""
+    started = time.perf_counter()
+    func()
+    single = time.perf_counter() - started
+    number = max(1, int(FORMATTER_TIMING_SECONDS / max(single, 1e-7)))
+    return _best_ms(func, repeat, number) * 1e3
+
+
+def _samples(node: Any, samples: Dict[type, Any]) -> Dict[type, Any]:
+    """Collect the first node of every model type found below a node"""
+    if isinstance(node, tuple):
+        for child in node:
+            _samples(child, samples)
+    elif is_dataclass(node):
+        samples.setdefault(type(node), node)
+        for item in fields(node):
+            _samples(getattr(node, item.name), samples)
+    return samples
+
+
+def _formatter_cases(generator) -> Dict[str, Callable[[], str]]:
+    """One call per formatter, on the first node of the document it renders"""
+    from vitagen.generator.model import (
+        InlineList,
+        ListContent,
+        ParagraphContent,
+        Segment,
+        Subsection,
+        TableContent,
+    )
+
+    logger = generator.logger
+    formatters = {
+        "display_list": (ListContent, lambda n: generator.display_list(n, logger)),
+        "display_table": (TableContent, lambda n: generator.display_table(n, logger)),
+        "display_paragraph": (
+            ParagraphContent,
+            lambda n: generator.display_paragraph(n, logger),
+        ),
+        "display_inline_list": (
+            InlineList,
+            lambda n: generator.display_inline_list(n, logger),
+        ),
+        "process_single_segment": (Segment, generator.process_single_segment),
+        "display_info": (
+            Subsection,
+            lambda n: generator.display_info(n.info_title, same_line=n.info_same_line),
+        ),
+        "display_additional_info": (
+            Subsection,
+            lambda n: generator.display_additional_info(n.location, n.duration),
+        ),
+    }
+
+    samples = _samples(generator.document, {})
+    return {
+        name: partial(formatter, samples[kind])
+        for name, (kind, formatter) in formatters.items()
+        if kind in samples
+    }
+
+
+def measure_scale(scale: str, repeat: int = 5, seed: int = 0) -> ScaleResult:
+    """
+    Benchmark a synthetic resume of a named scale.
+
+    Args:
+        scale (str): Name of the scale, a key of ``SCALES``
+        repeat (int): Timings per measurement, the best one is reported
+        seed (int): Seed of the synthetic document
+
+    Returns:
+        ScaleResult: Timings, throughput and peak memory of the scale
+    """
+    from vitagen.generator.main import ResumeContentGenerator
+    from vitagen.generator.model import parse_resume
+
+    data = synthesize(SCALES[scale], seed)
+    generator = ResumeContentGenerator(data)
+    output = generator.build_resume()
+
+    tracemalloc.start()
+    try:
+        ResumeContentGenerator(data).build_resume()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return ScaleResult(
+        scale=scale,
+        output_bytes=len(output.encode("utf-8")),
+        parse_ms=_best_ms(lambda: parse_resume(data), repeat),
+        build_ms=_best_ms(generator.build_resume, repeat),
+        peak_kib=peak / 1024,
+        formatters_us={
+            name: _time_formatter(func, repeat)
+            for name, func in sorted(_formatter_cases(generator).items())
+        },
+    )
+
+
+def run(scales: Optional[Iterable[str]] = None, repeat: int = 5) -> List[ScaleResult]:
+    """
+    Benchmark every requested scale.
+
+    Args:
+        scales (Optional[Iterable[str]]): Names of the scales, defaults to
+            ``DEFAULT_SCALES``
+        repeat (int): Timings per measurement
+
+    Returns:
+        List[ScaleResult]: One result per scale
+    """
+    return [measure_scale(scale, repeat) for scale in scales or DEFAULT_SCALES]
+
+
+def compare(
+    results: List[ScaleResult],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Regression]:
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (List[ScaleResult]): The current results
+        baseline (Dict[str, Dict[str, float]]): Metrics per scale of a previous run
+        tolerance (float): Relative growth tolerated per metric
+
+    Returns:
+        List[Regression]: The metrics that regressed, scales or metrics missing
+            from the baseline are not compared
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.scale, {})
+        for metric, current in result.metrics().items():
+            if metric in reference and current > reference[metric] * (1 + tolerance):
+                regressions.append(
+                    Regression(result.scale, metric, reference[metric], current)
+                )
+    return regressions
+
+
+def load_baseline(path: Union[str, Path]) -> Dict[str, Dict[str, float]]:
+    """Load the metrics per scale stored by :func:`save_baseline`"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: List[ScaleResult], path: Union[str, Path]) -> None:
+    """Store the metrics per scale of a run as the new baseline"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({result.scale: result.metrics() for result in results}, f, indent=2)
+        f.write("\n")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the benchmark options to a parser"""
+    parser.add_argument(
+        "--scale",
+        action="append",
+        choices=sorted(SCALES),
+        help=f"scale to run, repeatable, defaults to {', '.join(DEFAULT_SCALES)}",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timings per metric")
+    parser.add_argument("--baseline", help="json baseline to compare against")
+    parser.add_argument("--save-baseline", help="store the results as a baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="relative growth of a metric tolerated before failing",
+    )
+    parser.add_argument("--json", action="store_true", help="print a json report")
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="log level of the rendered documents, info events slow rendering down",
+    )
+
+
+def _print_report(results: List[ScaleResult], regressions: List[Regression]) -> None:
+    """Print a human readable report"""
+    for result in results:
+        print(
+            f"{result.scale}: build {result.build_ms:.2f} ms "
+            f"({result.documents_per_second:.1f} docs/s, "
+            f"{result.mb_per_second:.2f} MB/s), parse {result.parse_ms:.2f} ms, "
+            f"peak {result.peak_kib:.0f} KiB, output {result.output_bytes} bytes"
+        )
+        for name, us in result.formatters_us.items():
+            print(f"    {us:>10.2f} us  {name}")
+
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.scale} {regression.metric}: "
+            f"{regression.baseline:.2f} -> {regression.current:.2f} "
+            f"(x{regression.ratio:.2f})"
+        )
+
+
+def main(args: argparse.Namespace) -> int:
+    """Run the suite, fails when a metric regressed against the baseline"""
+    from vitagen.logger.struct_json_logger import configure_logging
+
+    os.environ[CONFIG_LOG_LEVEL] = args.log_level
+    configure_logging()
+
+    results = run(args.scale, args.repeat)
+    regressions = (
+        compare(results, load_baseline(args.baseline), args.tolerance)
+        if args.baseline
+        else []
+    )
+
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+
+    if args.json:
+        report = {
+            "results": [
+                {
+                    **asdict(result),
+                    "documents_per_second": result.documents_per_second,
+                    "mb_per_second": result.mb_per_second,
+                }
+                for result in results
+            ],
+            "regressions": [
+                {**asdict(regression), "ratio": regression.ratio}
+                for regression in regressions
+            ],
+        }
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(results, regressions)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    add_arguments(arg_parser)
+    sys.exit(main(arg_parser.parse_args()))
@@ -0,0 +1,314 @@
+"""Startup benchmark parsing ``python -X importtime`` into a report with budgets."""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+__all__ = [
+    "ImportTiming",
+    "StartupReport",
+    "CliTiming",
+    "CliReport",
+    "measure",
+    "measure_cli",
+    "run",
+    "run_cli",
+]
+
+# best of N cumulative import time budgets in milliseconds, per entry module
+BUDGETS_MS: Dict[str, float] = {
+    # the command line entry point, every mode imports its own modules lazily
+    "vitagen.app": 60.0,
+    # everything needed to render a single document
+    "vitagen.generator.main": 250.0,
+}
+
+# best of N budget in milliseconds of a whole command line render of a small
+# document, from importing the entry point to the written output
+CLI_BUDGET_MS = 300.0
+# of building the parser and parsing the arguments alone, the render imports
+# most of what a costly parser would, so only this budget tells it apart
+CLI_PARSE_BUDGET_MS = 30.0
+
+# run in a fresh interpreter, the arguments are those of the command line
+CLI_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import vitagen.app as app
+imported = time.perf_counter()
+app.parse_args(sys.argv[1:])
+parsed = time.perf_counter()
+app.start()
+done = time.perf_counter()
+print(json.dumps([imported - started, parsed - imported, done - parsed]), file=sys.stderr)
+"""
+
+
+@dataclass
+class ImportTiming:
+    """Import time of a single module"""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+
+
+@dataclass
+class StartupReport:
+    """Best import time of an entry module compared to its budget"""
+
+    module: str
+    cumulative_ms: float
+    budget_ms: float
+    heaviest: List[ImportTiming] = field(default_factory=list)
+
+    @property
+    def within_budget(self) -> bool:
+        """Whether the import stays within its budget"""
+        return self.cumulative_ms <= self.budget_ms
+
+
+@dataclass
+class CliTiming:
+    """Wall time of the phases of a command line render"""
+
+    import_ms: float
+    parse_ms: float
+    render_ms: float
+
+    @property
+    def total_ms(self) -> float:
+        """Time from importing the entry point to the written output"""
+        return self.import_ms + self.parse_ms + self.render_ms
+
+
+@dataclass
+class CliReport:
+    """Best command line render compared to its budget"""
+
+    timing: CliTiming
+    budget_ms: float
+    parse_budget_ms: float
+
+    @property
+    def within_budget(self) -> bool:
+        """Whether the render and the parse stay within their budgets"""
+        return (
+            self.timing.total_ms <= self.budget_ms
+            and self.timing.parse_ms <= self.parse_budget_ms
+        )
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse the stderr output of ``python -X importtime``.
+
+    Args:
+        output (str): The captured stderr
+
+    Returns:
+        List[ImportTiming]: One timing per imported module, in import order
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        timings.append(
+            ImportTiming(
+                module=module.strip(),
+                self_ms=int(self_us) / 1e3,
+                cumulative_ms=int(cumulative_us) / 1e3,
+            )
+        )
+    return timings
+
+
+def measure(module: str, python: Optional[str] = None) -> List[ImportTiming]:
+    """
+    Import a module in a fresh interpreter and collect its import times.
+
+    Args:
+        module (str): The module to import
+        python (Optional[str]): The interpreter to use, defaults to the current one
+
+    Returns:
+        List[ImportTiming]: One timing per imported module
+    """
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_cli(document: str, output: str, python: Optional[str] = None) -> CliTiming:
+    """
+    Render a document from the command line in a fresh interpreter.
+
+    The parser is built and the arguments parsed on their own first, so that
+    a costly parser shows apart from the render. Rendering parses them again
+    from the cached parser.
+
+    Args:
+        document (str): The JSON file to render
+        output (str): The file the document is rendered to
+        python (Optional[str]): The interpreter to use, defaults to the current one
+
+    Returns:
+        CliTiming: The wall time of every phase
+    """
+    result = subprocess.run(
+        [
+            python or sys.executable,
+            "-c",
+            CLI_SCRIPT,
+            "--input",
+            document,
+            "--output",
+            output,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    phases = json.loads(result.stderr.splitlines()[-1])
+    return CliTiming(*(round(seconds * 1e3, 3) for seconds in phases))
+
+
+def run_cli(
+    budget: float = CLI_BUDGET_MS,
+    parse_budget: float = CLI_PARSE_BUDGET_MS,
+    repeat: int = 5,
+) -> CliReport:
+    """
+    Measure the best command line render of a small synthetic document.
+
+    Args:
+        budget (float): Budget of the whole render in milliseconds
+        parse_budget (float): Budget of building the parser and parsing the
+            arguments in milliseconds
+        repeat (int): Fresh interpreters started
+
+    Returns:
+        CliReport: The best render and its budget
+    """
+    from vitagen.bench.synthetic import (  # pylint: disable=import-outside-toplevel
+        SCALES,
+        synthesize,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="vitagen-startup-") as directory:
+        document = os.path.join(directory, "resume.json")
+        with open(document, "w", encoding="utf-8") as f:
+            json.dump(synthesize(SCALES["small"]), f)
+
+        output = os.path.join(directory, "resume.tex")
+        timings = [measure_cli(document, output) for _ in range(repeat)]
+
+    return CliReport(
+        timing=min(timings, key=lambda timing: timing.total_ms),
+        budget_ms=budget,
+        parse_budget_ms=parse_budget,
+    )
+
+
+def run(
+    modules: Optional[Dict[str, float]] = None, repeat: int = 5, top: int = 10
+) -> List[StartupReport]:
+    """
+    Measure the best import time of every entry module out of several runs.
+
+    Args:
+        modules (Optional[Dict[str, float]]): Entry modules and their budgets
+        repeat (int): Fresh interpreters started per module
+        top (int): Number of heaviest imports listed per module
+
+    Returns:
+        List[StartupReport]: One report per entry module
+    """
+    reports = []
+    for module, budget in (modules or BUDGETS_MS).items():
+        best: List[ImportTiming] = []
+        for _ in range(repeat):
+            timings = measure(module)
+            if not best or timings[-1].cumulative_ms < best[-1].cumulative_ms:
+                best = timings
+
+        # the entry module itself is reported last by importtime
+        heaviest = sorted(best[:-1], key=lambda t: t.cumulative_ms, reverse=True)
+        reports.append(
+            StartupReport(
+                module=module,
+                cumulative_ms=best[-1].cumulative_ms,
+                budget_ms=budget,
+                heaviest=heaviest[:top],
+            )
+        )
+    return reports
+
+
+def main() -> int:
+    """Print the startup report, fails when a module exceeds its budget"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per module")
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports shown")
+    parser.add_argument("--json", action="store_true", help="print a json report")
+    args = parser.parse_args()
+
+    reports = run(repeat=args.repeat, top=args.top)
+    cli = run_cli(repeat=args.repeat)
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "imports": [
+                        {**asdict(r), "within_budget": r.within_budget} for r in reports
+                    ],
+                    "cli": {
+                        **asdict(cli),
+                        "total_ms": cli.timing.total_ms,
+                        "within_budget": cli.within_budget,
+                    },
+                },
+                indent=2,
+            )
+        )
+    else:
+        for report in reports:
+            status = "ok" if report.within_budget else "OVER BUDGET"
+            print(
+                f"{report.module}: {report.cumulative_ms:.1f} ms "
+                f"(budget {report.budget_ms:.0f} ms) {status}"
+            )
+            for timing in report.heaviest:
+                print(f"    {timing.cumulative_ms:>8.1f} ms  {timing.module.strip()}")
+
+        status = "ok" if cli.within_budget else "OVER BUDGET"
+        print(
+            f"command line render: {cli.timing.total_ms:.1f} ms "
+            f"(budget {cli.budget_ms:.0f} ms) {status}"
+        )
+        print(
+            f"    import {cli.timing.import_ms:.1f} ms, "
+            f"parse {cli.timing.parse_ms:.1f} ms "
+            f"(budget {cli.parse_budget_ms:.0f} ms), "
+            f"render {cli.timing.render_ms:.1f} ms"
+        )
+
+    within_budget = all(report.within_budget for report in reports)
+    return 0 if within_budget and cli.within_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Synthetic resume documents of controlled size for benchmarking."""
+
+import random
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List
+
+__all__ = ["ResumeShape", "SCALES", "synthesize"]
+
+WORDS = (
+    "designed built scaled migrated led shipped optimized automated reduced "
+    "latency throughput platform service pipeline kubernetes python typescript "
+    "R&D 40% cost_savings #1 $2M C++ node.js p99 <10ms {api} ~3x a|b "
+    "customers teams releases on-call observability caching"
+).split()
+
+STYLES = ({}, {"bold": True}, {"italic": True}, {"bold": True, "underline": True})
+
+
+@dataclass(frozen=True)
+class ResumeShape:
+    """Size of a synthetic resume"""
+
+    sections: int = 4
+    subsections: int = 3
+    list_items: int = 5
+    segments: int = 3
+    table_rows: int = 0
+    # paragraphs longer than 1000 characters take the regex escaping path
+    paragraph_chars: int = 0
+    multi_column: bool = True
+
+
+SCALES: Dict[str, ResumeShape] = {
+    "small": ResumeShape(sections=4, subsections=2, list_items=4, segments=3),
+    "medium": ResumeShape(
+        sections=8, subsections=3, list_items=6, table_rows=5, paragraph_chars=1500
+    ),
+    "large": ResumeShape(
+        sections=24,
+        subsections=6,
+        list_items=10,
+        segments=4,
+        table_rows=20,
+        paragraph_chars=4000,
+    ),
+    "xlarge": ResumeShape(
+        sections=64,
+        subsections=10,
+        list_items=20,
+        segments=5,
+        table_rows=50,
+        paragraph_chars=20000,
+    ),
+}
+SCALES["single-column"] = replace(SCALES["medium"], multi_column=False)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    """A run of random words"""
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _paragraph(rng: random.Random, chars: int) -> str:
+    """A text of at least the given length"""
+    parts: List[str] = []
+    length = 0
+    while length < chars:
+        sentence = _text(rng, 12).capitalize() + ".\n"
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts)
+
+
+def _list_item(rng: random.Random, shape: ResumeShape, index: int) -> Dict[str, Any]:
+    """A list item with styled, partly linked segments"""
+    segments = [
+        {
+            "text": _text(rng, 6),
+            "style": STYLES[(index + i) % len(STYLES)],
+            **({"href": f"https://example.com/{index}/{i}"} if i % 3 == 2 else {}),
+        }
+        for i in range(shape.segments)
+    ]
+    item: Dict[str, Any] = {"segments": segments}
+    if index % 4 == 3:
+        item["inlineList"] = {"items": [_text(rng, 1) for _ in range(6)]}
+    return item
+
+
+def _subsection(rng: random.Random, shape: ResumeShape, index: int) -> Dict[str, Any]:
+    """A subsection with heading, info, metadata and a list"""
+    return {
+        "heading": f"{_text(rng, 2)} {index}",
+        "info": {"title": _text(rng, 3), "sameLine": index % 2 == 0},
+        "metadata": {"location": _text(rng, 2), "duration": "2019 - Present"},
+        "content": {
+            "type": "list",
+            "style": {"showBullets": index % 2 == 0},
+            "items": [_list_item(rng, shape, i) for i in range(shape.list_items)],
+        },
+    }
+
+
+def _section(rng: random.Random, shape: ResumeShape, index: int) -> Dict[str, Any]:
+    """A section with subsections and a table or a long paragraph"""
+    subsections = [_subsection(rng, shape, i) for i in range(shape.subsections)]
+    if shape.paragraph_chars:
+        subsections.append(
+            {
+                "heading": "Summary",
+                "content": {
+                    "type": "paragraph",
+                    "text": _paragraph(rng, shape.paragraph_chars),
+                },
+            }
+        )
+
+    section: Dict[str, Any] = {
+        "heading": f"Section {index}",
+        "column": 2 if shape.multi_column and index % 2 else 1,
+        "subsections": subsections,
+    }
+    if shape.table_rows:
+        section["content"] = {
+            "type": "table",
+            "rows": [
+                [_text(rng, 1), _text(rng, 3), _text(rng, 2)]
+                for _ in range(shape.table_rows)
+            ],
+        }
+    return section
+
+
+def synthesize(shape: ResumeShape, seed: int = 0) -> Dict[str, Any]:
+    """
+    Synthesize a resume document of the given shape.
+
+    Texts are drawn from a vocabulary full of characters LaTeX needs escaped.
+    The same shape and seed always give the same document.
+
+    Args:
+        shape (ResumeShape): The size of the document
+        seed (int): Seed of the text generator
+
+    Returns:
+        Dict[str, Any]: The JSON compatible resume document
+    """
+    rng = random.Random(seed)
+    return {
+        "firstName": "Ada",
+        "middleName": "King",
+        "lastName": "Lovelace",
+        "preset": "carlito",
+        "spacing": "high_dense",
+        "links": [
+            {"href": "mailto:ada@example.com", "text": "ada@example.com"},
+            {"href": "https://example.com", "text": "example.com", "column": 2},
+        ],
+        "resume": {
+            "sections": [_section(rng, shape, i) for i in range(shape.sections)]
+        },
+    }
@@ -5,6 +5,7 @@ ENV_DEVELOPMENT = "development"
 ENV_PRODUCTION = "production"
 ENV_TESTING = "testing"
 ENV_LOG_PRETTY = "LOG_PRETTY"
+ENV_LOG_SUMMARY = "LOG_SUMMARY"
 
 # Configuration constants
 CONFIG_DEBUG = "DEBUG"
@@ -13,6 +14,30 @@ CONFIG_LOG_LEVEL = "LOG_LEVEL"
 
 # Informational messages
 INFO_RESUME_TEX_GENERATED_SUCCESSFULLY = "resume tex generated successfully."
+INFO_BATCH_STARTED = "batch rendering started."
+INFO_BATCH_DOCUMENT_RENDERED = "batch document rendered."
+INFO_BATCH_COMPLETED = "batch rendering completed."
+INFO_WATCH_STARTED = "watching for changes."
+INFO_WATCH_RENDERED = "resume tex regenerated."
+INFO_WATCH_STOPPED = "stopped watching for changes."
+INFO_SERVER_STARTED = "render server started."
+INFO_SERVER_REQUEST = "render request handled."
+INFO_SERVER_STOPPED = "render server stopped."
+INFO_PROFILE_SPAN = "render span finished."
+INFO_PROFILE_TRACE_WRITTEN = "profile trace written."
+INFO_SPACING_SELECTED = "spacing selected from estimated page fill."
+INFO_PDF_BUILT = "resume pdf built."
+INFO_COMPILE_STARTED = "pdf compilation started."
+INFO_COMPILE_DOCUMENT_BUILT = "compiled document pdf built."
+INFO_COMPILE_COMPLETED = "pdf compilation completed."
 
 # Error messages
 ERROR_PROVIDE_A_VALID_JSON_FILE_PATH = "please provide a valid json file path."
+ERROR_BATCH_DOCUMENT_FAILED = "batch document failed."
+ERROR_WATCH_RENDER_FAILED = "resume tex regeneration failed."
+ERROR_SERVER_RENDER_FAILED = "render request failed."
+ERROR_INVALID_THEME_CONFIG = "invalid theme config."
+ERROR_INVALID_VARIANT = "invalid variant."
+ERROR_PDF_BUILD_FAILED = "resume pdf build failed."
+ERROR_COMPILE_DOCUMENT_FAILED = "compiled document failed."
+ERROR_COMPILE_DOCUMENT_CANCELLED = "compiled document cancelled."
@@ -0,0 +1,149 @@
+"""JSON decoders documents are read with, the fastest one installed by default."""
+
+# Backends are optional dependencies, each is imported when it is first picked,
+# so that importing this module stays cheap and never fails.
+# pylint: disable=import-outside-toplevel
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union
+
+__all__ = [
+    "Decoder",
+    "DECODERS",
+    "available_decoders",
+    "get_decoder",
+    "set_decoder",
+    "decode",
+]
+
+# decodes UTF-8 encoded bytes, or text, into JSON values, invalid JSON raises
+# a ValueError whatever the backend
+Decoder = Callable[[Union[bytes, str]], Any]
+
+
+def _stdlib() -> Decoder:
+    """The decoder of the standard library, always available"""
+    import json
+
+    return json.loads
+
+
+def _orjson() -> Decoder:
+    """orjson, decoding bytes without decoding them to text first"""
+    import orjson
+
+    return orjson.loads  # pylint: disable=no-member
+
+
+def _msgspec() -> Decoder:
+    """msgspec, its decode errors raised as ValueError"""
+    import msgspec  # pylint: disable=import-error
+
+    decoder = msgspec.json.Decoder()
+
+    def decode_value(data: Union[bytes, str]) -> Any:
+        """Decode a value, raising decode errors as ValueError"""
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+
+    return decode_value
+
+
+# backends by name, in order of preference
+DECODERS: Dict[str, Callable[[], Decoder]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "json": _stdlib,
+}
+
+
+@dataclass
+class DecoderSettings:
+    """The backend of the process, readable without picking a decoder"""
+
+    # a key of DECODERS, the fastest installed backend when None
+    name: Optional[str] = None
+
+
+settings = DecoderSettings()
+
+
+@lru_cache(maxsize=None)
+def _load(name: str) -> Optional[Decoder]:
+    """The decoder of a backend, None if it is not installed"""
+    try:
+        return DECODERS[name]()
+    except ImportError:
+        return None
+
+
+def available_decoders() -> List[str]:
+    """Names of the installed backends, in order of preference"""
+    return [name for name in DECODERS if _load(name) is not None]
+
+
+@lru_cache(maxsize=1)
+def _fastest() -> Decoder:
+    """The decoder of the first installed backend"""
+    return _load(available_decoders()[0])
+
+
+def get_decoder(name: Optional[str] = None) -> Decoder:
+    """
+    Get the decoder of a backend.
+
+    Args:
+        name (Optional[str]): A key of ``DECODERS``, defaults to the backend
+            picked by ``set_decoder``, else to the fastest installed one
+
+    Returns:
+        Decoder: The decoder
+
+    Raises:
+        ValueError: If no backend has the name or it is not installed
+    """
+    name = name or settings.name
+    if name is None:
+        return _fastest()
+    if name not in DECODERS:
+        raise ValueError(
+            f"unknown json decoder '{name}', expected one of {list(DECODERS)}"
+        )
+    if (decoder := _load(name)) is None:
+        raise ValueError(f"json decoder '{name}' is not installed")
+    return decoder
+
+
+def set_decoder(name: Optional[str]) -> None:
+    """
+    Pick the backend every document of the process is decoded with.
+
+    Args:
+        name (Optional[str]): A key of ``DECODERS``, None picks the fastest
+            installed one
+
+    Raises:
+        ValueError: If no backend has the name or it is not installed
+    """
+    if name is not None:
+        get_decoder(name)
+    settings.name = name
+
+
+def decode(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON value with the picked backend.
+
+    Args:
+        data (Union[bytes, str]): UTF-8 encoded JSON, or JSON text
+
+    Returns:
+        Any: The decoded value
+
+    Raises:
+        ValueError: If the data is not valid JSON
+    """
+    return get_decoder()(data)
@@ -0,0 +1,296 @@
+"""Persistent content hash cache for rendered resume sections."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+from vitagen.utils import write_atomic
+
+__all__ = [
+    "SectionCache",
+    "SectionCacheEntry",
+    "SectionCacheReport",
+    "FragmentMemo",
+    "FRAGMENT_MEMO",
+    "LeafCacheStats",
+    "LeafCache",
+    "LEAF_CACHE",
+]
+
+# bump to invalidate every cached fragment regardless of the renderer sources
+CACHE_FORMAT_VERSION = "1"
+
+# configs a leaf cache keeps alive, themes share theirs across documents so
+# going beyond means configs are built per document
+MAX_LEAF_CONFIGS = 64
+
+
+@lru_cache(maxsize=1)
+def renderer_fingerprint() -> str:
+    """
+    Hash the sources of the generator package.
+
+    Any change to the rendering code therefore invalidates previously cached
+    fragments without having to remember to bump a version.
+
+    Returns:
+        str: Hex digest of every python source of the generator package
+    """
+    digest = hashlib.sha256(CACHE_FORMAT_VERSION.encode("utf-8"))
+    for path in sorted(Path(__file__).parent.rglob("*.py")):
+        digest.update(path.relative_to(Path(__file__).parent).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class SectionCacheEntry:
+    """Cache outcome of a single section"""
+
+    heading: str
+    key: str
+    hit: bool
+
+
+@dataclass
+class SectionCacheReport:
+    """Hits and misses of the sections rendered with a cache"""
+
+    entries: List[SectionCacheEntry] = field(default_factory=list)
+
+    @property
+    def hits(self) -> int:
+        """Number of sections served from the cache"""
+        return sum(1 for entry in self.entries if entry.hit)
+
+    @property
+    def misses(self) -> int:
+        """Number of sections that had to be rendered"""
+        return len(self.entries) - self.hits
+
+
+class SectionCache:
+    """
+    On disk cache of rendered section fragments keyed by content hash.
+
+    The key covers the section subtree, the global settings that affect its
+    rendering and the renderer sources, so a cached fragment is only reused
+    when rendering it again would produce the very same output.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.report = SectionCacheReport()
+
+    def key_for(self, section: Dict[str, Any], settings: Dict[str, Any]) -> str:
+        """
+        Compute the cache key of a section.
+
+        Args:
+            section (Dict[str, Any]): The section subtree of the input document
+            settings (Dict[str, Any]): Global settings affecting the section
+
+        Returns:
+            str: Hex digest identifying the rendered fragment
+        """
+        payload = json.dumps(
+            {
+                "renderer": renderer_fingerprint(),
+                "settings": settings,
+                "section": section,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        """Get the path of the fragment stored under a key"""
+        return self.directory / key[:2] / f"{key}.tex"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached fragment.
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            Optional[str]: The cached fragment or None if it is not cached or
+                cannot be read, rendering the section again overwrites it
+        """
+        try:
+            with open(self.path_for(key), "r", encoding="utf-8", newline="") as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def put(self, key: str, fragment: str) -> None:
+        """
+        Store a fragment atomically, concurrent writers never expose partial files.
+
+        Args:
+            key (str): The cache key
+            fragment (str): The rendered fragment
+        """
+        write_atomic(self.path_for(key), fragment)
+
+    def record(self, heading: str, key: str, hit: bool) -> None:
+        """Record the cache outcome of a section in the report"""
+        self.report.entries.append(SectionCacheEntry(heading=heading, key=key, hit=hit))
+
+
+class FragmentMemo:
+    """
+    In memory memo of the fragments rendered from shared document parts,
+    keyed by their content hash and kept across documents.
+
+    An entry is only served for a node equal to the one it was rendered
+    from, so that a content hash written by hand never serves the fragment
+    of another node. The oldest entry is dropped once ``max_entries`` are
+    kept.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: Dict[Hashable, Tuple[Any, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, node: Any) -> Optional[str]:
+        """
+        Get the fragment rendered from a node.
+
+        Args:
+            key (Hashable): The content hash of the node and the settings it
+                was rendered with
+            node (Any): The node to render
+
+        Returns:
+            Optional[str]: The fragment or None if it was not rendered yet
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != node:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, node: Any, fragment: str) -> None:
+        """Keep the fragment rendered from a node"""
+        if len(self.entries) >= self.max_entries and key not in self.entries:
+            self.entries.pop(next(iter(self.entries), None), None)
+        self.entries[key] = (node, fragment)
+
+
+# shared by every document rendered by the process, e.g. by a batch worker
+FRAGMENT_MEMO = FragmentMemo()
+
+
+@dataclass(frozen=True, slots=True)
+class LeafCacheStats:
+    """Counters of a leaf cache, subtracted to get those of a single render"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def __add__(self, other: "LeafCacheStats") -> "LeafCacheStats":
+        return LeafCacheStats(
+            self.hits + other.hits,
+            self.misses + other.misses,
+            self.evictions + other.evictions,
+        )
+
+    def __sub__(self, other: "LeafCacheStats") -> "LeafCacheStats":
+        return LeafCacheStats(
+            self.hits - other.hits,
+            self.misses - other.misses,
+            self.evictions - other.evictions,
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LeafCache:
+    """
+    Bounded LRU cache of the fragments of leaf formatters, e.g. segments,
+    inline lists and subsection headings, kept across documents.
+
+    Keys hold the exact input of a formatter along with the identity of its
+    config. Configs are not all hashable, so every config a fragment was
+    rendered with is kept alive by the cache, its identity is then never
+    reused by another config while it is part of a key. The least recently
+    used entry is dropped once ``max_entries`` are kept, every entry is
+    dropped once more than ``MAX_LEAF_CONFIGS`` configs are kept.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.configs: Dict[int, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # generators of a thread pool share the cache of their process
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        Get a fragment, marking it as the most recently used.
+
+        Args:
+            key (Hashable): The input of the formatter and the identity of
+                its config
+
+        Returns:
+            Optional[str]: The fragment or None if it is not cached
+        """
+        with self.lock:
+            fragment = self.entries.get(key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+    def put(self, key: Hashable, config: Any, fragment: str) -> None:
+        """Keep a fragment, along with the config its key holds the identity of"""
+        with self.lock:
+            if id(config) not in self.configs:
+                if len(self.configs) >= MAX_LEAF_CONFIGS:
+                    self.evictions += len(self.entries)
+                    self.entries.clear()
+                    self.configs.clear()
+                self.configs[id(config)] = config
+
+            self.entries[key] = fragment
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    @property
+    def stats(self) -> LeafCacheStats:
+        """Hits, misses and evictions since the cache was created"""
+        return LeafCacheStats(self.hits, self.misses, self.evictions)
+
+    def clear(self) -> None:
+        """Forget every fragment and config, counters are kept"""
+        with self.lock:
+            self.entries.clear()
+            self.configs.clear()
+
+
+# shared by every document rendered by the process, e.g. by a batch worker
+LEAF_CACHE = LeafCache()
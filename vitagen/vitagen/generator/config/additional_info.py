@@ -5,7 +5,7 @@ from dataclasses import dataclass
 __all = ["AdditionalInfoConfig"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AdditionalInfoConfig:
     """Configuration for additional info formatting"""
 
@@ -23,7 +23,7 @@ class ColumnType(Enum):
     MULTI = 2
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LatexEnvironment:
     """LaTeX environment configuration"""
 
@@ -50,7 +50,7 @@ class TextStyle(Enum):
     UNDERLINE = "underline"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StyleConfig:
     """Configuration for text styling"""
 
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 __all__ = ["LatexColumn"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LatexColumn:
     """Data class for LaTeX column configuration"""
 
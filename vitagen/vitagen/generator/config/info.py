@@ -6,7 +6,7 @@ from vitagen.generator.config.base import DisplayMode
 __all__ = ["InfoFormatConfig"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class InfoFormatConfig:
     """Configuration for info text formatting"""
 
@@ -13,7 +13,7 @@ class ListStyle(Enum):
     NO_BULLET = "tightnopoints"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ListFormatConfig:
     """Configuration for list formatting"""
 
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 __all__ = ["MetadataConfig"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MetadataConfig:
     """Configuration for metadata display"""
 
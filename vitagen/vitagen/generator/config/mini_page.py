@@ -6,7 +6,7 @@ from vitagen.generator.config.base import LatexEnvironment
 ___all__ = ["MinipageConfig"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MinipageConfig:
     """Configuration for minipage environment"""
 
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 __all__ = ["ParagraphConfig"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParagraphConfig:
     """Configuration for paragraph formatting"""
 
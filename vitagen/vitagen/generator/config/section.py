@@ -4,11 +4,10 @@ from dataclasses import dataclass, field
 from vitagen.generator.config.base import LatexEnvironment
 from vitagen.generator.config.mini_page import MinipageConfig
 
-
 __all__ = ["SectionConfig"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SectionConfig:
     """Configuration for section formatting"""
 
@@ -25,14 +25,18 @@ class SpacingModel(Enum):
     SPACIOUS = 1.4  # Maximum readability
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LatexScalingFactor:
     """Data class for LaTeX scaling modifier configuration"""
 
     begin: str = "\\begin{scalingfactor}{spacing_here}\n\\begingroup"
     end: str = "\\endgroup\n\\end{scalingfactor}"
 
+    def get_begin(self, spacing: int) -> str:
+        """Get the opening size modifier tags for a spacing"""
+        return self.begin.replace("spacing_here", str(spacing))
+
     def wrap(self, content: str, spacing: int) -> List[str]:
         """Wrap content with size modifier tags"""
 
-        return [self.begin.replace("spacing_here", str(spacing)), content, self.end]
+        return [self.get_begin(spacing), content, self.end]
@@ -1,12 +1,15 @@
 """Sub section configuration."""
 
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from vitagen.generator.model import Section
 
 __all__ = ["SubsectionConfig", "SubsectionElements"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SubsectionConfig:
     """Configuration for subsection formatting"""
 
@@ -17,12 +20,16 @@ class SubsectionConfig:
     multicol_end: str = "\\end{multicols}"
     default_columns: int = 1
 
-    def get_column_settings(self, section: Dict[str, Any]) -> int:
-        """Get column settings with default"""
-        return section.get("columnSettings", self.default_columns)
+    def get_column_settings(self, section: Union[Dict[str, Any], "Section"]) -> int:
+        """Get column settings with default, of a parsed or a raw JSON section"""
+        if isinstance(section, dict):
+            columns = section.get("columnSettings")
+        else:
+            columns = section.column_settings
+        return self.default_columns if columns is None else columns
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SubsectionElements:
     """Configuration for subsection elements"""
 
@@ -1,13 +1,13 @@
 """Configuration for table formatting"""
 
 from dataclasses import dataclass
-from typing import List
+from typing import Iterable, Iterator, List, Sequence
 
 __all__ = ["TableConfig"]
 
 
-@dataclass
-class TableConfig:
+@dataclass(frozen=True, slots=True)
+class TableConfig:  # pylint: disable=too-many-instance-attributes
     """Configuration for table formatting"""
 
     environment: str = "tabular"
@@ -17,6 +17,8 @@ class TableConfig:
     row_end: str = " \\\\"
     begin: str = "\\begin{tabular}{rll}"
     end: str = "\\end{tabular}"
+    # between the environments of a table split into chunks of rows
+    chunk_separator: str = "%\n\\par\n"
 
     def wrap_in_environment(self, content: str) -> str:
         """Wrap content in LaTeX environment"""
@@ -32,3 +34,33 @@ class TableConfig:
         return self.row_separator.join(
             self.format_row(row, escape_latex) for row in rows
         )
+
+    def iter_table(
+        self,
+        rows: Iterable[Sequence[str]],
+        escape_latex: callable,
+        chunk_rows: int = 0,
+    ) -> Iterator[str]:
+        """
+        Format rows lazily, a row at a time, into environments of at most
+        ``chunk_rows`` rows each, or into a single one without a chunk size.
+
+        A single environment is formatted as ``wrap_in_environment`` formats
+        the output of ``format_table``, no rows format nothing.
+        """
+        count = chunks = 0
+        for row in rows:
+            if count == 0:
+                yield f"{self.chunk_separator if chunks else ''}{self.begin}%\n"
+                chunks += 1
+            else:
+                yield self.row_separator
+            yield self.format_row(row, escape_latex)
+
+            count += 1
+            if count == chunk_rows:
+                yield f"%\n{self.end}"
+                count = 0
+
+        if count:
+            yield f"%\n{self.end}"
@@ -0,0 +1,175 @@
+"""Theme configuration, one shared instance of every formatter configuration."""
+
+import hashlib
+import json
+from dataclasses import dataclass, field, fields, is_dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Union
+from vitagen.generator.config.additional_info import AdditionalInfoConfig
+from vitagen.generator.config.base import StyleConfig, TextStyle
+from vitagen.generator.config.column import LatexColumn
+from vitagen.generator.config.info import InfoFormatConfig
+from vitagen.generator.config.inline_list_content import InlineListConfig
+from vitagen.generator.config.list_content import ListFormatConfig
+from vitagen.generator.config.paragraph_content import ParagraphConfig
+from vitagen.generator.config.section import SectionConfig
+from vitagen.generator.config.spacing_factor import LatexScalingFactor
+from vitagen.generator.config.sub_section import SubsectionConfig, SubsectionElements
+from vitagen.generator.config.table_content import TableConfig
+
+__all__ = [
+    "ThemeError",
+    "Theme",
+    "DEFAULT_THEME",
+    "parse_theme",
+    "load_theme",
+    "theme_digest",
+]
+
+ROOT_PATH = "$"
+
+
+class ThemeError(ValueError):
+    """Raised when a theme configuration does not match the formatter configs"""
+
+    def __init__(self, path: str, message: str):
+        super().__init__(f"{path}: {message}")
+        self.path = path
+        self.message = message
+
+
+@dataclass(frozen=True, slots=True)
+class Theme:  # pylint: disable=too-many-instance-attributes
+    """Formatter configurations of a generator, built once and shared"""
+
+    section: SectionConfig = field(default_factory=SectionConfig)
+    subsection: SubsectionConfig = field(default_factory=SubsectionConfig)
+    subsection_elements: SubsectionElements = field(default_factory=SubsectionElements)
+    info: InfoFormatConfig = field(default_factory=InfoFormatConfig)
+    additional_info: AdditionalInfoConfig = field(default_factory=AdditionalInfoConfig)
+    table: TableConfig = field(default_factory=TableConfig)
+    list_format: ListFormatConfig = field(default_factory=ListFormatConfig)
+    inline_list: InlineListConfig = field(default_factory=InlineListConfig)
+    paragraph: ParagraphConfig = field(default_factory=ParagraphConfig)
+    style: StyleConfig = field(default_factory=StyleConfig)
+    column: LatexColumn = field(default_factory=LatexColumn)
+    scaling_factor: LatexScalingFactor = field(default_factory=LatexScalingFactor)
+
+
+DEFAULT_THEME = Theme()
+
+
+def _camel(name: str) -> str:
+    """JSON key of a config field, e.g. ``title_format`` -> ``titleFormat``"""
+    head, *tail = name.split("_")
+    return head + "".join(part.capitalize() for part in tail)
+
+
+def _styles(current: Dict[TextStyle, str], value: Any, path: str) -> Dict:
+    """Override the commands of text styles"""
+    if not isinstance(value, dict):
+        raise ThemeError(path, "must be an object")
+
+    styles = {style.value: style for style in TextStyle}
+    commands = dict(current)
+    for key, command in value.items():
+        if key not in styles:
+            raise ThemeError(f"{path}.{key}", "unknown text style")
+        if not isinstance(command, str):
+            raise ThemeError(f"{path}.{key}", "must be a string")
+        commands[styles[key]] = command
+
+    return commands
+
+
+def _coerce(current: Any, value: Any, path: str) -> Any:
+    """Validate an override against the type of the setting it replaces"""
+    if is_dataclass(current):
+        return _override(current, value, path)
+
+    if isinstance(current, dict):
+        return _styles(current, value, path)
+
+    if isinstance(current, tuple):
+        if not isinstance(value, list) or len(value) != len(current):
+            raise ThemeError(path, f"must be an array of {len(current)} strings")
+        if not all(isinstance(item, str) for item in value):
+            raise ThemeError(path, f"must be an array of {len(current)} strings")
+        return tuple(value)
+
+    # bool is an int, but no setting is a flag
+    if isinstance(value, bool):
+        raise ThemeError(path, f"must be a {type(current).__name__}")
+    if isinstance(current, float) and isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, type(current)):
+        raise ThemeError(path, f"must be a {type(current).__name__}")
+
+    return value
+
+
+def _override(config: Any, overrides: Any, path: str) -> Any:
+    """Copy a frozen config with the settings of an object replaced"""
+    if not isinstance(overrides, dict):
+        raise ThemeError(path, "must be an object")
+
+    settings = {_camel(item.name): item.name for item in fields(config)}
+    changes = {}
+    for key, value in overrides.items():
+        if key not in settings:
+            raise ThemeError(f"{path}.{key}", "unknown setting")
+        name = settings[key]
+        changes[name] = _coerce(getattr(config, name), value, f"{path}.{key}")
+
+    return replace(config, **changes)
+
+
+def parse_theme(data: Dict[str, Any]) -> Theme:
+    """
+    Build a theme from the overrides of a theme configuration.
+
+    Keys are the camel cased names of the formatter configs and their
+    settings, every setting left out keeps its default.
+
+    Args:
+        data (Dict[str, Any]): The decoded theme configuration
+
+    Returns:
+        Theme: The default theme with the overrides applied
+
+    Raises:
+        ThemeError: If a key is unknown or a value has the wrong type
+
+    Examples:
+        >>> theme = parse_theme({"section": {"titleFormat": "\\\\section{{{}}}"}})
+        >>> theme.section.title_format
+        '\\\\section{{{}}}'
+    """
+    return _override(DEFAULT_THEME, data, ROOT_PATH)
+
+
+def load_theme(path: Union[str, Path]) -> Theme:
+    """
+    Load and validate a theme configuration from a JSON file.
+
+    Args:
+        path (Union[str, Path]): Path to the JSON file
+
+    Returns:
+        Theme: The validated theme
+
+    Raises:
+        ThemeError: If the file is not valid JSON or not a valid theme
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ThemeError(ROOT_PATH, f"invalid json: {e}") from e
+
+    return parse_theme(data)
+
+
+def theme_digest(theme: Theme) -> str:
+    """Short digest of a theme, changes whenever any setting changes"""
+    return hashlib.sha256(repr(theme).encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,185 @@
+"""Table driven LaTeX escaping engine."""
+
+import re
+from functools import lru_cache
+from typing import Dict, Final, Optional, Tuple
+
+__all__ = [
+    "LATEX_SPECIAL_CHARS",
+    "UNICODE_CHARS",
+    "LatexEscaper",
+    "get_escaper",
+    "escape_latex",
+]
+
+# texts longer than this switch to a single regex pass for multi character keys
+LONG_TEXT_THRESHOLD: Final[int] = 1000
+
+# texts longer than this are escaped with a replace chain instead of a table
+CHAIN_THRESHOLD: Final[int] = 128
+
+# first private use code point used to park characters during a replace chain
+PLACEHOLDER_START: Final[int] = 0xE000
+
+LATEX_SPECIAL_CHARS: Final[Dict[str, str]] = {
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    # "-": r"\-",
+    "{": r"\{",
+    "}": r"\}",
+    " ": r"{\space}",
+    ":": r"\:",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+    "\\": r"\textbackslash{}",
+    "|": r"\textbar{}",
+    "<": r"\textless{}",
+    ">": r"\textgreater{}",
+    "'": r"'",
+    "`": r"`",
+    '"': r"''",
+    "\n": r"\newline ",
+    "\t": r"\quad ",
+}
+
+# optional typographic replacements for unicode punctuation
+UNICODE_CHARS: Final[Dict[str, str]] = {
+    "\u2018": "`",  # left single quote
+    "\u2019": "'",  # right single quote
+    "\u201c": "``",  # left double quote
+    "\u201d": "''",  # right double quote
+    "\u2013": "--",  # en dash
+    "\u2014": "---",  # em dash
+    "\u2026": r"\ldots{}",  # ellipsis
+    "\u00a0": "~",  # non breaking space
+}
+
+
+class LatexEscaper:  # pylint: disable=too-few-public-methods
+    """
+    A compiled escaping variant for one character mapping.
+
+    Short texts go through a precompiled translation table indexed by code point,
+    longer ones through a fixed chain of ``str.replace`` calls which stays in C
+    for the whole text. Characters that also occur inside replacements are parked
+    on private use placeholders first, so no replacement is ever escaped twice.
+
+    Keys spanning several characters only take effect on texts longer than
+    ``LONG_TEXT_THRESHOLD``, through a precompiled alternation, mirroring the
+    behaviour the generator has always had.
+    """
+
+    __slots__ = ("mapping", "table", "pattern", "steps", "placeholders")
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping = mapping
+        chars = {k: v for k, v in mapping.items() if len(k) == 1 and k != v}
+
+        # a list table avoids a failing dict lookup for every plain character
+        self.table = [chr(i) for i in range(max([255, *map(ord, chars)]) + 1)]
+        for char, replacement in chars.items():
+            self.table[ord(char)] = replacement
+
+        self.pattern = (
+            re.compile("|".join(map(re.escape, mapping)))
+            if any(len(k) != 1 for k in mapping)
+            else None
+        )
+
+        # characters that occur inside a replacement must be replaced last
+        produced = set("".join(chars.values()))
+        parked = {
+            char: chr(PLACEHOLDER_START + i)
+            for i, char in enumerate(c for c in chars if c in produced)
+        }
+        self.placeholders = tuple(parked.values())
+        self.steps = (
+            *parked.items(),
+            *((k, v) for k, v in chars.items() if k not in parked),
+            *((placeholder, chars[char]) for char, placeholder in parked.items()),
+        )
+
+    def escape(self, text: str) -> str:
+        """
+        Escape special LaTeX characters in text.
+
+        Args:
+            text (str): Input text to escape
+
+        Returns:
+            str: Text with LaTeX special characters escaped
+        """
+        if len(text) <= CHAIN_THRESHOLD:
+            return text.translate(self.table)
+
+        if self.pattern is not None and len(text) > LONG_TEXT_THRESHOLD:
+            return self.pattern.sub(lambda m: self.mapping[m.group()], text)
+
+        if any(placeholder in text for placeholder in self.placeholders):
+            return text.translate(self.table)
+
+        for char, replacement in self.steps:
+            text = text.replace(char, replacement)
+        return text
+
+
+@lru_cache(maxsize=128)
+def _compile(custom_items: Tuple[Tuple[str, str], ...], unicode: bool) -> LatexEscaper:
+    """Compile and cache the escaper for a distinct custom mapping"""
+    mapping = dict(UNICODE_CHARS) if unicode else {}
+    mapping.update(LATEX_SPECIAL_CHARS)
+    mapping.update(custom_items)
+    return LatexEscaper(mapping)
+
+
+DEFAULT_ESCAPER: Final[LatexEscaper] = _compile((), False)
+
+
+def get_escaper(
+    custom_chars: Optional[Dict[str, str]] = None, unicode: bool = False
+) -> LatexEscaper:
+    """
+    Get the compiled escaper for a custom mapping.
+
+    Args:
+        custom_chars (Optional[Dict[str, str]]): Optional custom character mappings
+        unicode (bool): Whether to also replace unicode punctuation
+
+    Returns:
+        LatexEscaper: The compiled escaper, shared by every identical mapping
+    """
+    if not custom_chars and not unicode:
+        return DEFAULT_ESCAPER
+
+    return _compile(tuple(custom_chars.items()) if custom_chars else (), unicode)
+
+
+def escape_latex(
+    text: str, custom_chars: Optional[Dict[str, str]] = None, unicode: bool = False
+) -> str:
+    r"""
+    Escape special LaTeX characters in text.
+
+    Args:
+        text (str): Input text to escape
+        custom_chars (Optional[Dict[str, str]]): Optional custom character mappings
+        unicode (bool): Whether to also replace unicode punctuation
+
+    Returns:
+        str: Text with LaTeX special characters escaped
+
+    Examples:
+        >>> escape_latex("R&D_100%")
+        'R\\&D\\_100\\%'
+        >>> escape_latex("$50", {"$": "USD"})
+        'USD50'
+        >>> escape_latex("2019\u20132021", unicode=True)
+        '2019--2021'
+    """
+    if not custom_chars and not unicode:
+        return DEFAULT_ESCAPER.escape(text)
+
+    return get_escaper(custom_chars, unicode).escape(text)
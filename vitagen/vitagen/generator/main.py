@@ -1,11 +1,17 @@
 # pylint: disable=too-many-lines
 """Main module for resume content generation."""  # noqa: D301
 
-import re
-from functools import lru_cache, reduce
-from itertools import groupby
+import io
+import logging
+import time
+from collections import Counter
+from dataclasses import replace
+from functools import reduce
+from itertools import chain, groupby
 from operator import itemgetter
-from typing import Any, Dict, List, Optional, Union, Final, Set, Iterator
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from typing import TextIO
+from typing import TYPE_CHECKING
 from structlog import BoundLogger
 from vitagen.generator.config.base import (
     StyleConfig,
@@ -13,7 +19,7 @@ from vitagen.generator.config.base import (
     DisplayMode,
     TextStyle,
 )
-from vitagen.generator.config.content_base import ContentType, ContentFormatters
+from vitagen.generator.config.content_base import ContentFormatters
 from vitagen.generator.config.inline_list_content import InlineListConfig
 from vitagen.generator.config.paragraph_content import ParagraphConfig
 from vitagen.generator.config.table_content import TableConfig
@@ -22,19 +28,103 @@ from vitagen.generator.config.section import SectionConfig
 from vitagen.generator.config.sub_section import SubsectionConfig, SubsectionElements
 from vitagen.generator.config.additional_info import AdditionalInfoConfig
 from vitagen.generator.config.info import InfoFormatConfig
-from vitagen.generator.config.spacing_factor import SpacingModel, LatexScalingFactor
-from vitagen.generator.config.column import LatexColumn
-from vitagen.logger.struct_json_logger import get_logger
+from vitagen.generator.cache import FRAGMENT_MEMO, FragmentMemo, LeafCache
+from vitagen.generator.config.theme import DEFAULT_THEME, Theme, theme_digest
+from vitagen.generator.escape import get_escaper
+from vitagen.generator.paths import compile_path
+from vitagen.generator.sources import (
+    StreamingSink,
+    check_sources,
+    has_sources,
+    iter_lines,
+    list_items,
+    table_rows,
+)
+from vitagen.generator.model import (
+    Content,
+    InlineList,
+    Link,
+    ListContent,
+    ListItem,
+    ParagraphContent,
+    Resume,
+    Section,
+    Segment,
+    Subsection,
+    TableContent,
+    dump,
+    to_document,
+    parse_resume,
+)
+from vitagen.logger.struct_json_logger import (
+    get_logger,
+    is_enabled_for,
+    is_summary_mode,
+)
+from vitagen.profiling import TimedEscaper, no_span
+
+if TYPE_CHECKING:
+    from vitagen.generator.cache import SectionCache
+    from vitagen.profiling import SpanTracer
 
 __all__ = ["ResumeContentGenerator"]
 
 
-class ResumeContentGenerator:
+class ResumeContentGenerator:  # pylint: disable=R0902,R0904
     """Convert JSON data to LaTeX resume content."""
 
-    def __init__(self, json_data: Dict[str, Any]):
-        self.data = json_data
+    def __init__(
+        self,
+        json_data: Union[Dict[str, Any], Resume],
+        unicode_escapes: bool = False,
+        section_cache: Optional["SectionCache"] = None,
+        *,
+        theme: Optional[Theme] = None,
+        tracer: Optional["SpanTracer"] = None,
+        leaf_cache: Optional[LeafCache] = None,
+    ):
+        # an already parsed document is rendered as is, raw JSON is parsed once
+        if isinstance(json_data, Resume):
+            self.document = json_data
+        else:
+            self.document = parse_resume(json_data)
+        # sources are only read while rendering, missing ones fail up front
+        check_sources(self.document)
+        self.unicode_escapes = unicode_escapes
+        self.section_cache = section_cache
+        # formatter configs, shared by every call instead of built per call
+        self.theme = theme or DEFAULT_THEME
+        self.escaper = get_escaper(unicode=unicode_escapes)
         self.logger = get_logger("vitagen")
+
+        # profiling spans, a shared no-op context when not profiling
+        self.tracer = tracer
+        self.span = no_span
+        if tracer is not None:
+            self.span = tracer.span
+            self.escaper = TimedEscaper(self.escaper, tracer)
+
+        # decided once, filtered events then cost neither binds nor kwargs
+        summary = is_summary_mode()
+        self.log_info = is_enabled_for(logging.INFO)
+        self.log_items = self.log_info and not summary
+        self.log_warnings = is_enabled_for(logging.WARNING)
+        self.log_context = self.log_items or self.log_warnings
+        self.summarize = self.log_info and summary
+        self.section_stats: Optional[Counter] = None
+
+        # fragments shared across renders of variants of the same document
+        self.shared_fragments: Optional[Dict[Any, Any]] = None
+        # sink streaming content of external sources while sections are written
+        self.stream_sink: Optional[StreamingSink] = None
+        # fragments of parts included from shared files, kept across documents
+        self.fragment_memo: Optional[FragmentMemo] = FRAGMENT_MEMO
+        self.fragment_settings: Optional[tuple] = None
+        # fragments of leaf formatters, shared across documents when given
+        self.leaf_cache = leaf_cache
+        # the document in its JSON shape, built by the first value lookup
+        self.values: Optional[Dict[str, Any]] = None
+
         self.space_separator = "\\space"
         self.section_seperator = "\\sectionseperator"
         self.formatters = ContentFormatters(
@@ -44,7 +134,8 @@ class ResumeContentGenerator:
             table_formatter=self.display_table,
         )
 
-        self.logger.info("resume content generator initialized.")
+        if self.log_info:
+            self.logger.info("resume content generator initialized.")
 
     def escape_latex(
         self, text: str, custom_chars: dict[str, str] | None = None
@@ -65,48 +156,10 @@ class ResumeContentGenerator:
             >>> escape_latex("Cost: $50", {"$": "USD"})
             'Cost: USD50'
         """
-        # Define special characters as a constant
-        latex_special_chars: Final[dict[str, str]] = {
-            "&": r"\&",
-            "%": r"\%",
-            "$": r"\$",
-            "#": r"\#",
-            "_": r"\_",
-            # "-": r"\-",
-            "{": r"\{",
-            "}": r"\}",
-            " ": r"{\space}",
-            ":": r"\:",
-            "~": r"\textasciitilde{}",
-            "^": r"\textasciicircum{}",
-            "\\": r"\textbackslash{}",  # Added backslash escape
-            "|": r"\textbar{}",  # Added vertical bar escape
-            "<": r"\textless{}",  # Added less than escape
-            ">": r"\textgreater{}",  # Added greater than escape
-            "'": r"'",  # Added smart quotes
-            "`": r"`",  # Added backtick escape
-            '"': r"''",  # Added double quote escape
-            "\n": r"\newline ",  # Added newline handling
-            "\t": r"\quad ",  # Added tab handling
-        }
-
-        @lru_cache(maxsize=1024)
-        def _escape_char(char: str) -> str:
-            """Cache frequently used character replacements."""
-            return escape_chars.get(char, char)
+        if not custom_chars:
+            return self.escaper.escape(text)
 
-        # Merge custom characters with defaults if provided
-        escape_chars = latex_special_chars.copy()
-        if custom_chars:
-            escape_chars.update(custom_chars)
-
-        # Use regex for bulk replacements of most common patterns
-        if len(text) > 1000:  # For longer texts, regex might be faster
-            pattern = "|".join(map(re.escape, escape_chars.keys()))
-            return re.sub(pattern, lambda m: escape_chars[m.group()], text)
-
-        # For shorter texts, use join with generator expression
-        return "".join(_escape_char(c) for c in text)
+        return get_escaper(custom_chars, self.unicode_escapes).escape(text)
 
     def format_output_array(self, output: list[str]) -> str:
         """_summary_
@@ -131,46 +184,62 @@ class ResumeContentGenerator:
         """
         return f"{self.space_separator}{{{text}}}{self.space_separator}"
 
-    def get_value(self, key_path: str) -> str:
-        """Get value from JSON using dot notation."""
-        try:
-            current = self.data
-            for key in key_path.split("."):
-                if "[" in key:  # Handle array indexing
-                    base_key, index = key.split("[")
-                    index = int(index.rstrip("]"))
-                    current = current[base_key][index]
-                else:
-                    current = current.get(key, "")
-            return current if current is not None else ""
-        except (KeyError, IndexError, AttributeError):
-            return ""
+    def get_value(self, key_path: str, default: Any = "") -> Any:
+        """
+        Get a value of the document using dot notation.
+
+        Paths are those of the JSON document, evaluated against the parsed
+        one with every default resolved, see :func:`to_document`, whether the
+        generator was given raw JSON or a ``Resume``. Paths are compiled once
+        and cached, see :func:`compile_path`.
+
+        Args:
+            key_path (str): Path of the value, e.g. ``resume.sections[0].heading``
+            default (Any): Returned when the value is missing or null
+
+        Returns:
+            Any: The value at the path, or the default
+
+        Raises:
+            PathError: If the path is malformed
+
+        Examples:
+            >>> get_value("resume.sections[-1].subsections[0].metadata.duration")
+            '2019 - 2021'
+        """
+        if self.values is None:
+            self.values = to_document(self.document)
+        return compile_path(key_path).get(self.values, default)
 
     def process_header_sections(self) -> str:
         """Process header section."""
         output = []
+        document = self.document
 
-        first_name = self.get_value("firstName")
-        middle_name = self.get_value("middleName")
-        last_name = self.get_value("lastName")
+        first_name = document.first_name
+        middle_name = document.middle_name
+        last_name = document.last_name
         links = ""
 
         # depending on where any or all of the names are missing, the full name is constructed
         # if lets say the first name is missing,
         # the full name will be the middle name and last name
         # with self.space_separator in between
-        self.logger.info("found first name", value=first_name)
+        if self.log_info:
+            self.logger.info("found first name", value=first_name)
         if middle_name:
-            self.logger.info("found middle name", value=middle_name)
+            if self.log_info:
+                self.logger.info("found middle name", value=middle_name)
             first_name = f"{first_name} {middle_name}"
-        else:
+        elif self.log_warnings:
             self.logger.warning("no middle name found")
 
-        self.logger.info("found last name", value=last_name)
+        if self.log_info:
+            self.logger.info("found last name", value=last_name)
 
-        if self.data.get("links"):
-            links = self.process_links(self.data.get("links", []))
-        else:
+        if document.links:
+            links = self.process_links(document.links)
+        elif self.log_warnings:
             self.logger.warning("no links found")
 
         output.append(
@@ -179,12 +248,11 @@ class ResumeContentGenerator:
 
         return self.format_output_array(output)
 
-    def process_links(self, links: list[dict[str, str]]) -> str:
+    def process_links(self, links: tuple[Link, ...]) -> str:
         """Process links and generate LaTeX output.
 
         Args:
-            links (list[dict[str, str]]): List of links
-            containing 'href', 'text' and optional 'column'
+            links (tuple[Link, ...]): Links with 'href', 'text' and 'column'
 
         Returns:
             str: Formatted LaTeX output with links
@@ -194,10 +262,10 @@ class ResumeContentGenerator:
             return ""
 
         # Convert links to (column, formatted_link) tuples with default column=1
-        self.logger.info("found links", total=len(links))
+        if self.log_info:
+            self.logger.info("found links", total=len(links))
         formatted_links = [
-            (link.get("column", 1), f'\\href{{{link["href"]}}}{{{link["text"]}}}')
-            for link in links
+            (link.column, f"\\href{{{link.href}}}{{{link.text}}}") for link in links
         ]
 
         # Sort by column first for groupby to work correctly
@@ -220,36 +288,89 @@ class ResumeContentGenerator:
 
     def process_sections(
         self,
-        sections: List[Dict],
+        sections: tuple[Section, ...],
         process_section: callable,
-        golden_ratio: float = 0.618,
+        golden_ratio: Optional[float] = None,
     ) -> str:
         """
         Process resume sections for single/multi-column layout.
 
         Args:
-            sections: List of section dictionaries
+            sections: Sections of the document
             process_section: Function to process individual sections
-            golden_ratio: Column ratio (default: golden ratio 0.618)
+            golden_ratio: Column ratio, defaults to the ratio of the theme
 
         Returns:
             str: Formatted LaTeX output
 
         Example:
-            >>> sections = [
-            ...     {"title": "Education", "column": 1},
-            ...     {"title": "Experience", "column": 2}
-            ... ]
+            >>> sections = (
+            ...     Section(heading="Education", column=1),
+            ...     Section(heading="Experience", column=2),
+            ... )
             >>> result = process_sections(sections, process_single_section)
         """
+        sink = io.StringIO()
+        self.write_sections(sink, sections, process_section, golden_ratio)
+        return sink.getvalue()
+
+    def write_sections(
+        self,
+        sink: TextIO,
+        sections: tuple[Section, ...],
+        process_section: callable,
+        golden_ratio: Optional[float] = None,
+    ) -> None:
+        """
+        Write resume sections for single/multi-column layout to a sink.
+
+        Every section is written as soon as it is rendered, so only one section
+        is held in memory at a time. Content of external sources is streamed
+        into the sink, a row or item at a time, when its section is written.
+
+        Args:
+            sink: File like object the LaTeX output is written to
+            sections: Sections of the document
+            process_section: Function to process individual sections
+            golden_ratio: Column ratio, defaults to the ratio of the theme
+        """
+        if not any(has_sources(section) for section in sections):
+            self.write_columns(sink, sections, process_section, golden_ratio)
+            return
+
+        self.stream_sink = StreamingSink(sink)
+        try:
+            self.write_columns(
+                self.stream_sink, sections, process_section, golden_ratio
+            )
+        finally:
+            self.stream_sink = None
+
+    def write_columns(
+        self,
+        sink: TextIO,
+        sections: tuple[Section, ...],
+        process_section: callable,
+        golden_ratio: Optional[float] = None,
+    ) -> None:
+        """
+        Write resume sections into their columns.
+
+        Args:
+            sink: File like object the LaTeX output is written to
+            sections: Sections of the document
+            process_section: Function to process individual sections
+            golden_ratio: Column ratio, defaults to the ratio of the theme
+        """
         if not sections:
-            return ""
+            return
 
-        self.logger.info("found sections", total=len(sections))
+        if self.log_info:
+            self.logger.info("found sections", total=len(sections))
 
-        def get_column(section: Dict) -> int:
-            """Get section column number with default to 1"""
-            return section.get("column", ColumnType.SINGLE.value)
+        def get_column(section: Section) -> int:
+            """Get section column number"""
+            return section.column
 
         # Check if multi-column layout is needed
         is_multi_column = any(
@@ -258,13 +379,21 @@ class ResumeContentGenerator:
 
         # Single column layout processing
         if not is_multi_column:
-            self.logger.info("using single column layout")
-            return "\n" + "".join(map(process_section, sections))
+            if self.log_info:
+                self.logger.info("using single column layout")
+            sink.write("\n")
+            for section in sections:
+                sink.write(process_section(section))
+            return
 
-        self.logger.info("using multi-column layout")
+        if self.log_info:
+            self.logger.info("using multi-column layout")
 
         # Setup multi-column configuration
-        col_config = LatexColumn(ratio=golden_ratio)
+        col_config = self.theme.column
+        if golden_ratio is not None:
+            col_config = replace(col_config, ratio=golden_ratio)
+        scaling_factor = self.theme.scaling_factor
 
         # Group sections by column
         sorted_sections = sorted(sections, key=get_column)
@@ -273,49 +402,49 @@ class ResumeContentGenerator:
         }
 
         # log how many sections are there for each column
-        self.logger.info(
-            "sections grouped by column",
-            **{
-                f"in_col_{col}": len(sections)
-                for col, sections in sections_by_column.items()
-            },
-        )
-
-        # Build multi-column layout
-        layout = [
-            f"\\columnratio{{{col_config.ratio}}}",
-            col_config.begin,
-            # Left column
-            col_config.left_begin,
-            *map(process_section, sections_by_column.get(ColumnType.LEFT.value, [])),
-            col_config.left_end,
-            # Right column
-            col_config.right_begin,
-            *map(process_section, sections_by_column.get(ColumnType.RIGHT.value, [])),
-            col_config.right_end,
-            col_config.end,
-        ]
+        if self.log_info:
+            self.logger.info(
+                "sections grouped by column",
+                **{
+                    f"in_col_{col}": len(sections)
+                    for col, sections in sections_by_column.items()
+                },
+            )
 
-        spacing = SpacingModel[
-            self.data.get("spacing", SpacingModel.ULTRA.name).upper()
-        ].value
+        spacing = self.document.spacing.value
 
-        self.logger.info(
-            "using spacing factor",
-            value=self.data.get("spacing", SpacingModel.NORMAL.name),
-        )
+        if self.log_info:
+            self.logger.info(
+                "using spacing factor", value=self.document.spacing.name.lower()
+            )
 
-        # Filter out empty strings and join with newlines
-        return self.format_output_array(
-            LatexScalingFactor().wrap(
-                "\n".join(filter(None, layout)),
-                spacing,
+        def layout() -> Iterator[str]:
+            """Pieces of the multi-column layout, sections rendered on demand"""
+            yield f"\\columnratio{{{col_config.ratio}}}"
+            yield col_config.begin
+            # Left column
+            yield col_config.left_begin
+            yield from map(
+                process_section, sections_by_column.get(ColumnType.LEFT.value, [])
             )
-        )
+            yield col_config.left_end
+            # Right column
+            yield col_config.right_begin
+            yield from map(
+                process_section, sections_by_column.get(ColumnType.RIGHT.value, [])
+            )
+            yield col_config.right_end
+            yield col_config.end
+
+        # Build multi-column layout, skipping empty pieces as a join would
+        sink.write(f"{scaling_factor.get_begin(spacing)}%\n")
+        for index, piece in enumerate(filter(None, layout())):
+            sink.write(f"\n{piece}" if index else piece)
+        sink.write(f"%\n{scaling_factor.end}")
 
     def process_single_section(
         self,
-        section: Dict[str, Any],
+        section: Section,
         config: Optional[SectionConfig] = None,
     ) -> str:
         """
@@ -324,44 +453,63 @@ class ResumeContentGenerator:
         if not section:
             return ""
 
+        if (
+            section.fragment is not None
+            and config is None
+            and self.fragment_memo is not None
+            and not has_sources(section)
+        ):
+            return self.memoized(
+                ("section", section.fragment),
+                section,
+                lambda: self.process_single_section(replace(section, fragment=None)),
+            )
+
         # Use default config if none provided
-        config = config or SectionConfig()
+        config = config or self.theme.section
 
         # create a new logger for the section
         # with the section title as the name
-        logger = self.logger.bind(section_title=section.get("heading", ""))
-        logger.info("processing section")
+        logger = self.logger
+        if self.log_context:
+            logger = logger.bind(section_title=section.heading)
+        if self.log_items:
+            logger.info("processing section")
+
+        # summary mode aggregates the section into a single event
+        if self.summarize:
+            self.section_stats = Counter()
+            started = time.perf_counter()
 
         # Get appropriate minipage environment based on width
-        is_full_width = section.get("fullWidth", False)
+        is_full_width = section.full_width
         minipage_env = config.minipage.get_environment(is_full_width)
 
-        if is_full_width:
+        if is_full_width and self.log_items:
             logger.info("using full width")
 
         def build_section() -> List[str]:
             """Build section components"""
 
-            move_to_end = section.get("moveToEnd", False)
-
             components = [
-                "\\vfill" if move_to_end else "",
+                "\\vfill" if section.move_to_end else "",
                 minipage_env.begin,
                 "%",  # LaTeX comment
                 "\\sloppy",
                 config.group.begin,
                 config.separator,
-                config.title_format.format(section.get("heading", "").upper()),
+                config.title_format.format(section.heading.upper()),
             ]
 
             # Process subsections if available
-            if section.get("subsections"):
+            if section.subsections:
                 components.append(self.process_subsections(section, logger))
 
             # Add content if available
-            if section.get("content"):
-                logger.info("processing section content")
-                components.append(self.display_content(section.get("content"), logger))
+            if section.content:
+                if self.log_items:
+                    logger.info("processing section content")
+                components.append(self.display_content(section.content, logger))
 
             # Add closing tags
             components.extend([config.group.end, config.separator, minipage_env.end])
@@ -369,11 +517,22 @@ class ResumeContentGenerator:
             return components
 
         # Filter out empty strings and join with newlines
-        return "\n".join(filter(None, build_section()))
+        output = "\n".join(filter(None, build_section()))
+
+        if self.summarize:
+            self.logger.info(
+                "section rendered",
+                section_title=section.heading,
+                duration_ms=round((time.perf_counter() - started) * 1e3, 3),
+                **self.section_stats,
+            )
+            self.section_stats = None
+
+        return output
 
     def process_subsections(
         self,
-        section: Dict[str, Any],
+        section: Section,
         logger: BoundLogger,
         config: Optional[SubsectionConfig] = None,
     ) -> str:
@@ -389,29 +548,43 @@ class ResumeContentGenerator:
             str: Formatted LaTeX output for subsections
 
         Example:
-            >>> section = {
-            ...     "subsections": [
-            ...         {"title": "Skills", "items": ["Python", "Java"]},
-            ...         {"title": "Languages", "items": ["English", "Spanish"]}
-            ...     ],
-            ...     "columnSettings": 2
-            ... }
-            >>> result = process_subsections(section, process_single_subsection)
+            >>> section = Section(
+            ...     subsections=(
+            ...         Subsection(heading="Skills"),
+            ...         Subsection(heading="Languages"),
+            ...     ),
+            ...     column_settings=2,
+            ... )
+            >>> result = process_subsections(section, logger)
         """
         # Get subsections or return empty string
-        subsections = section.get("subsections", [])
+        subsections = section.subsections
         if not subsections:
             return ""
 
         # Use default config if none provided
-        config = config or SubsectionConfig()
-        logger.info("found subsections", total=len(subsections))
+        config = config or self.theme.subsection
+        if self.log_items:
+            logger.info("found subsections", total=len(subsections))
+        if self.section_stats is not None:
+            self.section_stats["subsections"] += len(subsections)
+
+        def process(index: int, subsection: Subsection, with_mini_page: bool) -> str:
+            """Process a subsection within its profiling span"""
+            with self.span(
+                "subsection",
+                f".subsections[{index}]",
+                heading=subsection.heading,
+            ):
+                return self.process_single_subsection(
+                    subsection, logger, with_mini_page=with_mini_page
+                )
 
         def process_single_column() -> Iterator[str]:
             """Process subsections in single column layout"""
             return (
-                self.process_single_subsection(subsection, logger, with_mini_page=False)
-                for subsection in subsections
+                process(index, subsection, with_mini_page=False)
+                for index, subsection in enumerate(subsections)
             )
 
         def process_multi_column(num_columns: int) -> List[str]:
@@ -420,10 +593,8 @@ class ResumeContentGenerator:
                 config.multicol_sep,
                 f"{config.multicol_begin}{{{num_columns}}}",
                 *[
-                    self.process_single_subsection(
-                        subsection, logger, with_mini_page=True
-                    )
-                    for subsection in subsections
+                    process(index, subsection, with_mini_page=True)
+                    for index, subsection in enumerate(subsections)
                 ],
                 config.multicol_end,
             ]
@@ -432,10 +603,11 @@ class ResumeContentGenerator:
         column_count = config.get_column_settings(section)
 
         # Process based on layout type
-        logger.info(
-            "found layout type for subsection items",
-            subsection_column_count=column_count,
-        )
+        if self.log_items:
+            logger.info(
+                "found layout type for subsection items",
+                subsection_column_count=column_count,
+            )
         if column_count == ColumnType.SINGLE.value:
             return f"{self.section_seperator}%\n".join(
                 filter(None, process_single_column())
@@ -447,7 +619,7 @@ class ResumeContentGenerator:
 
     def process_single_subsection(
         self,
-        subsection: Dict[str, Any],
+        subsection: Subsection,
         logger: BoundLogger,
         with_mini_page: bool = False,
         elements: Optional[SubsectionElements] = None,
@@ -465,20 +637,39 @@ class ResumeContentGenerator:
             str: Formatted LaTeX output for subsection
 
         Example:
-            >>> subsection = {
-            ...     "heading": "Project X",
-            ...     "info": {"title": "Lead Developer", "sameLine": True},
-            ...     "metadata": {"location": "New York", "duration": "2020-2021"},
-            ...     "content": ["Developed features", "Led team"]
-            ... }
-            >>> result = process_single_subsection(subsection)
+            >>> subsection = Subsection(
+            ...     heading="Project X",
+            ...     info_title="Lead Developer",
+            ...     location="New York",
+            ...     duration="2020-2021",
+            ... )
+            >>> result = process_single_subsection(subsection, logger)
         """
         if not subsection:
             return ""
 
-        elements = elements or SubsectionElements()
+        if (
+            subsection.fragment is not None
+            and elements is None
+            and self.fragment_memo is not None
+            and getattr(subsection.content, "source", None) is None
+        ):
+            return self.memoized(
+                ("subsection", subsection.fragment, with_mini_page),
+                subsection,
+                lambda: self.process_single_subsection(
+                    replace(subsection, fragment=None), logger, with_mini_page
+                ),
+            )
+
+        elements = elements or self.theme.subsection_elements
+
+        def format_heading() -> str:
+            """Format the escaped, upper cased heading"""
+            heading = self.escape_latex(subsection.heading.upper())
+            return elements.heading_format.format(heading) if heading else ""
 
-        def build_subsection() -> List[str]:
+        def build_subsection() -> List[str]:  # pylint: disable=too-many-branches
             """Build subsection components"""
             new_logger = logger
             components = [elements.group[0]]  # Begin group
@@ -488,22 +679,29 @@ class ResumeContentGenerator:
                 components.append(elements.minipage[0])
 
             # Process heading
-            if heading := self.escape_latex(subsection.get("heading", "").upper()):
-                new_logger = logger.bind(
-                    subsection_heading=subsection.get("heading", "")
-                )
-                new_logger.info("processing subsection")
+            if subsection.heading:
+                if self.log_context:
+                    new_logger = logger.bind(subsection_heading=subsection.heading)
+                if self.log_items:
+                    new_logger.info("processing subsection")
 
                 # Add heading
-                components.append(elements.heading_format.format(heading))
+                if self.leaf_cache is not None:
+                    key = ("subsection_heading", subsection.heading)
+                    components.append(self.cached_leaf(key, elements, format_heading))
+                else:
+                    components.append(format_heading())
 
             has_info = False
             # Process info block
-            if title := subsection.get("info", {}).get("title"):
-                same_line = subsection.get("info", {}).get("sameLine", True)
-                new_logger.info(
-                    "processing info block", info_title=title, show_same_line=same_line
-                )
+            if title := subsection.info_title:
+                same_line = subsection.info_same_line
+                if self.log_items:
+                    new_logger.info(
+                        "processing info block",
+                        info_title=title,
+                        show_same_line=same_line,
+                    )
 
                 has_info = True
                 # Add info block
@@ -511,34 +709,35 @@ class ResumeContentGenerator:
                     self.display_info(
                         title,
                         same_line=same_line,
-                        has_heading=subsection.get("heading", "") != "",
+                        has_heading=subsection.heading != "",
                     )
                 )
 
             # Process metadata
-            if metadata := subsection.get("metadata", {}):
-                # check if location or duration is present
-                if metadata.get("location") or metadata.get("duration"):
+            # check if location or duration is present
+            if subsection.location or subsection.duration:
+                if self.log_items:
                     new_logger.info(
                         "processing metadata",
-                        location=metadata.get("location"),
-                        duration=metadata.get("duration"),
+                        location=subsection.location,
+                        duration=subsection.duration,
                     )
 
-                    if not has_info:
-                        components.append("\\newline%")
-                    # Add additional info
-                    components.append(
-                        self.display_additional_info(
-                            metadata.get("location", ""), metadata.get("duration", "")
-                        )
+                if not has_info:
+                    components.append("\\newline%")
+                # Add additional info
+                components.append(
+                    self.display_additional_info(
+                        subsection.location, subsection.duration
                     )
+                )
 
             # Process content
-            if content := subsection.get("content"):
-                new_logger.info("processing subsection content")
+            if content := subsection.content:
+                if self.log_items:
+                    new_logger.info("processing subsection content")
                 components.append(self.display_content(content, new_logger))
-            else:
+            elif self.log_warnings:
                 new_logger.warning("no subsection content found")
 
             # Close environments
@@ -582,7 +781,7 @@ class ResumeContentGenerator:
             '\\info{• {Team Lead}}'
         """
         # Use default config if none provided
-        config = config or InfoFormatConfig()
+        config = config or self.theme.info
 
         # Use provided escape function or identity function
         escape_func = self.escape_latex or (lambda x: x)
@@ -608,6 +807,9 @@ class ResumeContentGenerator:
 
         # Choose display mode based on same_line parameter
         mode = DisplayMode.SAME_LINE if same_line else DisplayMode.NEW_LINE
+        if self.leaf_cache is not None:
+            key = ("info", text, mode, has_heading)
+            return self.cached_leaf(key, config, lambda: format_info(mode))
         return format_info(mode)
 
     def display_additional_info(
@@ -639,7 +841,7 @@ class ResumeContentGenerator:
             '\\additionalinfo{{San Francisco} • {Full-time}}'
         """
         # Use default config if none provided
-        config = config or AdditionalInfoConfig()
+        config = config or self.theme.additional_info
 
         # Use provided escape function or identity function
         escape_func = self.escape_latex or (lambda x: x)
@@ -664,59 +866,57 @@ class ResumeContentGenerator:
 
             return "".join(inner_content)
 
-        # Return full command
-        return f"{config.command}{{{format_text()}}}"
+        def format_command() -> str:
+            """Format the full command"""
+            return f"{config.command}{{{format_text()}}}"
+
+        if self.leaf_cache is not None:
+            key = ("additional_info", primary_text, secondary_text)
+            return self.cached_leaf(key, config, format_command)
+        return format_command()
 
     def display_content(
         self,
-        content: Union[Dict[str, Any], List[str]],
+        content: Optional[Content],
         logger: BoundLogger,
-        default_type: str = ContentType.LIST.value,
     ) -> str:
         """
         Display content based on its type with appropriate formatting.
 
         Args:
-            content: Content dictionary with type and data or direct list of items
+            content: Parsed list, paragraph, table or inline list content
             logger: Logger for the section
-            default_type: Default content type if not specified
 
         Returns:
             str: Formatted content using appropriate display methods
 
         Examples:
-            >>> formatters = ContentFormatters(
-            ...     list_formatter=lambda x:
-            '\\begin{itemize}\\item ' + '\\item '.join(x['items']) + '\\end{itemize}',
-            ...     paragraph_formatter=lambda x: '\\par ' + x['text']
-            ... )
-            >>> content = {"type": "list", "items": ["Item 1", "Item 2"]}
-            >>> print(display_content(content, formatters))
-            \\begin{itemize}\\item Item 1\\item Item 2\\end{itemize}
+            >>> content = ParagraphContent(text="Simple paragraph")
+            >>> print(display_content(content, logger))
+            \\begin{tightnopoints}\\item{Simple paragraph}\\end{tightnopoints}
         """
         formatters = self.formatters
 
-        # Handle direct list input
-        if isinstance(content, list):
-            content = {"type": default_type, "items": content}
-
-        # Handle empty or invalid content
-        if not content or not isinstance(content, dict):
+        # Handle empty content
+        if content is None:
             return ""
 
         def format_content() -> str:
             """Format content using appropriate formatter"""
-            content_type = content.get("type", default_type)
+            content_type = content.content_type.value
 
-            new_logger = logger.bind(content_type=content_type)
+            new_logger = logger
+            if self.log_context:
+                new_logger = logger.bind(content_type=content_type)
             formatter = formatters.get_formatter(content_type)
-            return formatter(content, new_logger)
+            with self.span("content", ".content", content_type=content_type):
+                return formatter(content, new_logger)
 
         return format_content()
 
     def display_table(
         self,
-        content: Dict[str, Any],
+        content: TableContent,
         logger: BoundLogger,
         config: Optional[TableConfig] = None,
     ):
@@ -733,14 +933,20 @@ class ResumeContentGenerator:
         """
 
         # Use default config if none provided
-        config = config or TableConfig()
+        config = config or self.theme.table
+
+        if content.source is not None:
+            return self.defer(lambda: self.stream_table(content, logger, config))
 
         def format_table() -> str:
             """Format table with rows and columns"""
-            if not (rows := content.get("rows", [])):
+            if not (rows := content.rows):
                 return ""
 
-            logger.info("found table rows", total=len(rows))
+            if self.log_items:
+                logger.info("found table rows", total=len(rows))
+            if self.section_stats is not None:
+                self.section_stats["table_rows"] += len(rows)
 
             # Build table
             return config.wrap_in_environment(
@@ -749,9 +955,59 @@ class ResumeContentGenerator:
 
         return format_table()
 
+    def defer(self, chunks: Callable[[], Iterator[str]]) -> str:
+        """
+        Stream content into the sink its section is written to.
+
+        Content rendered outside of ``write_sections`` has no sink to stream
+        into and is rendered in place instead.
+
+        Args:
+            chunks: Produces the content, chunk by chunk, when called
+
+        Returns:
+            str: A marker standing in for the content, or the content itself
+        """
+        if self.stream_sink is None:
+            return "".join(chunks())
+        return self.stream_sink.defer(chunks)
+
+    def stream_table(
+        self,
+        content: TableContent,
+        logger: BoundLogger,
+        config: TableConfig,
+    ) -> Iterator[str]:
+        """
+        Format the rows of a table with an external source as they are read.
+
+        Args:
+            content: Table content with inline rows and an external source
+            logger: Logger for the section
+            config: Table formatting configuration
+
+        Yields:
+            str: The table, chunked into environments of ``chunk_rows`` rows
+        """
+        counts = Counter()
+
+        def counted_rows() -> Iterator[tuple[str, ...]]:
+            for row in table_rows(content):
+                counts["rows"] += 1
+                yield row
+
+        yield from config.iter_table(
+            counted_rows(), self.escape_latex, content.chunk_rows
+        )
+
+        if self.log_items:
+            logger.info(
+                "streamed table rows", total=counts["rows"], source=content.source.path
+            )
+
     def display_list(
         self,
-        content: Dict[str, Any],
+        content: ListContent,
         logger: BoundLogger,
         config: Optional[ListFormatConfig] = None,
     ) -> str:
@@ -767,71 +1023,111 @@ class ResumeContentGenerator:
             str: Formatted LaTeX list
 
         Example:
-            >>> content = {
-            ...     "items": [
-            ...         {
-            ...             "segments": [{"text": "Lead Developer"}],
-            ...             "inlineList": ["Python", "Java"]
-            ...         }
-            ...     ],
-            ...     "style": {"showBullets": True}
-            ... }
-            >>> result = display_list(content, process_segment, format_inline_list)
+            >>> content = ListContent(
+            ...     items=(
+            ...         ListItem(
+            ...             segments=(Segment(text="Lead Developer"),),
+            ...             inline_list=InlineList(items=("Python", "Java")),
+            ...         ),
+            ...     ),
+            ...     show_bullets=True,
+            ... )
+            >>> result = display_list(content, logger)
         """
         # Use default config if none provided
-        config = config or ListFormatConfig()
+        config = config or self.theme.list_format
+
+        # Get environment type, the same for every item
+        env = config.get_environment(content.show_bullets)
 
-        def format_segments(segments: List[Dict[str, Any]]) -> str:
+        def format_segments(segments: tuple[Segment, ...]) -> str:
             """Format list of segments"""
             processed_segments = [
                 f"{{{self.process_single_segment(segment)}}}" for segment in segments
             ]
             return f"\\item{config.space_separator.join(processed_segments)}"
 
-        def process_list_item(item: Dict[str, Any]) -> str:
+        def process_list_item(item: ListItem) -> str:
             """Process single list item with its segments and inline list"""
-            # Get environment type
-            show_bullets = content.get("style", {}).get("showBullets", True)
-            env = config.get_environment(show_bullets)
-
             components = []
 
             # Add segments if present
-            if segments := item.get("segments"):
+            if segments := item.segments:
                 # Add environment begin
                 components.append(f"\\begin{{{env}}}")
 
-                logger.info("found segments", total_segments=len(segments))
+                if self.log_items:
+                    logger.info("found segments", total_segments=len(segments))
+                if self.section_stats is not None:
+                    self.section_stats["segments"] += len(segments)
 
                 components.append(format_segments(segments))
                 # Add environment end
                 components.append(f"\\end{{{env}}}")
-            else:
+            elif self.log_warnings:
                 logger.warning("no segments found")
 
             # Add inline list if present
-            if inline_list := item.get("inlineList"):
+            if inline_list := item.inline_list:
                 # check if segments exist`
                 # if yes append newline to the end of the segments
-                if not item.get("segments"):
+                if not item.segments:
                     components.append("\\newline%")
 
                 components.append(
                     self.display_inline_list(
-                        inline_list, logger.bind(content_type="inline_list")
+                        inline_list,
+                        (
+                            logger.bind(content_type="inline_list")
+                            if self.log_context
+                            else logger
+                        ),
                     )
                 )
                 # components.append("\n")
 
             return "\n".join(filter(None, components))
 
+        def stream_items() -> Iterator[str]:
+            """Process every item, finishing the last one as ``build_list`` does"""
+            previous = None
+            for item in list_items(content):
+                if previous is not None:
+                    yield previous
+                previous = process_list_item(item)
+
+            if previous is not None:
+                if previous.endswith("inline_list"):
+                    previous += "\n\\vspace{\\baselineskip}\\\\"
+                yield previous
+
+        def stream_list() -> Iterator[str]:
+            """Stream the list of an external source, an item at a time"""
+            items = stream_items()
+            if (first := next(items, None)) is None:
+                return
+            yield from iter_lines(
+                chain((config.group_begin, first), items, (config.group_end,))
+            )
+            if self.log_items:
+                logger.info("streamed list items", source=content.source.path)
+
         def build_list() -> str:
             """Build complete list with all items"""
-            if not (items := content.get("items", [])):
+            if content.source is not None:
+                return self.defer(stream_list)
+
+            if not (items := content.items):
                 return ""
 
-            show_bullets = content.get("style", {}).get("showBullets", True)
-            logger.info("found list items", total=len(items), show_bullets=show_bullets)
+            if self.log_items:
+                logger.info(
+                    "found list items",
+                    total=len(items),
+                    show_bullets=content.show_bullets,
+                )
+            if self.section_stats is not None:
+                self.section_stats["list_items"] += len(items)
 
             # Process all items
             processed_items = [*[process_list_item(item) for item in items]]
@@ -850,7 +1146,7 @@ class ResumeContentGenerator:
 
     def display_inline_list(
         self,
-        inline_list: Dict[str, Any],
+        inline_list: InlineList,
         logger: BoundLogger,
         config: Optional[InlineListConfig] = None,
     ) -> str:
@@ -858,7 +1154,7 @@ class ResumeContentGenerator:
         Display items as inline list with custom separator.
 
         Args:
-            inline_list: Dictionary containing items and separator
+            inline_list: Inline list with items and an optional separator
             logger: Logger for the section
             config: Optional formatting configuration
 
@@ -866,23 +1162,18 @@ class ResumeContentGenerator:
             str: Formatted inline list with wrapped separator
 
         Examples:
-            >>> items = {
-            ...     "items": ["Python", "Java", "SQL"],
-            ...     "separator": "•"
-            ... }
-            >>> print(display_inline_list(items))
-            {Python} • {Java} • {SQL}
-            \\newline
+            >>> items = InlineList(items=("Python", "Java", "SQL"), separator="•")
+            >>> print(display_inline_list(items, logger))
+            Python • Java • SQL%inline_list
 
             >>> custom_config = InlineListConfig(default_separator="|")
-            >>> print(display_inline_list(items, custom_config))
-            {Python} | {Java} | {SQL}
-            \\newline
+            >>> print(display_inline_list(InlineList(items=("Python",)), logger, custom_config))
+            Python%inline_list
         """
         # Use default config if none provided
-        config = config or InlineListConfig()
+        config = config or self.theme.inline_list
 
-        def format_list(items: List[str], separator: str) -> str:
+        def format_list(items: tuple[str, ...], separator: str) -> str:
             """Format list items with separator"""
             if not items:
                 return ""
@@ -899,16 +1190,27 @@ class ResumeContentGenerator:
         def build_inline_list() -> str:
             """Build complete inline list with newline"""
             # Get items and separator
-            items = inline_list.get("items", [])
-            separator = inline_list.get("separator", config.default_separator)
+            items = inline_list.items
+            separator = inline_list.separator
+            if separator is None:
+                separator = config.default_separator
 
-            logger.info(
-                "found inline list items",
-                total_inline_list=len(items),
-                inline_list_separator=separator,
-            )
+            if self.log_items:
+                logger.info(
+                    "found inline list items",
+                    total_inline_list=len(items),
+                    inline_list_separator=separator,
+                )
+            if self.section_stats is not None:
+                self.section_stats["inline_list_items"] += len(items)
             # Format list
-            formatted_list = format_list(items, separator)
+            if self.leaf_cache is not None:
+                key = ("inline_list", items, separator)
+                formatted_list = self.cached_leaf(
+                    key, config, lambda: format_list(items, separator)
+                )
+            else:
+                formatted_list = format_list(items, separator)
 
             # Add newline if content exists
             if formatted_list:
@@ -920,7 +1222,7 @@ class ResumeContentGenerator:
 
     def process_single_segment(
         self,
-        segment: Dict[str, Any],
+        segment: Segment,
         config: Optional[StyleConfig] = None,
     ) -> str:
         """
@@ -934,52 +1236,49 @@ class ResumeContentGenerator:
             str: LaTeX formatted text with applied styles
 
         Examples:
-            >>> segment = {
-            ...     "text": "Important text",
-            ...     "style": {"bold": True, "italic": True},
-            ...     "href": "https://example.com"
-            ... }
-            >>> result = process_single_segment(segment, escape_latex)
+            >>> segment = Segment(
+            ...     text="Important text",
+            ...     href="https://example.com",
+            ...     styles=(TextStyle.BOLD, TextStyle.ITALIC),
+            ... )
+            >>> result = process_single_segment(segment)
             >>> print(result)
             {\\bfseries{\\itshape{\\href{https://example.com}{Important text}}}}
         """
         # Use default config if none provided
-        config = config or StyleConfig()
-
-        def get_active_styles(style_dict: Dict[str, bool]) -> Set[TextStyle]:
-            """Get set of active styles from style dictionary"""
-            return {style for style in TextStyle if style_dict.get(style.value, False)}
+        config = config or self.theme.style
 
-        def apply_styles(text: str, styles: Set[TextStyle]) -> str:
+        def apply_styles(text: str, styles: Tuple[TextStyle, ...]) -> str:
             """Apply multiple styles to text"""
 
             def apply_style_chain(t, style):
                 return config.apply_style(t, style)
 
-            return reduce(apply_style_chain, styles, text)
+            # the first style ends up outermost, e.g. bold around underline
+            return reduce(apply_style_chain, reversed(styles), text)
 
         def process_text() -> str:
             """Process text with styles and hyperlink"""
             # Get and escape text
-            text = self.escape_latex(segment.get("text", ""))
-
-            # Get active styles
-            styles = get_active_styles(segment.get("style", {}))
+            text = self.escape_latex(segment.text)
 
             # Apply styles
-            styled_text = apply_styles(text, styles)
+            styled_text = apply_styles(text, segment.styles)
 
             # Add hyperlink if present
-            if href := segment.get("href"):
+            if href := segment.href:
                 styled_text = config.href_format.format(href, styled_text)
 
             return config.wrap_text(styled_text)
 
+        if self.leaf_cache is not None:
+            key = ("segment", segment.text, segment.styles, segment.href)
+            return self.cached_leaf(key, config, process_text)
         return process_text()
 
     def display_paragraph(
         self,
-        content: Dict[str, Any],
+        content: ParagraphContent,
         logger: BoundLogger,
         config: Optional[ParagraphConfig] = None,
     ) -> str:
@@ -995,20 +1294,19 @@ class ResumeContentGenerator:
             str: LaTeX formatted paragraph
 
         Examples:
-            >>> content = {
-            ...     "text": "Visit our website",
-            ...     "href": "https://example.com"
-            ... }
-            >>> print(display_paragraph(content))
+            >>> content = ParagraphContent(
+            ...     text="Visit our website", href="https://example.com"
+            ... )
+            >>> print(display_paragraph(content, logger))
             \\begin{tightnopoints}
             \\item{\\href{https://example.com}{Visit our website}}\\end{tightnopoints}
 
-            >>> content = {"text": "Simple paragraph"}
-            >>> print(display_paragraph(content))
+            >>> content = ParagraphContent(text="Simple paragraph")
+            >>> print(display_paragraph(content, logger))
             \\begin{tightnopoints}\\item{Simple paragraph}\\end{tightnopoints}
         """
         # Use default config if none provided
-        config = config or ParagraphConfig()
+        config = config or self.theme.paragraph
 
         # Use provided escape function or identity function
         escape_func = self.escape_latex or (lambda x: x)
@@ -1027,15 +1325,17 @@ class ResumeContentGenerator:
         def build_paragraph() -> str:
             """Build complete paragraph with environment"""
             # Get text and href
-            text = content.get("text", "")
-            href = content.get("href")
+            text = content.text
+            href = content.href
 
-            if not href:
+            if self.log_items and not href:
                 logger.info("found paragraph text", para_text=text)
-            else:
+            elif self.log_items:
                 logger.info(
                     "found paragraph text with hyperlink", para_text=text, href=href
                 )
+            if self.section_stats is not None:
+                self.section_stats["paragraphs"] += 1
 
             # Format text with hyperlink if present
             formatted_text = format_paragraph_text(text, href)
@@ -1045,34 +1345,253 @@ class ResumeContentGenerator:
 
         return build_paragraph()
 
+    def memoized(self, key: tuple, node: Any, render: Callable[[], str]) -> str:
+        """
+        Render a part included from a shared fragment once per process.
+
+        Parts render alike in every document, whatever its preset, spacing
+        or layout, only the theme and the escaping change their fragment.
+
+        Args:
+            key: Kind and content hash of the part, with its own settings
+            node: The part, compared to the one a memoized fragment was
+                rendered from
+            render: Renders the part when it is not memoized
+
+        Returns:
+            str: Formatted LaTeX output of the part
+        """
+        if self.fragment_settings is None:
+            theme = "" if self.theme == DEFAULT_THEME else theme_digest(self.theme)
+            self.fragment_settings = (theme, self.unicode_escapes)
+        key = (*key, *self.fragment_settings)
+
+        if (fragment := self.fragment_memo.get(key, node)) is not None:
+            if self.log_items:
+                self.logger.info("fragment memo hit", kind=key[0], fragment=key[1])
+            return fragment
+
+        fragment = render()
+        self.fragment_memo.put(key, node, fragment)
+        return fragment
+
+    def cached_leaf(self, key: tuple, config: Any, render: Callable[[], str]) -> str:
+        """
+        Render a leaf fragment through the leaf cache shared across documents.
+
+        Args:
+            key: Kind and exact input of the formatter
+            config: The config the formatter renders with, part of the key
+                by its identity
+            render: Renders the fragment when it is not cached
+
+        Returns:
+            str: The fragment, served from the cache when it was rendered before
+        """
+        key = (*key, id(config), self.unicode_escapes)
+        if (fragment := self.leaf_cache.get(key)) is not None:
+            return fragment
+
+        fragment = render()
+        self.leaf_cache.put(key, config, fragment)
+        return fragment
+
+    def cached_section_processor(self, preset: str) -> callable:
+        """
+        Wrap section processing with the persistent section cache.
+
+        Args:
+            preset: The preset the resume is rendered with
+
+        Returns:
+            callable: Section processor serving unchanged sections from the cache
+        """
+        cache = self.section_cache
+
+        # global settings that may change how a section is rendered
+        settings = {
+            "spacing": self.document.spacing.name,
+            "preset": preset,
+            "multiColumn": self.document.is_multi_column,
+            "unicodeEscapes": self.unicode_escapes,
+        }
+        # keys of the default theme stay those of renders before themes existed
+        if self.theme != DEFAULT_THEME:
+            settings["theme"] = theme_digest(self.theme)
+
+        def process_section(section: Section) -> str:
+            """Serve a section from the cache or render and store it"""
+            # streamed content is read while written, it is never cached
+            if has_sources(section):
+                return self.process_single_section(section)
+
+            key = cache.key_for(dump(section), settings)
+            heading = section.heading
+
+            if (fragment := cache.get(key)) is not None:
+                cache.record(heading, key, hit=True)
+                if self.log_items:
+                    self.logger.info(
+                        "section cache hit", section_title=heading, key=key
+                    )
+                return fragment
+
+            fragment = self.process_single_section(section)
+            cache.put(key, fragment)
+            cache.record(heading, key, hit=False)
+            if self.log_items:
+                self.logger.info("section cache miss", section_title=heading, key=key)
+
+            return fragment
+
+        return process_section
+
+    def header_fragment(self) -> str:
+        """
+        Render the header, once per name and links when fragments are shared.
+
+        Returns:
+            str: Formatted LaTeX output of the header
+        """
+        fragments = self.shared_fragments
+        if fragments is None:
+            return self.process_header_sections()
+
+        document = self.document
+        key = (
+            "header",
+            document.first_name,
+            document.middle_name,
+            document.last_name,
+            document.links,
+        )
+        if (fragment := fragments.get(key)) is None:
+            fragment = fragments[key] = self.process_header_sections()
+        return fragment
+
+    def shared_section_processor(self, process_section: callable) -> callable:
+        """
+        Render every section once across variants of the same document.
+
+        Sections never depend on the preset, spacing, last updated stamp or
+        footer, so variants that only differ in those share the fragments.
+
+        Args:
+            process_section: Function to process individual sections
+
+        Returns:
+            callable: Section processor reusing the fragment of a section object
+        """
+        fragments = self.shared_fragments
+
+        def process_shared(section: Section) -> str:
+            """Reuse the fragment of a section rendered for another variant"""
+            # streamed content only streams into the sink of its own render
+            if has_sources(section):
+                return process_section(section)
+
+            # the section is kept with its fragment, so its id is never reused
+            entry = fragments.get(id(section))
+            if entry is None or entry[0] is not section:
+                entry = fragments[id(section)] = (section, process_section(section))
+            return entry[1]
+
+        return process_shared
+
+    def traced_section_processor(
+        self, sections: tuple[Section, ...], process_section: callable
+    ) -> callable:
+        """
+        Wrap section processing in a profiling span per section.
+
+        Args:
+            sections: Sections of the document, in document order
+            process_section: Function to process individual sections
+
+        Returns:
+            callable: Section processor keyed by the JSON path of the section
+        """
+        # sections are rendered grouped by column, not in document order
+        indices = {id(section): index for index, section in enumerate(sections)}
+
+        def process_traced(section: Section) -> str:
+            """Process a section within its profiling span"""
+            with self.span(
+                "section",
+                f".resume.sections[{indices[id(section)]}]",
+                heading=section.heading,
+            ):
+                return process_section(section)
+
+        return process_traced
+
     def build_resume(self) -> str:
         """Build resume content."""
-        output = ["% chktex-file 6", "% chktex-file 36"]
+        sink = io.StringIO()
+        self.write_resume(sink)
+        with self.span("output"):
+            return sink.getvalue()
 
-        preset = self.get_value("preset")
-        if preset:
-            self.logger.info(f"using preset: {preset}", preset=preset)
-            output.append(f"\\loadpresent{{{preset}}}")
-        else:
-            self.logger.info("using default preset", preset="deedy-inspired-open-fonts")
-            output.append("\\loadpresent{deedy-inspired-open-fonts}")
+    def write_resume(self, sink: TextIO) -> None:
+        """
+        Write resume content to a sink as the document is walked.
+
+        The output is identical to :meth:`build_resume`, without ever holding
+        more than one rendered section in memory.
+
+        Args:
+            sink: File like object the LaTeX output is written to, e.g. an open
+                file, a socket file or an ``io.StringIO``
+        """
+        with self.span("document"):
+            separator = "%\n"
+            sink.write(f"% chktex-file 6{separator}% chktex-file 36{separator}")
+
+            preset = self.document.preset
+            if preset:
+                if self.log_info:
+                    self.logger.info(f"using preset: {preset}", preset=preset)
+                sink.write(f"\\loadpresent{{{preset}}}{separator}")
+            else:
+                if self.log_info:
+                    self.logger.info(
+                        "using default preset", preset="deedy-inspired-open-fonts"
+                    )
+                sink.write(f"\\loadpresent{{deedy-inspired-open-fonts}}{separator}")
 
-        if self.data.get("showLastUpdated", True):
-            output.append("\\lastupdated%")
+            if self.document.show_last_updated:
+                sink.write(f"\\lastupdated%{separator}")
 
-        # process name section
-        output.append(self.process_header_sections())
-        self.logger.info("processed header section")
+            # process name section
+            with self.span("header"):
+                sink.write(f"{self.header_fragment()}{separator}")
+            if self.log_info:
+                self.logger.info("processed header section")
 
-        # process sections
-        output.append(
-            self.process_sections(
-                self.get_value("resume.sections"), self.process_single_section
-            )
-        )
-        self.logger.info("processed sections")
+            # process sections
+            sections = self.document.sections
+            process_section = self.process_single_section
+            if self.section_cache is not None and sections:
+                process_section = self.cached_section_processor(preset)
 
-        if not self.data.get("hideFooter", False):
-            output.append("\\footertext%")
+            if self.shared_fragments is not None:
+                process_section = self.shared_section_processor(process_section)
 
-        return self.format_output_array(output)
+            if self.tracer is not None:
+                process_section = self.traced_section_processor(
+                    sections, process_section
+                )
+
+            with self.span("sections"):
+                self.write_sections(sink, sections, process_section)
+            if self.log_info:
+                self.logger.info("processed sections")
+
+            if self.section_cache is not None and self.log_info:
+                report = self.section_cache.report
+                self.logger.info(
+                    "section cache report", hits=report.hits, misses=report.misses
+                )
+
+            if not self.document.hide_footer:
+                sink.write(f"{separator}\\footertext%")
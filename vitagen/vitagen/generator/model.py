@@ -0,0 +1,710 @@
+"""Typed document model of a resume, parsed and validated in a single pass."""
+
+import os
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from vitagen.generator.config.base import ColumnType, TextStyle
+from vitagen.generator.config.content_base import ContentType
+from vitagen.generator.config.spacing_factor import SpacingModel
+from vitagen.loader import FRAGMENT_KEY, load_document, parse_document
+
+__all__ = [
+    "DocumentError",
+    "ExternalSource",
+    "Link",
+    "Segment",
+    "InlineList",
+    "ListItem",
+    "ListContent",
+    "ParagraphContent",
+    "TableContent",
+    "Content",
+    "Subsection",
+    "Section",
+    "Resume",
+    "parse_resume",
+    "decode_resume",
+    "load_resume",
+    "dump",
+    "to_document",
+]
+
+ROOT_PATH = "$"
+
+# style keys of a segment in declaration order, resolved once instead of per segment
+STYLE_KEYS = tuple((style.value, style) for style in TextStyle)
+
+# formats of external sources by the file suffixes they are inferred from
+SOURCE_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class DocumentError(ValueError):
+    """Raised when a resume document does not match the expected structure"""
+
+    def __init__(self, path: str, message: str):
+        super().__init__(f"{path}: {message}")
+        self.path = path
+        self.message = message
+
+
+@dataclass(frozen=True, slots=True)
+class ExternalSource:
+    """
+    A CSV or JSONL file the rows of a table or the items of a list are read
+    from while rendering, one at a time instead of inline in the document.
+    """
+
+    path: str
+    format: str = "csv"
+    # whether the first CSV row names the columns instead of holding cells
+    header: bool = False
+    # columns picked from every row, by key of JSONL objects or CSV header name
+    columns: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Link:
+    """A link of the header"""
+
+    href: str
+    text: str
+    column: int = ColumnType.SINGLE.value
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """A styled, optionally linked run of text of a list item"""
+
+    text: str = ""
+    href: Optional[str] = None
+    # in ``STYLE_KEYS`` order, styles are nested in that order whatever the
+    # order of the keys of the document, and the hash seed of the process
+    styles: Tuple[TextStyle, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class InlineList:
+    """Items rendered on a single line, also used as ``inline_list`` content"""
+
+    items: Tuple[str, ...] = ()
+    separator: Optional[str] = None
+
+    content_type = ContentType.INLINE_LIST
+
+
+@dataclass(frozen=True, slots=True)
+class ListItem:
+    """An item of a list with its segments and inline list"""
+
+    segments: Tuple[Segment, ...] = ()
+    inline_list: Optional[InlineList] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ListContent:
+    """List content, the default for unknown content types"""
+
+    items: Tuple[ListItem, ...] = ()
+    show_bullets: bool = True
+    # items read after the inline ones while rendering
+    source: Optional[ExternalSource] = None
+
+    content_type = ContentType.LIST
+
+
+@dataclass(frozen=True, slots=True)
+class ParagraphContent:
+    """Paragraph content with an optional hyperlink"""
+
+    text: str = ""
+    href: Optional[str] = None
+
+    content_type = ContentType.PARAGRAPH
+
+
+@dataclass(frozen=True, slots=True)
+class TableContent:
+    """Table content given as rows of cells"""
+
+    rows: Tuple[Tuple[str, ...], ...] = ()
+    # rows read after the inline ones while rendering
+    source: Optional[ExternalSource] = None
+    # rows per tabular environment, 0 keeps every row in a single one
+    chunk_rows: int = 0
+
+    content_type = ContentType.TABLE
+
+
+Content = Union[ListContent, ParagraphContent, TableContent, InlineList]
+
+
+@dataclass(frozen=True, slots=True)
+class Subsection:
+    """A subsection of a section, e.g. a position or a degree"""
+
+    heading: str = ""
+    info_title: str = ""
+    info_same_line: bool = True
+    location: str = ""
+    duration: str = ""
+    content: Optional[Content] = None
+    # content hash of a subsection included from a shared fragment
+    fragment: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Section:  # pylint: disable=too-many-instance-attributes
+    """A section of the resume, e.g. experience or education"""
+
+    heading: str = ""
+    column: int = ColumnType.SINGLE.value
+    # subsection columns, None falls back to the default columns of the theme
+    column_settings: Optional[int] = None
+    full_width: bool = False
+    move_to_end: bool = False
+    subsections: Tuple[Subsection, ...] = ()
+    content: Optional[Content] = None
+    # content hash of a section included from a shared fragment
+    fragment: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Resume:  # pylint: disable=too-many-instance-attributes
+    """A complete resume document with every default resolved"""
+
+    first_name: str = ""
+    middle_name: str = ""
+    last_name: str = ""
+    links: Tuple[Link, ...] = ()
+    preset: str = ""
+    spacing: SpacingModel = SpacingModel.ULTRA
+    show_last_updated: bool = True
+    hide_footer: bool = False
+    sections: Tuple[Section, ...] = ()
+
+    @property
+    def is_multi_column(self) -> bool:
+        """Whether any section is placed in the right column"""
+        return any(
+            section.column == ColumnType.RIGHT.value for section in self.sections
+        )
+
+
+def _object(value: Any, path: str) -> Dict[str, Any]:
+    """Validate an optional JSON object"""
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise DocumentError(path, f"expected an object, got {type(value).__name__}")
+    return value
+
+
+def _array(value: Any, path: str) -> List[Any]:
+    """Validate an optional JSON array"""
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise DocumentError(path, f"expected an array, got {type(value).__name__}")
+    return value
+
+
+def _string(
+    obj: Dict[str, Any], key: str, path: str, default: Optional[str] = ""
+) -> Optional[str]:
+    """Get an optional string member"""
+    if (value := obj.get(key)) is None:
+        return default
+    if not isinstance(value, str):
+        raise DocumentError(
+            f"{path}.{key}", f"expected a string, got {type(value).__name__}"
+        )
+    return value
+
+
+def _required_string(obj: Dict[str, Any], key: str, path: str) -> str:
+    """Get a required string member"""
+    if key not in obj:
+        raise DocumentError(path, f"missing required member '{key}'")
+    return _string(obj, key, path)
+
+
+def _integer(
+    obj: Dict[str, Any], key: str, path: str, default: Optional[int]
+) -> Optional[int]:
+    """Get an optional integer member"""
+    if (value := obj.get(key)) is None:
+        return default
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise DocumentError(
+            f"{path}.{key}", f"expected an integer, got {type(value).__name__}"
+        )
+    return value
+
+
+def _strings(value: Any, path: str) -> Tuple[str, ...]:
+    """Validate an optional array of strings"""
+    items = _array(value, path)
+    for index, item in enumerate(items):
+        if not isinstance(item, str):
+            raise DocumentError(
+                f"{path}[{index}]", f"expected a string, got {type(item).__name__}"
+            )
+    return tuple(items)
+
+
+def _parse_link(value: Any, path: str) -> Link:
+    """Parse a header link"""
+    obj = _object(value, path)
+    return Link(
+        href=_required_string(obj, "href", path),
+        text=_required_string(obj, "text", path),
+        column=_integer(obj, "column", path, ColumnType.SINGLE.value),
+    )
+
+
+def _parse_segment(value: Any, path: str) -> Segment:
+    """Parse a segment of a list item"""
+    obj = _object(value, path)
+    style = _object(obj.get("style"), f"{path}.style")
+    return Segment(
+        text=_string(obj, "text", path),
+        href=_string(obj, "href", path) or None,
+        styles=(
+            tuple(s for key, s in STYLE_KEYS if style.get(key, False)) if style else ()
+        ),
+    )
+
+
+def _parse_inline_list(value: Any, path: str) -> InlineList:
+    """Parse an inline list"""
+    obj = _object(value, path)
+    return InlineList(
+        items=_strings(obj.get("items"), f"{path}.items"),
+        separator=_string(obj, "separator", path, None),
+    )
+
+
+def _parse_list_item(value: Any, path: str) -> ListItem:
+    """Parse an item of a list"""
+    obj = _object(value, path)
+    segments = _array(obj.get("segments"), f"{path}.segments")
+    inline_list = obj.get("inlineList")
+    return ListItem(
+        segments=tuple(
+            _parse_segment(segment, f"{path}.segments[{index}]")
+            for index, segment in enumerate(segments)
+        ),
+        inline_list=(
+            _parse_inline_list(inline_list, f"{path}.inlineList")
+            if inline_list
+            else None
+        ),
+    )
+
+
+def _parse_source(
+    value: Any, path: str, base: Optional[Path] = None
+) -> Optional[ExternalSource]:
+    """
+    Parse an external source, given as its path or as an object.
+
+    The file is only read when the content is rendered, relative paths are
+    relative to ``base``, the directory of the document file, like includes,
+    and to the working directory for a document without one. The format
+    defaults to the one of the file suffix.
+    """
+    if value is None:
+        return None
+    obj = {"path": value} if isinstance(value, str) else _object(value, path)
+
+    file = _required_string(obj, "path", path)
+    suffix = os.path.splitext(file)[1].lower()
+    source_format = _string(obj, "format", path, SOURCE_FORMATS.get(suffix))
+    if source_format not in SOURCE_FORMATS.values():
+        choices = ", ".join(sorted(set(SOURCE_FORMATS.values())))
+        if source_format is None:
+            raise DocumentError(
+                f"{path}.format",
+                f"unknown suffix '{suffix}', expected one of {choices}",
+            )
+        raise DocumentError(
+            f"{path}.format",
+            f"unknown source format '{source_format}', expected one of {choices}",
+        )
+    return ExternalSource(
+        path=str(base / file) if base is not None else file,
+        format=source_format,
+        header=bool(obj.get("header", False)),
+        columns=_strings(obj.get("columns"), f"{path}.columns"),
+    )
+
+
+def _parse_list(
+    obj: Dict[str, Any], path: str, base: Optional[Path] = None
+) -> ListContent:
+    """Parse list content"""
+    items = _array(obj.get("items"), f"{path}.items")
+    style = _object(obj.get("style"), f"{path}.style")
+    return ListContent(
+        items=tuple(
+            _parse_list_item(item, f"{path}.items[{index}]")
+            for index, item in enumerate(items)
+        ),
+        show_bullets=bool(style.get("showBullets", True)),
+        source=_parse_source(obj.get("source"), f"{path}.source", base),
+    )
+
+
+def _parse_table(
+    obj: Dict[str, Any], path: str, base: Optional[Path] = None
+) -> TableContent:
+    """Parse table content"""
+    rows = _array(obj.get("rows"), f"{path}.rows")
+    chunk_rows = _integer(obj, "chunkRows", path, 0)
+    if chunk_rows < 0:
+        raise DocumentError(f"{path}.chunkRows", "expected a non negative integer")
+    return TableContent(
+        rows=tuple(
+            _strings(row, f"{path}.rows[{index}]") for index, row in enumerate(rows)
+        ),
+        source=_parse_source(obj.get("source"), f"{path}.source", base),
+        chunk_rows=chunk_rows,
+    )
+
+
+def _parse_content(
+    value: Any, path: str, base: Optional[Path] = None
+) -> Optional[Content]:
+    """
+    Parse the content of a section or subsection.
+
+    A bare array is a list of items, objects are dispatched on their ``type``
+    and unknown types fall back to a list. Empty or non object content renders
+    nothing and is dropped.
+    """
+    if isinstance(value, list):
+        value = {"type": ContentType.LIST.value, "items": value}
+
+    if not value or not isinstance(value, dict):
+        return None
+
+    content_type = value.get("type", ContentType.LIST.value)
+    if content_type == ContentType.PARAGRAPH.value:
+        return ParagraphContent(
+            text=_string(value, "text", path), href=_string(value, "href", path) or None
+        )
+    if content_type == ContentType.TABLE.value:
+        return _parse_table(value, path, base)
+    if content_type == ContentType.INLINE_LIST.value:
+        return _parse_inline_list(value, path)
+    return _parse_list(value, path, base)
+
+
+def _parse_subsection(
+    value: Any, path: str, base: Optional[Path] = None
+) -> Optional[Subsection]:
+    """Parse a subsection, empty subsections render nothing and are dropped"""
+    if not (obj := _object(value, path)):
+        return None
+
+    info = _object(obj.get("info"), f"{path}.info")
+    metadata = _object(obj.get("metadata"), f"{path}.metadata")
+    return Subsection(
+        heading=_string(obj, "heading", path),
+        info_title=_string(info, "title", f"{path}.info"),
+        info_same_line=bool(info.get("sameLine", True)),
+        location=_string(metadata, "location", f"{path}.metadata"),
+        duration=_string(metadata, "duration", f"{path}.metadata"),
+        content=_parse_content(obj.get("content"), f"{path}.content", base),
+        fragment=_string(obj, FRAGMENT_KEY, path, None),
+    )
+
+
+def _parse_section(
+    value: Any, path: str, base: Optional[Path] = None
+) -> Optional[Section]:
+    """Parse a section, empty sections render nothing and are dropped"""
+    if not (obj := _object(value, path)):
+        return None
+
+    subsections = _array(obj.get("subsections"), f"{path}.subsections")
+    parsed = (
+        _parse_subsection(subsection, f"{path}.subsections[{index}]", base)
+        for index, subsection in enumerate(subsections)
+    )
+    return Section(
+        heading=_string(obj, "heading", path),
+        column=_integer(obj, "column", path, ColumnType.SINGLE.value),
+        column_settings=_integer(obj, "columnSettings", path, None),
+        full_width=bool(obj.get("fullWidth", False)),
+        move_to_end=bool(obj.get("moveToEnd", False)),
+        subsections=tuple(subsection for subsection in parsed if subsection),
+        content=_parse_content(obj.get("content"), f"{path}.content", base),
+        fragment=_string(obj, FRAGMENT_KEY, path, None),
+    )
+
+
+def _parse_spacing(obj: Dict[str, Any], path: str) -> SpacingModel:
+    """Resolve the spacing model from its case insensitive name"""
+    name = _string(obj, "spacing", path, SpacingModel.ULTRA.name)
+    try:
+        return SpacingModel[name.upper()]
+    except KeyError:
+        choices = ", ".join(model.name.lower() for model in SpacingModel)
+        raise DocumentError(
+            f"{path}.spacing", f"unknown spacing '{name}', expected one of {choices}"
+        ) from None
+
+
+def parse_resume(
+    data: Dict[str, Any], path: Optional[Union[str, Path]] = None
+) -> Resume:
+    """
+    Parse and validate a resume document.
+
+    Every default is resolved here, once, so the renderer never has to look
+    into the raw JSON again and the parsed document can be rendered any
+    number of times.
+
+    Args:
+        data (Dict[str, Any]): The decoded JSON document
+        path (Optional[Union[str, Path]]): The file the document was read
+            from, relative source paths are resolved against its directory
+
+    Returns:
+        Resume: The typed document
+
+    Raises:
+        DocumentError: If the document does not match the expected structure,
+            the error names the JSON path of the offending value
+    """
+    obj = _object(data, ROOT_PATH)
+    resume = _object(obj.get("resume"), f"{ROOT_PATH}.resume")
+    links = _array(obj.get("links"), f"{ROOT_PATH}.links")
+    sections = _array(resume.get("sections"), f"{ROOT_PATH}.resume.sections")
+    base = Path(path).resolve().parent if path is not None else None
+
+    parsed = (
+        _parse_section(section, f"{ROOT_PATH}.resume.sections[{index}]", base)
+        for index, section in enumerate(sections)
+    )
+    return Resume(
+        first_name=_string(obj, "firstName", ROOT_PATH),
+        middle_name=_string(obj, "middleName", ROOT_PATH),
+        last_name=_string(obj, "lastName", ROOT_PATH),
+        links=tuple(
+            _parse_link(link, f"{ROOT_PATH}.links[{index}]")
+            for index, link in enumerate(links)
+        ),
+        preset=_string(obj, "preset", ROOT_PATH),
+        spacing=_parse_spacing(obj, ROOT_PATH),
+        show_last_updated=bool(obj.get("showLastUpdated", True)),
+        hide_footer=bool(obj.get("hideFooter", False)),
+        sections=tuple(section for section in parsed if section),
+    )
+
+
+def decode_resume(
+    data: Union[bytes, str], path: Optional[Union[str, Path]] = None
+) -> Resume:
+    """
+    Decode a JSON resume document straight into its typed model.
+
+    The decoded tree is dropped as soon as it is parsed, so that it is never
+    kept alongside the model while the document is rendered.
+
+    Args:
+        data (Union[bytes, str]): The JSON encoded resume document, UTF-8
+            encoded bytes or text
+        path (Optional[Union[str, Path]]): The file the data was read from,
+            includes and sources are resolved relative to it
+
+    Returns:
+        Resume: The typed document
+
+    Raises:
+        ValueError: If the data is not a valid resume document
+    """
+    return parse_resume(parse_document(data, path), path)
+
+
+def load_resume(path: Union[str, Path]) -> Resume:
+    """
+    Load a resume document from a JSON file straight into its typed model.
+
+    Args:
+        path (Union[str, Path]): Path to the JSON file
+
+    Returns:
+        Resume: The typed document
+
+    Raises:
+        ValueError: If the file is not a valid resume document
+    """
+    return parse_resume(load_document(path), path)
+
+
+def dump(node: Any) -> Any:
+    """
+    Convert a model node into plain JSON compatible values.
+
+    Sets are sorted, so equal nodes always dump to equal values, e.g. for
+    hashing them into cache keys.
+
+    Args:
+        node (Any): A model node or a value of one
+
+    Returns:
+        Any: Dicts, lists and scalars mirroring the node
+    """
+    if is_dataclass(node):
+        return {
+            "kind": type(node).__name__,
+            **{f.name: dump(getattr(node, f.name)) for f in fields(node)},
+        }
+    if isinstance(node, Enum):
+        return node.value
+    if isinstance(node, frozenset):
+        return sorted(dump(item) for item in node)
+    if isinstance(node, tuple):
+        return [dump(item) for item in node]
+    return node
+
+
+def _optional(obj: Dict[str, Any], **members: Any) -> Dict[str, Any]:
+    """Add the members that are not None to a JSON object"""
+    obj.update((key, value) for key, value in members.items() if value is not None)
+    return obj
+
+
+def _source_document(source: Optional[ExternalSource]) -> Optional[Dict[str, Any]]:
+    """The JSON object of an external source"""
+    if source is None:
+        return None
+    return {
+        "path": source.path,
+        "format": source.format,
+        "header": source.header,
+        "columns": list(source.columns),
+    }
+
+
+def _inline_list_document(inline_list: InlineList) -> Dict[str, Any]:
+    """The JSON object of an inline list"""
+    return _optional(
+        {"type": ContentType.INLINE_LIST.value, "items": list(inline_list.items)},
+        separator=inline_list.separator,
+    )
+
+
+def _item_document(item: ListItem) -> Dict[str, Any]:
+    """The JSON object of a list item"""
+    segments = [
+        _optional(
+            {"text": segment.text},
+            href=segment.href,
+            style={style.value: True for style in segment.styles} or None,
+        )
+        for segment in item.segments
+    ]
+    return _optional(
+        {"segments": segments},
+        inlineList=item.inline_list and _inline_list_document(item.inline_list),
+    )
+
+
+def _content_document(content: Optional[Content]) -> Optional[Dict[str, Any]]:
+    """The JSON object of the content of a section or subsection"""
+    if isinstance(content, ParagraphContent):
+        return _optional(
+            {"type": ContentType.PARAGRAPH.value, "text": content.text},
+            href=content.href,
+        )
+    if isinstance(content, TableContent):
+        return _optional(
+            {
+                "type": ContentType.TABLE.value,
+                "rows": [list(row) for row in content.rows],
+                "chunkRows": content.chunk_rows,
+            },
+            source=_source_document(content.source),
+        )
+    if isinstance(content, InlineList):
+        return _inline_list_document(content)
+    if isinstance(content, ListContent):
+        return _optional(
+            {
+                "type": ContentType.LIST.value,
+                "items": [_item_document(item) for item in content.items],
+                "style": {"showBullets": content.show_bullets},
+            },
+            source=_source_document(content.source),
+        )
+    return None
+
+
+def _subsection_document(subsection: Subsection) -> Dict[str, Any]:
+    """The JSON object of a subsection"""
+    return _optional(
+        {
+            "heading": subsection.heading,
+            "info": {
+                "title": subsection.info_title,
+                "sameLine": subsection.info_same_line,
+            },
+            "metadata": {
+                "location": subsection.location,
+                "duration": subsection.duration,
+            },
+        },
+        content=_content_document(subsection.content),
+        **{FRAGMENT_KEY: subsection.fragment},
+    )
+
+
+def _section_document(section: Section) -> Dict[str, Any]:
+    """The JSON object of a section"""
+    return _optional(
+        {
+            "heading": section.heading,
+            "column": section.column,
+            "fullWidth": section.full_width,
+            "moveToEnd": section.move_to_end,
+            "subsections": [_subsection_document(s) for s in section.subsections],
+        },
+        columnSettings=section.column_settings,
+        content=_content_document(section.content),
+        **{FRAGMENT_KEY: section.fragment},
+    )
+
+
+def to_document(resume: Resume) -> Dict[str, Any]:
+    """
+    Convert a parsed document back into a JSON resume document.
+
+    The document has the shape of the one it was parsed from, with every
+    default resolved and without the members that render nothing, e.g. to
+    look values up by their JSON paths. Parsing it gives the same model.
+
+    Args:
+        resume (Resume): The parsed document
+
+    Returns:
+        Dict[str, Any]: The JSON resume document
+    """
+    return {
+        "firstName": resume.first_name,
+        "middleName": resume.middle_name,
+        "lastName": resume.last_name,
+        "links": [
+            {"href": link.href, "text": link.text, "column": link.column}
+            for link in resume.links
+        ],
+        "preset": resume.preset,
+        "spacing": resume.spacing.name.lower(),
+        "showLastUpdated": resume.show_last_updated,
+        "hideFooter": resume.hide_footer,
+        "resume": {"sections": [_section_document(s) for s in resume.sections]},
+    }
@@ -0,0 +1,112 @@
+"""Key path expressions over raw JSON documents, compiled once and cached."""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Tuple, Union
+
+__all__ = ["PathError", "KeyPath", "compile_path"]
+
+# a dot separated part of a path: an optional key followed by any number of indices
+SEGMENT = re.compile(r"(?P<key>[^.\[\]]*)(?P<indices>(?:\[-?\d+\])*)")
+INDEX = re.compile(r"\[(-?\d+)\]")
+
+# compiled paths kept around, templates and validators reuse a small set of paths
+CACHE_SIZE = 1024
+
+# marks a missing member, distinct from a member that is null
+MISSING = object()
+
+
+class PathError(ValueError):
+    """Raised when a key path expression is malformed"""
+
+    def __init__(self, expression: str, message: str):
+        super().__init__(f"{expression!r}: {message}")
+        self.expression = expression
+        self.message = message
+
+
+@dataclass(frozen=True, slots=True)
+class KeyPath:
+    """
+    A compiled key path, a sequence of object keys and array indices.
+
+    Evaluating a path never raises: a missing key, an index out of range or a
+    step into a value of the wrong type all give the default.
+    """
+
+    expression: str
+    steps: Tuple[Union[str, int], ...]
+
+    def get(self, data: Any, default: Any = "") -> Any:
+        """
+        Get the value at the path.
+
+        Args:
+            data (Any): The decoded JSON document
+            default (Any): Returned when the value is missing or null
+
+        Returns:
+            Any: The value at the path, or the default
+        """
+        current = data
+        for step in self.steps:
+            if isinstance(step, str):
+                if not isinstance(current, dict):
+                    return default
+                current = current.get(step, MISSING)
+                if current is MISSING:
+                    return default
+            else:
+                if not isinstance(current, list):
+                    return default
+                if not -len(current) <= step < len(current):
+                    return default
+                current = current[step]
+
+        return default if current is None else current
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_path(expression: str) -> KeyPath:
+    """
+    Compile a key path expression into a reusable accessor.
+
+    Parts are separated by dots, every part is a key followed by any number
+    of array indices, negative indices count from the end. Only the first
+    part may omit its key, to index into a top level array.
+
+    Args:
+        expression (str): The path, e.g. ``resume.sections[2].subsections[0].heading``
+
+    Returns:
+        KeyPath: The compiled path, the same instance for the same expression
+
+    Raises:
+        PathError: If the expression is malformed
+
+    Examples:
+        >>> compile_path("resume.sections[2].subsections[0].heading").steps
+        ('resume', 'sections', 2, 'subsections', 0, 'heading')
+        >>> compile_path("rows[0][1]").get({"rows": [["a", "b"]]})
+        'b'
+    """
+    if not expression:
+        raise PathError(expression, "empty path")
+
+    steps = []
+    for position, part in enumerate(expression.split(".")):
+        match = SEGMENT.fullmatch(part)
+        if match is None:
+            raise PathError(expression, f"malformed part {part!r}")
+
+        key, indices = match.group("key"), match.group("indices")
+        if key:
+            steps.append(key)
+        elif position or not indices:
+            raise PathError(expression, "empty key")
+
+        steps.extend(int(index) for index in INDEX.findall(indices))
+
+    return KeyPath(expression=expression, steps=tuple(steps))
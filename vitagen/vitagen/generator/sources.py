@@ -0,0 +1,236 @@
+"""Rows and items of content read lazily from external CSV and JSONL files."""
+
+import csv
+import json
+import os
+import re
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+from vitagen.generator.model import (
+    Content,
+    DocumentError,
+    ExternalSource,
+    ListContent,
+    ListItem,
+    Resume,
+    Section,
+    Segment,
+    TableContent,
+    _parse_list_item,
+)
+
+__all__ = [
+    "iter_rows",
+    "iter_items",
+    "table_rows",
+    "list_items",
+    "has_sources",
+    "external_sources",
+    "check_sources",
+    "iter_lines",
+    "StreamingSink",
+]
+
+# stands in for streamed content in rendered fragments until they are written
+STREAM_MARKER = re.compile("\x00stream:([0-9]+)\x00")
+
+
+def _records(source: ExternalSource) -> Iterator[Tuple[str, Any]]:
+    """Every record of a source with its location, one line at a time"""
+    with open(source.path, "r", encoding="utf-8", newline="") as f:
+        if source.format == "csv":
+            for number, row in enumerate(csv.reader(f), start=1):
+                yield f"{source.path}:{number}", row
+            return
+
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            location = f"{source.path}:{number}"
+            try:
+                yield location, json.loads(line)
+            except ValueError as e:
+                raise DocumentError(location, f"invalid json: {e}") from None
+
+
+def _cell(value: Any, location: str) -> str:
+    """A cell of a record, scalars of JSONL records are written as they read"""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        raise DocumentError(location, f"expected a scalar, got {type(value).__name__}")
+    return value if isinstance(value, str) else str(value)
+
+
+def _cells(source: ExternalSource) -> Iterator[Tuple[str, Any]]:
+    """
+    Every record of a source, rows reduced to the columns of the source.
+
+    Objects of JSONL sources are kept as they are, so that lists can parse
+    them as items, every other record is a tuple of cells.
+    """
+    names: Optional[List[str]] = None
+    for location, record in _records(source):
+        if source.header and names is None:
+            names = [_cell(name, location) for name in record]
+            continue
+
+        if isinstance(record, dict):
+            yield location, record
+            continue
+        if not isinstance(record, list):
+            raise DocumentError(
+                location, f"expected an array or object, got {type(record).__name__}"
+            )
+
+        if source.columns and names is not None:
+            by_name = dict(zip(names, record))
+            record = [by_name.get(column) for column in source.columns]
+        yield location, tuple(_cell(value, location) for value in record)
+
+
+def iter_rows(source: ExternalSource) -> Iterator[Tuple[str, ...]]:
+    """
+    Read the rows of a table from a source, one at a time.
+
+    Args:
+        source (ExternalSource): The source of the rows
+
+    Yields:
+        Tuple[str, ...]: The cells of a row, for JSONL objects the values of
+            the columns of the source, or of every key without columns
+
+    Raises:
+        DocumentError: If a record is not a row, naming its file and line
+    """
+    for location, record in _cells(source):
+        if isinstance(record, dict):
+            keys = source.columns or tuple(record)
+            record = tuple(_cell(record.get(key), location) for key in keys)
+        yield record
+
+
+def iter_items(source: ExternalSource) -> Iterator[ListItem]:
+    """
+    Read the items of a list from a source, one at a time.
+
+    Args:
+        source (ExternalSource): The source of the items
+
+    Yields:
+        ListItem: JSONL objects parsed as list items, every other row as an
+            item with a plain segment per cell
+
+    Raises:
+        DocumentError: If a record is not an item, naming its file and line
+    """
+    for location, record in _cells(source):
+        if isinstance(record, dict):
+            yield _parse_list_item(record, location)
+        else:
+            yield ListItem(segments=tuple(Segment(text=cell) for cell in record))
+
+
+def table_rows(content: TableContent) -> Iterator[Tuple[str, ...]]:
+    """The inline rows of a table followed by those of its source"""
+    yield from content.rows
+    if content.source is not None:
+        yield from iter_rows(content.source)
+
+
+def list_items(content: ListContent) -> Iterator[ListItem]:
+    """The inline items of a list followed by those of its source"""
+    yield from content.items
+    if content.source is not None:
+        yield from iter_items(content.source)
+
+
+def _content_source(content: Optional[Content]) -> Optional[ExternalSource]:
+    """The external source of content, if it has one"""
+    return getattr(content, "source", None)
+
+
+def has_sources(section: Section) -> bool:
+    """Whether a section or one of its subsections reads an external source"""
+    return _content_source(section.content) is not None or any(
+        _content_source(subsection.content) is not None
+        for subsection in section.subsections
+    )
+
+
+def external_sources(document: Resume) -> Iterator[ExternalSource]:
+    """Every external source a document reads, in document order"""
+    for section in document.sections:
+        for subsection in section.subsections:
+            if (source := _content_source(subsection.content)) is not None:
+                yield source
+        if (source := _content_source(section.content)) is not None:
+            yield source
+
+
+def check_sources(document: Resume) -> None:
+    """
+    Check that every external source of a document exists, before rendering.
+
+    Raises:
+        DocumentError: If a source file does not exist
+    """
+    for source in external_sources(document):
+        if not os.path.isfile(source.path):
+            raise DocumentError(source.path, "source file not found")
+
+
+def iter_lines(parts: Iterable[str], separator: str = "\n") -> Iterator[str]:
+    """
+    Join the non empty parts with a separator, lazily.
+
+    Yields:
+        str: The pieces of ``separator.join(filter(None, parts))``
+    """
+    pending = ""
+    for part in parts:
+        if part:
+            yield f"{pending}{part}"
+            pending = separator
+
+
+class StreamingSink:
+    """
+    Sink writing streamed content in place of the markers standing in for it.
+
+    Rendering content of an external source only leaves a marker in its
+    fragment, the content is read, formatted and written chunk by chunk once
+    the fragment is written, so that it is never held in memory.
+    """
+
+    def __init__(self, sink: TextIO):
+        self.sink = sink
+        self.streams: List[Optional[Callable[[], Iterator[str]]]] = []
+
+    def defer(self, chunks: Callable[[], Iterator[str]]) -> str:
+        """
+        Stand in for streamed content until the fragment holding it is written.
+
+        Args:
+            chunks: Produces the content, chunk by chunk, when called
+
+        Returns:
+            str: The marker to put in the fragment
+        """
+        self.streams.append(chunks)
+        return f"\x00stream:{len(self.streams) - 1}\x00"
+
+    def write(self, text: str) -> int:
+        """Write a fragment, streaming the content of its markers"""
+        if "\x00" not in text:
+            return self.sink.write(text)
+
+        position = 0
+        for match in STREAM_MARKER.finditer(text):
+            self.sink.write(text[position : match.start()])
+            index = int(match.group(1))
+            chunks, self.streams[index] = self.streams[index], None
+            for chunk in chunks():
+                self.sink.write(chunk)
+            position = match.end()
+        self.sink.write(text[position:])
+        return len(text)
@@ -0,0 +1,176 @@
+"""Rendering of many preset and spacing variants of a resume from one parse."""
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING
+from vitagen.generator.config.spacing_factor import SpacingModel
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import Resume
+from vitagen.profiling import no_span
+
+if TYPE_CHECKING:
+    from vitagen.generator.cache import SectionCache
+    from vitagen.generator.config.theme import Theme
+    from vitagen.profiling import SpanTracer
+
+__all__ = ["Variant", "parse_variant", "variant_output", "render_variants"]
+
+# accepted spellings of the boolean settings of a variant
+BOOLEANS = {
+    "true": True,
+    "yes": True,
+    "1": True,
+    "false": False,
+    "no": False,
+    "0": False,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Variant:
+    """Document level settings overridden for one variant, None keeps the document's"""
+
+    preset: Optional[str] = None
+    spacing: Optional[SpacingModel] = None
+    show_last_updated: Optional[bool] = None
+    hide_footer: Optional[bool] = None
+    name: str = ""
+
+    @property
+    def label(self) -> str:
+        """The name of the variant, derived from its settings when not given"""
+        if self.name:
+            return self.name
+
+        parts = []
+        if self.preset is not None:
+            parts.append(self.preset)
+        if self.spacing is not None:
+            parts.append(self.spacing.name.lower())
+        if self.show_last_updated is not None:
+            parts.append("updated" if self.show_last_updated else "no-updated")
+        if self.hide_footer is not None:
+            parts.append("no-footer" if self.hide_footer else "footer")
+        return "-".join(parts) or "default"
+
+    def apply(self, document: Resume) -> Resume:
+        """The document with the settings of the variant applied"""
+        changes = {
+            "preset": self.preset,
+            "spacing": self.spacing,
+            "show_last_updated": self.show_last_updated,
+            "hide_footer": self.hide_footer,
+        }
+        return replace(
+            document,
+            **{key: value for key, value in changes.items() if value is not None},
+        )
+
+
+def _boolean(key: str, value: str) -> bool:
+    """Parse a boolean setting of a variant"""
+    if value.lower() not in BOOLEANS:
+        raise ValueError(f"{key} must be true or false, got '{value}'")
+    return BOOLEANS[value.lower()]
+
+
+def parse_variant(spec: str) -> Variant:
+    """
+    Parse a variant from its command line form.
+
+    Args:
+        spec (str): Comma separated settings, e.g.
+            ``preset=carlito,spacing=ultra,showLastUpdated=false,hideFooter=true``.
+            ``name`` sets the label the output is named after.
+
+    Returns:
+        Variant: The parsed variant
+
+    Raises:
+        ValueError: If a setting is unknown or has an invalid value
+    """
+    settings: Dict[str, Any] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        key, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"expected key=value, got '{item}'")
+
+        if key in ("preset", "name"):
+            settings[key] = value
+        elif key == "spacing":
+            try:
+                settings["spacing"] = SpacingModel[value.upper()]
+            except KeyError:
+                choices = ", ".join(model.name.lower() for model in SpacingModel)
+                raise ValueError(
+                    f"unknown spacing '{value}', expected one of {choices}"
+                ) from None
+        elif key == "showLastUpdated":
+            settings["show_last_updated"] = _boolean(key, value)
+        elif key == "hideFooter":
+            settings["hide_footer"] = _boolean(key, value)
+        else:
+            raise ValueError(f"unknown variant setting '{key}'")
+
+    return Variant(**settings)
+
+
+def variant_output(output: Union[str, Path], variant: Variant) -> Path:
+    """The output path of a variant, e.g. ``resume.tex`` -> ``resume-ultra.tex``"""
+    output = Path(output)
+    return output.with_name(f"{output.stem}-{variant.label}{output.suffix}")
+
+
+def render_variants(
+    data: Union[Dict[str, Any], Resume],
+    variants: Iterable[Variant],
+    *,
+    unicode_escapes: bool = False,
+    section_cache: Optional["SectionCache"] = None,
+    theme: Optional["Theme"] = None,
+    tracer: Optional["SpanTracer"] = None,
+) -> List[Tuple[Variant, str]]:
+    """
+    Render every variant of a document from a single parse.
+
+    The header and every section are rendered once and shared by all
+    variants, each variant only renders its own preamble, column layout and
+    footer.
+
+    Args:
+        data (Union[Dict[str, Any], Resume]): The raw or parsed document
+        variants (Iterable[Variant]): The variants to render
+        unicode_escapes (bool): Escape with unicode aware replacements
+        section_cache (Optional[SectionCache]): Persistent section cache
+        theme (Optional[Theme]): Formatter configuration
+        tracer (Optional[SpanTracer]): Records a ``variant`` span per variant
+
+    Returns:
+        List[Tuple[Variant, str]]: Every variant with its LaTeX output, in order
+
+    Examples:
+        >>> outputs = render_variants(data, [Variant(spacing=SpacingModel.NORMAL)])
+    """
+    generator = ResumeContentGenerator(
+        data,
+        unicode_escapes,
+        section_cache,
+        theme=theme,
+        tracer=tracer,
+    )
+    span = tracer.span if tracer else no_span
+    document = generator.document
+    generator.shared_fragments = {}
+
+    outputs = []
+    try:
+        for variant in variants:
+            generator.document = variant.apply(document)
+            with span("variant", variant=variant.label):
+                outputs.append((variant, generator.build_resume()))
+    finally:
+        generator.document = document
+        generator.shared_fragments = None
+
+    return outputs
@@ -0,0 +1,203 @@
+"""Byte offset index of JSONL files, records read by offset instead of line by line."""
+
+import json
+import mmap
+import os
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+from vitagen.utils import write_atomic
+
+__all__ = ["JsonlRecord", "JsonlIndex", "build_index", "load_index", "read_record"]
+
+# bump to rebuild every cached index regardless of its source
+INDEX_VERSION = 1
+
+# columns of an index, an array of unsigned 64 bit integers each
+COLUMNS = ("lines", "offsets", "lengths", "crcs")
+
+
+@dataclass(frozen=True, slots=True)
+class JsonlRecord:
+    """A non blank line of a JSONL file"""
+
+    line: int
+    offset: int
+    length: int
+    # CRC-32 of the bytes of the line, telling an edited record from the same one
+    crc: int
+
+
+@dataclass
+class JsonlIndex:
+    """
+    Offsets of the records of a JSONL file, as of its size and modification time.
+
+    Records are kept in columns of integers instead of objects, so that the
+    index of a file of many thousands of records stays small and loads in a
+    single read.
+    """
+
+    path: str
+    size: int = 0
+    mtime_ns: int = 0
+    lines: array = field(default_factory=lambda: array("Q"))
+    offsets: array = field(default_factory=lambda: array("Q"))
+    lengths: array = field(default_factory=lambda: array("Q"))
+    crcs: array = field(default_factory=lambda: array("Q"))
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __iter__(self) -> Iterator[JsonlRecord]:
+        for line, offset, length, crc in zip(
+            self.lines, self.offsets, self.lengths, self.crcs
+        ):
+            yield JsonlRecord(line=line, offset=offset, length=length, crc=crc)
+
+    def matches(self, path: Union[str, Path]) -> bool:
+        """Whether the index is the one of a file as it is now"""
+        stat = os.stat(path)
+        return (
+            self.path == str(Path(path).resolve())
+            and self.size == stat.st_size
+            and self.mtime_ns == stat.st_mtime_ns
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialize the index, a JSON header line followed by its columns"""
+        header = {
+            "version": INDEX_VERSION,
+            "byteorder": sys.byteorder,
+            "path": self.path,
+            "size": self.size,
+            "mtimeNs": self.mtime_ns,
+            "count": len(self),
+        }
+        columns = b"".join(getattr(self, column).tobytes() for column in COLUMNS)
+        return json.dumps(header).encode("utf-8") + b"\n" + columns
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "JsonlIndex":
+        """
+        Deserialize an index written by ``to_bytes``.
+
+        Raises:
+            ValueError: If the data is not an index of the current version
+        """
+        head, _, body = data.partition(b"\n")
+        header = json.loads(head)
+        if (header.get("version"), header.get("byteorder")) != (
+            INDEX_VERSION,
+            sys.byteorder,
+        ):
+            raise ValueError("index of another version")
+
+        index = cls(
+            path=header["path"], size=header["size"], mtime_ns=header["mtimeNs"]
+        )
+        width = header["count"] * index.offsets.itemsize
+        if len(body) != width * len(COLUMNS):
+            raise ValueError("truncated index")
+        for position, column in enumerate(COLUMNS):
+            getattr(index, column).frombytes(
+                body[position * width : (position + 1) * width]
+            )
+        return index
+
+
+def _lines(data: Union[bytes, mmap.mmap]) -> Iterator[Tuple[int, int, int]]:
+    """Yield (line number, offset, length) of every line of the data"""
+    offset, number, size = 0, 1, len(data)
+    while offset < size:
+        end = data.find(b"\n", offset)
+        if end < 0:
+            end = size
+        yield number, offset, end - offset
+        offset, number = end + 1, number + 1
+
+
+def build_index(path: Union[str, Path]) -> JsonlIndex:
+    """
+    Index the records of a JSONL file, reading it once through a memory map.
+
+    Args:
+        path (Union[str, Path]): The JSONL file
+
+    Returns:
+        JsonlIndex: The line, offset, length and checksum of every non blank line
+    """
+    path = Path(path).resolve()
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        index = JsonlIndex(path=str(path), size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        if not stat.st_size:
+            return index
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for number, offset, length in _lines(data):
+                record = data[offset : offset + length]
+                if not record.strip():
+                    continue
+                index.lines.append(number)
+                index.offsets.append(offset)
+                index.lengths.append(length)
+                index.crcs.append(zlib.crc32(record))
+    return index
+
+
+def load_index(path: Union[str, Path], cache: Union[str, Path]) -> JsonlIndex:
+    """
+    Get the index of a JSONL file, from a cache file while the file is unchanged.
+
+    Args:
+        path (Union[str, Path]): The JSONL file
+        cache (Union[str, Path]): The file the index is cached in, rebuilt and
+            replaced once the JSONL file changed
+
+    Returns:
+        JsonlIndex: The index of the file as it is now
+    """
+    try:
+        index = JsonlIndex.from_bytes(Path(cache).read_bytes())
+        if index.matches(path):
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+
+    index = build_index(path)
+    write_atomic(cache, index.to_bytes())
+    return index
+
+
+@lru_cache(maxsize=8)
+def _mapped(
+    path: str, size: int, mtime_ns: int  # pylint: disable=unused-argument
+) -> mmap.mmap:
+    """A read only map of a file, kept by the process while the file is unchanged"""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_record(path: Union[str, Path], offset: int, length: int) -> bytes:
+    """
+    Read a record of a JSONL file by its offset, without reading the records
+    before it.
+
+    Every process maps the file once and slices its records out of the map.
+
+    Args:
+        path (Union[str, Path]): The JSONL file
+        offset (int): Offset of the record, from its index
+        length (int): Length of the record, from its index
+
+    Returns:
+        bytes: The record
+    """
+    stat = os.stat(path)
+    data = _mapped(str(path), stat.st_size, stat.st_mtime_ns)
+    return data[offset : offset + length]
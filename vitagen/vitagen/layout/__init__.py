@@ -0,0 +1 @@
+"""Page layout estimates computed from font metrics, without running LaTeX."""
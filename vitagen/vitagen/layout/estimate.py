@@ -0,0 +1,480 @@
+"""Page fill of a resume under every spacing model, estimated from font metrics."""
+
+# The document model is imported when an estimate runs, so that registering
+# the estimate command on the command line parser stays cheap.
+# pylint: disable=import-outside-toplevel
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+from vitagen.generator.config.spacing_factor import SpacingModel
+from vitagen.layout.fonts import (
+    PROJECT_ROOT,
+    FontMetrics,
+    PresetFonts,
+    load_preset_fonts,
+)
+
+if TYPE_CHECKING:
+    from vitagen.generator.config.theme import Theme
+    from vitagen.generator.model import (
+        Content,
+        ListItem,
+        Resume,
+        Section,
+        Subsection,
+    )
+
+__all__ = [
+    "FillEstimate",
+    "PageEstimator",
+    "PROJECT_ROOT",
+    "estimate_fill",
+    "recommend_spacing",
+    "select_spacing",
+    "add_arguments",
+    "main",
+]
+
+# page geometry of resume.cls in points: US letter, 1.25cm by 0.7cm margins
+TEXT_WIDTH = 614.295 - 2 * 35.565
+TEXT_HEIGHT = 794.97 - 2 * 19.917
+# the footer text block starts 270mm from the top of the page
+FOOTER_TOP = 768.222 - 19.917
+
+# paracol and multicols column separation, the fboxsep around section minipages
+COLUMN_SEP = 10.0
+MINIPAGE_INSET = 2 * 3.0
+
+# theme/sizes/golden-ration.tex, heights are multiplied by the spacing scale
+NORMAL_SIZE = 12.0
+GOLDEN_RATIO = 1.618
+SMALL_SIZE = NORMAL_SIZE / GOLDEN_RATIO
+LARGE_SIZE = NORMAL_SIZE * GOLDEN_RATIO
+HUGE_SIZE = NORMAL_SIZE * GOLDEN_RATIO * GOLDEN_RATIO * 1.2
+INFO_SIZE = NORMAL_SIZE - 1
+ADDITIONAL_INFO_SIZE = NORMAL_SIZE - 2
+
+# the body is set in the 10pt article class size with its 12pt leading
+BODY_SIZE = 10.0
+BODY_LEADING = 12.0
+# tightemize indents its items by the itemize margin and spaces them by 1pt
+BULLET_INDENT = 2.5 * BODY_SIZE
+BULLET_GAP = 1.0
+# \vspace{0.5em} below a section title, \vspace{5pt} below the name
+SECTION_TITLE_GAP = 0.5 * BODY_SIZE
+NAME_GAP = 5.0
+RULE_HEIGHT = 0.4
+
+INLINE_LIST_SEPARATOR = " • "
+INFO_SEPARATOR = " | "
+
+
+@dataclass(frozen=True, slots=True)
+class FillEstimate:
+    """Estimated height of a document set with one spacing model"""
+
+    spacing: SpacingModel
+    height_pt: float
+    available_pt: float
+
+    @property
+    def fill(self) -> float:
+        """Share of the page the document takes, above 1 when it overflows"""
+        return self.height_pt / self.available_pt
+
+    @property
+    def fits(self) -> bool:
+        """Whether the document fits on a single page"""
+        return self.height_pt <= self.available_pt
+
+
+def _lines(words: Iterable[float], space: float, width: float) -> int:
+    """Lines a greedy line breaker fills with words of the given widths"""
+    lines, line = 0, 0.0
+    for word in words:
+        if lines and line + space + word <= width:
+            line += space + word
+        else:
+            # a word wider than the line overflows it, the layout is sloppy
+            lines, line = lines + 1, word
+    return lines
+
+
+def _words(text: str, font: FontMetrics, size: float) -> List[float]:
+    """Widths of the words of a text"""
+    return [font.width(word, size) for word in text.split()]
+
+
+class PageEstimator:
+    """
+    Estimates the height of a resume from the advance widths of its fonts.
+
+    Text is broken into lines greedily without hyphenation or kerning, every
+    line takes the leading of its font size. Heights that do not depend on
+    the spacing scale, the body text in particular, are measured once and
+    reused for every spacing model.
+    """
+
+    def __init__(self, fonts: PresetFonts, theme: Optional["Theme"] = None):
+        from vitagen.generator.config.theme import DEFAULT_THEME
+
+        self.fonts = fonts
+        self.theme = theme or DEFAULT_THEME
+        self.content_heights: Dict[Tuple[int, float], float] = {}
+
+    def estimate(self, document: "Resume", spacing: SpacingModel) -> FillEstimate:
+        """
+        Estimate the height of a document set with a spacing model.
+
+        Args:
+            document (Resume): The parsed document
+            spacing (SpacingModel): The spacing model to set it with
+
+        Returns:
+            FillEstimate: The height against the height available on the page
+        """
+        from vitagen.generator.config.base import ColumnType
+
+        height = self.header_height(document)
+        if document.is_multi_column:
+            # only the paracol columns are scaled by the spacing model
+            scale = spacing.value
+            usable = TEXT_WIDTH - COLUMN_SEP
+            ratio = self.theme.column.ratio
+            height += max(
+                self.column_height(
+                    document.sections, ColumnType.LEFT.value, usable * ratio, scale
+                ),
+                self.column_height(
+                    document.sections,
+                    ColumnType.RIGHT.value,
+                    usable * (1 - ratio),
+                    scale,
+                ),
+            )
+        else:
+            height += sum(
+                self.section_height(section, TEXT_WIDTH - MINIPAGE_INSET, 1.0)
+                for section in document.sections
+            )
+
+        available = TEXT_HEIGHT if document.hide_footer else FOOTER_TOP
+        return FillEstimate(spacing=spacing, height_pt=height, available_pt=available)
+
+    def header_height(self, document: "Resume") -> float:
+        """Height of the name, the profile links and the rule below them"""
+        fonts = self.fonts
+        words = _words(document.first_name, fonts.first_name, HUGE_SIZE)
+        words += _words(document.last_name, fonts.last_name, HUGE_SIZE)
+        space = fonts.last_name.width(" ", HUGE_SIZE)
+        height = _lines(words, space, TEXT_WIDTH) * HUGE_SIZE * GOLDEN_RATIO
+
+        rows: Dict[int, List[str]] = {}
+        for link in document.links:
+            rows.setdefault(link.column, []).append(link.text)
+        space = fonts.profile_links.width(" ", NORMAL_SIZE)
+        for column in range(1, max(rows, default=0) + 1):
+            text = INFO_SEPARATOR.join(rows.get(column, ()))
+            words = _words(text, fonts.profile_links, NORMAL_SIZE)
+            lines = max(_lines(words, space, TEXT_WIDTH), 1)
+            height += lines * NORMAL_SIZE * GOLDEN_RATIO
+
+        return height + NAME_GAP + RULE_HEIGHT
+
+    def column_height(
+        self,
+        sections: Iterable["Section"],
+        column: int,
+        width: float,
+        scale: float,
+    ) -> float:
+        """Height of the sections of one paracol column"""
+        return sum(
+            self.section_height(section, width - MINIPAGE_INSET, scale)
+            for section in sections
+            if section.column == column
+        )
+
+    def section_height(self, section: "Section", width: float, scale: float) -> float:
+        """Height of a section set in a minipage of the given width"""
+        if section.full_width:
+            width = TEXT_WIDTH
+
+        title = _words(section.heading.upper(), self.fonts.section, LARGE_SIZE)
+        space = self.fonts.section.width(" ", LARGE_SIZE)
+        height = 2 * SMALL_SIZE + SECTION_TITLE_GAP
+        height += _lines(title, space, width) * LARGE_SIZE * GOLDEN_RATIO * scale
+
+        if section.subsections:
+            height += self.subsections_height(section, width, scale)
+        if section.content is not None:
+            height += self.content_height(section.content, width)
+        return height
+
+    def subsections_height(
+        self, section: "Section", width: float, scale: float
+    ) -> float:
+        """Height of the subsections of a section, balanced over its columns"""
+        subsections = section.subsections
+        columns = self.theme.subsection.get_column_settings(section)
+
+        if columns <= 1:
+            heights = [self.subsection_height(s, width, scale) for s in subsections]
+            return sum(heights) + SMALL_SIZE * (len(heights) - 1)
+
+        # multicols balances the columns, a subsection minipage never breaks
+        width = (width - COLUMN_SEP * (columns - 1)) / columns
+        heights = [self.subsection_height(s, width, scale) for s in subsections]
+        multicol_sep = -10 + 2 * scale
+        return max(*heights, sum(heights) / columns) + 2 * multicol_sep
+
+    def subsection_height(
+        self, subsection: "Subsection", width: float, scale: float
+    ) -> float:
+        """Height of a subsection with its heading, info, metadata and content"""
+        fonts = self.fonts
+        heading = _words(subsection.heading.upper(), fonts.subsection, NORMAL_SIZE)
+        info = _words(subsection.info_title, fonts.info, INFO_SIZE)
+        heading_space = fonts.subsection.width(" ", NORMAL_SIZE)
+        info_space = fonts.info.width(" ", INFO_SIZE)
+        normal_height = NORMAL_SIZE * GOLDEN_RATIO * scale
+        info_height = INFO_SIZE * GOLDEN_RATIO * scale
+
+        height = 0.0
+        if heading and info and subsection.info_same_line:
+            separator = fonts.info.width(INFO_SEPARATOR.strip(), INFO_SIZE)
+            words = heading + [separator] + info
+            height += _lines(words, info_space, width) * normal_height
+        else:
+            height += _lines(heading, heading_space, width) * normal_height
+            height += _lines(info, info_space, width) * info_height
+
+        height += self.metadata_height(subsection, width, scale)
+        if subsection.content is not None:
+            height += self.content_height(subsection.content, width)
+        return height
+
+    def metadata_height(
+        self, subsection: "Subsection", width: float, scale: float
+    ) -> float:
+        """Height of the location and duration of a subsection"""
+        metadata = INFO_SEPARATOR.join(
+            filter(None, (subsection.location, subsection.duration))
+        )
+        font = self.fonts.additional_info
+        words = _words(metadata, font, ADDITIONAL_INFO_SIZE)
+        lines = _lines(words, font.width(" ", ADDITIONAL_INFO_SIZE), width)
+        return lines * ADDITIONAL_INFO_SIZE * GOLDEN_RATIO * scale
+
+    def content_height(self, content: "Content", width: float) -> float:
+        """Height of list, paragraph, table or inline list content"""
+        key = (id(content), width)
+        if key not in self.content_heights:
+            self.content_heights[key] = self._content_height(content, width)
+        return self.content_heights[key]
+
+    def _content_height(self, content: "Content", width: float) -> float:
+        """Height of content, set in the body font that is not scaled"""
+        from vitagen.generator.model import (
+            InlineList,
+            ListContent,
+            ParagraphContent,
+            TableContent,
+        )
+        from vitagen.generator.sources import list_items, table_rows
+
+        space = self.fonts.main.width(" ", BODY_SIZE)
+        if isinstance(content, ListContent):
+            indent, gap = (
+                (BULLET_INDENT, BULLET_GAP) if content.show_bullets else (0.0, 0.0)
+            )
+            return sum(
+                self.list_item_lines(item, width - indent) * BODY_LEADING + gap
+                for item in list_items(content)
+            )
+        if isinstance(content, ParagraphContent):
+            words = _words(content.text, self.fonts.main, BODY_SIZE)
+            return _lines(words, space, width) * BODY_LEADING
+        if isinstance(content, TableContent):
+            # tabular rows never wrap
+            return sum(1 for _ in table_rows(content)) * BODY_LEADING
+        if isinstance(content, InlineList):
+            return self.inline_list_lines(content, width) * BODY_LEADING
+        return 0.0
+
+    def list_item_lines(self, item: "ListItem", width: float) -> int:
+        """Lines of a list item, its inline list starting on a line of its own"""
+        from vitagen.generator.config.base import TextStyle
+
+        fonts = self.fonts
+        words: List[float] = []
+        for segment in item.segments:
+            font = fonts.bold if TextStyle.BOLD in segment.styles else fonts.main
+            words += _words(segment.text, font, BODY_SIZE)
+
+        lines = _lines(words, fonts.main.width(" ", BODY_SIZE), width)
+        if item.inline_list is not None:
+            lines += self.inline_list_lines(item.inline_list, width)
+        return lines
+
+    def inline_list_lines(self, inline_list, width: float) -> int:
+        """Lines of the items of an inline list and their separators"""
+        text = INLINE_LIST_SEPARATOR.join(inline_list.items)
+        words = _words(text, self.fonts.main, BODY_SIZE)
+        return _lines(words, self.fonts.main.width(" ", BODY_SIZE), width)
+
+
+def estimate_fill(
+    document: "Resume",
+    *,
+    theme: Optional["Theme"] = None,
+    root: Union[str, Path, None] = None,
+    models: Iterable[SpacingModel] = SpacingModel,
+) -> List[FillEstimate]:
+    """
+    Estimate the page fill of a document under every spacing model.
+
+    Args:
+        document (Resume): The parsed document
+        theme (Optional[Theme]): Formatter configuration, for column settings
+        root (Union[str, Path, None]): Directory holding ``theme/`` and
+            ``fonts/``, defaults to ``PROJECT_ROOT``
+        models (Iterable[SpacingModel]): The spacing models to estimate
+
+    Returns:
+        List[FillEstimate]: One estimate per model, densest model first
+
+    Examples:
+        >>> estimates = estimate_fill(parse_resume(data))
+        >>> [estimate.fits for estimate in estimates]
+        [True, True, True, False, ...]
+    """
+    fonts = load_preset_fonts(Path(root or PROJECT_ROOT), document.preset)
+    estimator = PageEstimator(fonts, theme)
+    return [
+        estimator.estimate(document, model)
+        for model in sorted(models, key=lambda model: model.value)
+    ]
+
+
+def recommend_spacing(
+    estimates: Iterable[FillEstimate], current: Optional[SpacingModel] = None
+) -> FillEstimate:
+    """
+    Pick the spacing model that fills the page the most while still fitting.
+
+    Every model denser than one that fits fits as well, the recommendation
+    is the loosest of them. When no model fits, the densest one is picked.
+    Among models filling the page equally, e.g. all models of a single
+    column document, the current model of the document is kept.
+
+    Args:
+        estimates (Iterable[FillEstimate]): The estimates of the candidate models
+        current (Optional[SpacingModel]): The model the document is set with
+
+    Returns:
+        FillEstimate: The estimate of the recommended model
+    """
+    estimates = list(estimates)
+    fitting = [estimate for estimate in estimates if estimate.fits]
+    if not fitting:
+        return min(
+            estimates,
+            key=lambda estimate: (
+                round(estimate.height_pt, 3),
+                estimate.spacing != current,
+            ),
+        )
+
+    return max(
+        fitting,
+        key=lambda estimate: (
+            round(estimate.height_pt, 3),
+            estimate.spacing == current,
+            estimate.spacing.value,
+        ),
+    )
+
+
+def select_spacing(
+    document: "Resume",
+    *,
+    theme: Optional["Theme"] = None,
+    root: Union[str, Path, None] = None,
+) -> FillEstimate:
+    """Estimate every spacing model and recommend one for the document"""
+    estimates = estimate_fill(document, theme=theme, root=root)
+    return recommend_spacing(estimates, document.spacing)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the estimate options to a parser"""
+    parser.add_argument("document", help="path to the JSON file")
+    parser.add_argument(
+        "--root",
+        default=str(PROJECT_ROOT),
+        help="directory holding the theme/ presets and the fonts/ they use",
+    )
+    parser.add_argument("--preset", help="estimate with another preset")
+    parser.add_argument("--json", action="store_true", help="print a json report")
+
+
+def _print_report(
+    estimates: List[FillEstimate], recommended: FillEstimate, current: SpacingModel
+) -> None:
+    """Print a human readable report"""
+    for estimate in estimates:
+        marks = []
+        if estimate.spacing == recommended.spacing:
+            marks.append("recommended")
+        if estimate.spacing == current:
+            marks.append("current")
+        if not estimate.fits:
+            marks.append("overflows")
+        print(
+            f"{estimate.spacing.name.lower():<12} {estimate.fill:>7.1%} "
+            f"{estimate.height_pt:>8.1f} pt  {', '.join(marks)}".rstrip()
+        )
+
+
+def main(args: argparse.Namespace, theme: Optional["Theme"] = None) -> int:
+    """Estimate a document, fails when it overflows under every spacing model"""
+    from dataclasses import replace
+    from vitagen.generator.model import load_resume
+
+    document = load_resume(Path(args.document).resolve())
+    if args.preset is not None:
+        document = replace(document, preset=args.preset)
+
+    estimates = estimate_fill(document, theme=theme, root=args.root)
+    recommended = recommend_spacing(estimates, document.spacing)
+
+    if args.json:
+        report = {
+            "estimates": [
+                {
+                    **asdict(estimate),
+                    "spacing": estimate.spacing.name.lower(),
+                    "fill": estimate.fill,
+                    "fits": estimate.fits,
+                }
+                for estimate in estimates
+            ],
+            "current": document.spacing.name.lower(),
+            "recommended": recommended.spacing.name.lower(),
+        }
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(estimates, recommended, document.spacing)
+
+    return 0 if recommended.fits else 1
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    add_arguments(arg_parser)
+    sys.exit(main(arg_parser.parse_args()))
@@ -0,0 +1,395 @@
+"""Glyph advance widths of the bundled fonts and of the fonts a preset selects."""
+
+import re
+import struct
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+__all__ = [
+    "FontError",
+    "FontMetrics",
+    "PresetFonts",
+    "PROJECT_ROOT",
+    "DEFAULT_PRESET",
+    "read_font",
+    "preset_macros",
+    "preset_sources",
+    "load_preset_fonts",
+]
+
+# the directory the LaTeX sources are compiled from, holding theme/ and fonts/
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# the preset the generator falls back to when a document names none
+DEFAULT_PRESET = "deedy-inspired-open-fonts"
+
+FONT_SUFFIXES = (".ttf", ".otf")
+
+# average advance in em of fonts that are not bundled, e.g. system fonts
+FALLBACK_ADVANCE = 0.46
+FALLBACK_UNITS_PER_EM = 1000
+
+# fallbacks of modifiers/default-fonts.tex, a role left empty by the preset
+# uses the font of another role
+ROLE_FALLBACKS = (
+    ("mainfont", "lightfont"),
+    ("extralightfont", "lightfont"),
+    ("firstnamefont", "thinfont"),
+    ("lastnamefont", "lightfont"),
+    ("lastupdatedfont", "extralightfont"),
+    ("sectionfont", "lightfont"),
+    ("subsectionfont", "boldfont"),
+    ("profilelinksfont", "mediumfont"),
+    ("infofont", "mediumfont"),
+    ("additionalinfofont", "mediumfont"),
+)
+
+# the macro definitions presets are written with, in the order TeX runs them
+MACRO = re.compile(
+    r"\\input\{(?P<input>[^}]*)\}"
+    r"|\\def\\(?P<def>[A-Za-z]+)\{(?P<body>[^{}]*)\}"
+    r"|\\let\\(?P<let>[A-Za-z]+)\s*=?\s*\\(?P<source>[A-Za-z]+)"
+)
+COMMENT = re.compile(r"(?<!\\)%.*")
+MACRO_CALL = re.compile(r"\\([A-Za-z]+)")
+BOLD_FONT_OPTION = re.compile(r"(?:^|,)\s*BoldFont\s*=\s*([^,]+)")
+# font names within the value of a macro, e.g. of ``BoldFont=Lato-Reg,ItalicFont=...``
+FONT_NAME = re.compile(r"[,=]")
+
+# cmap subtables by preference, full unicode before the basic plane
+CMAP_ENCODINGS = ((3, 10), (0, 4), (3, 1), (0, 3))
+
+# code points beyond the planes a resume is written in are not mapped
+MAX_CODEPOINT = 0x2FFFF
+
+
+class FontError(ValueError):
+    """Raised when a font file is not a readable TrueType or OpenType font"""
+
+    def __init__(self, path: str, message: str):
+        super().__init__(f"{path}: {message}")
+        self.path = path
+        self.message = message
+
+
+@dataclass(frozen=True, slots=True)
+class FontMetrics:
+    """Horizontal advances of the characters of a font, in font units"""
+
+    name: str
+    units_per_em: int = FALLBACK_UNITS_PER_EM
+    advances: Dict[int, int] = field(default_factory=dict)
+    default_advance: int = int(FALLBACK_UNITS_PER_EM * FALLBACK_ADVANCE)
+
+    def width(self, text: str, size: float) -> float:
+        """
+        Width of a run of text set in the font.
+
+        Args:
+            text (str): The text, without kerning or ligatures
+            size (float): Font size in points
+
+        Returns:
+            float: The width in points
+        """
+        advances = self.advances
+        default = self.default_advance
+        units = sum(advances.get(ord(char), default) for char in text)
+        return units * size / self.units_per_em
+
+
+@dataclass(frozen=True, slots=True)
+class PresetFonts:  # pylint: disable=too-many-instance-attributes
+    """Metrics of the font of every role a preset assigns"""
+
+    main: FontMetrics
+    bold: FontMetrics
+    section: FontMetrics
+    subsection: FontMetrics
+    info: FontMetrics
+    additional_info: FontMetrics
+    first_name: FontMetrics
+    last_name: FontMetrics
+    profile_links: FontMetrics
+
+
+def _tables(data: bytes, path: str) -> Dict[bytes, int]:
+    """Offsets of the tables of a font"""
+    if len(data) < 12:
+        raise FontError(path, "truncated font header")
+
+    (num_tables,) = struct.unpack_from(">H", data, 4)
+    tables = {}
+    for index in range(num_tables):
+        tag, _, offset, _ = struct.unpack_from(">4sIII", data, 12 + 16 * index)
+        tables[tag] = offset
+    return tables
+
+
+def _format4_segment(
+    data: bytes, start: int, end: int, delta: int, glyphs_at: int
+) -> Iterator[Tuple[int, int]]:
+    """Code points of a segment with their glyphs, read from ``glyphs_at`` if set"""
+    for codepoint in range(start, min(end, 0xFFFE) + 1):
+        if glyphs_at:
+            (glyph,) = struct.unpack_from(
+                ">H", data, glyphs_at + 2 * (codepoint - start)
+            )
+            glyph = (glyph + delta) & 0xFFFF if glyph else 0
+        else:
+            glyph = (codepoint + delta) & 0xFFFF
+        if glyph:
+            yield codepoint, glyph
+
+
+def _cmap_format4(data: bytes, offset: int) -> Dict[int, int]:
+    """Glyphs of the code points of a segment mapping subtable"""
+    (seg_count_x2,) = struct.unpack_from(">H", data, offset + 6)
+
+    # end codes, a reserved pad, then start codes, deltas and range offsets
+    ends, starts, deltas, range_offsets = (
+        struct.unpack_from(
+            f">{seg_count_x2 // 2}{kind}",
+            data,
+            offset + 14 + index * seg_count_x2 + (2 if index else 0),
+        )
+        for index, kind in enumerate("HHhH")
+    )
+    range_offsets_at = offset + 16 + 3 * seg_count_x2
+
+    glyphs: Dict[int, int] = {}
+    for segment, start in enumerate(starts):
+        # a range offset is relative to its own entry
+        range_offset = range_offsets[segment]
+        glyphs_at = range_offset and range_offsets_at + 2 * segment + range_offset
+        glyphs.update(
+            _format4_segment(data, start, ends[segment], deltas[segment], glyphs_at)
+        )
+    return glyphs
+
+
+def _cmap_format12(data: bytes, offset: int) -> Dict[int, int]:
+    """Glyphs of the code points of a segmented coverage subtable"""
+    (num_groups,) = struct.unpack_from(">I", data, offset + 12)
+    glyphs = {}
+    for group in range(num_groups):
+        start, end, first_glyph = struct.unpack_from(
+            ">III", data, offset + 16 + 12 * group
+        )
+        for codepoint in range(start, min(end, MAX_CODEPOINT) + 1):
+            glyphs[codepoint] = first_glyph + codepoint - start
+    return glyphs
+
+
+def _cmap(data: bytes, offset: int, path: str) -> Dict[int, int]:
+    """Glyphs of the code points of the preferred unicode subtable"""
+    (num_subtables,) = struct.unpack_from(">H", data, offset + 2)
+    subtables = {}
+    for index in range(num_subtables):
+        platform, encoding, subtable = struct.unpack_from(
+            ">HHI", data, offset + 4 + 8 * index
+        )
+        subtables.setdefault((platform, encoding), offset + subtable)
+
+    for encoding in CMAP_ENCODINGS:
+        if encoding not in subtables:
+            continue
+        subtable = subtables[encoding]
+        (format_,) = struct.unpack_from(">H", data, subtable)
+        if format_ == 4:
+            return _cmap_format4(data, subtable)
+        if format_ == 12:
+            return _cmap_format12(data, subtable)
+
+    raise FontError(path, "no supported unicode cmap subtable")
+
+
+@lru_cache(maxsize=None)
+def read_font(path: Union[str, Path]) -> FontMetrics:
+    """
+    Read the advance widths of a TrueType or OpenType font.
+
+    Only the ``head``, ``hhea``, ``hmtx`` and ``cmap`` tables are read, the
+    metrics of every file are read once per process.
+
+    Args:
+        path (Union[str, Path]): Path to the ``.ttf`` or ``.otf`` file
+
+    Returns:
+        FontMetrics: The advance of every mapped character
+
+    Raises:
+        FontError: If the file lacks a table or is truncated
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    tables = _tables(data, str(path))
+
+    missing = [tag for tag in (b"head", b"hhea", b"hmtx", b"cmap") if tag not in tables]
+    if missing:
+        names = ", ".join(tag.decode("ascii") for tag in missing)
+        raise FontError(str(path), f"missing tables {names}")
+
+    try:
+        (units_per_em,) = struct.unpack_from(">H", data, tables[b"head"] + 18)
+        (num_metrics,) = struct.unpack_from(">H", data, tables[b"hhea"] + 34)
+        metrics = struct.unpack_from(f">{2 * num_metrics}H", data, tables[b"hmtx"])
+        glyphs = _cmap(data, tables[b"cmap"], str(path))
+    except struct.error as e:
+        raise FontError(str(path), f"truncated table: {e}") from e
+
+    # glyphs past the last metric share its advance
+    advances = metrics[::2]
+    last = len(advances) - 1
+    return FontMetrics(
+        name=path.stem,
+        units_per_em=units_per_em,
+        advances={
+            codepoint: advances[min(glyph, last)] for codepoint, glyph in glyphs.items()
+        },
+        default_advance=advances[0],
+    )
+
+
+def _run_macros(
+    root: Path, path: Path, macros: Dict[str, str], sources: List[Path]
+) -> None:
+    """Apply the definitions of a TeX file and of the files it inputs"""
+    if not path.is_file():
+        return
+
+    sources.append(path)
+    text = COMMENT.sub("", path.read_text(encoding="utf-8"))
+    for match in MACRO.finditer(text):
+        if match.group("input") is not None:
+            _run_macros(root, root / match.group("input"), macros, sources)
+        elif match.group("def") is not None:
+            macros[match.group("def")] = match.group("body").strip()
+        else:
+            macros[match.group("let")] = macros.get(match.group("source"), "")
+
+
+def _expand(macros: Dict[str, str], name: str) -> str:
+    """Value of a macro with macros standing in for the whole value expanded"""
+    value = macros.get(name, "")
+    seen = {name}
+    while (call := MACRO_CALL.fullmatch(value)) and call.group(1) not in seen:
+        seen.add(call.group(1))
+        value = macros.get(call.group(1), "")
+    return value
+
+
+def _load_preset(root: Path, preset: str) -> Tuple[Dict[str, str], List[Path]]:
+    """Macros defined by a preset and the files they were read from"""
+    macros: Dict[str, str] = {}
+    sources: List[Path] = []
+    presets = root / "theme" / "presets"
+    _run_macros(root, presets / "default.tex", macros, sources)
+    _run_macros(root, presets / f"{preset or DEFAULT_PRESET}.tex", macros, sources)
+    return macros, sources
+
+
+def preset_macros(root: Union[str, Path], preset: str) -> Dict[str, str]:
+    """
+    Font macros defined by a preset, the way ``\\loadpresent`` defines them.
+
+    Only ``\\def``, ``\\let`` and ``\\input`` are interpreted, which is all the
+    presets and font files use to name their fonts.
+
+    Args:
+        root (Union[str, Path]): The directory containing ``theme/`` and ``fonts/``
+        preset (str): Name of the preset, the default preset when empty
+
+    Returns:
+        Dict[str, str]: Every macro by name, roles the preset leaves empty
+            resolved as ``modifiers/default-fonts.tex`` does
+    """
+    macros, _ = _load_preset(Path(root), preset)
+
+    for role, fallback in ROLE_FALLBACKS:
+        if not macros.get(role):
+            macros[role] = f"\\{fallback}"
+
+    return {name: _expand(macros, name) for name in macros}
+
+
+def preset_sources(root: Union[str, Path], preset: str) -> List[Path]:
+    """
+    Files a preset is loaded from, with the bundled font files it names.
+
+    Args:
+        root (Union[str, Path]): The directory containing ``theme/`` and ``fonts/``
+        preset (str): Name of the preset, the default preset when empty
+
+    Returns:
+        List[Path]: The preset, every theme file it inputs and every bundled
+            font named by one of its macros or font options, without duplicates
+    """
+    root = Path(root)
+    _, sources = _load_preset(root, preset)
+
+    fonts = _font_files(root)
+    for value in preset_macros(root, preset).values():
+        for name in FONT_NAME.split(value):
+            if name.strip() in fonts:
+                sources.append(fonts[name.strip()])
+
+    return list(dict.fromkeys(sources))
+
+
+@lru_cache(maxsize=None)
+def _font_files(root: Path) -> Dict[str, Path]:
+    """The bundled font files by name"""
+    files: Dict[str, Path] = {}
+    for suffix in FONT_SUFFIXES:
+        for path in sorted((root / "fonts").rglob(f"*{suffix}")):
+            files.setdefault(path.stem, path)
+    return files
+
+
+def _metrics(root: Path, name: str) -> FontMetrics:
+    """Metrics of a font by name, estimated when it is not bundled"""
+    path: Optional[Path] = _font_files(root).get(name)
+    if path is None:
+        return FontMetrics(name=name or "fallback")
+    try:
+        return read_font(path)
+    except (OSError, FontError):
+        return FontMetrics(name=name)
+
+
+@lru_cache(maxsize=None)
+def load_preset_fonts(root: Union[str, Path], preset: str) -> PresetFonts:
+    """
+    Load the metrics of the fonts a preset sets every role in.
+
+    Fonts are looked up by name among the bundled fonts, a font that is not
+    bundled, e.g. a system font, gets an average advance per character.
+
+    Args:
+        root (Union[str, Path]): The directory containing ``theme/`` and ``fonts/``
+        preset (str): Name of the preset, the default preset when empty
+
+    Returns:
+        PresetFonts: The metrics of every role
+    """
+    root = Path(root)
+    macros = preset_macros(root, preset)
+
+    # bold runs of the body use the bold face configured for the main font
+    bold = BOLD_FONT_OPTION.search(macros.get("mainfontoptions", ""))
+    bold_name = bold.group(1).strip() if bold else macros.get("boldfont", "")
+
+    return PresetFonts(
+        main=_metrics(root, macros["mainfont"]),
+        bold=_metrics(root, bold_name),
+        section=_metrics(root, macros["sectionfont"]),
+        subsection=_metrics(root, macros["subsectionfont"]),
+        info=_metrics(root, macros["infofont"]),
+        additional_info=_metrics(root, macros["additionalinfofont"]),
+        first_name=_metrics(root, macros["firstnamefont"]),
+        last_name=_metrics(root, macros["lastnamefont"]),
+        profile_links=_metrics(root, macros["profilelinksfont"]),
+    )
@@ -0,0 +1,337 @@
+"""Loading of resume documents from disk, resolving their ``$ref`` includes."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union
+from vitagen.decoders import decode
+
+__all__ = [
+    "IncludeError",
+    "FragmentCache",
+    "load_document",
+    "parse_document",
+    "resolve_refs",
+    "has_refs",
+]
+
+# members of an object standing for the value it references, and holding the
+# content hash of a resolved object, e.g. to memoize its rendering
+REF_KEY = "$ref"
+FRAGMENT_KEY = "$fragment"
+
+# change signature of a file, its modification time and size
+Stamp = Tuple[int, int]
+
+
+class IncludeError(ValueError):
+    """Raised when a ``$ref`` include cannot be resolved"""
+
+    def __init__(self, location: str, message: str):
+        super().__init__(f"{location}: {message}")
+        self.location = location
+        self.message = message
+
+
+def _stamp(path: Path) -> Stamp:
+    """Get the change signature of a file"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _copy(value: Any) -> Any:
+    """Copy the objects and arrays of a value, so callers never share them"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _digest(value: Dict[str, Any]) -> str:
+    """Content hash of a resolved object"""
+    payload = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _mark(value: Any) -> Any:
+    """Hold the content hash of a resolved object in its ``$fragment`` member"""
+    if isinstance(value, dict):
+        value.pop(FRAGMENT_KEY, None)
+        value[FRAGMENT_KEY] = _digest(value)
+    return value
+
+
+def _pointer(document: Any, pointer: str, location: str) -> Any:
+    """Get the value a JSON pointer (RFC 6901) points to"""
+    if not pointer:
+        return document
+    if not pointer.startswith("/"):
+        raise IncludeError(location, "json pointer must start with '/'")
+
+    value = document
+    for token in pointer[1:].split("/"):
+        token = token.replace("~1", "/").replace("~0", "~")
+        if isinstance(value, dict) and token in value:
+            value = value[token]
+        elif isinstance(value, list) and token.isdigit() and int(token) < len(value):
+            value = value[int(token)]
+        else:
+            raise IncludeError(location, f"json pointer has no value at '{token}'")
+    return value
+
+
+class FragmentCache:
+    """
+    Fragment files parsed once and kept, along with the values resolved from
+    them, until the files change.
+
+    Values resolved from a fragment are checked against the modification time
+    and size of every file they were resolved from, so that a batch parses
+    and resolves each shared file once however many documents include it.
+    """
+
+    def __init__(self):
+        self.files: Dict[Path, Tuple[Stamp, Any]] = {}
+        self.fragments: Dict[Tuple[Path, str], Tuple[FrozenSet, Any]] = {}
+        self.parsed = 0
+        self.hits = 0
+
+    def load(self, path: Path) -> Tuple[Stamp, Any]:
+        """
+        Get a parsed fragment file, parsing it again only once it changed.
+
+        Args:
+            path (Path): The resolved path of the file
+
+        Returns:
+            Tuple[Stamp, Any]: The change signature and the decoded value
+
+        Raises:
+            IncludeError: If the file cannot be read or is not valid JSON
+        """
+        try:
+            stamp = _stamp(path)
+            entry = self.files.get(path)
+            if entry is not None and entry[0] == stamp:
+                return entry
+            with open(path, "rb") as f:
+                entry = self.files[path] = (stamp, decode(f.read()))
+        except OSError as e:
+            raise IncludeError(str(path), e.strerror or str(e)) from None
+        except ValueError as e:
+            raise IncludeError(str(path), f"invalid json: {e}") from None
+        self.parsed += 1
+        return entry
+
+    def get(self, key: Tuple[Path, str]) -> Optional[Tuple[FrozenSet, Any]]:
+        """
+        Get a resolved value along with the signatures of the files it was
+        resolved from, None if any of them changed since.
+        """
+        if (entry := self.fragments.get(key)) is None:
+            return None
+        try:
+            if any(_stamp(path) != stamp for path, stamp in entry[0]):
+                return None
+        except OSError:
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: Tuple[Path, str], stamps: FrozenSet, value: Any) -> None:
+        """Keep a resolved value with the signatures of the files it was resolved from"""
+        self.fragments[key] = (stamps, value)
+
+    def clear(self) -> None:
+        """Forget every file and value"""
+        self.files.clear()
+        self.fragments.clear()
+
+
+# shared by every document loaded by the process, e.g. by a batch worker
+FRAGMENTS = FragmentCache()
+
+
+class _Resolver:
+    """Resolves the includes of a single document"""
+
+    def __init__(self, root: Any, path: Path, cache: FragmentCache):
+        self.root = root
+        self.path = path
+        self.cache = cache
+        # the includes being resolved, innermost last, to report cycles
+        self.stack: List[Tuple[Path, str]] = []
+
+    def resolve(self, value: Any, path: Path, stamps: set) -> Any:
+        """Copy a value of a file with every include replaced by its value"""
+        if isinstance(value, list):
+            return [self.resolve(item, path, stamps) for item in value]
+        if not isinstance(value, dict):
+            return value
+        if REF_KEY not in value:
+            return {
+                key: self.resolve(item, path, stamps) for key, item in value.items()
+            }
+
+        resolved = self.include(value[REF_KEY], path, stamps)
+        if siblings := {key: item for key, item in value.items() if key != REF_KEY}:
+            if not isinstance(resolved, dict):
+                raise IncludeError(
+                    str(path), f"cannot override members of '{value[REF_KEY]}'"
+                )
+            resolved.update(self.resolve(siblings, path, stamps))
+            _mark(resolved)
+        return resolved
+
+    def include(self, ref: Any, path: Path, stamps: set) -> Any:
+        """Resolve the value a reference of a file points to"""
+        if not isinstance(ref, str) or not ref:
+            raise IncludeError(str(path), f"{REF_KEY} must be a non empty string")
+        name, _, pointer = ref.partition("#")
+        if "://" in name:
+            raise IncludeError(str(path), f"only local files can be included: {ref}")
+
+        target = (path.parent / name).resolve() if name else path
+        key = (target, pointer)
+        location = f"{target}#{pointer}"
+        if key in self.stack:
+            chain = " -> ".join(
+                f"{p}#{q}" for p, q in self.stack[self.stack.index(key) :]
+            )
+            raise IncludeError(location, f"include cycle: {chain} -> {location}")
+
+        # values of the document itself are resolved anew for every document,
+        # as is every value depending on them
+        if target == self.path:
+            stamps.add((target, None))
+            self.stack.append(key)
+            try:
+                return _mark(
+                    self.resolve(_pointer(self.root, pointer, location), target, stamps)
+                )
+            finally:
+                self.stack.pop()
+
+        if (cached := self.cache.get(key)) is not None:
+            stamps.update(cached[0])
+            return _copy(cached[1])
+
+        stamp, document = self.cache.load(target)
+        own = {(target, stamp)}
+        self.stack.append(key)
+        try:
+            value = _mark(
+                self.resolve(_pointer(document, pointer, location), target, own)
+            )
+        finally:
+            self.stack.pop()
+
+        if self.path not in {path for path, _ in own}:
+            self.cache.put(key, frozenset(own), value)
+        stamps.update(own)
+        return _copy(value)
+
+
+def resolve_refs(
+    data: Any,
+    path: Union[str, Path],
+    cache: Optional[FragmentCache] = None,
+    includes: Optional[Set[Path]] = None,
+) -> Any:
+    """
+    Replace every ``$ref`` include of a document by the value it references.
+
+    An include is an object ``{"$ref": "file.json#/json/pointer"}``, the file
+    is relative to the file holding the include and defaults to it, the
+    pointer defaults to the whole file. Other members of the include override
+    those of the object it references. Every resolved object holds the
+    content hash of its members in ``$fragment``.
+
+    Args:
+        data (Any): The decoded document
+        path (Union[str, Path]): The file the document was read from
+        cache (Optional[FragmentCache]): Cache of the fragment files, defaults
+            to the one shared by the process
+        includes (Optional[Set[Path]]): Receives the resolved path of every
+            fragment file the document includes, e.g. to watch them
+
+    Returns:
+        Any: A copy of the document without includes
+
+    Raises:
+        IncludeError: If an include is invalid, cyclic or its file or value is missing
+    """
+    path = Path(path).resolve()
+    resolver = _Resolver(data, path, FRAGMENTS if cache is None else cache)
+    stamps = set()
+    resolved = resolver.resolve(data, path, stamps)
+    if includes is not None:
+        includes.update(file for file, _ in stamps if file != path)
+    return resolved
+
+
+def has_refs(data: Any) -> bool:
+    """Whether a decoded document holds any ``$ref`` include"""
+    if isinstance(data, list):
+        return any(has_refs(item) for item in data)
+    if isinstance(data, dict):
+        return REF_KEY in data or any(has_refs(item) for item in data.values())
+    return False
+
+
+def parse_document(
+    text: Union[bytes, str],
+    path: Optional[Union[str, Path]] = None,
+    includes: Optional[Set[Path]] = None,
+) -> Dict[str, Any]:
+    """
+    Parse a resume document from its JSON text.
+
+    Bytes are decoded as they are, without decoding them to text first, by
+    the JSON decoder of the process, see ``vitagen.decoders``.
+
+    Args:
+        text (Union[bytes, str]): The JSON encoded resume document, UTF-8
+            encoded bytes or text
+        path (Optional[Union[str, Path]]): The file the text was read from,
+            its includes are resolved relative to it, left as they are without
+        includes (Optional[Set[Path]]): Receives the resolved path of every
+            fragment file the document includes
+
+    Returns:
+        Dict[str, Any]: The decoded resume document
+
+    Raises:
+        ValueError: If the text is not valid JSON or not a JSON object, or an
+            include cannot be resolved
+    """
+    data = decode(text)
+    if not isinstance(data, dict):
+        raise ValueError("resume document must be a json object")
+
+    if path is not None and has_refs(data):
+        return resolve_refs(data, path, includes=includes)
+
+    return data
+
+
+def load_document(
+    path: Union[str, Path], includes: Optional[Set[Path]] = None
+) -> Dict[str, Any]:
+    """
+    Load a resume document from a JSON file, resolving its includes.
+
+    Args:
+        path (Union[str, Path]): Path to the JSON file
+        includes (Optional[Set[Path]]): Receives the resolved path of every
+            fragment file the document includes
+
+    Returns:
+        Dict[str, Any]: The decoded resume document
+    """
+    with open(path, "rb") as f:
+        return parse_document(f.read(), path, includes)
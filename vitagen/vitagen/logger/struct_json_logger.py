@@ -3,14 +3,51 @@
 import os
 import json
 import logging
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict
 import structlog
-from pygments import highlight
-from pygments.lexers import JsonLexer  # pylint: disable=no-name-in-module
-from pygments.formatters import TerminalFormatter  # pylint: disable=no-name-in-module
-from vitagen.constants import CONFIG_LOG_LEVEL, ENV_LOG_PRETTY
+from vitagen.constants import CONFIG_LOG_LEVEL, ENV_LOG_PRETTY, ENV_LOG_SUMMARY
 
-__all__ = ["configure_logging", "get_logger"]
+__all__ = ["configure_logging", "get_logger", "is_enabled_for", "is_summary_mode"]
+
+
+@dataclass
+class LogSettings:
+    """Settings of the configured logging, readable without touching a logger"""
+
+    # structlog logs every level until it is configured
+    level: int = logging.NOTSET
+    summary: bool = False
+
+
+settings = LogSettings()
+
+
+def is_enabled_for(level: int) -> bool:
+    """
+    Check whether events of a level are emitted.
+
+    Hot paths check this once up front, so that events which would be filtered
+    out cost neither a bound logger nor their keyword arguments.
+
+    Args:
+        level: A ``logging`` level such as ``logging.INFO``
+
+    Returns:
+        bool: True if events of the level are emitted
+    """
+    return level >= settings.level
+
+
+def is_summary_mode() -> bool:
+    """
+    Check whether per item render events are replaced by one event per section.
+
+    Returns:
+        bool: True if ``LOG_SUMMARY`` is enabled
+    """
+    return settings.summary
 
 
 def order_fields(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
@@ -75,9 +112,13 @@ def configure_logging():
     else:
         processors += (structlog.processors.JSONRenderer(),)
 
+    settings.level = log_level
+    settings.summary = os.environ.get(ENV_LOG_SUMMARY, "False") == "True"
+
     structlog.configure(
         wrapper_class=structlog.make_filtering_bound_logger(log_level),
         processors=processors,
+        cache_logger_on_first_use=True,
     )
 
 
@@ -90,6 +131,14 @@ def colored_json_serializer(obj, **kwargs):
     Returns:
         str: The serialized JSON object with color.
     """
+    # pygments is only needed for pretty printed logs, import it on first use
+    # pylint: disable=import-outside-toplevel
+    from pygments import highlight
+    from pygments.lexers import JsonLexer  # pylint: disable=no-name-in-module
+    from pygments.formatters import (  # pylint: disable=no-name-in-module
+        TerminalFormatter,
+    )
+
     level = obj.get("level").upper()
 
     json_str = json.dumps(obj, indent=2, **kwargs)
@@ -105,9 +154,14 @@ def colored_json_serializer(obj, **kwargs):
     return f"[{colored_level}]: {colored_json}"
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str = None):
     """
     Get a configured logger instance.
+
+    Loggers are shared per name and cache their bound logger on first use, so
+    logging has to be configured before a logger is used.
+
     Args:
         name: Optional name for the logger. If None, uses the default logger.
     Returns:
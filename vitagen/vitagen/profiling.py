@@ -0,0 +1,352 @@
+"""Nested timing and memory spans of a render, reported as log events or a Chrome trace."""
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from vitagen.constants import INFO_PROFILE_SPAN, INFO_PROFILE_TRACE_WRITTEN
+
+__all__ = [
+    "Span",
+    "SpanHook",
+    "SpanTracer",
+    "TimedEscaper",
+    "MemoryHook",
+    "create_tracer",
+    "no_span",
+    "log_spans",
+    "write_chrome_trace",
+]
+
+# shared by every disabled span, entering it does nothing
+NULL_SPAN = nullcontext()
+
+
+@dataclass
+class Span:
+    """A timed stage of a render, e.g. a section or a content formatter"""
+
+    name: str
+    path: str
+    depth: int
+    start_ns: int
+    end_ns: int = 0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        """Wall time of the span in milliseconds"""
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class SpanHook:
+    """
+    Receives every span as it opens and closes.
+
+    Hooks attach their own measurements to ``span.attrs``, they are told about
+    a span before its clock starts and after it stopped, so their own cost is
+    not part of the span.
+    """
+
+    def start(self) -> None:
+        """Called when the tracer starts recording"""
+
+    def stop(self) -> None:
+        """Called when the tracer stops recording"""
+
+    def on_enter(self, span: Span) -> None:
+        """Called when a span opens"""
+
+    def on_exit(self, span: Span) -> None:
+        """Called when a span closes"""
+
+
+class SpanTracer:
+    """
+    Records nested spans of a render.
+
+    Every span is keyed by the JSON path of the node it renders, built from
+    the path of its parent span and its own suffix. Used as a context manager,
+    the tracer starts and stops its hooks.
+    """
+
+    def __init__(self, hooks: Iterable[SpanHook] = ()):
+        self.hooks = list(hooks)
+        self.spans: List[Span] = []
+        self.stack: List[Span] = []
+
+    def __enter__(self) -> "SpanTracer":
+        for hook in self.hooks:
+            hook.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        for hook in reversed(self.hooks):
+            hook.stop()
+
+    @contextmanager
+    def span(self, name: str, suffix: str = "", **attrs) -> Iterator[Span]:
+        """
+        Time the enclosed block as a child of the innermost open span.
+
+        Args:
+            name (str): Kind of the stage, e.g. ``section``
+            suffix (str): JSON path of the node relative to the parent span
+            **attrs: Additional fields reported with the span, e.g. a heading
+
+        Yields:
+            Span: The open span
+        """
+        parent_path = self.stack[-1].path if self.stack else "$"
+        span = Span(
+            name=name,
+            path=parent_path + suffix,
+            depth=len(self.stack),
+            start_ns=0,
+            attrs=attrs,
+        )
+        for hook in self.hooks:
+            hook.on_enter(span)
+
+        self.stack.append(span)
+        span.start_ns = time.perf_counter_ns()
+        try:
+            yield span
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            self.stack.pop()
+            for hook in reversed(self.hooks):
+                hook.on_exit(span)
+            self.spans.append(span)
+
+    def add(self, key: str, amount: float) -> None:
+        """Accumulate a measurement on the innermost open span"""
+        if self.stack:
+            attrs = self.stack[-1].attrs
+            attrs[key] = attrs.get(key, 0.0) + amount
+
+    def report(
+        self,
+        logger,
+        trace_path: Union[str, Path, None] = None,
+        process_name: Optional[str] = None,
+    ) -> None:
+        """
+        Log the finished spans and optionally write them as a Chrome trace.
+
+        Args:
+            logger: The logger the events are emitted on
+            trace_path (Union[str, Path, None]): The trace file to write, if any
+            process_name (Optional[str]): Label of the process row of the trace
+        """
+        log_spans(self.spans, logger)
+        if trace_path:
+            write_chrome_trace(self.spans, trace_path, logger, process_name)
+
+
+@dataclass
+class _MemoryFrame:
+    """Traced memory at the start of an open span"""
+
+    start: int
+    peak: int = 0
+    snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+class MemoryHook(SpanHook):
+    """
+    Accounts the memory allocated within every span using ``tracemalloc``.
+
+    Every span gets its ``peak_kib``, the highest memory use above its start,
+    and its ``retained_kib``, the memory still allocated when it closed. Spans
+    up to ``snapshot_depth`` also name the ``top_sites`` of the memory they
+    retained. Allocations are traced from :meth:`start` to :meth:`stop`,
+    unless ``tracemalloc`` was already tracing.
+    """
+
+    def __init__(self, top: int = 5, snapshot_depth: int = 1):
+        self.top = top
+        self.snapshot_depth = snapshot_depth
+        self.frames: List[_MemoryFrame] = []
+        self.started = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+
+    def stop(self) -> None:
+        if self.started:
+            tracemalloc.stop()
+            self.started = False
+
+    def on_enter(self, span: Span) -> None:
+        if not tracemalloc.is_tracing():
+            return
+
+        snapshot = None
+        if span.depth <= self.snapshot_depth:
+            snapshot = tracemalloc.take_snapshot()
+
+        # the parent keeps its own peak, the global one is reset for the child
+        current, peak = tracemalloc.get_traced_memory()
+        if self.frames:
+            self.frames[-1].peak = max(self.frames[-1].peak, peak)
+        self.frames.append(_MemoryFrame(start=current, snapshot=snapshot))
+        tracemalloc.reset_peak()
+
+    def on_exit(self, span: Span) -> None:
+        if not tracemalloc.is_tracing() or not self.frames:
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+        frame = self.frames.pop()
+        peak = max(frame.peak, peak)
+        if self.frames:
+            self.frames[-1].peak = max(self.frames[-1].peak, peak)
+
+        span.attrs["peak_kib"] = (peak - frame.start) / 1024
+        span.attrs["retained_kib"] = (current - frame.start) / 1024
+        if frame.snapshot is not None:
+            span.attrs["top_sites"] = self.top_sites(frame.snapshot)
+
+    def top_sites(self, before: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        """
+        Name the lines that retained the most memory since a snapshot.
+
+        Args:
+            before (tracemalloc.Snapshot): Allocations when the span opened
+
+        Returns:
+            List[Dict[str, Any]]: Site, retained size and allocation count of
+                the largest sites
+        """
+        ignored = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            # the spans and snapshots of the profiler itself
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )
+        after = tracemalloc.take_snapshot().filter_traces(ignored)
+        differences = after.compare_to(before.filter_traces(ignored), "lineno")
+        return [
+            {
+                "site": str(difference.traceback[0]),
+                "size_kib": round(difference.size_diff / 1024, 3),
+                "count": difference.count_diff,
+            }
+            for difference in differences[: self.top]
+            if difference.size_diff > 0
+        ]
+
+
+def create_tracer(
+    profile: bool = False, memory_report: bool = False
+) -> Optional[SpanTracer]:
+    """
+    Create the tracer of a render, if it is profiled at all.
+
+    Args:
+        profile (bool): Record timing spans
+        memory_report (bool): Record timing spans with their memory
+
+    Returns:
+        Optional[SpanTracer]: The tracer, ``None`` when nothing is recorded
+    """
+    if memory_report:
+        return SpanTracer([MemoryHook()])
+    return SpanTracer() if profile else None
+
+
+def no_span(*_, **__) -> nullcontext:
+    """Stand in for :meth:`SpanTracer.span` when profiling is disabled"""
+    return NULL_SPAN
+
+
+class TimedEscaper:  # pylint: disable=too-few-public-methods
+    """Escaper accumulating its time on the innermost open span"""
+
+    __slots__ = ("escaper", "tracer")
+
+    def __init__(self, escaper, tracer: SpanTracer):
+        self.escaper = escaper
+        self.tracer = tracer
+
+    def escape(self, text: str) -> str:
+        """Escape text, adding the elapsed time as ``escape_ms``"""
+        started = time.perf_counter_ns()
+        escaped = self.escaper.escape(text)
+        self.tracer.add("escape_ms", (time.perf_counter_ns() - started) / 1e6)
+        return escaped
+
+
+def log_spans(spans: Iterable[Span], logger) -> None:
+    """
+    Emit one structured event per finished span, outermost first.
+
+    Args:
+        spans (Iterable[Span]): The finished spans
+        logger: The logger the events are emitted on
+    """
+    for span in sorted(spans, key=lambda s: (s.start_ns, s.depth)):
+        logger.info(
+            INFO_PROFILE_SPAN,
+            span=span.name,
+            path=span.path,
+            depth=span.depth,
+            duration_ms=round(span.duration_ms, 3),
+            **{
+                key: round(value, 3) if isinstance(value, float) else value
+                for key, value in span.attrs.items()
+            },
+        )
+
+
+def write_chrome_trace(
+    spans: Iterable[Span],
+    path: Union[str, Path],
+    logger=None,
+    process_name: Optional[str] = None,
+) -> None:
+    """
+    Write spans as a Chrome trace, viewable in chrome://tracing or Perfetto.
+
+    Args:
+        spans (Iterable[Span]): The finished spans
+        path (Union[str, Path]): The trace file to write
+        logger: Optional logger announcing the written file
+        process_name (Optional[str]): Label of the process row, e.g. the document
+    """
+    pid = os.getpid()
+    events: List[Dict[str, Any]] = [
+        {
+            "name": span.name,
+            "cat": "render",
+            "ph": "X",
+            "ts": span.start_ns / 1e3,
+            "dur": (span.end_ns - span.start_ns) / 1e3,
+            "pid": pid,
+            "tid": 0,
+            "args": {"path": span.path, **span.attrs},
+        }
+        for span in spans
+    ]
+    if process_name:
+        events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": process_name},
+            }
+        )
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    if logger is not None:
+        logger.info(INFO_PROFILE_TRACE_WRITTEN, value=str(path), spans=len(events))
@@ -0,0 +1,528 @@
+"""Local render server backed by a pool of pre-warmed worker processes."""
+
+import argparse
+import ipaddress
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import stat
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Connection
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Callable, Optional, Set
+from vitagen.constants import (
+    ERROR_SERVER_RENDER_FAILED,
+    INFO_SERVER_REQUEST,
+    INFO_SERVER_STARTED,
+    INFO_SERVER_STOPPED,
+)
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import parse_resume
+from vitagen.generator.sources import external_sources
+from vitagen.loader import has_refs, parse_document
+from vitagen.logger.struct_json_logger import configure_logging, get_logger
+
+__all__ = [
+    "InvalidDocumentError",
+    "PoolBusyError",
+    "RenderPool",
+    "create_server",
+    "serve",
+    "add_arguments",
+]
+
+# requests larger than this are rejected before reaching a worker
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# seconds a stopped worker gets to exit before it is killed
+STOP_SECONDS = 1.0
+
+# messages of the server to a worker, and outcomes of a worker to the server
+RENDER, PING, STOP = "render", "ping", "stop"
+OK, INVALID, FAILED = "ok", "invalid", "failed"
+
+
+class InvalidDocumentError(ValueError):
+    """Raised when a request body is not a valid resume document"""
+
+
+class PoolBusyError(RuntimeError):
+    """Raised when the render pool has no free slot for a request"""
+
+
+def render_payload(body: bytes) -> str:
+    """
+    Render a JSON encoded resume document inside a worker process.
+
+    Args:
+        body (bytes): UTF-8 encoded JSON resume document
+
+    Returns:
+        str: The generated LaTeX content
+
+    Raises:
+        InvalidDocumentError: If the body is not a valid resume document
+    """
+    try:
+        data = parse_document(body)
+        # requests must not read files of the machine the server runs on
+        if has_refs(data):
+            raise InvalidDocumentError("includes are not allowed")
+        document = parse_resume(data)
+    except ValueError as e:
+        raise InvalidDocumentError(str(e)) from None
+
+    if next(external_sources(document), None) is not None:
+        raise InvalidDocumentError("external sources are not allowed")
+
+    return ResumeContentGenerator(document).build_resume()
+
+
+def _work(conn: Connection, render: Callable[[bytes], str]) -> None:
+    """Render the bodies the server sends, until told to stop"""
+    # interrupts are handled by the server, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    configure_logging()
+
+    while True:
+        try:
+            kind, body = conn.recv()
+        except EOFError:
+            return
+        if kind == STOP:
+            return
+        if kind == PING:
+            conn.send((OK, os.getpid()))
+            continue
+        try:
+            conn.send((OK, render(body)))
+        except InvalidDocumentError as e:
+            conn.send((INVALID, str(e)))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            conn.send((FAILED, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """A worker process and the end of its pipe held by the server"""
+
+    def __init__(self, render: Callable[[bytes], str]):
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_work, args=(child, render), daemon=True
+        )
+        self.process.start()
+        # only the worker holds the other end, its exit ends the pipe
+        child.close()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """The process id of the worker"""
+        return self.process.pid
+
+    def call(self, kind: str, body: Optional[bytes], timeout: Optional[float]):
+        """
+        Send a message and wait for its outcome.
+
+        Raises:
+            TimeoutError: If the worker did not answer within the timeout
+            EOFError: If the worker exited without answering
+        """
+        self.conn.send((kind, body))
+        if not self.conn.poll(timeout):
+            raise TimeoutError
+        return self.conn.recv()
+
+    def kill(self) -> None:
+        """Stop the worker whatever it is doing"""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        """Ask an idle worker to exit, killing it if it does not"""
+        try:
+            self.conn.send((STOP, None))
+        except OSError:
+            pass
+        self.process.join(STOP_SECONDS)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class RenderPool:  # pylint: disable=too-many-instance-attributes
+    """
+    Pool of pre-forked, already imported worker processes with backpressure.
+
+    At most ``workers`` documents render concurrently and at most
+    ``max_pending`` more wait for a worker. Requests beyond that are refused
+    immediately instead of queueing without bound. A request that does not
+    finish within ``timeout`` seconds, waiting for a worker included, is
+    abandoned and the worker rendering it is killed and replaced, so that
+    slow documents never keep workers or slots from later requests.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: float = 30.0,
+        render: Callable[[bytes], str] = render_payload,
+    ):
+        """
+        Args:
+            workers (Optional[int]): Number of worker processes, defaults to
+                the CPU count
+            max_pending (Optional[int]): Requests allowed to wait for a worker,
+                defaults to the number of workers
+            timeout (float): Seconds a single render may take
+            render (Callable[[bytes], str]): Renders a request body inside a
+                worker, a picklable module level function
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_pending = self.workers if max_pending is None else max_pending
+        self.timeout = timeout
+        self.render_body = render
+        self.slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self.idle: "queue.SimpleQueue[_Worker]" = queue.SimpleQueue()
+        self.running: Set[_Worker] = set()
+        self.guard = threading.Lock()
+        self.closed = False
+        for _ in range(self.workers):
+            worker = _Worker(render)
+            self.running.add(worker)
+            self.idle.put(worker)
+
+    def _replace(self, worker: _Worker) -> None:
+        """Kill a worker and put a fresh one in its place, unless shut down"""
+        replacement = None
+        with self.guard:
+            self.running.discard(worker)
+            if not self.closed:
+                replacement = _Worker(self.render_body)
+                self.running.add(replacement)
+        worker.kill()
+        if replacement is not None:
+            self.idle.put(replacement)
+
+    def warm_up(self) -> None:
+        """Wait until every worker process is up before the first request arrives"""
+        workers = [self.idle.get() for _ in range(self.workers)]
+        try:
+            for worker in workers:
+                worker.call(PING, None, None)
+        finally:
+            for worker in workers:
+                self.idle.put(worker)
+
+    def render(self, body: bytes) -> str:
+        """
+        Render a JSON encoded resume document on a worker.
+
+        Args:
+            body (bytes): UTF-8 encoded JSON resume document
+
+        Returns:
+            str: The generated LaTeX content
+
+        Raises:
+            PoolBusyError: If all workers and pending slots are taken
+            InvalidDocumentError: If the body is not a valid resume document
+            TimeoutError: If rendering takes longer than the timeout
+        """
+        if not self.slots.acquire(blocking=False):  # pylint: disable=R1732
+            raise PoolBusyError("all render workers are busy")
+
+        deadline = time.monotonic() + self.timeout
+        try:
+            try:
+                worker = self.idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise TimeoutError(
+                    f"rendering took longer than {self.timeout}s"
+                ) from None
+            try:
+                outcome, value = worker.call(
+                    RENDER, body, max(0.0, deadline - time.monotonic())
+                )
+            except TimeoutError:
+                # a running render cannot be interrupted, only its worker
+                self._replace(worker)
+                raise TimeoutError(
+                    f"rendering took longer than {self.timeout}s"
+                ) from None
+            except (EOFError, OSError):
+                self._replace(worker)
+                raise RuntimeError("render worker exited") from None
+            self.idle.put(worker)
+        finally:
+            self.slots.release()
+
+        if outcome == INVALID:
+            raise InvalidDocumentError(value)
+        if outcome == FAILED:
+            raise RuntimeError(value)
+        return value
+
+    def shutdown(self) -> None:
+        """Stop the idle workers and kill those still rendering"""
+        with self.guard:
+            self.closed = True
+            workers, self.running = self.running, set()
+        idle = set()
+        while True:
+            try:
+                idle.add(self.idle.get_nowait())
+            except queue.Empty:
+                break
+        for worker in workers:
+            if worker in idle:
+                worker.stop()
+            else:
+                worker.kill()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler exposing the render pool"""
+
+    server_version = "vitagen"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Silence the default stderr access log, requests are logged as events"""
+
+    def send_text(self, status: HTTPStatus, body: str, content_type: str) -> None:
+        """Send a complete response"""
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_error_json(self, status: HTTPStatus, message: str) -> None:
+        """Send an error response with a JSON body"""
+        self.send_text(status, json.dumps({"error": message}), "application/json")
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Report the health of the server"""
+        if self.path != "/health":
+            self.send_error_json(HTTPStatus.NOT_FOUND, "not found")
+            return
+
+        pool: RenderPool = self.server.pool
+        self.send_text(
+            HTTPStatus.OK,
+            json.dumps({"status": "ok", "workers": pool.workers}),
+            "application/json",
+        )
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Render the resume document in the request body"""
+        if self.path != "/render":
+            self.send_error_json(HTTPStatus.NOT_FOUND, "not found")
+            return
+
+        if (header := self.headers.get("Content-Length")) is None:
+            self.send_error_json(HTTPStatus.LENGTH_REQUIRED, "content length required")
+            return
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        # a negative length would read until the client disconnects
+        if length < 0:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, "invalid content length")
+            return
+        if length > MAX_BODY_BYTES:
+            self.send_error_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "body too large")
+            return
+
+        started = time.perf_counter()
+        status = HTTPStatus.OK
+        try:
+            self.send_text(
+                status, self.server.pool.render(self.rfile.read(length)), "text/x-tex"
+            )
+        except InvalidDocumentError as e:
+            status = HTTPStatus.BAD_REQUEST
+            self.send_error_json(status, str(e))
+        except PoolBusyError as e:
+            status = HTTPStatus.SERVICE_UNAVAILABLE
+            self.send_error_json(status, str(e))
+        except TimeoutError as e:
+            status = HTTPStatus.GATEWAY_TIMEOUT
+            self.send_error_json(status, str(e))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            get_logger("vitagen").error(ERROR_SERVER_RENDER_FAILED, error=str(e))
+            self.send_error_json(status, "rendering failed")
+
+        get_logger("vitagen").info(
+            INFO_SERVER_REQUEST,
+            status=int(status),
+            request_bytes=length,
+            latency_ms=round((time.perf_counter() - started) * 1e3, 2),
+        )
+
+
+class RenderHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server listening on a loopback TCP address"""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, pool: RenderPool):
+        super().__init__(address, RenderRequestHandler)
+        self.pool = pool
+
+
+class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """Threading HTTP server listening on a unix domain socket"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, pool: RenderPool):
+        super().__init__(socket_path, RenderRequestHandler)
+        self.pool = pool
+
+
+def _check_loopback(host: str) -> None:
+    """Refuse to listen on anything but the local machine"""
+    if host == "localhost":
+        return
+    if not ipaddress.ip_address(host).is_loopback:
+        raise ValueError(f"render server only listens on localhost, got {host}")
+
+
+def _remove_socket(socket_path: str) -> None:
+    """
+    Remove the socket a previous server left behind.
+
+    Raises:
+        ValueError: If the path exists and is not a socket, it is left untouched
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{socket_path} exists and is not a unix socket")
+    os.unlink(socket_path)
+
+
+def create_server(
+    pool: RenderPool,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+):
+    """
+    Create a render server bound to localhost or to a unix socket.
+
+    Args:
+        pool (RenderPool): The pool rendering the documents
+        host (str): Loopback address to listen on
+        port (int): Port to listen on, 0 picks a free one
+        socket_path (Optional[str]): Unix socket to listen on instead of TCP
+
+    Returns:
+        The bound server, ready for ``serve_forever``
+
+    Raises:
+        ValueError: If the host is not a loopback address, or the socket path
+            exists and is not a socket
+    """
+    if socket_path:
+        _remove_socket(socket_path)
+        return UnixHTTPServer(socket_path, pool)
+
+    _check_loopback(host)
+    return RenderHTTPServer((host, port), pool)
+
+
+def serve(
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    timeout: float = 30.0,
+) -> None:
+    """
+    Serve ``POST /render`` until interrupted.
+
+    Args:
+        host (str): Loopback address to listen on
+        port (int): Port to listen on
+        socket_path (Optional[str]): Unix socket to listen on instead of TCP
+        workers (Optional[int]): Number of worker processes, defaults to the CPU count
+        max_pending (Optional[int]): Requests allowed to wait for a worker
+        timeout (float): Seconds a single render may take
+
+    Raises:
+        ValueError: If the host is not a loopback address, or the socket path
+            exists and is not a socket
+    """
+    logger = get_logger("vitagen")
+    if socket_path:
+        # refused before the workers are spawned, never removed
+        _remove_socket(socket_path)
+    else:
+        _check_loopback(host)
+
+    pool = RenderPool(workers=workers, max_pending=max_pending, timeout=timeout)
+    try:
+        pool.warm_up()
+        server = create_server(pool, host=host, port=port, socket_path=socket_path)
+    except BaseException:
+        pool.shutdown()
+        raise
+
+    logger.info(
+        INFO_SERVER_STARTED,
+        address=socket_path or f"http://{host}:{server.server_address[1]}",
+        workers=pool.workers,
+        max_pending=pool.max_pending,
+        timeout=timeout,
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
+        if socket_path:
+            _remove_socket(socket_path)
+
+    logger.info(INFO_SERVER_STOPPED)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the serve options to a parser"""
+    parser.add_argument("--host", default="127.0.0.1", help="loopback address")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--socket", help="unix socket to listen on instead of tcp")
+    # a dest of its own, the render mode has a --workers option of its own
+    parser.add_argument(
+        "--workers",
+        dest="serve_workers",
+        type=int,
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "--max-pending", type=int, help="requests allowed to wait for a free worker"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="seconds a single render may take"
+    )
@@ -0,0 +1 @@
+"""Compilation of rendered resumes into PDFs with a TeX engine."""
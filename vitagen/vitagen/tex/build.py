@@ -0,0 +1,520 @@
+"""Build driver compiling a resume into a PDF, cached by the content of every input."""
+
+# The generator is imported when a build runs, so that registering the build
+# command on the command line parser stays cheap.
+# pylint: disable=import-outside-toplevel
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union
+from vitagen.layout.fonts import DEFAULT_PRESET, PROJECT_ROOT, preset_sources
+from vitagen.profiling import SpanTracer
+from vitagen.tex.engine import ENGINES, TexEngine, XeLatexEngine
+from vitagen.tex.preamble import CLASS_FILE, MAIN_TEX, FormatCache, split_main
+from vitagen.utils import copy_atomic, create_tmp_dir, remove_tmp_dir, write_atomic
+
+if TYPE_CHECKING:
+    from vitagen.generator.cache import SectionCache
+    from vitagen.generator.config.theme import Theme
+    from vitagen.generator.model import Resume
+
+__all__ = [
+    "BuildError",
+    "BuildResult",
+    "PdfCache",
+    "SourceDigests",
+    "build_sources",
+    "content_digest",
+    "compile_tex",
+    "build",
+    "add_arguments",
+    "add_compile_arguments",
+    "cache_directory",
+    "format_directory",
+]
+
+# bump to invalidate every cached PDF regardless of its inputs
+CACHE_FORMAT_VERSION = "1"
+
+# the main file and the class every build compiles
+SOURCE_FILES = (MAIN_TEX, CLASS_FILE)
+# directories of commands and modifiers the class and the main file input
+SOURCE_DIRS = ("cmd", "modifiers", "processor")
+# the rendered document the main file inputs, hashed by its content instead
+GENERATED_TEX = "processor/python-data.tex"
+
+# files whose change after a pass means references are not settled yet
+AUX_SUFFIXES = (".aux", ".out")
+MAX_PASSES = 2
+
+DEFAULT_CACHE_DIR = ".vitagen-cache/pdf"
+DEFAULT_FORMAT_DIR = ".vitagen-cache/formats"
+DIGESTS_FILE = "digests.json"
+
+
+class BuildError(RuntimeError):
+    """Raised when the TeX engine fails to compile a document"""
+
+    def __init__(self, message: str, log_path: Optional[Path] = None):
+        super().__init__(message)
+        self.message = message
+        self.log_path = log_path
+
+
+@dataclass
+class BuildResult:
+    """Outcome of a build"""
+
+    pdf: Path
+    digest: str
+    cached: bool
+    passes: int = 0
+    fmt: Optional[Path] = None
+    stages_ms: Dict[str, float] = field(default_factory=dict)
+
+
+class PdfCache:
+    """On disk cache of compiled PDFs keyed by the digest of their inputs"""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def path_for(self, digest: str) -> Path:
+        """Get the path of the PDF stored under a digest"""
+        return self.directory / digest[:2] / f"{digest}.pdf"
+
+    def get(self, digest: str) -> Optional[Path]:
+        """
+        Get a cached PDF.
+
+        Args:
+            digest (str): The content digest of the build
+
+        Returns:
+            Optional[Path]: Path of the cached PDF or None if it is not cached
+        """
+        path = self.path_for(digest)
+        return path if path.is_file() else None
+
+    def put(self, digest: str, pdf: Path) -> Path:
+        """
+        Store a PDF atomically, concurrent builds never expose partial files.
+
+        Args:
+            digest (str): The content digest of the build
+            pdf (Path): The compiled PDF
+
+        Returns:
+            Path: Path of the cached copy
+        """
+        path = self.path_for(digest)
+        copy_atomic(pdf, path)
+        return path
+
+
+class SourceDigests:
+    """
+    Digests of source files, recomputed only when their size or mtime changes.
+
+    The digests are persisted in a JSON file, so that repeated builds of
+    unchanged sources do not read the sources, fonts included, again.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else None
+        self.entries: Dict[str, Tuple[int, int, str]] = {}
+        self.changed = False
+        if self.path is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = {
+                        name: tuple(entry) for name, entry in json.load(f).items()
+                    }
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def digest(self, path: Path) -> str:
+        """Get the digest of a file"""
+        stat = path.stat()
+        entry = self.entries.get(str(path))
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.entries[str(path)] = (stat.st_mtime_ns, stat.st_size, digest)
+        self.changed = True
+        return digest
+
+    def save(self) -> None:
+        """Persist the digests, if any changed"""
+        if self.path is not None and self.changed:
+            write_atomic(self.path, json.dumps(self.entries, sort_keys=True))
+            self.changed = False
+
+
+def build_sources(root: Union[str, Path], preset: str) -> List[Path]:
+    """
+    Every source file a build of a document with a preset reads.
+
+    Args:
+        root (Union[str, Path]): The directory the sources are compiled from
+        preset (str): Name of the preset, the default preset when empty
+
+    Returns:
+        List[Path]: The main file, the class, the command, modifier and
+            processor files, the theme files of the preset and its fonts
+    """
+    root = Path(root)
+    sources = [root / name for name in SOURCE_FILES]
+    for directory in SOURCE_DIRS:
+        sources.extend(sorted((root / directory).glob("*.tex")))
+    sources.extend(preset_sources(root, preset or DEFAULT_PRESET))
+
+    generated = root / GENERATED_TEX
+    return [
+        path for path in dict.fromkeys(sources) if path != generated and path.is_file()
+    ]
+
+
+def content_digest(
+    tex: str,
+    root: Union[str, Path],
+    sources: List[Path],
+    engine: str,
+    digests: Optional[SourceDigests] = None,
+) -> str:
+    """
+    Digest of everything a build reads, equal digests compile to equal PDFs.
+
+    Args:
+        tex (str): The rendered document
+        root (Union[str, Path]): The directory the sources are compiled from
+        sources (List[Path]): The source files of the build
+        engine (str): Name of the engine compiling the document
+        digests (Optional[SourceDigests]): Memo of the source file digests
+
+    Returns:
+        str: Hex digest of the build
+    """
+    root = Path(root)
+    digests = digests or SourceDigests()
+    digest = hashlib.sha256(f"{CACHE_FORMAT_VERSION}:{engine}".encode("utf-8"))
+    digest.update(hashlib.sha256(tex.encode("utf-8")).digest())
+    for path in sources:
+        digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+        digest.update(bytes.fromhex(digests.digest(path)))
+    return digest.hexdigest()
+
+
+def _aux_state(job: Path) -> Tuple[Optional[bytes], ...]:
+    """Contents of the auxiliary files of a job, None for missing files"""
+    state = []
+    for suffix in AUX_SUFFIXES:
+        try:
+            state.append(job.with_suffix(suffix).read_bytes())
+        except FileNotFoundError:
+            state.append(None)
+    return tuple(state)
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until a monotonic deadline, None without one"""
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _write_main(tex: str, root: Path, work_dir: Path, preamble: bool) -> Path:
+    """Write the rendered document and a main file inputting it into a work directory"""
+    document = work_dir / Path(GENERATED_TEX).name
+    write_atomic(document, tex)
+    main = work_dir / MAIN_TEX
+    source = (root / MAIN_TEX).read_text(encoding="utf-8")
+    if not preamble:
+        _, source = split_main(source)
+    write_atomic(main, source.replace(GENERATED_TEX, document.as_posix()))
+    return main
+
+
+def compile_tex(  # pylint: disable=too-many-locals
+    tex: str,
+    root: Union[str, Path],
+    work_dir: Union[str, Path],
+    engine: TexEngine,
+    *,
+    fmt: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    cancel: Optional[threading.Event] = None,
+    tracer: Optional[SpanTracer] = None,
+) -> Tuple[Path, int]:
+    """
+    Compile a rendered document, running a second pass only when needed.
+
+    The main file is copied into the work directory with the rendered
+    document in place of ``processor/python-data.tex``, so that the job files
+    stay out of the sources. A pass is only repeated when it changed the
+    auxiliary files the pass read, which a work directory reused across
+    builds of the same document keeps rare. Against a format, the main file
+    is copied without the preamble the format was dumped from.
+
+    Args:
+        tex (str): The rendered document
+        root (Union[str, Path]): The directory the sources are compiled from
+        work_dir (Union[str, Path]): Directory of the job files
+        engine (TexEngine): The engine running the passes
+        fmt (Optional[Path]): Format of the preamble to compile against
+        timeout (Optional[float]): Seconds every pass may take together
+        cancel (Optional[threading.Event]): Stops the running pass once set
+        tracer (Optional[SpanTracer]): Records a ``pass`` span per pass
+
+    Returns:
+        Tuple[Path, int]: The compiled PDF and the number of passes run
+
+    Raises:
+        BuildError: If a pass failed, timed out or wrote no PDF
+        CompileCancelled: If the compile was cancelled
+    """
+    root, work_dir = Path(root).resolve(), Path(work_dir).resolve()
+    main = _write_main(tex, root, work_dir, preamble=fmt is None)
+    job = work_dir / main.stem
+    tracer = tracer or SpanTracer()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    before = _aux_state(job)
+    for passes in range(1, MAX_PASSES + 1):
+        with tracer.span("pass", number=passes):
+            try:
+                status = engine.run(
+                    main,
+                    work_dir,
+                    root,
+                    fmt=fmt,
+                    timeout=_remaining(deadline),
+                    cancel=cancel,
+                )
+            except subprocess.TimeoutExpired as e:
+                raise BuildError(
+                    f"{engine.name} timed out after {timeout}s in pass {passes}",
+                    job.with_suffix(".log"),
+                ) from e
+
+        if status != 0 or not job.with_suffix(".pdf").is_file():
+            raise BuildError(
+                f"{engine.name} pass {passes} failed with status {status}",
+                job.with_suffix(".log"),
+            )
+
+        after = _aux_state(job)
+        if after == before:
+            break
+        before = after
+
+    return job.with_suffix(".pdf"), passes
+
+
+def _render(
+    data: Union[Dict[str, Any], "Resume"],
+    theme: Optional["Theme"],
+    section_cache: Optional["SectionCache"],
+) -> Tuple[str, str]:
+    """Render a document, returning the LaTeX output and the preset"""
+    from vitagen.generator.main import ResumeContentGenerator
+
+    generator = ResumeContentGenerator(data, section_cache=section_cache, theme=theme)
+    return generator.build_resume(), generator.document.preset
+
+
+def build(  # pylint: disable=too-many-arguments,too-many-locals
+    data: Union[Dict[str, Any], "Resume"],
+    pdf: Union[str, Path],
+    *,
+    root: Union[str, Path, None] = None,
+    cache: Optional[PdfCache] = None,
+    formats: Optional[FormatCache] = None,
+    engine: Optional[TexEngine] = None,
+    theme: Optional["Theme"] = None,
+    section_cache: Optional["SectionCache"] = None,
+    timeout: Optional[float] = None,
+    work_dir: Union[str, Path, None] = None,
+    cancel: Optional[threading.Event] = None,
+    tracer: Optional[SpanTracer] = None,
+) -> BuildResult:
+    """
+    Build the PDF of a document, served from the cache when nothing changed.
+
+    The digest covers the rendered document, the class, the command,
+    modifier and processor files, the theme files and fonts of the preset
+    and the engine. Builds that miss the cache reuse a work directory per
+    output name next to the cache, so that the auxiliary files of the
+    previous build save the second pass, unless given a work directory.
+    With a format cache, passes start from the format of the preamble. A
+    compile that only succeeds without the format rejects the format.
+
+    Args:
+        data (Union[Dict[str, Any], Resume]): The raw or parsed document
+        pdf (Union[str, Path]): Path the PDF is written to
+        root (Union[str, Path, None]): The directory the sources are compiled
+            from, defaults to ``PROJECT_ROOT``
+        cache (Optional[PdfCache]): Cache of compiled PDFs, none to always compile
+        formats (Optional[FormatCache]): Cache of preamble formats, none to
+            compile the preamble in every pass
+        engine (Optional[TexEngine]): The engine, XeLaTeX by default
+        theme (Optional[Theme]): Formatter configuration of the render
+        section_cache (Optional[SectionCache]): Persistent section cache
+        timeout (Optional[float]): Seconds the passes may take together
+        work_dir (Union[str, Path, None]): Directory of the job files, by
+            default one per output name next to the cache or a scratch
+            directory without a cache
+        cancel (Optional[threading.Event]): Stops the running pass once set
+        tracer (Optional[SpanTracer]): Records a span per stage
+
+    Returns:
+        BuildResult: The PDF, the digest, whether it was cached, the passes
+            run, the format compiled against and the milliseconds of every stage
+
+    Raises:
+        BuildError: If the engine failed
+        CompileCancelled: If the build was cancelled while compiling
+    """
+    root = Path(root or PROJECT_ROOT)
+    pdf = Path(pdf)
+    engine = engine or XeLatexEngine()
+    tracer = tracer or SpanTracer()
+    stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(name: str) -> Iterator[None]:
+        """Time a stage of the build"""
+        with tracer.span(name) as span:
+            yield
+        stages[f"{name}_ms"] = span.duration_ms
+
+    with stage("render"):
+        tex, preset = _render(data, theme, section_cache)
+
+    with stage("hash"):
+        digests = SourceDigests(cache.directory / DIGESTS_FILE if cache else None)
+        digest = content_digest(
+            tex, root, build_sources(root, preset), engine.name, digests
+        )
+        digests.save()
+
+    with stage("lookup"):
+        cached = cache.get(digest) if cache is not None else None
+        if cached is not None:
+            copy_atomic(cached, pdf)
+
+    if cached is not None:
+        return BuildResult(pdf=pdf, digest=digest, cached=True, stages_ms=stages)
+
+    if work_dir is None and cache is not None:
+        work_dir = cache.directory / "work" / pdf.stem
+        Path(work_dir).mkdir(parents=True, exist_ok=True)
+
+    scratch = create_tmp_dir() if work_dir is None else None
+    try:
+        fmt = None
+        if formats is not None:
+            with stage("format"):
+                fmt = formats.ensure(root, engine, timeout=timeout, cancel=cancel)
+
+        def compile_with(fmt: Optional[Path]) -> Tuple[Path, int]:
+            return compile_tex(
+                tex,
+                root,
+                work_dir or scratch,
+                engine,
+                fmt=fmt,
+                timeout=timeout,
+                cancel=cancel,
+                tracer=tracer,
+            )
+
+        with stage("compile"):
+            try:
+                compiled, passes = compile_with(fmt)
+            except BuildError as e:
+                if fmt is None or isinstance(e.__cause__, subprocess.TimeoutExpired):
+                    raise
+                # tell a broken format from a broken document
+                compiled, passes = compile_with(None)
+                formats.reject(fmt, e.message)
+                fmt = None
+
+        with stage("store"):
+            if cache is not None:
+                cache.put(digest, compiled)
+            copy_atomic(compiled, pdf)
+    finally:
+        if scratch is not None:
+            remove_tmp_dir(scratch)
+
+    return BuildResult(
+        pdf=pdf, digest=digest, cached=False, passes=passes, fmt=fmt, stages_ms=stages
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the build options to a parser"""
+    parser.add_argument("document", help="path to the JSON file")
+    parser.add_argument(
+        "--pdf", help="path of the PDF, defaults to the document with a .pdf suffix"
+    )
+    add_compile_arguments(parser)
+
+
+def add_compile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the sources, cache and engine of a build to a parser"""
+    parser.add_argument(
+        "--root",
+        default=str(PROJECT_ROOT),
+        help="directory the LaTeX sources are compiled from",
+    )
+    parser.add_argument(
+        "--pdf-cache",
+        help=f"directory of the PDF cache, defaults to {DEFAULT_CACHE_DIR} "
+        "below --root",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="always compile, in a scratch directory"
+    )
+    parser.add_argument(
+        "--format-cache",
+        help=f"directory of the preamble formats, defaults to {DEFAULT_FORMAT_DIR} "
+        "below --root",
+    )
+    parser.add_argument(
+        "--no-format",
+        action="store_true",
+        help="compile the preamble in every pass instead of loading its format",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default=XeLatexEngine.name,
+        help="tex engine, stub writes a placeholder PDF without TeX installed",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="seconds the engine passes of a document may take together",
+    )
+
+
+def cache_directory(args: argparse.Namespace) -> Optional[Path]:
+    """The PDF cache directory of the command line, None when disabled"""
+    if args.no_cache:
+        return None
+    return Path(args.pdf_cache or os.path.join(args.root, DEFAULT_CACHE_DIR))
+
+
+def format_directory(args: argparse.Namespace) -> Optional[Path]:
+    """The preamble format directory of the command line, None when disabled"""
+    if args.no_format:
+        return None
+    return Path(args.format_cache or os.path.join(args.root, DEFAULT_FORMAT_DIR))
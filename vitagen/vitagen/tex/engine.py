@@ -0,0 +1,374 @@
+"""TeX engines run by the build driver, XeLaTeX or a stub standing in for it."""
+
+import hashlib
+import os
+import re
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+__all__ = [
+    "CompileCancelled",
+    "TexEngine",
+    "XeLatexEngine",
+    "StubEngine",
+    "ENGINES",
+    "create_engine",
+]
+
+# files a main file inputs by absolute path, e.g. the rendered document
+ABSOLUTE_INPUT = re.compile(r"\\input\{(/[^}]*)\}")
+
+# what LaTeX writes to the auxiliary file of a single page document
+STUB_AUX = "\\relax\n\\gdef \\@abspage@last{1}\n"
+
+# seconds between checks of a running pass for its timeout and cancellation
+POLL_INTERVAL = 0.05
+
+
+class CompileCancelled(Exception):
+    """Raised when a pass is stopped because its compile was cancelled"""
+
+
+class TexEngine:
+    """
+    Compiles a main file, writing the PDF, log and auxiliary files of the job
+    into an output directory.
+
+    Every pass runs in the directory the LaTeX sources are compiled from, so
+    that the class, theme and font paths of the sources resolve.
+    """
+
+    name = "tex"
+
+    def version(self) -> str:
+        """The build of the engine, formats dumped by one only load in the same"""
+        return self.name
+
+    def run(
+        self,
+        main: Path,
+        output_dir: Path,
+        cwd: Path,
+        *,
+        fmt: Optional[Path] = None,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        Run a single pass over a main file.
+
+        Args:
+            main (Path): The main ``.tex`` file
+            output_dir (Path): Directory the job files are written to
+            cwd (Path): Directory the sources are compiled from
+            fmt (Optional[Path]): A format dumped by ``dump`` to start the pass
+                from, the main file then holds the document without its preamble
+            timeout (Optional[float]): Seconds the pass may take
+            cancel (Optional[threading.Event]): Stops the pass once set
+
+        Returns:
+            int: Exit status of the pass, 0 on success
+
+        Raises:
+            subprocess.TimeoutExpired: If the pass took longer than the timeout
+            CompileCancelled: If the cancel event was set during the pass
+        """
+        raise NotImplementedError
+
+    def dump(
+        self,
+        preamble: Path,
+        output_dir: Path,
+        cwd: Path,
+        jobname: str,
+        *,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        Dump the state after a preamble into a format, ``<jobname>.fmt``.
+
+        Args:
+            preamble (Path): File holding the preamble, ending in ``\\dump``
+            output_dir (Path): Directory the format and its log are written to
+            cwd (Path): Directory the sources are compiled from
+            jobname (str): Name of the format
+            timeout (Optional[float]): Seconds the dump may take
+            cancel (Optional[threading.Event]): Stops the dump once set
+
+        Returns:
+            int: Exit status of the dump, 0 on success
+
+        Raises:
+            subprocess.TimeoutExpired: If the dump took longer than the timeout
+            CompileCancelled: If the cancel event was set during the dump
+        """
+        raise NotImplementedError
+
+
+@lru_cache(maxsize=None)
+def _executable_version(executable: str) -> str:
+    """The first line ``--version`` prints, the executable itself if it fails"""
+    try:
+        completed = subprocess.run(
+            [executable, "--version"],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return executable
+    lines = completed.stdout.splitlines()
+    return f"{shutil.which(executable) or executable}:{lines[0] if lines else ''}"
+
+
+class XeLatexEngine(TexEngine):
+    """The XeLaTeX engine, in non interactive mode"""
+
+    name = "xelatex"
+
+    def __init__(self, executable: str = "xelatex", extra_args: Sequence[str] = ()):
+        self.executable = executable
+        self.extra_args = tuple(extra_args)
+
+    def version(self) -> str:
+        return _executable_version(self.executable)
+
+    def command(
+        self, main: Path, output_dir: Path, fmt: Optional[Path] = None
+    ) -> List[str]:
+        """The command line of a pass"""
+        return [
+            self.executable,
+            "-interaction=nonstopmode",
+            "-halt-on-error",
+            f"-output-directory={output_dir}",
+            *([f"-fmt={fmt.with_suffix('')}"] if fmt is not None else []),
+            *self.extra_args,
+            str(main),
+        ]
+
+    def dump_command(self, preamble: Path, output_dir: Path, jobname: str) -> List[str]:
+        """The command line dumping a format on top of the LaTeX one"""
+        return [
+            self.executable,
+            "-ini",
+            "-interaction=nonstopmode",
+            "-halt-on-error",
+            f"-jobname={jobname}",
+            f"-output-directory={output_dir}",
+            *self.extra_args,
+            f"&{self.name}",
+            str(preamble),
+        ]
+
+    def run(
+        self,
+        main: Path,
+        output_dir: Path,
+        cwd: Path,
+        *,
+        fmt: Optional[Path] = None,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> int:
+        return self._wait(self.command(main, output_dir, fmt), cwd, timeout, cancel)
+
+    def dump(
+        self,
+        preamble: Path,
+        output_dir: Path,
+        cwd: Path,
+        jobname: str,
+        *,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> int:
+        command = self.dump_command(preamble, output_dir, jobname)
+        return self._wait(command, cwd, timeout, cancel)
+
+    def _wait(
+        self,
+        command: List[str],
+        cwd: Path,
+        timeout: Optional[float],
+        cancel: Optional[threading.Event],
+    ) -> int:
+        """Run a command until it exits, times out or is cancelled"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # a session of its own lets a stopped pass take its children down too
+        with subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=os.name == "posix",
+        ) as process:
+            try:
+                while True:
+                    try:
+                        return process.wait(timeout=POLL_INTERVAL)
+                    except subprocess.TimeoutExpired:
+                        pass
+                    if cancel is not None and cancel.is_set():
+                        raise CompileCancelled(
+                            f"{self.name} run over {command[-1]} cancelled"
+                        )
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise subprocess.TimeoutExpired(command, timeout)
+            finally:
+                if process.poll() is None:
+                    _kill(process)
+
+
+def _kill(process: subprocess.Popen) -> None:
+    """Kill a pass and every process it started, then reap it"""
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        process.kill()
+    process.wait()
+
+
+def _placeholder_pdf(title: str) -> bytes:
+    """A valid single blank page PDF carrying a title"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>",
+        f"<< /Title ({title}) /Producer (vitagen stub engine) >>".encode("ascii"),
+    ]
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode("ascii")
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R /Info 4 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode("ascii")
+    return bytes(pdf)
+
+
+class StubEngine(TexEngine):
+    """
+    Stands in for a TeX engine where none is installed, e.g. in tests.
+
+    A pass writes a blank PDF titled with the digest of the main file and the
+    files it inputs by absolute path, along with a log and the ``.aux`` file
+    of a single page document, so that only the first pass in a fresh work
+    directory asks for a second one. A dump writes a format holding the
+    digest of the preamble. Every pass is recorded in ``passes`` and every
+    dump in ``dumps``, both take ``delay`` seconds to stand in for the time
+    TeX takes.
+    """
+
+    name = "stub"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.passes: List[Path] = []
+        self.dumps: List[Path] = []
+
+    def _wait(
+        self, path: Path, timeout: Optional[float], cancel: Optional[threading.Event]
+    ) -> None:
+        """Take ``delay`` seconds, unless cancelled or timed out first"""
+        if not self.delay:
+            return
+        delay = self.delay if timeout is None else min(self.delay, timeout)
+        if (cancel or threading.Event()).wait(delay):
+            raise CompileCancelled(f"{self.name} run over {path} cancelled")
+        if delay < self.delay:
+            raise subprocess.TimeoutExpired(self.name, timeout)
+
+    def run(
+        self,
+        main: Path,
+        output_dir: Path,
+        cwd: Path,
+        *,
+        fmt: Optional[Path] = None,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> int:
+        self._wait(main, timeout, cancel)
+
+        job = output_dir / main.stem
+        if fmt is not None and not fmt.is_file():
+            job.with_suffix(".log").write_text(f"format {fmt} not found\n", "utf-8")
+            return 1
+
+        source = main.read_text(encoding="utf-8")
+        digest = hashlib.sha256(source.encode("utf-8"))
+        for path in ABSOLUTE_INPUT.findall(source):
+            digest.update(Path(path).read_bytes())
+        title = digest.hexdigest()[:16]
+
+        job.with_suffix(".aux").write_text(STUB_AUX, "utf-8")
+        job.with_suffix(".log").write_text(f"stub engine pass over {main}\n", "utf-8")
+        job.with_suffix(".pdf").write_bytes(_placeholder_pdf(title))
+        self.passes.append(main)
+        return 0
+
+    def dump(
+        self,
+        preamble: Path,
+        output_dir: Path,
+        cwd: Path,
+        jobname: str,
+        *,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> int:
+        self._wait(preamble, timeout, cancel)
+
+        job = output_dir / jobname
+        digest = hashlib.sha256(preamble.read_bytes()).hexdigest()
+        job.with_suffix(".log").write_text(f"stub engine dump of {preamble}\n", "utf-8")
+        job.with_suffix(".fmt").write_text(f"stub format {digest}\n", "utf-8")
+        self.dumps.append(preamble)
+        return 0
+
+
+# engines selectable on the command line
+ENGINES: Dict[str, type] = {
+    XeLatexEngine.name: XeLatexEngine,
+    StubEngine.name: StubEngine,
+}
+
+
+def create_engine(name: str = XeLatexEngine.name) -> TexEngine:
+    """
+    Create an engine by name.
+
+    Args:
+        name (str): A key of ``ENGINES``
+
+    Returns:
+        TexEngine: A new engine
+
+    Raises:
+        ValueError: If no engine has the name
+    """
+    if name not in ENGINES:
+        raise ValueError(f"unknown engine '{name}', expected one of {sorted(ENGINES)}")
+    return ENGINES[name]()
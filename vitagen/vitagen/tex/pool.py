@@ -0,0 +1,312 @@
+"""Parallel compilation of many resumes into PDFs, each job in a scratch directory of its own."""
+
+# The batch jobs and the generator are imported when a compilation runs, so
+# that registering the compile command on the command line parser stays cheap.
+# pylint: disable=import-outside-toplevel
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, TYPE_CHECKING, Union
+from vitagen.constants import (
+    ERROR_COMPILE_DOCUMENT_CANCELLED,
+    ERROR_COMPILE_DOCUMENT_FAILED,
+    INFO_COMPILE_COMPLETED,
+    INFO_COMPILE_DOCUMENT_BUILT,
+    INFO_COMPILE_STARTED,
+)
+from vitagen.logger.struct_json_logger import get_logger
+from vitagen.tex.build import BuildError, PdfCache, add_compile_arguments, build
+from vitagen.tex.engine import CompileCancelled, TexEngine
+from vitagen.tex.preamble import MAIN_TEX, FormatCache
+from vitagen.utils import copy_atomic, create_tmp_dir, remove_tmp_dir
+
+if TYPE_CHECKING:
+    from vitagen.batch import BatchJob
+    from vitagen.generator.config.theme import Theme
+
+__all__ = [
+    "CompileOptions",
+    "CompileResult",
+    "CompileSummary",
+    "compile_job",
+    "run_compile",
+    "add_arguments",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class CompileOptions:
+    """Settings shared by every job of a compilation"""
+
+    engine: TexEngine
+    root: Path
+    cache: Optional[PdfCache] = None
+    formats: Optional[FormatCache] = None
+    timeout: Optional[float] = None
+
+
+@dataclass
+class CompileResult:  # pylint: disable=too-many-instance-attributes
+    """Outcome of compiling a single document"""
+
+    name: str
+    pdf: Path
+    ok: bool
+    seconds: float
+    log: Optional[Path] = None
+    cached: bool = False
+    passes: int = 0
+    cancelled: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class CompileSummary:
+    """Aggregate outcome of a compilation"""
+
+    results: List[CompileResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        """Number of documents compiled successfully"""
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def cancelled(self) -> int:
+        """Number of documents whose compilation was cancelled"""
+        return sum(1 for result in self.results if result.cancelled)
+
+    @property
+    def failed(self) -> int:
+        """Number of documents that failed to compile, cancelled ones excluded"""
+        return len(self.results) - self.succeeded - self.cancelled
+
+
+def _collect_log(work_dir: str, log: Path) -> Optional[Path]:
+    """Copy the engine log of a job next to its PDF, if the engine wrote one"""
+    source = Path(work_dir) / Path(MAIN_TEX).with_suffix(".log")
+    if not source.is_file():
+        return None
+    copy_atomic(source, log)
+    return log
+
+
+def compile_job(
+    job: "BatchJob", options: CompileOptions, cancel: threading.Event
+) -> CompileResult:
+    """
+    Compile a single document in a scratch directory, isolating any failure
+    to the job itself.
+
+    The PDF and the engine log are written next to the rendered output of
+    the job, with ``.pdf`` and ``.log`` suffixes, and the scratch directory is
+    removed whatever the outcome.
+
+    Args:
+        job (BatchJob): The document to compile
+        options (CompileOptions): The engine, sources, caches and timeout
+        cancel (threading.Event): Stops the job once set
+
+    Returns:
+        CompileResult: The outcome of the job
+    """
+    from vitagen.generator.cache import SectionCache
+
+    started = time.perf_counter()
+    pdf = Path(job.output).with_suffix(".pdf")
+
+    def result(**kwargs) -> CompileResult:
+        return CompileResult(
+            name=job.name, pdf=pdf, seconds=time.perf_counter() - started, **kwargs
+        )
+
+    if cancel.is_set():
+        return result(ok=False, cancelled=True, error="cancelled before it started")
+
+    scratch = create_tmp_dir()
+    log = None
+    try:
+        built = build(
+            job.load(),
+            pdf,
+            root=options.root,
+            cache=options.cache,
+            formats=options.formats,
+            engine=options.engine,
+            theme=job.theme,
+            section_cache=SectionCache(job.cache_dir) if job.cache_dir else None,
+            timeout=options.timeout,
+            work_dir=scratch,
+            cancel=cancel,
+        )
+        log = _collect_log(scratch, pdf.with_suffix(".log"))
+    except CompileCancelled as e:
+        return result(ok=False, cancelled=True, error=str(e))
+    except BuildError as e:
+        log = _collect_log(scratch, pdf.with_suffix(".log"))
+        return result(ok=False, log=log, error=e.message)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return result(ok=False, error=f"{type(e).__name__}: {e}")
+    finally:
+        remove_tmp_dir(scratch)
+
+    return result(ok=True, log=log, cached=built.cached, passes=built.passes)
+
+
+def run_compile(  # pylint: disable=too-many-arguments
+    source: Union[str, Path],
+    output_dir: Union[str, Path],
+    options: CompileOptions,
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    *,
+    fail_fast: bool = False,
+    theme: Optional["Theme"] = None,
+) -> CompileSummary:
+    """
+    Compile every document of a batch source into a PDF.
+
+    At most ``workers`` engine processes run at a time. Once interrupted, or
+    after the first failure with ``fail_fast``, running passes are killed and
+    the jobs that did not start yet are reported as cancelled.
+
+    Args:
+        source (Union[str, Path]): Directory, glob pattern or JSONL file of documents
+        output_dir (Union[str, Path]): Directory the PDFs and logs are written to
+        options (CompileOptions): The engine, sources, caches and timeout
+        workers (Optional[int]): Number of documents compiled at a time,
+            defaults to the CPU count
+        cache_dir (Optional[str]): Directory of the persistent section cache
+        fail_fast (bool): Cancel the remaining jobs after the first failure
+        theme (Optional[Theme]): Formatter configuration of every document
+
+    Returns:
+        CompileSummary: Per document results, in the order of the source, and
+            the wall time
+
+    Raises:
+        KeyboardInterrupt: Once every running job stopped, when interrupted
+    """
+    from vitagen.batch import collect_jobs
+
+    logger = get_logger("vitagen")
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = collect_jobs(source, output_dir, cache_dir, theme=theme)
+    logger.info(
+        INFO_COMPILE_STARTED,
+        total=len(jobs),
+        workers=workers,
+        engine=options.engine.name,
+    )
+
+    summary = CompileSummary()
+    started = time.perf_counter()
+    summary.results = _run_jobs(jobs, options, workers, fail_fast, logger)
+    summary.wall_seconds = time.perf_counter() - started
+
+    logger.info(
+        INFO_COMPILE_COMPLETED,
+        total=len(summary.results),
+        succeeded=summary.succeeded,
+        failed=summary.failed,
+        cancelled=summary.cancelled,
+        cached=sum(1 for result in summary.results if result.cached),
+        wall_seconds=round(summary.wall_seconds, 4),
+    )
+
+    return summary
+
+
+def _run_jobs(
+    jobs: List["BatchJob"],
+    options: CompileOptions,
+    workers: int,
+    fail_fast: bool,
+    logger,
+) -> List[CompileResult]:
+    """Compile jobs on a bounded pool, logging every result as it arrives"""
+    results: List[Optional[CompileResult]] = [None] * len(jobs)
+    cancel = threading.Event()
+
+    def run(job: "BatchJob") -> CompileResult:
+        result = compile_job(job, options, cancel)
+        # cancelled by the failing job itself, before its thread takes the next
+        if fail_fast and not result.ok:
+            cancel.set()
+        return result
+
+    # the engines run in processes of their own, threads only wait for them
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="vitagen-tex"
+    ) as pool:
+        futures = {pool.submit(run, job): index for index, job in enumerate(jobs)}
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                _log_result(result, logger)
+        except KeyboardInterrupt:
+            cancel.set()
+            for future in futures:
+                future.cancel()
+            raise
+
+    return [result for result in results if result is not None]
+
+
+def _log_result(result: CompileResult, logger) -> None:
+    """Log the outcome of a single document"""
+    if result.ok:
+        logger.info(
+            INFO_COMPILE_DOCUMENT_BUILT,
+            document=result.name,
+            pdf=str(result.pdf),
+            cached=result.cached,
+            passes=result.passes,
+            seconds=round(result.seconds, 4),
+        )
+    elif result.cancelled:
+        logger.warning(
+            ERROR_COMPILE_DOCUMENT_CANCELLED,
+            document=result.name,
+            seconds=round(result.seconds, 4),
+        )
+    else:
+        logger.error(
+            ERROR_COMPILE_DOCUMENT_FAILED,
+            document=result.name,
+            seconds=round(result.seconds, 4),
+            error=result.error,
+            log=str(result.log) if result.log else None,
+        )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the compile options to a parser"""
+    parser.add_argument(
+        "source", help="directory, glob or JSONL file of JSON documents to compile"
+    )
+    parser.add_argument(
+        "output_dir", help="directory the PDFs and engine logs are written to"
+    )
+    # a dest of its own, the render mode has a --workers option of its own
+    parser.add_argument(
+        "--workers",
+        dest="compile_workers",
+        type=int,
+        help="number of documents compiled at a time, defaults to the CPU count",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="cancel the remaining documents after the first failure",
+    )
+    add_compile_arguments(parser)
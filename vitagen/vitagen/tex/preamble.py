@@ -0,0 +1,218 @@
+"""Formats dumped from the preamble of the main file, cached by the content of its inputs."""
+
+import hashlib
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from vitagen.tex.engine import TexEngine
+from vitagen.utils import copy_atomic, create_tmp_dir, remove_tmp_dir, write_atomic
+
+__all__ = [
+    "MAIN_TEX",
+    "CLASS_FILE",
+    "FormatCache",
+    "split_main",
+    "preamble_sources",
+    "format_key",
+]
+
+# bump to invalidate every cached format regardless of its inputs
+FORMAT_VERSION = "1"
+
+# the main file and the class its preamble loads
+MAIN_TEX = "resume.tex"
+CLASS_FILE = "resume.cls"
+
+BEGIN_DOCUMENT = "\\begin{document}"
+COMMENT = re.compile(r"(?<!\\)%.*")
+# inputs and the braces telling top level inputs from those of definitions
+CLASS_TOKEN = re.compile(r"\\input\{(?P<input>[^}]*)\}|(?<!\\)[{}]")
+
+
+def split_main(source: str) -> Tuple[str, str]:
+    """
+    Split a main file into its preamble and its document.
+
+    Args:
+        source (str): The main file
+
+    Returns:
+        Tuple[str, str]: Everything before ``\\begin{document}`` and the rest
+
+    Raises:
+        ValueError: If the main file has no document
+    """
+    index = source.find(BEGIN_DOCUMENT)
+    if index < 0:
+        raise ValueError(f"main file has no {BEGIN_DOCUMENT}")
+    return source[:index], source[index:]
+
+
+def _class_inputs(text: str) -> List[str]:
+    """
+    Files a class inputs while it is loaded.
+
+    Inputs within braces belong to command definitions, the class only
+    defines those and the document runs them.
+    """
+    inputs, depth = [], 0
+    for match in CLASS_TOKEN.finditer(COMMENT.sub("", text)):
+        if match.group("input") is None:
+            depth += 1 if match.group(0) == "{" else -1
+        elif depth == 0:
+            inputs.append(match.group("input"))
+    return inputs
+
+
+def preamble_sources(root: Union[str, Path]) -> List[Path]:
+    """
+    Every source file the preamble of the main file reads.
+
+    Args:
+        root (Union[str, Path]): The directory the sources are compiled from
+
+    Returns:
+        List[Path]: The main file, the class and the files the class inputs
+            while it is loaded
+    """
+    root = Path(root)
+    sources = [root / MAIN_TEX, root / CLASS_FILE]
+    sources.extend(
+        root / name
+        for name in _class_inputs((root / CLASS_FILE).read_text(encoding="utf-8"))
+    )
+    return [path for path in dict.fromkeys(sources) if path.is_file()]
+
+
+def format_key(preamble: str, root: Union[str, Path], engine: TexEngine) -> str:
+    """
+    Digest of everything a format is dumped from, equal keys dump equal formats.
+
+    Args:
+        preamble (str): The preamble of the main file
+        root (Union[str, Path]): The directory the sources are compiled from
+        engine (TexEngine): The engine dumping and loading the format
+
+    Returns:
+        str: Hex digest of the format
+    """
+    root = Path(root)
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{engine.version()}".encode("utf-8"))
+    digest.update(hashlib.sha256(preamble.encode("utf-8")).digest())
+    for path in preamble_sources(root):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+class FormatCache:
+    """
+    On disk cache of formats dumped from the preamble of the main file.
+
+    A format is dumped once per key and loaded by every later compile, so
+    that passes skip loading the class, its packages and their settings. A
+    preamble that fails to dump, or a format that fails to compile with, is
+    remembered next to the formats and compiled without a format from then
+    on.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.locks: Dict[str, threading.Lock] = {}
+        self.guard = threading.Lock()
+
+    def path_for(self, key: str) -> Path:
+        """Get the path of the format stored under a key"""
+        return self.directory / key[:2] / f"{key}.fmt"
+
+    def reject(self, fmt: Path, reason: str) -> None:
+        """
+        Stop using a format, e.g. after a compile with it failed.
+
+        Args:
+            fmt (Path): A format returned by ``ensure``
+            reason (str): Why the format is rejected, kept in its place
+        """
+        write_atomic(fmt.with_suffix(".failed"), reason)
+        fmt.unlink(missing_ok=True)
+
+    def ensure(
+        self,
+        root: Union[str, Path],
+        engine: TexEngine,
+        *,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Optional[Path]:
+        """
+        Get the format of the current preamble, dumping it if it is not cached.
+
+        Concurrent callers of the same cache wait for a single dump.
+
+        Args:
+            root (Union[str, Path]): The directory the sources are compiled from
+            engine (TexEngine): The engine dumping and loading the format
+            timeout (Optional[float]): Seconds the dump may take
+            cancel (Optional[threading.Event]): Stops the dump once set
+
+        Returns:
+            Optional[Path]: The format, None if the preamble does not dump
+
+        Raises:
+            CompileCancelled: If the dump was cancelled
+        """
+        root = Path(root).resolve()
+        preamble, _ = split_main((root / MAIN_TEX).read_text(encoding="utf-8"))
+        key = format_key(preamble, root, engine)
+        path = self.path_for(key)
+
+        with self.guard:
+            lock = self.locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if path.is_file():
+                return path
+            if path.with_suffix(".failed").is_file():
+                return None
+            return self._dump(
+                preamble, key, root, engine, timeout=timeout, cancel=cancel
+            )
+
+    def _dump(
+        self,
+        preamble: str,
+        key: str,
+        root: Path,
+        engine: TexEngine,
+        *,
+        timeout: Optional[float],
+        cancel: Optional[threading.Event],
+    ) -> Optional[Path]:
+        """Dump a preamble in a scratch directory and store the format"""
+        path = self.path_for(key)
+        scratch = Path(create_tmp_dir())
+        try:
+            source = scratch / "preamble.tex"
+            write_atomic(source, f"{preamble}\n\\dump\n")
+            try:
+                status = engine.dump(
+                    source, scratch, root, key, timeout=timeout, cancel=cancel
+                )
+            except subprocess.TimeoutExpired:
+                # a slow machine may dump it next time, nothing is remembered
+                return None
+
+            dumped, log = scratch / f"{key}.fmt", scratch / f"{key}.log"
+            if status != 0 or not dumped.is_file():
+                reason = f"{engine.name} dump failed with status {status}\n"
+                if log.is_file():
+                    reason += log.read_text(encoding="utf-8", errors="replace")
+                write_atomic(path.with_suffix(".failed"), reason)
+                return None
+
+            copy_atomic(dumped, path)
+            return path
+        finally:
+            remove_tmp_dir(scratch)
@@ -1,20 +1,116 @@
 """Utility functions for the application."""
 
 import os
-
+import secrets
+import stat
 import tempfile
-from shutil import rmtree
-import uuid
+from shutil import copyfileobj, rmtree
+from typing import Tuple, Union
+
+TMP_DIR_PREFIX = "vitagen-"
+
+
+def create_tmp_dir(prefix: str = TMP_DIR_PREFIX) -> str:
+    """Create a temporary directory of its own for the caller.
+
+    Every call gets a new directory, so that concurrent jobs never share
+    their scratch files.
+
+    Args:
+        prefix (str): Prefix of the directory name
+
+    Returns:
+        str: Path of the new directory
+    """
+    return tempfile.mkdtemp(prefix=prefix)
+
+
+def remove_tmp_dir(path):
+    """Remove a temporary directory and everything in it.
+
+    Args:
+        path: Path of a directory created by ``create_tmp_dir``
+    """
+    rmtree(path, ignore_errors=True)
+
+
+def _create_tmp(path) -> Tuple[int, str]:
+    """Create the temporary file an atomic write of a file is moved from.
+
+    The file is created next to its target with the mode of the target, or
+    for a new target with the mode a plain ``open`` would give it, the
+    default mode minus the umask, unlike ``mkstemp`` which only allows the
+    owner in.
+
+    Args:
+        path: Path of the file to write
+
+    Returns:
+        Tuple[int, str]: The descriptor and the path of the temporary file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp_path = os.path.join(directory, f"tmp{secrets.token_hex(6)}.tmp")
+        try:
+            # the umask applies to the mode, as it does for open
+            fd = os.open(tmp_path, flags, 0o666)
+            break
+        except FileExistsError:
+            continue
+
+    try:
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+    except FileNotFoundError:
+        pass
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_path)
+        raise
+    return fd, tmp_path
+
+
+def write_atomic(path, content: Union[str, bytes]):
+    """Write text to a file atomically, readers never see a partial file.
+
+    The content is written to a temporary file next to the target and moved
+    over it once complete, keeping the mode of the target.
 
-TMP_DIR_UUID = str(uuid.uuid1())
-TMP_DIR = os.path.join(tempfile.gettempdir(), TMP_DIR_UUID)
+    Args:
+        path: Path of the file to write
+        content (Union[str, bytes]): Text to write, or bytes written as they are
+    """
+    fd, tmp_path = _create_tmp(path)
+    try:
+        if isinstance(content, bytes):
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
-def create_tmp_dir():
-    """Create a temporary directory for the application."""
-    os.makedirs(TMP_DIR)
+def copy_atomic(source, path):
+    """Copy a file atomically, readers never see a partial copy.
 
+    The copy keeps the mode of the file it replaces, a new one gets the
+    default mode minus the umask.
 
-def remove_tmp_dir():
-    """Remove the temporary directory for the application."""
-    rmtree(TMP_DIR, ignore_errors=True)
+    Args:
+        source: Path of the file to copy
+        path: Path of the copy
+    """
+    fd, tmp_path = _create_tmp(path)
+    try:
+        with os.fdopen(fd, "wb") as f, open(source, "rb") as src:
+            copyfileobj(src, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
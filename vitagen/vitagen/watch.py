@@ -0,0 +1,167 @@
+"""Watch mode keeping the generator warm and re-rendering on every change."""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
+from vitagen.constants import (
+    ERROR_WATCH_RENDER_FAILED,
+    INFO_WATCH_RENDERED,
+    INFO_WATCH_STARTED,
+    INFO_WATCH_STOPPED,
+)
+from vitagen.generator.cache import SectionCache
+from vitagen.generator.config.theme import Theme
+from vitagen.generator.main import ResumeContentGenerator
+from vitagen.generator.model import parse_resume
+from vitagen.generator.sources import external_sources
+from vitagen.loader import load_document
+from vitagen.logger.struct_json_logger import get_logger
+from vitagen.utils import write_atomic
+
+__all__ = ["render_once", "watch"]
+
+Signature = Optional[Tuple[int, int]]
+
+
+def _signature(path: Path) -> Signature:
+    """Get a cheap change signature of a file, None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _snapshot(paths: Iterable[Path]) -> Dict[Path, Signature]:
+    """Get the change signatures of every watched path"""
+    return {path: _signature(path) for path in paths}
+
+
+def _rebase(
+    seen: Dict[Path, Signature], paths: Iterable[Path]
+) -> Dict[Path, Signature]:
+    """Keep the signatures of the paths still watched, take those of new ones"""
+    return {path: seen[path] if path in seen else _signature(path) for path in paths}
+
+
+def render_once(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    cache_dir: Optional[str] = None,
+    theme: Optional[Theme] = None,
+    dependencies: Optional[Set[Path]] = None,
+) -> float:
+    """
+    Render a document and atomically replace the output with it.
+
+    Args:
+        input_path (Union[str, Path]): Path to the JSON document
+        output_path (Union[str, Path]): Path of the generated tex file
+        cache_dir (Optional[str]): Directory of the persistent section cache
+        theme (Optional[Theme]): Formatter configuration, defaults to the default theme
+        dependencies (Optional[Set[Path]]): Receives every other file the
+            render read, the fragment files the document includes and the
+            external sources it reads
+
+    Returns:
+        float: The render latency in seconds
+    """
+    started = time.perf_counter()
+
+    document = parse_resume(load_document(input_path, dependencies), input_path)
+    if dependencies is not None:
+        dependencies.update(Path(source.path) for source in external_sources(document))
+    section_cache = SectionCache(cache_dir) if cache_dir else None
+    generator = ResumeContentGenerator(
+        document, section_cache=section_cache, theme=theme
+    )
+    write_atomic(output_path, generator.build_resume())
+
+    return time.perf_counter() - started
+
+
+def watch(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    cache_dir: Optional[str] = None,
+    *,
+    debounce: float = 0.1,
+    poll_interval: float = 0.05,
+    extra_paths: Iterable[Union[str, Path]] = (),
+    stop: Optional[threading.Event] = None,
+    theme: Optional[Theme] = None,
+) -> None:
+    """
+    Re-render a document every time its input changes, until stopped.
+
+    Changes are detected by polling modification time and size of the input
+    and of every fragment file and external source it read in the last render.
+    A burst of saves is debounced: rendering starts once the inputs stayed
+    unchanged for ``debounce`` seconds. Render failures, e.g. a half written JSON file, are
+    logged and the previous output is kept.
+
+    Args:
+        input_path (Union[str, Path]): Path to the JSON document
+        output_path (Union[str, Path]): Path of the generated tex file
+        cache_dir (Optional[str]): Directory of the persistent section cache
+        debounce (float): Quiet period in seconds before re-rendering
+        poll_interval (float): Seconds between two polls of the inputs
+        extra_paths (Iterable[Union[str, Path]]): Additional files triggering a render
+        stop (Optional[threading.Event]): Event ending the watch, runs until
+            interrupted when not provided
+        theme (Optional[Theme]): Formatter configuration, loaded once and kept
+            across renders
+    """
+    logger = get_logger("vitagen")
+    stop = stop or threading.Event()
+    watched = [Path(input_path), *map(Path, extra_paths)]
+    paths = list(watched)
+
+    def render() -> None:
+        """Render, watching the files the render read from then on"""
+        nonlocal paths
+        dependencies: Set[Path] = set()
+        try:
+            latency = render_once(
+                input_path, output_path, cache_dir, theme, dependencies
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # the files of the last successful render stay watched
+            logger.error(ERROR_WATCH_RENDER_FAILED, error=f"{type(e).__name__}: {e}")
+            return
+        paths = [*watched, *sorted(dependencies - set(watched))]
+        logger.info(
+            INFO_WATCH_RENDERED,
+            value=str(output_path),
+            render_ms=round(latency * 1e3, 2),
+            dependencies=len(dependencies),
+        )
+
+    logger.info(INFO_WATCH_STARTED, paths=[str(path) for path in paths])
+
+    seen = _snapshot(paths)
+    render()
+    # files found by the render are compared from their state after it
+    seen = _rebase(seen, paths)
+
+    try:
+        while not stop.wait(poll_interval):
+            if (current := _snapshot(paths)) == seen:
+                continue
+
+            # wait for the burst of saves to settle
+            while not stop.wait(debounce):
+                if (settled := _snapshot(paths)) == current:
+                    break
+                current = settled
+
+            seen = current
+            if not stop.is_set():
+                render()
+                seen = _rebase(seen, paths)
+    except KeyboardInterrupt:
+        pass
+
+    logger.info(INFO_WATCH_STOPPED)